@@ -0,0 +1,344 @@
+"""Parallel vectorization of a directory of floor plan images.
+
+`run_batch` fans `run_vectorize` out over a process pool. Each plan gets its
+own output directory, and a ``batch.source.json`` marker records the hash of
+the source bytes and config that produced it, so reruns skip unchanged plans.
+One JSON line per plan, with per-stage timings, is appended to the summary
+file as results arrive, so an interrupted batch keeps its progress.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .logging_utils import configure_logging
+from .pipeline import PIPELINE_ERRORS, run_vectorize
+from .types import VectorizeConfig
+
+log = configure_logging("haus.batch")
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".webp")
+SOURCE_MARKER = "batch.source.json"
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    image_path: Path
+    out_dir: Path
+    source_sha256: str
+    wall_height: float = 2.6
+    scale_override: float | None = None
+    clean: bool = True
+    clean_max_side: int | None = None
+
+
+def discover_images(input_dir: Path, exclude: Path | None = None) -> list[Path]:
+    """Return floor plan images under *input_dir*, recursively, in a stable order.
+
+    Anything under *exclude* is skipped, so an output directory inside the
+    input tree does not feed its own renders back in on the next run.
+    """
+    excluded = exclude.resolve() if exclude is not None else None
+    return sorted(
+        path
+        for path in input_dir.rglob("*")
+        if path.is_file()
+        and path.suffix.lower() in IMAGE_SUFFIXES
+        and (excluded is None or not path.resolve().is_relative_to(excluded))
+    )
+
+
+def _output_dirs(images: list[Path], input_dir: Path, out_root: Path) -> list[Path]:
+    stems: dict[Path, int] = {}
+    for image in images:
+        key = image.relative_to(input_dir).with_suffix("")
+        stems[key] = stems.get(key, 0) + 1
+    dirs = []
+    for image in images:
+        relative = image.relative_to(input_dir)
+        key = relative.with_suffix("")
+        # 1.png and 1.jpg side by side would otherwise share an output dir.
+        name = key.name if stems[key] == 1 else f"{key.name}_{image.suffix.lstrip('.').lower()}"
+        dirs.append(out_root / key.parent / name)
+    return dirs
+
+
+def source_hash(
+    image_path: Path,
+    *,
+    wall_height: float,
+    scale_override: float | None,
+    clean: bool,
+    clean_max_side: int | None = None,
+) -> str:
+    """Hash the image bytes together with every config value that changes the output."""
+    digest = hashlib.sha256()
+    with image_path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    settings: list[Any] = [wall_height, scale_override, clean]
+    if clean_max_side is not None:
+        # Appended only when set, so existing full-resolution outputs stay current.
+        settings.append(clean_max_side)
+    digest.update(json.dumps(settings).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _is_current(job: BatchJob) -> bool:
+    marker = job.out_dir / SOURCE_MARKER
+    try:
+        recorded = json.loads(marker.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return False
+    return (
+        isinstance(recorded, dict)
+        and recorded.get("source_sha256") == job.source_sha256
+        and (job.out_dir / "vector.metadata.json").exists()
+    )
+
+
+def _init_worker(max_memory_mb: int | None) -> None:
+    import cv2
+
+    # One OpenCV thread per process: the pool already saturates the cores, and
+    # nested thread pools make throughput scale worse, not better.
+    cv2.setNumThreads(1)
+    if max_memory_mb:
+        try:
+            import resource
+
+            limit = int(max_memory_mb) * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError):
+            log.warning("Could not cap worker memory at %s MB on this platform", max_memory_mb)
+
+
+def _vectorize_job(job: BatchJob) -> dict[str, Any]:
+    timings: dict[str, float] = {}
+    started = time.perf_counter()
+    row: dict[str, Any] = {
+        "image": str(job.image_path),
+        "out_dir": str(job.out_dir),
+        "source_sha256": job.source_sha256,
+        "pid": os.getpid(),
+    }
+    try:
+        metadata = run_vectorize(
+            VectorizeConfig(
+                image_path=job.image_path,
+                out_dir=job.out_dir,
+                wall_height=job.wall_height,
+                scale_override=job.scale_override,
+                clean=job.clean,
+                clean_max_side=job.clean_max_side,
+            ),
+            timings=timings,
+        )
+    except MemoryError:
+        row.update({"status": "error", "error": "worker memory limit exceeded"})
+    except PIPELINE_ERRORS as exc:
+        row.update({"status": "error", "error": f"{type(exc).__name__}: {exc}"})
+    else:
+        walls = metadata.get("walls", {})
+        openings = metadata.get("openings", {})
+        row.update(
+            {
+                "status": "ok",
+                "wall_count": walls.get("total_segments") if isinstance(walls, dict) else None,
+                "opening_count": openings.get("total") if isinstance(openings, dict) else None,
+            }
+        )
+        marker = {
+            "source_sha256": job.source_sha256,
+            "image": str(job.image_path),
+            "wall_height": job.wall_height,
+            "scale_override": job.scale_override,
+            "clean": job.clean,
+            "clean_max_side": job.clean_max_side,
+        }
+        (job.out_dir / SOURCE_MARKER).write_text(json.dumps(marker, indent=2), encoding="utf-8")
+    row["timings_s"] = {stage: round(seconds, 6) for stage, seconds in timings.items()}
+    row["total_s"] = round(time.perf_counter() - started, 6)
+    return row
+
+
+def plan_batch(
+    input_dir: Path,
+    out_root: Path,
+    *,
+    wall_height: float = 2.6,
+    scale_override: float | None = None,
+    clean: bool = True,
+    clean_max_side: int | None = None,
+) -> list[BatchJob]:
+    images = discover_images(input_dir, exclude=out_root)
+    return [
+        BatchJob(
+            image_path=image,
+            out_dir=out_dir,
+            source_sha256=source_hash(
+                image,
+                wall_height=wall_height,
+                scale_override=scale_override,
+                clean=clean,
+                clean_max_side=clean_max_side,
+            ),
+            wall_height=wall_height,
+            scale_override=scale_override,
+            clean=clean,
+            clean_max_side=clean_max_side,
+        )
+        for image, out_dir in zip(images, _output_dirs(images, input_dir, out_root))
+    ]
+
+
+def _run_pool(
+    jobs: list[BatchJob],
+    workers: int,
+    max_tasks_per_worker: int | None,
+    max_memory_mb: int | None,
+) -> Iterator[dict[str, Any]]:
+    if workers <= 1:
+        for job in jobs:
+            yield _vectorize_job(job)
+        return
+
+    pool_kwargs: dict[str, Any] = {
+        "max_workers": workers,
+        "initializer": _init_worker,
+        "initargs": (max_memory_mb,),
+    }
+    if max_tasks_per_worker and sys.version_info >= (3, 11):
+        # Recycling workers returns OpenCV's scratch buffers to the OS between plans.
+        # ProcessPoolExecutor only takes max_tasks_per_child from Python 3.11; older workers live for the whole batch.
+        pool_kwargs["max_tasks_per_child"] = max_tasks_per_worker
+    queue = deque(jobs)
+    while queue:
+        # A worker that dies (native crash, OOM kill, the memory cap) breaks the whole
+        # pool: its in-flight jobs are reported as errors and the rest go to a new pool.
+        with ProcessPoolExecutor(**pool_kwargs) as pool:
+            in_flight: dict[Future[dict[str, Any]], BatchJob] = {}
+            broken = False
+            while queue or in_flight:
+                # Keep a bounded window of submissions so hundreds of plans never queue at once.
+                while queue and not broken and len(in_flight) < workers * 2:
+                    try:
+                        future = pool.submit(_vectorize_job, queue[0])
+                    except BrokenProcessPool:
+                        broken = True
+                        break
+                    in_flight[future] = queue.popleft()
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = in_flight.pop(future)
+                    try:
+                        yield future.result()
+                    except BrokenProcessPool as exc:
+                        broken = True
+                        yield _worker_error(job, exc)
+                    except PIPELINE_ERRORS as exc:
+                        yield _worker_error(job, exc)
+                if broken and not in_flight:
+                    break
+
+
+def _worker_error(job: BatchJob, exc: Exception) -> dict[str, Any]:
+    return {
+        "image": str(job.image_path),
+        "out_dir": str(job.out_dir),
+        "source_sha256": job.source_sha256,
+        "status": "error",
+        "error": f"worker failed: {type(exc).__name__}: {exc}",
+    }
+
+
+def run_batch(
+    input_dir: Path,
+    out_root: Path,
+    *,
+    workers: int | None = None,
+    summary_path: Path | None = None,
+    wall_height: float = 2.6,
+    scale_override: float | None = None,
+    clean: bool = True,
+    clean_max_side: int | None = None,
+    force: bool = False,
+    max_tasks_per_worker: int | None = 20,
+    max_memory_mb: int | None = None,
+) -> dict[str, Any]:
+    """Vectorize every image under *input_dir* into *out_root* and return a summary."""
+    started = time.perf_counter()
+    workers = max(1, workers or os.cpu_count() or 1)
+    summary_path = summary_path or out_root / "batch-summary.jsonl"
+    jobs = plan_batch(
+        input_dir,
+        out_root,
+        wall_height=wall_height,
+        scale_override=scale_override,
+        clean=clean,
+        clean_max_side=clean_max_side,
+    )
+
+    todo: list[BatchJob] = []
+    skipped = 0
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
+    with summary_path.open("a", encoding="utf-8") as summary:
+        for job in jobs:
+            if not force and _is_current(job):
+                skipped += 1
+                row = {
+                    "image": str(job.image_path),
+                    "out_dir": str(job.out_dir),
+                    "source_sha256": job.source_sha256,
+                    "status": "skipped",
+                }
+                summary.write(json.dumps(row) + "\n")
+            else:
+                todo.append(job)
+        summary.flush()
+
+        counts = {"ok": 0, "error": 0}
+        stage_totals: dict[str, float] = {}
+        busy_s = 0.0
+        workers = min(workers, max(1, len(todo)))
+        for row in _run_pool(todo, workers, max_tasks_per_worker, max_memory_mb):
+            counts[row["status"]] = counts.get(row["status"], 0) + 1
+            busy_s += float(row.get("total_s", 0.0))
+            for stage, seconds in row.get("timings_s", {}).items():
+                stage_totals[stage] = stage_totals.get(stage, 0.0) + seconds
+            if row["status"] == "error":
+                log.error("Vectorize failed for %s: %s", row["image"], row.get("error"))
+            summary.write(json.dumps(row) + "\n")
+            summary.flush()
+
+    wall_s = time.perf_counter() - started
+    return {
+        "input_dir": str(input_dir),
+        "out_dir": str(out_root),
+        "summary_path": str(summary_path),
+        "workers": workers,
+        "images": len(jobs),
+        "processed": counts["ok"] + counts["error"],
+        "ok": counts["ok"],
+        "errors": counts["error"],
+        "skipped": skipped,
+        "wall_s": round(wall_s, 3),
+        "busy_s": round(busy_s, 3),
+        # busy / wall approaches the worker count when the pool scales linearly.
+        "parallel_efficiency": round(busy_s / (wall_s * workers), 3) if wall_s > 0 and counts["ok"] else None,
+        "stage_totals_s": {stage: round(seconds, 3) for stage, seconds in sorted(stage_totals.items())},
+    }
@@ -0,0 +1,49 @@
+"""Repeatable performance benchmarks for `haus bench`.
+
+Each suite returns a JSON-serializable report so runs can be diffed or
+checked into BENCHMARKS.md. Suites live in one module per area and share
+the timing harness in `harness`: timings are the best of *repeat* runs.
+Suites listed in `COMPARATORS` can also check a report against a saved
+baseline.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from . import chat, extraction, layout, state
+from .extraction import compare_extraction, extraction_benchmark
+from .harness import synthetic_layout
+from .layout import layout_benchmark
+
+__all__ = [
+    "COMPARATORS",
+    "SUITES",
+    "compare_benchmark",
+    "compare_extraction",
+    "extraction_benchmark",
+    "layout_benchmark",
+    "run_benchmark",
+    "synthetic_layout",
+]
+
+SUITES: dict[str, Callable[..., dict[str, Any]]] = dict(sorted({**chat.SUITES, **extraction.SUITES, **layout.SUITES, **state.SUITES}.items()))
+
+COMPARATORS: dict[str, Callable[..., list[str]]] = {**extraction.COMPARATORS}
+
+
+def run_benchmark(suite: str, **kwargs: Any) -> dict[str, Any]:
+    if suite not in SUITES:
+        raise ValueError(f"Unknown benchmark suite '{suite}'. Choose from: {', '.join(sorted(SUITES))}")
+    return SUITES[suite](**kwargs)
+
+
+def compare_benchmark(report: dict[str, Any], baseline: dict[str, Any], **kwargs: Any) -> list[str]:
+    """Check *report* against a *baseline* report from the same suite."""
+    suite = str(report.get("suite"))
+    if suite not in COMPARATORS:
+        raise ValueError(f"Benchmark suite '{suite}' has no baseline comparison.")
+    if baseline.get("suite") != suite:
+        raise ValueError(f"Baseline is from suite '{baseline.get('suite')}', not '{suite}'.")
+    return COMPARATORS[suite](report, baseline, **kwargs)
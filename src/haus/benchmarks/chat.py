@@ -0,0 +1,392 @@
+"""Chat suites: tool dispatch, context size, streaming, HTTP reuse and local CLI runtimes."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from .harness import best_of, env_var, mcp_layout, speedup, synthetic_layout, versus
+
+
+def tools_benchmark(
+    sizes: tuple[int, ...] | list[int] = (100, 1000),
+    repeat: int = 3,
+    web_latency: float = 0.15,
+) -> dict[str, Any]:
+    """Time one model turn of read-only tool calls, dispatched one by one and through ``_ToolDispatcher.many``.
+
+    The turn makes two web searches, a catalog search and three layout
+    reads (``list_objects``, ``score_layout``, ``get_layout_summary``) on a
+    synthetic layout of each size. Web searches are stood in for by a
+    *web_latency* second sleep, so no network is used.
+    """
+    from .. import chat_server
+
+    turn: list[tuple[str, dict[str, Any]]] = [
+        ("web_search", {"query": "compact sofa"}),
+        ("search_furniture_catalog", {"query": "sofa"}),
+        ("list_objects", {}),
+        ("web_search", {"query": "rug sizes"}),
+        ("score_layout", {}),
+        ("get_layout_summary", {}),
+    ]
+
+    def _web_search(args: dict[str, Any]) -> str:
+        time.sleep(web_latency)
+        return json.dumps({"query": args.get("query"), "results": []})
+
+    original_search = chat_server._DISPATCH_RAW["web_search"]
+    chat_server._DISPATCH_RAW["web_search"] = _web_search
+    rows: list[dict[str, Any]] = []
+    try:
+        for size in sizes:
+            with mcp_layout(synthetic_layout(size)):
+                dispatch = chat_server._ToolDispatcher(request_id="bench", tool_log=[])
+
+                def _serial(dispatch: Any = dispatch) -> list[str]:
+                    return [dispatch(name, args) for name, args in turn]
+
+                def _batched(dispatch: Any = dispatch) -> list[str]:
+                    return dispatch.many(turn)
+
+                _serial()
+                rows.append(
+                    {
+                        "items": size,
+                        "calls": len(turn),
+                        **versus(_serial, _batched, repeat, ("serial_s", "batched_s")),
+                        "same_results": _serial() == _batched(),
+                    }
+                )
+    finally:
+        chat_server._DISPATCH_RAW["web_search"] = original_search
+    return {"suite": "tools", "repeat": repeat, "web_latency_s": web_latency, "results": rows}
+
+
+def context_benchmark(
+    sizes: tuple[int, ...] | list[int] = (2, 4, 8),
+    repeat: int = 1,
+    items: int = 200,
+    result_chars: int = 2000,
+) -> dict[str, Any]:
+    """Estimated tokens a provider tool loop sends per step, with and without context compaction.
+
+    Each of ``sizes`` steps reads ``get_semantic_layout_json`` and
+    ``list_objects`` on a synthetic layout of *items* items, as Anthropic-style
+    history. ``verbatim`` resends every result as is; ``compacted`` runs
+    ``compact_messages`` with *result_chars* before each step. The tool list
+    is measured in full and as routed for an object edit (``"move the
+    sofa"``). *repeat* is accepted for CLI symmetry; the counts are exact.
+    """
+    from .. import chat_server
+    from ..llm.context import compact_messages, estimate_tokens
+
+    system_tokens = estimate_tokens(chat_server._SYSTEM)
+    tool_tokens = {
+        "all": estimate_tokens(chat_server._TOOLS_SPEC),
+        "edit_object": estimate_tokens(chat_server._route_tools_spec("move the sofa")),
+    }
+    with mcp_layout(synthetic_layout(items)):
+        dispatch = chat_server._ToolDispatcher(request_id="bench", tool_log=[])
+        results = [(name, dispatch(name, {})) for name in ("get_semantic_layout_json", "list_objects")]
+    rows: list[dict[str, Any]] = []
+    for steps in sizes:
+        totals = {"verbatim": 0, "compacted": 0}
+        last = {"verbatim": 0, "compacted": 0}
+        for mode, limit in (("verbatim", 0), ("compacted", result_chars)):
+            messages: list[dict[str, Any]] = [{"role": "user", "content": "Tidy up the living room."}]
+            for step in range(steps):
+                sent, _ = compact_messages(messages, limit)
+                last[mode] = system_tokens + tool_tokens["all"] + estimate_tokens(sent)
+                totals[mode] += last[mode]
+                calls = [{"type": "tool_use", "id": f"t{step}-{n}", "name": name, "input": {}} for n, (name, _) in enumerate(results)]
+                outputs = [{"type": "tool_result", "tool_use_id": call["id"], "content": text} for call, (_, text) in zip(calls, results)]
+                messages += [{"role": "assistant", "content": calls}, {"role": "user", "content": outputs}]
+        rows.append(
+            {
+                "steps": steps,
+                "items": items,
+                "verbatim_tokens": totals["verbatim"],
+                "compacted_tokens": totals["compacted"],
+                "last_step_verbatim": last["verbatim"],
+                "last_step_compacted": last["compacted"],
+                "ratio": round(totals["verbatim"] / totals["compacted"], 1) if totals["compacted"] else None,
+            }
+        )
+    return {
+        "suite": "context",
+        "repeat": repeat,
+        "result_chars": result_chars,
+        "system_tokens": system_tokens,
+        "tool_tokens": tool_tokens,
+        "results": rows,
+    }
+
+
+def stream_benchmark(
+    sizes: tuple[int, ...] | list[int] = (1, 4, 16),
+    repeat: int = 1,
+    chunks: int = 20,
+    chunk_delay: float = 0.05,
+) -> dict[str, Any]:
+    """``/api/health`` latency while N ``/api/chat/stream`` requests are generating.
+
+    Each stream is served by a stand-in provider that blocks for
+    *chunk_delay* seconds before each of its *chunks* text chunks, as a
+    provider waiting on a model does. A health check falls due every 10 ms
+    until the streams finish, and its latency counts from when it fell due,
+    so time the event loop spent blocked is included. ``sizes`` is the
+    number of concurrent streams.
+    """
+    import asyncio
+
+    import httpx
+
+    from .. import chat_server
+    from ..llm.types import ChatChunk
+
+    def _slow_stream(api_key: str, messages: list[dict[str, Any]], model: str, dispatch: Callable[..., str]) -> Any:
+        for _ in range(chunks):
+            time.sleep(chunk_delay)
+            yield ChatChunk("text", {"delta": "x"})
+        yield ChatChunk("done", {"response": "x" * chunks, "history": messages})
+
+    async def _run(app: Any, streams: int) -> dict[str, Any]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            latencies: list[float] = []
+            started = time.perf_counter()
+            tasks = [
+                asyncio.create_task(client.post("/api/chat/stream", json={"message": "hello", "provider": "ollama"}, timeout=None))
+                for _ in range(streams)
+            ]
+            while not all(task.done() for task in tasks):
+                due = time.perf_counter() + 0.01
+                await asyncio.sleep(0.01)
+                await client.get("/api/health")
+                latencies.append(time.perf_counter() - due)
+            responses = await asyncio.gather(*tasks)
+            wall = time.perf_counter() - started
+        latencies.sort()
+        return {
+            "streams": streams,
+            "wall_s": round(wall, 3),
+            "completed": sum(1 for response in responses if "event: done" in response.text),
+            "health_checks": len(latencies),
+            "health_p50_ms": round(1000 * latencies[len(latencies) // 2], 2) if latencies else None,
+            "health_p99_ms": round(1000 * latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 2) if latencies else None,
+            "health_max_ms": round(1000 * latencies[-1], 2) if latencies else None,
+        }
+
+    original = chat_server._STREAM_FNS.get("ollama")
+    chat_server._STREAM_FNS["ollama"] = _slow_stream
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            app = chat_server.create_app(tmp)
+            rows = []
+            for streams in sizes:
+                runs = [asyncio.run(_run(app, streams)) for _ in range(max(1, repeat))]
+                rows.append(min(runs, key=lambda row: row["health_p99_ms"] or 0.0))
+    finally:
+        if original is None:
+            chat_server._STREAM_FNS.pop("ollama", None)
+        else:
+            chat_server._STREAM_FNS["ollama"] = original
+    return {"suite": "stream", "repeat": repeat, "chunk_delay_s": chunk_delay, "chunks": chunks, "results": rows}
+
+
+def http_benchmark(
+    sizes: tuple[int, ...] | list[int] = (10, 100),
+    repeat: int = 3,
+) -> dict[str, Any]:
+    """Send N sequential ``POST /api/chat`` requests to a local keep-alive server with ``urlopen`` and with ``http_pool``.
+
+    The server is a ``ThreadingHTTPServer`` speaking HTTP/1.1 on loopback,
+    answering each request with a small Ollama-style JSON body, so the
+    difference is connection setup (and the server's thread per connection)
+    rather than network latency. ``sizes`` is the number of requests.
+    """
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.request import Request, urlopen
+
+    from .. import http_pool
+
+    reply = json.dumps({"message": {"role": "assistant", "content": "ok"}, "done": True}).encode("utf-8")
+
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def do_POST(self) -> None:
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(reply)))
+            self.end_headers()
+            self.wfile.write(reply)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/chat"
+    body = json.dumps({"model": "bench", "messages": [{"role": "user", "content": "hello"}], "stream": False}).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    rows: list[dict[str, Any]] = []
+    try:
+        for size in sizes:
+            pool = http_pool.ConnectionPool()
+
+            def _unpooled(size: int = size) -> None:
+                for _ in range(size):
+                    with urlopen(Request(url, data=body, headers=headers, method="POST"), timeout=10) as response:
+                        json.loads(response.read())
+
+            def _pooled(size: int = size, pool: http_pool.ConnectionPool = pool) -> None:
+                for _ in range(size):
+                    with pool.request("POST", url, body=body, headers=headers, timeout=10) as response:
+                        json.loads(response.read())
+
+            timings = versus(_unpooled, _pooled, repeat, ("urlopen_s", "pooled_s"))
+            stats = pool.stats()
+            pool.clear()
+            rows.append(
+                {
+                    "requests": size,
+                    **timings,
+                    "connections_opened": stats["opened"],
+                    "reuse_rate": stats["reuse_rate"],
+                }
+            )
+    finally:
+        server.shutdown()
+        server.server_close()
+    return {"suite": "http", "repeat": repeat, "results": rows}
+
+
+def runtime_benchmark(
+    sizes: tuple[int, ...] | list[int] = (1, 4, 8),
+    repeat: int = 1,
+    startup: float = 0.4,
+    generate: float = 0.3,
+    tool_time: float = 0.05,
+) -> dict[str, Any]:
+    """Time a local CLI runtime tool loop of N steps with and without a pre-started spare process.
+
+    The runtime is a Python stand-in that sleeps *startup* seconds before
+    reading its prompt on stdin, as a CLI loading and authenticating does,
+    then *generate* seconds to answer. Between steps Haus spends
+    *tool_time* seconds running tool calls. ``sizes`` is the number of
+    steps; ``cold`` sets ``HAUS_LOCAL_RUNTIME_WARM=0``.
+    """
+    import sys
+
+    from ..llm.providers import local_cli
+
+    script = f"import sys, time; time.sleep({startup}); prompt = sys.stdin.read(); time.sleep({generate}); print(len(prompt))"
+    cmd = [sys.executable, "-c", script]
+    rows: list[dict[str, Any]] = []
+    for steps in sizes:
+        row: dict[str, Any] = {"steps": steps}
+        for label, warm in (("cold", "0"), ("warm", "1")):
+            pool = local_cli._RuntimePool()
+            original_pool, local_cli._RUNTIME_POOL = local_cli._RUNTIME_POOL, pool
+
+            def _loop(steps: int = steps) -> None:
+                for step in range(steps):
+                    local_cli._run(cmd, f"step {step}")
+                    time.sleep(tool_time)
+
+            try:
+                with env_var("HAUS_LOCAL_RUNTIME_WARM", warm):
+                    row[f"{label}_s"] = round(best_of(_loop, repeat), 3)
+                row[f"{label}_mean_step_s"] = local_cli.runtime_pool_stats()["runtimes"][Path(sys.executable).name]["mean_s"]
+            finally:
+                local_cli._RUNTIME_POOL = original_pool
+                pool.close()
+        row["speedup"] = speedup(row["cold_s"], row["warm_s"])
+        rows.append(row)
+    return {"suite": "runtime", "repeat": repeat, "startup_s": startup, "generate_s": generate, "tool_time_s": tool_time, "results": rows}
+
+
+def ttfb_benchmark(
+    sizes: tuple[int, ...] | list[int] = (0, 2, 4),
+    repeat: int = 1,
+    tokens: int = 30,
+    token_delay: float = 0.02,
+) -> dict[str, Any]:
+    """Time to first text and to ``done`` for a local CLI runtime chat, blocking vs streamed.
+
+    The runtime is a Python stand-in that writes its tool-protocol JSON one
+    word at a time, *token_delay* seconds apart, *tokens* words per reply.
+    ``sizes`` is how many tool steps it takes before answering. ``blocking``
+    is ``_chat_with_tool_protocol``, whose text the stream endpoint could
+    only send once the whole chat finished; ``streamed`` is
+    ``_stream_with_tool_protocol`` over ``_stream_run``.
+    """
+    import sys
+
+    from ..llm.providers import local_cli
+
+    script = (
+        "import json, sys, time\n"
+        "prompt = sys.stdin.read()\n"
+        "done = prompt.count('Tool result:')\n"
+        "words = ' '.join(f'word{i}' for i in range(int(sys.argv[3])))\n"
+        "calls = [{'name': 'list_objects', 'arguments': {}}] if done < int(sys.argv[1]) else []\n"
+        "for piece in json.dumps({'response': words, 'tool_calls': calls}).split(' '):\n"
+        "    sys.stdout.write(piece + ' '); sys.stdout.flush(); time.sleep(float(sys.argv[2]))\n"
+    )
+    spec = [{"name": "list_objects", "description": "List objects", "parameters": {"type": "object", "properties": {}}}]
+    rows: list[dict[str, Any]] = []
+    with env_var("HAUS_LOCAL_RUNTIME_WARM", "0"):
+        for steps in sizes:
+            cmd = [sys.executable, "-c", script, str(steps), str(token_delay), str(tokens)]
+            row: dict[str, Any] = {"tool_steps": steps}
+            for label in ("blocking", "streamed"):
+                best: tuple[float, float] | None = None
+                for _ in range(max(1, repeat)):
+                    messages = [{"role": "user", "content": [{"type": "text", "text": "what is here?"}]}]
+                    started = time.perf_counter()
+                    first: float | None = None
+                    if label == "blocking":
+                        local_cli._chat_with_tool_protocol(
+                            lambda prompt, cmd=cmd: local_cli._run(cmd, prompt), messages, dispatch=lambda name, args: "[]", system="bench", tools_spec=spec, max_tool_steps=steps + 1
+                        )
+                    else:
+                        chunks = local_cli._stream_with_tool_protocol(
+                            lambda prompt, cmd=cmd: local_cli._stream_run(cmd, prompt),
+                            messages,
+                            dispatch=lambda name, args: "[]",
+                            system="bench",
+                            tools_spec=spec,
+                            max_tool_steps=steps + 1,
+                            live=True,
+                        )
+                        for chunk in chunks:
+                            if chunk.type == "text" and first is None:
+                                first = time.perf_counter() - started
+                    total = time.perf_counter() - started
+                    run = (first if first is not None else total, total)
+                    best = run if best is None or run < best else best
+                assert best is not None
+                row[f"{label}_first_text_s"] = round(best[0], 3)
+                row[f"{label}_done_s"] = round(best[1], 3)
+            rows.append(row)
+    return {"suite": "ttfb", "repeat": repeat, "tokens": tokens, "token_delay_s": token_delay, "results": rows}
+
+
+SUITES: dict[str, Callable[..., dict[str, Any]]] = {
+    "context": context_benchmark,
+    "http": http_benchmark,
+    "runtime": runtime_benchmark,
+    "stream": stream_benchmark,
+    "tools": tools_benchmark,
+    "ttfb": ttfb_benchmark,
+}
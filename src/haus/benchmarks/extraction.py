@@ -0,0 +1,292 @@
+"""Floor-plan image suites: per-stage extraction timings with a baseline check, and pyramid cleaning."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+DEFAULT_EXTRACTION_SCALES = (1, 2, 4)
+DEFAULT_CORPUS_DIR = Path("corpus")
+DEFAULT_PYRAMID_MAX_SIDE = 1200
+# Stage timings below this many seconds are too noisy to flag as regressions.
+_MIN_REGRESSION_S = 0.05
+
+
+def _extraction_cases(corpus_dir: Path) -> list[tuple[Path, bool]]:
+    """Uncleaned plans run through cleaning and extraction; cleaned ones through extraction only."""
+    cases = [(path, True) for path in sorted((corpus_dir / "uncleaned").glob("*.png"))]
+    cases += [(path, False) for path in sorted((corpus_dir / "cleaned").glob("*.jpg"))]
+    return cases
+
+
+def _extraction_case(
+    image_path: str,
+    scale: int,
+    clean: bool,
+    repeat: int,
+    trace_memory: bool,
+    clean_max_side: int | None = None,
+) -> dict[str, Any]:
+    # Runs in a fresh process per case, so the process peak RSS belongs to this case alone.
+    import tracemalloc
+
+    import cv2
+
+    from ..extraction import extract_floor_plan
+    from ..preprocess import clean_floor_plan
+    from ..profiling import StageTrace, _peak_rss_mb, flatten, stage, tracing
+
+    img_bgr = cv2.imread(image_path)
+    if img_bgr is None:
+        raise ValueError(f"Could not read image: {image_path}")
+    img_rgb = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB)
+    if scale > 1:
+        img_rgb = cv2.resize(img_rgb, None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR)
+    base_rss_mb = _peak_rss_mb()
+
+    if trace_memory:
+        tracemalloc.start()
+    best: dict[str, float] = {}
+    stage_rss: dict[str, float] = {}
+    stage_alloc: dict[str, float] = {}
+    counts: list[dict[str, int]] = []
+    for _ in range(max(1, repeat)):
+        trace = StageTrace()
+        with tracing(trace):
+            image = img_rgb
+            if clean:
+                with stage("clean"):
+                    image = clean_floor_plan(image, max_side=clean_max_side)
+            with stage("extract"):
+                data, _, _ = extract_floor_plan(image)
+        report = trace.to_dict()
+        for path, seconds in flatten(report).items():
+            best[path] = min(best.get(path, seconds), seconds)
+        stage_rss = flatten(report, "peak_rss_mb")
+        if trace_memory:
+            stage_alloc = flatten(report, "alloc_peak_kb")
+        counts.append(
+            {"walls": len(data.walls), "openings": len(data.openings), "columns": len(data.columns)}
+        )
+    if trace_memory:
+        tracemalloc.stop()
+    peak_rss_mb = _peak_rss_mb()
+
+    row: dict[str, Any] = {
+        "image": image_path,
+        "scale": scale,
+        "clean": clean,
+        "shape_hw": [int(img_rgb.shape[0]), int(img_rgb.shape[1])],
+        "total_s": round(sum(best.get(name, 0.0) for name in ("clean", "extract")), 6),
+        "stages_s": {path: round(seconds, 6) for path, seconds in best.items()},
+        "base_rss_mb": base_rss_mb,
+        "peak_rss_mb": peak_rss_mb,
+        "rss_growth_mb": (
+            round(peak_rss_mb - base_rss_mb, 1) if peak_rss_mb is not None and base_rss_mb is not None else None
+        ),
+        "stage_peak_rss_mb": stage_rss,
+        **counts[0],
+        # Every repeat must extract the same geometry.
+        "stable": all(run == counts[0] for run in counts),
+    }
+    if trace_memory:
+        row["stage_alloc_peak_kb"] = stage_alloc
+    return row
+
+
+def extraction_benchmark(
+    corpus_dir: Path = DEFAULT_CORPUS_DIR,
+    scales: tuple[int, ...] | list[int] = DEFAULT_EXTRACTION_SCALES,
+    repeat: int = 1,
+    trace_memory: bool = False,
+    clean_max_side: int | None = None,
+) -> dict[str, Any]:
+    """Time and measure `clean_floor_plan` and `extract_floor_plan` per stage over the corpus.
+
+    Each image runs at its native size and upscaled by every factor in *scales*.
+    *clean_max_side* switches cleaning to pyramid mode.
+    """
+    import multiprocessing
+
+    cases = _extraction_cases(Path(corpus_dir))
+    if not cases:
+        raise ValueError(f"No corpus images found under {corpus_dir}/uncleaned or {corpus_dir}/cleaned")
+    context = multiprocessing.get_context("spawn")
+    rows: list[dict[str, Any]] = []
+    for scale in scales:
+        for image_path, clean in cases:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                rows.append(
+                    pool.submit(
+                        _extraction_case, str(image_path), int(scale), clean, repeat, trace_memory, clean_max_side
+                    ).result()
+                )
+    return {
+        "suite": "extraction",
+        "repeat": repeat,
+        "scales": [int(scale) for scale in scales],
+        "trace_memory": trace_memory,
+        "clean_max_side": clean_max_side,
+        "results": rows,
+    }
+
+
+def _erased_iou(source: np.ndarray, first: np.ndarray, second: np.ndarray) -> float:
+    """IoU of the pixels two cleaning runs changed in *source*."""
+    erased_a = np.asarray(first != source).any(axis=2)
+    erased_b = np.asarray(second != source).any(axis=2)
+    union = np.count_nonzero(erased_a | erased_b)
+    return round(np.count_nonzero(erased_a & erased_b) / union, 4) if union else 1.0
+
+
+def _dark_agreement(first: np.ndarray, second: np.ndarray) -> float:
+    """Fraction of pixels on which two cleaned plans agree about ink vs background."""
+    import cv2
+
+    from ..preprocess import _DARK_THRESH
+
+    dark_a = cv2.cvtColor(first, cv2.COLOR_RGB2GRAY) < _DARK_THRESH
+    dark_b = cv2.cvtColor(second, cv2.COLOR_RGB2GRAY) < _DARK_THRESH
+    return round(float(np.count_nonzero(dark_a == dark_b)) / dark_a.size, 4)
+
+
+def _pyramid_case(image_path: str, scale: int, max_side: int) -> dict[str, Any]:
+    import cv2
+
+    from ..extraction import extract_floor_plan
+    from ..preprocess import clean_floor_plan
+    from ..profiling import _peak_rss_mb
+
+    img_bgr = cv2.imread(image_path)
+    if img_bgr is None:
+        raise ValueError(f"Could not read image: {image_path}")
+    native = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB)
+    source = cv2.resize(native, None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR) if scale > 1 else native
+    base_rss_mb = _peak_rss_mb()
+
+    # Pyramid first: peak RSS only ever rises, so its reading is not inflated by the full run.
+    started = time.perf_counter()
+    pyramid = clean_floor_plan(source, max_side=max_side)
+    pyramid_s = time.perf_counter() - started
+    pyramid_rss_mb = _peak_rss_mb()
+    started = time.perf_counter()
+    full = clean_floor_plan(source)
+    full_s = time.perf_counter() - started
+    full_rss_mb = _peak_rss_mb()
+
+    native_clean = clean_floor_plan(native)
+    native_hw = (native.shape[1], native.shape[0])
+    full_data, _, _ = extract_floor_plan(full)
+    pyramid_data, _, _ = extract_floor_plan(pyramid)
+
+    def _growth(peak: float | None) -> float | None:
+        return round(peak - base_rss_mb, 1) if peak is not None and base_rss_mb is not None else None
+
+    return {
+        "image": image_path,
+        "scale": scale,
+        "shape_hw": [int(source.shape[0]), int(source.shape[1])],
+        "pyramid_active": max(source.shape[:2]) > max_side,
+        "full_s": round(full_s, 6),
+        "pyramid_s": round(pyramid_s, 6),
+        "speedup": round(full_s / pyramid_s, 2) if pyramid_s > 0 else None,
+        "pyramid_rss_growth_mb": _growth(pyramid_rss_mb),
+        "full_rss_growth_mb": _growth(full_rss_mb),
+        "vs_full": {
+            "erased_iou": _erased_iou(source, full, pyramid),
+            "dark_agreement": _dark_agreement(full, pyramid),
+        },
+        # Both outputs brought back to the native size and checked against
+        # cleaning the original, un-upscaled plan.
+        "vs_native": {
+            "full_dark_agreement": _dark_agreement(
+                cv2.resize(full, native_hw, interpolation=cv2.INTER_AREA), native_clean
+            ),
+            "pyramid_dark_agreement": _dark_agreement(
+                cv2.resize(pyramid, native_hw, interpolation=cv2.INTER_AREA), native_clean
+            ),
+        },
+        "walls": {"full": len(full_data.walls), "pyramid": len(pyramid_data.walls)},
+        "openings": {"full": len(full_data.openings), "pyramid": len(pyramid_data.openings)},
+    }
+
+
+def pyramid_benchmark(
+    corpus_dir: Path = DEFAULT_CORPUS_DIR,
+    scales: tuple[int, ...] | list[int] = (2, 4),
+    clean_max_side: int = DEFAULT_PYRAMID_MAX_SIDE,
+) -> dict[str, Any]:
+    """Compare pyramid-mode `clean_floor_plan` with the full-resolution path on the uncleaned corpus."""
+    import multiprocessing
+
+    images = sorted((Path(corpus_dir) / "uncleaned").glob("*.png"))
+    if not images:
+        raise ValueError(f"No corpus images found under {corpus_dir}/uncleaned")
+    context = multiprocessing.get_context("spawn")
+    rows: list[dict[str, Any]] = []
+    for scale in scales:
+        for image_path in images:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                rows.append(pool.submit(_pyramid_case, str(image_path), int(scale), int(clean_max_side)).result())
+    return {
+        "suite": "pyramid",
+        "scales": [int(scale) for scale in scales],
+        "clean_max_side": int(clean_max_side),
+        "results": rows,
+    }
+
+
+def _case_key(row: dict[str, Any]) -> tuple[str, int]:
+    return Path(str(row["image"])).as_posix(), int(row["scale"])
+
+
+def compare_extraction(
+    report: dict[str, Any],
+    baseline: dict[str, Any],
+    time_tolerance: float = 0.25,
+    rss_tolerance: float = 0.2,
+) -> list[str]:
+    """List the ways *report* regressed from *baseline*; empty means it passes.
+
+    A stage regresses when it is both *time_tolerance* slower (as a fraction)
+    and at least 50 ms slower. Peak RSS is compared above the process's
+    post-import baseline, and wall/opening/column counts must match exactly.
+    """
+    previous = {_case_key(row): row for row in baseline.get("results", [])}
+    regressions: list[str] = []
+    for row in report.get("results", []):
+        before = previous.get(_case_key(row))
+        if before is None:
+            continue
+        label = f"{Path(str(row['image'])).as_posix()} @{row['scale']}x"
+        for path, seconds in row.get("stages_s", {}).items():
+            old = before.get("stages_s", {}).get(path)
+            if old is None:
+                continue
+            if seconds > old * (1 + time_tolerance) and seconds - old >= _MIN_REGRESSION_S:
+                regressions.append(f"{label}: {path} took {seconds:.3f}s (baseline {old:.3f}s)")
+        new_mb = row.get("rss_growth_mb")
+        old_mb = before.get("rss_growth_mb")
+        if new_mb is not None and old_mb is not None and new_mb > max(old_mb * (1 + rss_tolerance), old_mb + 1):
+            regressions.append(f"{label}: peak RSS grew {new_mb:.1f} MB (baseline {old_mb:.1f} MB)")
+        for field in ("walls", "openings", "columns"):
+            if field in before and row.get(field) != before[field]:
+                regressions.append(f"{label}: {field} changed from {before[field]} to {row.get(field)}")
+        if not row.get("stable", True):
+            regressions.append(f"{label}: repeated runs extracted different geometry")
+    return regressions
+
+
+SUITES: dict[str, Callable[..., dict[str, Any]]] = {
+    "extraction": extraction_benchmark,
+    "pyramid": pyramid_benchmark,
+}
+
+COMPARATORS: dict[str, Callable[..., list[str]]] = {
+    "extraction": compare_extraction,
+}
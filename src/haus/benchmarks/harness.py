@@ -0,0 +1,167 @@
+"""The timing harness and synthetic inputs every benchmark suite shares."""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import random
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+_FURNITURE_SPECS = (
+    ("chair", (0.5, 0.45, 0.5)),
+    ("desk", (1.2, 0.75, 0.6)),
+    ("storage", (0.8, 1.2, 0.4)),
+    ("table", (1.2, 0.75, 0.8)),
+    ("wardrobe", (1.2, 2.0, 0.6)),
+)
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    """Seconds taken by the fastest of *repeat* calls of *fn*."""
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def scaling_exponent(sizes: list[int], timings: list[float]) -> float | None:
+    """Least-squares slope of log(time) against log(items); 1.0 is linear, 2.0 quadratic."""
+    points = [(math.log(n), math.log(t)) for n, t in zip(sizes, timings) if n > 0 and t > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    denom = sum((x - mean_x) ** 2 for x, _ in points)
+    if denom <= 0:
+        return None
+    return round(sum((x - mean_x) * (y - mean_y) for x, y in points) / denom, 3)
+
+
+def speedup(before_s: float, after_s: float) -> float | None:
+    """How many times faster *after_s* is than *before_s*, to one decimal."""
+    return round(before_s / after_s, 1) if after_s > 0 else None
+
+
+def versus(before: Callable[[], Any], after: Callable[[], Any], repeat: int, labels: tuple[str, str]) -> dict[str, Any]:
+    """Time two ways of doing the same work and report both under *labels*, with the speedup."""
+    before_s = best_of(before, repeat)
+    after_s = best_of(after, repeat)
+    return {labels[0]: round(before_s, 6), labels[1]: round(after_s, 6), "speedup": speedup(before_s, after_s)}
+
+
+def scaling_exponents(rows: list[dict[str, Any]], *metrics: str) -> dict[str, float | None]:
+    """``scaling_exponent`` of each metric over *rows* by their ``items``; ``a.b`` reads ``row["a"]["b"]`` and reports as ``b``."""
+    counts = [row["items"] for row in rows]
+    exponents: dict[str, float | None] = {}
+    for metric in metrics:
+        *path, name = metric.split(".")
+        timings = []
+        for row in rows:
+            for key in path:
+                row = row[key]
+            timings.append(row[name])
+        exponents[name] = scaling_exponent(counts, timings)
+    return exponents
+
+
+def synthetic_layout(item_count: int, seed: int = 0) -> dict[str, Any]:
+    """Build a furnished layout at constant density: floor area grows with *item_count*."""
+    rng = random.Random(seed)
+    spacing = 1.6
+    columns = max(1, math.ceil(math.sqrt(item_count)))
+    items: list[dict[str, Any]] = [
+        {
+            "type": "furniture",
+            "furnitureType": "tv_console",
+            "name": "tv",
+            "pos": [0.0, 0.25, 0.0],
+            "rot": 0.0,
+            "visible": True,
+            "geo": [1.6, 0.5, 0.4],
+        }
+    ]
+    slot = 0
+    while len(items) < item_count:
+        row, column = divmod(slot, columns)
+        slot += 1
+        if row == 0 and column < 3:
+            continue
+        furniture_type, (width, height, depth) = rng.choice(_FURNITURE_SPECS)
+        items.append(
+            {
+                "type": "furniture",
+                "furnitureType": furniture_type,
+                "pos": [
+                    round(column * spacing + rng.uniform(-0.2, 0.2), 3),
+                    height / 2,
+                    round(row * spacing + rng.uniform(-0.2, 0.2), 3),
+                ],
+                "rot": rng.choice((0.0, math.pi / 2, math.pi / 6)),
+                "visible": True,
+                "geo": [width, height, depth],
+                "room": f"Room {row // 4 * 4 + column // 4}",
+            }
+        )
+    return {"version": 1, "items": items[:item_count]}
+
+
+def with_rooms(layout: dict[str, Any], spacing: float = 1.6) -> dict[str, Any]:
+    """Add square rooms over the 4x4 furniture blocks `synthetic_layout` labels as rooms."""
+    rows = cols = 0
+    for item in layout["items"]:
+        cols = max(cols, round(item["pos"][0] / spacing) + 1)
+        rows = max(rows, round(item["pos"][2] / spacing) + 1)
+    side = 4 * spacing
+    layout["rooms"] = [
+        {
+            "id": f"room-{block_row}-{block_col}",
+            "label": f"Room {block_row}-{block_col}",
+            "bounds": {
+                "x_min": block_col * side - spacing / 2,
+                "z_min": block_row * side - spacing / 2,
+                "x_max": (block_col + 1) * side - spacing / 2,
+                "z_max": (block_row + 1) * side - spacing / 2,
+            },
+        }
+        for block_row in range(math.ceil(rows / 4))
+        for block_col in range(math.ceil(cols / 4))
+    ]
+    return layout
+
+
+@contextmanager
+def mcp_layout(layout: dict[str, Any]) -> Iterator[Path]:
+    """Point the MCP server at a temporary file holding *layout* until the block exits."""
+    from .. import mcp_server
+
+    original_path = mcp_server.LAYOUT_PATH
+    try:
+        with tempfile.TemporaryDirectory(prefix="haus-bench-") as tmp:
+            layout_path = Path(tmp) / "layout.json"
+            layout_path.write_text(json.dumps(layout), encoding="utf-8")
+            mcp_server.LAYOUT_PATH = layout_path
+            yield layout_path
+    finally:
+        mcp_server.LAYOUT_PATH = original_path
+
+
+@contextmanager
+def env_var(name: str, value: str) -> Iterator[None]:
+    """Set environment variable *name* to *value* until the block exits."""
+    original = os.environ.get(name)
+    os.environ[name] = value
+    try:
+        yield
+    finally:
+        if original is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = original
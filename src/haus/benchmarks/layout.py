@@ -0,0 +1,347 @@
+"""Layout geometry suites: scoring, placement screening, geometry kernels, validation and the layout graph."""
+
+from __future__ import annotations
+
+import copy
+import math
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+
+from .harness import (
+    best_of,
+    mcp_layout,
+    scaling_exponents,
+    synthetic_layout,
+    versus,
+    with_rooms,
+)
+
+DEFAULT_LAYOUT_SIZES = (50, 100, 200, 400, 800)
+
+
+def layout_benchmark(
+    sizes: tuple[int, ...] | list[int] = DEFAULT_LAYOUT_SIZES,
+    repeat: int = 3,
+) -> dict[str, Any]:
+    """Time `score_layout` and `simulate_layout_options` across layout sizes."""
+    from .. import mcp_server
+
+    def _simulate() -> None:
+        mcp_server._SIMULATION_CACHE.clear()
+        mcp_server.simulate_layout_options("sofa facing the tv with a coffee table", max_options=3)
+
+    rows: list[dict[str, Any]] = []
+    for size in sizes:
+        with mcp_layout(synthetic_layout(size)):
+            rows.append(
+                {
+                    "items": size,
+                    "score_layout_s": round(best_of(mcp_server.score_layout, repeat), 6),
+                    "simulate_layout_options_s": round(best_of(_simulate, repeat), 6),
+                }
+            )
+    return {
+        "suite": "layout",
+        "repeat": repeat,
+        "results": rows,
+        "scaling_exponent": scaling_exponents(rows, "score_layout_s", "simulate_layout_options_s"),
+    }
+
+
+def placement_benchmark(
+    sizes: tuple[int, ...] | list[int] = (50, 100, 200),
+    repeat: int = 3,
+    grid_size: float = 0.1,
+) -> dict[str, Any]:
+    """Time whole-layout candidate screening on a fine grid, batched vs scalar."""
+    from .. import mcp_server
+
+    rows: list[dict[str, Any]] = []
+    for size in sizes:
+        data = mcp_server._normalize_layout(synthetic_layout(size))
+
+        def _screen(batched: bool, data: dict[str, Any] = data) -> list[dict[str, Any]]:
+            candidates, _ = mcp_server._simulate_candidates(
+                data=data,
+                furniture_type="chair",
+                room_name="",
+                near_index=None,
+                face_index=0,
+                min_distance=0.0,
+                max_distance=4.0,
+                require_clear_sightline=False,
+                max_candidates=5,
+                grid_size=grid_size,
+                batched=batched,
+            )
+            return candidates
+
+        started = time.perf_counter()
+        scalar = _screen(False)
+        scalar_s = time.perf_counter() - started
+        rows.append(
+            {
+                "items": size,
+                "batched_s": round(best_of(lambda: _screen(True), repeat), 6),
+                "scalar_s": round(scalar_s, 6),
+                "same_ranking": _screen(True) == scalar,
+            }
+        )
+    return {"suite": "placement", "repeat": repeat, "grid_size": grid_size, "results": rows}
+
+
+def geometry_benchmark(
+    sizes: tuple[int, ...] | list[int] = (100, 400, 1600),
+    repeat: int = 3,
+    samples: int = 64,
+) -> dict[str, Any]:
+    """Time per-call tuple geometry against the packed-array kernels on the same inputs."""
+    from .. import geometry, placement
+
+    rows: list[dict[str, Any]] = []
+    for size in sizes:
+        items = synthetic_layout(size)["items"]
+        rng = random.Random(size)
+        for item in items:
+            item["rot"] = round(rng.uniform(0.0, math.pi), 3)
+        polygons = [geometry._item_corners(item, 0.0) for item in items]
+        pairs = [(i, j) for i in range(size) for j in range(i + 1, min(size, i + 9))]
+        left = [polygons[i] for i, _ in pairs]
+        right = [polygons[j] for _, j in pairs]
+        x_min, z_min, x_max, z_max = geometry.layout_bounds({"items": items})
+        points = [(x_min + (x_max - x_min) * t, z_min + (z_max - z_min) * t) for t in np.linspace(0.0, 1.0, samples)]
+        rects = [geometry.polygon_bbox(polygon) for polygon in polygons]
+
+        def _footprints_scalar(items: list[dict[str, Any]] = items) -> list[geometry.Polygon]:
+            return [geometry._item_corners(item, 0.0) for item in items]
+
+        def _footprints_cached(items: list[dict[str, Any]] = items) -> np.ndarray:
+            return placement.pack_items(items)
+
+        def _sat_scalar(left: list[geometry.Polygon] = left, right: list[geometry.Polygon] = right) -> list[bool]:
+            return [geometry.polygons_intersect(a, b) for a, b in zip(left, right)]
+
+        def _sat_kernel(left: list[geometry.Polygon] = left, right: list[geometry.Polygon] = right) -> np.ndarray:
+            return placement.pair_intersects(placement.pack_polygons(left), placement.pack_polygons(right))
+
+        def _distance_scalar(left: list[geometry.Polygon] = left, right: list[geometry.Polygon] = right) -> list[float]:
+            return [geometry.polygon_distance(a, b) for a, b in zip(left, right)]
+
+        def _distance_kernel(left: list[geometry.Polygon] = left, right: list[geometry.Polygon] = right) -> np.ndarray:
+            return placement.pair_distances(placement.pack_polygons(left), placement.pack_polygons(right))
+
+        def _points_scalar(points: list[geometry.Point] = points, polygons: list[geometry.Polygon] = polygons) -> list[float]:
+            return [min(geometry.distance_point_to_polygon(point, polygon) for polygon in polygons) for point in points]
+
+        def _points_kernel(points: list[geometry.Point] = points, polygons: list[geometry.Polygon] = polygons) -> np.ndarray:
+            return placement.point_polygon_distances(np.asarray(points), placement.pack_polygons(polygons)).min(axis=1)
+
+        def _gaps_scalar(rects: list[geometry.Rect] = rects) -> list[float]:
+            return [min(geometry.rect_gap(a, b) for b in rects) for a in rects]
+
+        def _gaps_kernel(rects: list[geometry.Rect] = rects) -> np.ndarray:
+            boxes = np.asarray(rects)
+            return placement.box_gaps(boxes, boxes).min(axis=1)
+
+        kernels = {
+            "footprints": (_footprints_scalar, _footprints_cached),
+            "pair_sat": (_sat_scalar, _sat_kernel),
+            "pair_distance": (_distance_scalar, _distance_kernel),
+            "point_distance": (_points_scalar, _points_kernel),
+            "rect_gaps": (_gaps_scalar, _gaps_kernel),
+        }
+        row: dict[str, Any] = {"items": size, "pairs": len(pairs), "samples": samples}
+        for name, (scalar_fn, kernel_fn) in kernels.items():
+            kernel_fn()  # warm the footprint cache so "footprints" times the cached path
+            row[name] = {
+                **versus(scalar_fn, kernel_fn, repeat, ("scalar_s", "kernel_s")),
+                "agrees": bool(np.allclose(np.asarray(scalar_fn(), dtype=float), np.asarray(kernel_fn(), dtype=float), atol=1e-9)),
+            }
+        rows.append(row)
+    return {"suite": "geometry", "repeat": repeat, "results": rows}
+
+
+def validation_benchmark(
+    sizes: tuple[int, ...] | list[int] = (100, 1000, 10000),
+    repeat: int = 3,
+) -> dict[str, Any]:
+    """Time the validation pair scans, all-pairs against sweep-and-prune, and the whole report.
+
+    ``one_item_edit`` re-validates after one item moves, in full and from the
+    previous report plus the layout diff, both for the whole report and for
+    the warning checks alone.
+    """
+    from .. import geometry, placement, semantic_ir, workbench
+
+    rows: list[dict[str, Any]] = []
+    for size in sizes:
+        layout = synthetic_layout(size)
+        rng = random.Random(size)
+        # One hinged door per 100 items, dropped among the furniture.
+        for number in range(max(1, size // 100)):
+            anchor = rng.choice(layout["items"])["pos"]
+            layout["items"].append(
+                {
+                    "id": f"door-{number}",
+                    "type": "door",
+                    "width_m": 0.8,
+                    "swing_direction": rng.choice(("in", "out", "left", "right")),
+                    "pos": [anchor[0] + 0.8, 1.0, anchor[2]],
+                    "rot": 0.0,
+                    "visible": True,
+                    "geo": [0.8, 2.0, 0.05],
+                }
+            )
+        items = layout["items"]
+        boxes = workbench._item_boxes(items)
+
+        def _scan(boxes: np.ndarray = boxes) -> list[tuple[int, int]]:
+            found = []
+            for i in range(len(boxes)):
+                overlapping = placement.boxes_overlap(boxes[i : i + 1], boxes[i + 1 :])[0]
+                gaps = placement.box_gaps(boxes[i : i + 1], boxes[i + 1 :])[0]
+                found.extend((i, i + 1 + j) for j in np.flatnonzero(overlapping | ((gaps > 0) & (gaps < 0.75))).tolist())
+            return found
+
+        def _sweep(boxes: np.ndarray = boxes) -> list[tuple[int, int]]:
+            pairs = placement.sweep_pairs(boxes, 0.75)
+            left, right = boxes[pairs[:, 0]], boxes[pairs[:, 1]]
+            gaps = placement.pair_box_gaps(left, right)
+            keep = placement.pair_boxes_overlap(left, right) | ((gaps > 0) & (gaps < 0.75))
+            return [tuple(pair) for pair in pairs[keep].tolist()]
+
+        def _swings_scan(items: list[dict[str, Any]] = items) -> list[tuple[Any, Any]]:
+            found = []
+            for door in items:
+                if door.get("type") != "door":
+                    continue
+                swing = geometry.door_swing_polygon(door)
+                found.extend(
+                    (door.get("id"), other.get("id"))
+                    for other in items
+                    if other is not door and geometry.polygons_intersect(swing, geometry.item_polygon(other))
+                )
+            return found
+
+        def _swings_sweep(layout: dict[str, Any] = layout) -> list[tuple[Any, Any]]:
+            return [(conflict["door_id"], conflict["conflict_id"]) for conflict in geometry.door_swing_conflicts(layout)]
+
+        def _report(layout: dict[str, Any] = layout) -> None:
+            workbench.build_validation_report(layout)
+
+        row: dict[str, Any] = {"items": len(items), "candidate_pairs": len(placement.sweep_pairs(boxes, 0.75))}
+        for name, (scan_fn, sweep_fn) in {"pairs": (_scan, _sweep), "door_swings": (_swings_scan, _swings_sweep)}.items():
+            row[name] = {**versus(scan_fn, sweep_fn, repeat, ("all_pairs_s", "sweep_s")), "agrees": scan_fn() == sweep_fn()}
+        row["build_validation_report_s"] = round(best_of(_report, repeat), 6)
+
+        # One moved chair, re-validated against the previous report.
+        edited = copy.deepcopy(layout)
+        edited["items"][len(edited["items"]) // 2]["pos"][0] += 0.4
+        changes = semantic_ir.layout_diff(layout, edited)["ops"]
+        previous = workbench.build_validation_report(layout)
+
+        def _edited_full(edited: dict[str, Any] = edited) -> dict[str, Any]:
+            return workbench.build_validation_report(edited)
+
+        def _edited_incremental(
+            edited: dict[str, Any] = edited, previous: dict[str, Any] = previous, changes: list[dict[str, Any]] = changes
+        ) -> dict[str, Any]:
+            return workbench.build_validation_report(edited, previous=previous, changes=changes)
+
+        migrated = workbench.migrate_layout(edited)
+        unknowns = workbench.unknowns_for_layout(migrated)
+        remembered = workbench._VALIDATION_SECTIONS[previous["id"]][1]
+
+        def _checks_full(migrated: dict[str, Any] = migrated, unknowns: list[dict[str, str]] = unknowns) -> None:
+            workbench._validation_sections(migrated, "blank", "general_aging_ready", unknowns, None)
+
+        def _checks_incremental(
+            migrated: dict[str, Any] = migrated,
+            unknowns: list[dict[str, str]] = unknowns,
+            previous: dict[str, Any] = previous,
+            changes: list[dict[str, Any]] = changes,
+            remembered: list[Any] = remembered,
+        ) -> None:
+            scope = workbench._validation_scope(migrated, ("blank", "general_aging_ready"), previous, changes)
+            if scope is None:
+                raise RuntimeError("the one-item edit should re-validate incrementally")
+            sections = workbench._validation_sections(migrated, "blank", "general_aging_ready", unknowns, scope)
+            workbench._merge_sections(migrated, remembered, sections, scope)
+
+        row["one_item_edit"] = {
+            **versus(_edited_full, _edited_incremental, repeat, ("full_s", "incremental_s")),
+            "checks_full_s": round(best_of(_checks_full, repeat), 6),
+            "checks_incremental_s": round(best_of(_checks_incremental, repeat), 6),
+            "agrees": _edited_full()["warnings"] == _edited_incremental()["warnings"],
+        }
+        rows.append(row)
+    return {
+        "suite": "validation",
+        "repeat": repeat,
+        "results": rows,
+        "scaling_exponent": scaling_exponents(rows, "pairs.sweep_s", "build_validation_report_s"),
+    }
+
+
+def graph_benchmark(
+    sizes: tuple[int, ...] | list[int] = (100, 200, 400),
+    repeat: int = 3,
+) -> dict[str, Any]:
+    """Time layout graph builds: cold, after moving one item, and for an unchanged layout."""
+    from ..semantic_ir import LayoutGraphEngine
+
+    def _comparable(graph: dict[str, Any]) -> dict[str, Any]:
+        return {key: value for key, value in graph.items() if key != "generated_at"}
+
+    rows: list[dict[str, Any]] = []
+    for size in sizes:
+        layout = with_rooms(synthetic_layout(size))
+        moved = copy.deepcopy(layout)
+        moved["items"][size // 2]["pos"][0] += 0.3
+
+        def _cold(moved: dict[str, Any] = moved) -> None:
+            LayoutGraphEngine().build(moved)
+
+        cold_s = best_of(_cold, repeat)
+        incremental_s = float("inf")
+        for _ in range(max(1, repeat)):
+            engine = LayoutGraphEngine()
+            engine.build(layout)
+            started = time.perf_counter()
+            incremental = engine.build(moved)
+            incremental_s = min(incremental_s, time.perf_counter() - started)
+
+        def _unchanged(engine: LayoutGraphEngine = engine, moved: dict[str, Any] = moved) -> None:
+            engine.build(moved)
+
+        rows.append(
+            {
+                "items": size,
+                "rooms": len(layout["rooms"]),
+                "cold_s": round(cold_s, 6),
+                "incremental_s": round(incremental_s, 6),
+                "unchanged_s": round(best_of(_unchanged, repeat), 6),
+                "reuse_rate": engine.stats()["reuse_rate"],
+                "matches_cold": _comparable(incremental) == _comparable(LayoutGraphEngine().build(moved)),
+            }
+        )
+
+    return {
+        "suite": "graph",
+        "repeat": repeat,
+        "results": rows,
+        "scaling_exponent": scaling_exponents(rows, "cold_s", "incremental_s"),
+    }
+
+
+SUITES: dict[str, Callable[..., dict[str, Any]]] = {
+    "geometry": geometry_benchmark,
+    "graph": graph_benchmark,
+    "layout": layout_benchmark,
+    "placement": placement_benchmark,
+    "validation": validation_benchmark,
+}
@@ -0,0 +1,242 @@
+"""Layout state suites: schema migration, scenario patches, project snapshot storage and the JSON wire format."""
+
+from __future__ import annotations
+
+import copy
+import json
+import random
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from .harness import best_of, speedup, synthetic_layout
+
+
+def migration_benchmark(
+    sizes: tuple[int, ...] | list[int] = (100, 1000, 5000),
+    repeat: int = 3,
+) -> dict[str, Any]:
+    """Time and trace the allocations of chat-turn tool work on a current and on a legacy layout.
+
+    ``read_turn`` is what read-only tools do with the shared layout: check
+    its schema, validate it and build a reasoning report. ``edit_turn`` takes
+    a private copy, moves one item, builds a scenario transaction (a diff
+    plus two reasoning reports), applies it and validates the result. A
+    current layout passes through ``migrate_layout`` uncopied. A legacy one
+    (no ``layout_schema_version``) is copied on every call, as every layout
+    was before.
+    """
+    import tracemalloc
+
+    from .. import semantic_ir, workbench
+
+    def _read_turn(layout: dict[str, Any]) -> None:
+        semantic_ir._GRAPH_ENGINE.clear()
+        workbench.validate_layout_schema(layout)
+        workbench.build_validation_report(layout)
+        semantic_ir.reasoning_report(layout)
+
+    def _edit_turn(layout: dict[str, Any]) -> None:
+        semantic_ir._GRAPH_ENGINE.clear()
+        edited = workbench.editable_layout(layout)
+        edited["items"][len(edited["items"]) // 2]["pos"][0] += 0.3
+        workbench.validate_layout_schema(edited)
+        patch = semantic_ir.scenario_transaction(layout, edited)
+        semantic_ir.apply_scenario_patch(layout, patch)
+        workbench.build_validation_report(edited)
+
+    rows: list[dict[str, Any]] = []
+    for size in sizes:
+        current = workbench.migrate_layout(synthetic_layout(size))
+        legacy = copy.deepcopy(current)
+        del legacy["layout_schema_version"]
+        row: dict[str, Any] = {"items": size}
+        for turn_name, turn in (("read_turn", _read_turn), ("edit_turn", _edit_turn)):
+            entry: dict[str, Any] = {}
+            for name, layout in (("current", current), ("legacy", legacy)):
+
+                def _run(layout: dict[str, Any] = layout, turn: Callable[[dict[str, Any]], None] = turn) -> None:
+                    turn(layout)
+
+                seconds = best_of(_run, repeat)
+                before = workbench.migration_stats()
+                tracemalloc.start()
+                turn(layout)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                after = workbench.migration_stats()
+                entry[name] = {
+                    "seconds": round(seconds, 6),
+                    "alloc_peak_mb": round(peak / 1e6, 2),
+                    "layout_copies": after["copied"] - before["copied"],
+                    "zero_copy_migrations": after["reused"] - before["reused"],
+                }
+            entry["speedup"] = speedup(entry["legacy"]["seconds"], entry["current"]["seconds"])
+            row[turn_name] = entry
+        rows.append(row)
+    return {"suite": "migration", "repeat": repeat, "results": rows}
+
+
+def patch_benchmark(
+    sizes: tuple[int, ...] | list[int] = (1000, 10000),
+    repeat: int = 3,
+) -> dict[str, Any]:
+    """Time ``layout_diff`` and scenario patch application for a renovation touching 10% of the items.
+
+    The edit moves 8% of the items, removes 1% and adds 1% as many new ones;
+    ``sequence_s`` applies it as ten smaller patches to one ``IndexedLayout``.
+    """
+    from .. import semantic_ir, workbench
+
+    rows: list[dict[str, Any]] = []
+    for size in sizes:
+        base = workbench.migrate_layout(synthetic_layout(size))
+        edited = copy.deepcopy(base)
+        rng = random.Random(size)
+        for item in rng.sample(edited["items"], size * 8 // 100):
+            item["pos"][0] += 0.25
+        for item in rng.sample(edited["items"], size // 100):
+            edited["items"].remove(item)
+        edited["items"].extend(
+            {"id": f"new-{number}", "furnitureType": "cabinet", "pos": [0.0, 0.4, float(number)], "rot": 0.0, "geo": [0.6, 0.8, 0.6]}
+            for number in range(size // 100)
+        )
+        diff = semantic_ir.layout_diff(base, edited)
+        patch = {"ops": diff["ops"]}
+        chunk = max(1, len(diff["ops"]) // 10)
+        patches = [{"ops": diff["ops"][start : start + chunk]} for start in range(0, len(diff["ops"]), chunk)]
+        applied = semantic_ir.apply_scenario_patch(base, patch)
+
+        def _diff(base: dict[str, Any] = base, edited: dict[str, Any] = edited) -> None:
+            semantic_ir.layout_diff(base, edited)
+
+        def _apply(base: dict[str, Any] = base, patch: dict[str, Any] = patch) -> None:
+            semantic_ir.apply_scenario_patch(base, patch)
+
+        def _revert(applied: dict[str, Any] = applied, patch: dict[str, Any] = patch) -> None:
+            semantic_ir.revert_scenario_patch(applied, {"ops": patch["ops"]})
+
+        def _sequence(base: dict[str, Any] = base, patches: list[dict[str, Any]] = patches) -> None:
+            indexed = semantic_ir.IndexedLayout(base)
+            for step in patches:
+                indexed.apply_patch(step)
+            indexed.layout()
+
+        reverted = semantic_ir.revert_scenario_patch(applied, {"ops": patch["ops"]})
+        rows.append(
+            {
+                "items": size,
+                "ops": len(diff["ops"]),
+                "diff_s": round(best_of(_diff, repeat), 6),
+                "apply_s": round(best_of(_apply, repeat), 6),
+                "revert_s": round(best_of(_revert, repeat), 6),
+                "sequence_s": round(best_of(_sequence, repeat), 6),
+                "round_trips": sorted(item["id"] for item in reverted["items"]) == sorted(item["id"] for item in base["items"])
+                and not semantic_ir.layout_diff(applied, edited)["ops"],
+            }
+        )
+    return {"suite": "patch", "repeat": repeat, "results": rows}
+
+
+def storage_benchmark(
+    sizes: tuple[int, ...] | list[int] = (100, 1000, 5000),
+    repeat: int = 3,
+    snapshots: int = 8,
+) -> dict[str, Any]:
+    """Project file size, save time and load time with inline snapshots and with shared snapshot blobs.
+
+    The project holds *snapshots* layout versions and as many scenarios, each
+    moving 2% of the items of the base layout. ``inline`` writes every
+    snapshot layout in full, as projects were stored before; ``blobs`` goes
+    through ``pack_snapshots`` and is saved again after a load, so snapshots
+    share their blob dicts as they do in a running server.
+    """
+    from .. import workbench
+
+    rows: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "project.haus-project.json"
+        for size in sizes:
+            rng = random.Random(size)
+            base = workbench.migrate_layout(synthetic_layout(size))
+            project: dict[str, Any] = {"schema": workbench.PROJECT_SCHEMA_ID, "layout": base, "layout_versions": [], "scenarios": []}
+            for index in range(2 * snapshots):
+                layout = workbench.editable_layout(base)
+                for item in rng.sample(layout["items"], max(1, size // 50)):
+                    item["pos"][0] += 0.2
+                key = "layout_versions" if index < snapshots else "scenarios"
+                project[key].append({"id": f"{key}-{index}", "layout": layout})
+
+            def _save_inline(project: dict[str, Any] = project) -> None:
+                path.write_text(json.dumps(project, indent=2, sort_keys=True), encoding="utf-8")
+
+            def _save_blobs(project: dict[str, Any]) -> None:
+                path.write_text(json.dumps(workbench.pack_snapshots(project), indent=2, sort_keys=True), encoding="utf-8")
+
+            def _load() -> dict[str, Any]:
+                return workbench.unpack_snapshots(json.loads(path.read_text(encoding="utf-8")))
+
+            entry: dict[str, Any] = {"items": size, "snapshots": 2 * snapshots}
+            _save_inline()
+            entry["inline"] = {
+                "bytes": path.stat().st_size,
+                "save_s": round(best_of(_save_inline, repeat), 6),
+                "load_s": round(best_of(_load, repeat), 6),
+            }
+            _save_blobs(project)
+            loaded = _load()
+            entry["blobs"] = {
+                "bytes": path.stat().st_size,
+                "save_s": round(best_of(lambda loaded=loaded: _save_blobs(loaded), repeat), 6),
+                "load_s": round(best_of(_load, repeat), 6),
+            }
+            entry["size_ratio"] = round(entry["inline"]["bytes"] / entry["blobs"]["bytes"], 1)
+            entry["round_trips"] = json.dumps(_load(), sort_keys=True) == json.dumps(project, sort_keys=True)
+            rows.append(entry)
+    return {"suite": "storage", "repeat": repeat, "results": rows}
+
+
+def wire_benchmark(
+    sizes: tuple[int, ...] | list[int] = (100, 1000, 5000),
+    repeat: int = 5,
+) -> dict[str, Any]:
+    """Encode and decode a tool result carrying a whole layout, pretty-printed with ``json`` and compact with ``jsonio``.
+
+    ``pretty`` is what tool results and layout files used before: two-space
+    indentation and sorted keys. ``compact`` is ``jsonio.dumps`` with the
+    backend this process has (orjson when installed). Decoding is what
+    ``chat_server._dispatch`` does to fill ``result_json``.
+    """
+    from .. import jsonio, workbench
+
+    rows: list[dict[str, Any]] = []
+    for size in sizes:
+        payload = {"ok": True, "layout": workbench.migrate_layout(synthetic_layout(size))}
+        pretty = json.dumps(payload, indent=2, sort_keys=True)
+        compact = jsonio.dumps(payload)
+        rows.append(
+            {
+                "items": size,
+                "pretty": {
+                    "bytes": len(pretty),
+                    "encode_s": round(best_of(lambda payload=payload: json.dumps(payload, indent=2, sort_keys=True), repeat), 6),
+                    "decode_s": round(best_of(lambda pretty=pretty: json.loads(pretty), repeat), 6),
+                },
+                "compact": {
+                    "bytes": len(compact),
+                    "encode_s": round(best_of(lambda payload=payload: jsonio.dumps(payload), repeat), 6),
+                    "decode_s": round(best_of(lambda compact=compact: jsonio.loads(compact), repeat), 6),
+                },
+                "round_trips": jsonio.loads(compact) == json.loads(pretty),
+            }
+        )
+    return {"suite": "wire", "repeat": repeat, "backend": jsonio.backend(), "results": rows}
+
+
+SUITES: dict[str, Callable[..., dict[str, Any]]] = {
+    "migration": migration_benchmark,
+    "patch": patch_benchmark,
+    "storage": storage_benchmark,
+    "wire": wire_benchmark,
+}
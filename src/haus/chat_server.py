@@ -11,35 +11,43 @@ import importlib
 import json
 import mimetypes
 import os
+import asyncio
 import base64
+import contextlib
+import contextvars
 import ipaddress
 import re
 import socket
+import threading
 import time
 import uuid
 from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from html.parser import HTMLParser
 from pathlib import Path
 from typing import Any, cast
 from urllib.error import HTTPError, URLError
 from urllib.parse import parse_qs, parse_qsl, quote_plus, urlencode, unquote, urlparse, urlunparse
-from urllib.request import Request as UrlRequest, urlopen
 
 from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
 from starlette.datastructures import UploadFile
 from starlette.middleware.cors import CORSMiddleware
 from starlette.requests import Request
-from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from starlette.routing import Mount, Route
 from starlette.staticfiles import StaticFiles
 import uvicorn
 
 from . import mcp_server as _mcp_server
-from . import geometry
+from . import geometry, http_pool, jsonio
 from .agent_loop import RoomPlan, plan_flat, plan_room
 from .catalog import catalog_item_to_layout_item, catalog_search_meta, catalog_sources, get_catalog_item, search_furniture_catalog, search_ikea_catalog
+from .http_pool import http_pool_stats
 from .llm import DEFAULT_MODELS, ENV_KEYS, provider_specs, provider_status, providers_with_env_keys, resolve_model, supported_provider_ids
+from .llm.context import context_stats
 from .llm.providers import anthropic as anthropic_provider
+from .llm.providers.common import dispatch_calls
 from .llm.providers import gemini as gemini_provider
 from .llm.providers import local_cli as local_cli_provider
 from .llm.providers import ollama as ollama_provider
@@ -47,8 +55,11 @@ from .llm.providers import openai as openai_provider
 from .llm.providers import openai_compatible as openai_compatible_provider
 from .llm.types import ChatChunk
 from .logging_utils import configure_logging, new_request_id
-from .pipeline import run_vectorize
+from .pipeline import _to_serializable, run_vectorize
 from .types import VectorizeConfig
+from .vectorize_cache import VectorizeCache, cache_key
+from .vectorize_jobs import JobQueueFull, VectorizeJob, VectorizeJobManager
+from .vectorize_jobs import sse_event as job_sse_event
 from .mcp_server import (
     _coerce_float,
     _save_layout,
@@ -87,6 +98,7 @@ from .mcp_server import (
     simulate_layout_options,
     snap_to_grid,
     score_walkway,
+    plan_accessible_route,
     suggest_furniture_placement,
     swap_furniture,
     tag_room,
@@ -102,7 +114,8 @@ from .mcp_server import (
     refresh_ikea_catalog,
 )
 from .room_capture import build_room_capture_layout
-from .workbench import validate_layout_schema
+from .semantic_ir import layout_graph_cache_stats
+from .workbench import command_routes, migration_stats, validate_layout_schema
 
 log = configure_logging("haus.chat")
 
@@ -112,6 +125,7 @@ _MAX_TOOL_STEPS = 12
 _MAX_CHAT_ATTACHMENTS = 3
 _MAX_ATTACHMENT_BYTES = 5 * 1024 * 1024
 _MAX_FLOORPLAN_BYTES = 15 * 1024 * 1024
+_JOB_POLL_SECONDS = 0.05
 _ALLOWED_IMAGE_MIME_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
 _ALLOWED_FLOORPLAN_MIME_TYPES = {"image/jpeg", "image/png", "image/webp"}
 _FLOORPLAN_EXTENSIONS = {
@@ -748,10 +762,29 @@ _TOOLS_SPEC = [
                 "x2": {"type": "number"},
                 "z2": {"type": "number"},
                 "min_width": {"type": "number", "default": 0.9},
+                "resolution": {"type": "number", "default": 0.05},
             },
             "required": ["x1", "z1", "x2", "z2"],
         },
     },
+    {
+        "name": "plan_accessible_route",
+        "description": "Find the shortest clear route between two rooms, doors or fixtures for a mobility profile and report its bottleneck width.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "start": {"type": "string", "description": "Room id/label/kind or item id/name/furniture type."},
+                "end": {"type": "string", "description": "Room id/label/kind or item id/name/furniture type."},
+                "profile": {
+                    "type": "string",
+                    "default": "wheelchair",
+                    "description": "One of general_aging_ready, cane, walker, wheelchair, caregiver_assisted, low_vision.",
+                },
+                "width_m": {"type": "number", "default": 0.0, "description": "Override the profile's clear path width when > 0."},
+            },
+            "required": ["start", "end"],
+        },
+    },
     {
         "name": "score_layout",
         "description": "Score the full layout against a usability standards profile.",
@@ -832,6 +865,34 @@ def _strict_tool_spec(tool: dict[str, Any]) -> dict[str, Any]:
 
 _TOOLS_SPEC = [_strict_tool_spec(tool) for tool in _TOOLS_SPEC]
 _TOOL_SPEC_BY_NAME = {str(tool["name"]): tool for tool in _TOOLS_SPEC}
+_PLAN_GENERATION_TOOLS = frozenset({"design_room", "design_flat", "auto_place_furniture", "simulate_layout_options", "apply_simulated_option"})
+_CATALOG_REFRESH_TOOLS = frozenset({"refresh_ikea_catalog", "refresh_furniture_catalog"})
+_WEB_TOOLS = frozenset({"web_search", "fetch_web_page"})
+# Tools left out of the list sent to the model for a message's command routes
+# (workbench.command_routes). A tool is only dropped when every route the
+# message matches excludes it; routes not listed get every tool.
+_ROUTE_TOOL_EXCLUSIONS: dict[str, frozenset[str]] = {
+    "validate_layout": _PLAN_GENERATION_TOOLS | _CATALOG_REFRESH_TOOLS,
+    "edit_object": _PLAN_GENERATION_TOOLS | _CATALOG_REFRESH_TOOLS | _WEB_TOOLS,
+    "export_report": _PLAN_GENERATION_TOOLS | _CATALOG_REFRESH_TOOLS | frozenset(_TOOL_SAFETY),
+}
+
+
+def _route_tools_spec(message: str) -> list[dict[str, Any]]:
+    """The tools to offer for *message*: all of them, minus those none of its command routes has a use for."""
+    if os.environ.get("HAUS_CONTEXT_TOOL_ROUTES", "1").strip().lower() in {"0", "false", "no", "off"}:
+        return _TOOLS_SPEC
+    routes = command_routes(message)
+    if not routes:
+        return _TOOLS_SPEC
+    excluded = frozenset.intersection(*(_ROUTE_TOOL_EXCLUSIONS.get(route, frozenset()) for route in routes))
+    if not excluded:
+        return _TOOLS_SPEC
+    return [tool for tool in _TOOLS_SPEC if tool["name"] not in excluded]
+
+
+def _dispatch_tools(dispatch: Callable[[str, dict[str, Any]], str]) -> list[dict[str, Any]]:
+    return getattr(dispatch, "tools_spec", None) or _TOOLS_SPEC
 
 
 def _schema_type_error(path: str, expected: str, value: Any) -> str | None:
@@ -1047,16 +1108,13 @@ def _validate_public_reference_url(url: str) -> None:
 def _read_public_url(url: str, *, timeout: int = _WEB_TIMEOUT_SECONDS) -> tuple[str, str]:
     _validate_public_reference_url(url)
 
-    req = UrlRequest(
-        url,
-        headers={
-            "User-Agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) Haus/0.1"
-            )
-        },
-    )
-    with urlopen(req, timeout=timeout) as response:  # noqa: S310 - URL is validated above.
+    headers = {
+        "User-Agent": (
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) Haus/0.1"
+        )
+    }
+    with http_pool.request("GET", url, headers=headers, timeout=timeout) as response:
         content_type = response.headers.get("content-type", "")
         body = response.read(_MAX_WEB_RESPONSE_BYTES + 1)
     if len(body) > _MAX_WEB_RESPONSE_BYTES:
@@ -1082,8 +1140,7 @@ def _request_json(
     if body is not None:
         req_headers.setdefault("Content-Type", "application/json")
 
-    req = UrlRequest(url, data=body, headers=req_headers, method=method)
-    with urlopen(req, timeout=_WEB_TIMEOUT_SECONDS) as response:  # noqa: S310 - provider URLs are fixed.
+    with http_pool.request(method, url, body=body, headers=req_headers, timeout=_WEB_TIMEOUT_SECONDS) as response:
         raw = response.read(_MAX_WEB_RESPONSE_BYTES + 1)
     if len(raw) > _MAX_WEB_RESPONSE_BYTES:
         raise ValueError("Search provider response was too large.")
@@ -1468,7 +1525,7 @@ def _furniture_footprint_m2(room_plans: list[RoomPlan]) -> float:
 
 
 def _draft_room_plans(brief: str, scope: str) -> tuple[list[RoomPlan], tuple[float, float, float, float], int]:
-    data = _mcp_server._load_layout()
+    data = _mcp_server._load_layout("draft_design_plan")
     bounds = _mcp_server._layout_bounds(data)
     if scope == "whole_flat":
         room_zones = _mcp_server._layout_room_zones(data)
@@ -1775,7 +1832,7 @@ def _apply_design_plan(plan_id: str) -> tuple[dict[str, Any], int]:
     if not room_plans:
         return {"ok": False, "error": f"Plan '{plan_id}' has no applyable room plans."}, 422
 
-    data = _mcp_server._load_layout()
+    data = _mcp_server._load_layout("apply_design_plan")
     trace: list[dict[str, Any]] = [
         {
             "tool": "get_layout_summary",
@@ -1941,6 +1998,7 @@ _DISPATCH_RAW: dict[str, Callable[[dict[str, Any]], str]] = {
     "simulate_layout_options": lambda a: simulate_layout_options(**a),
     "apply_simulated_option": lambda a: apply_simulated_option(**a),
     "score_walkway": lambda a: score_walkway(**a),
+    "plan_accessible_route": lambda a: plan_accessible_route(**a),
     "score_layout": lambda a: score_layout(**a),
     "get_semantic_layout_json": lambda a: get_semantic_layout_json(),
     "bim_readiness_report": lambda a: bim_readiness_report(),
@@ -2003,6 +2061,121 @@ def _confirmation_required_result(name: str, args: dict[str, Any]) -> str:
     )
 
 
+# Provider calls run in worker threads. Tools that share state take its lock, so
+# they still run one at a time, as they did on the event loop.
+_TOOL_LOCK = threading.RLock()
+_FOOTPRINT_LOCKS: dict[str, threading.RLock] = {"catalog": threading.RLock(), "layout": _TOOL_LOCK}
+
+# Shared state each tool reads or writes; tools not listed work on the layout.
+# Tools with a common footprint share unsynchronized caches and never overlap.
+_TOOL_FOOTPRINTS: dict[str, tuple[str, ...]] = {
+    "list_furniture_catalog": ("catalog",),
+    "list_furniture_catalog_sources": ("catalog",),
+    "search_furniture_catalog": ("catalog",),
+    "search_ikea_catalog": ("catalog",),
+    "get_furniture_catalog_item": ("catalog",),
+    "get_ikea_catalog_item": ("catalog",),
+    "refresh_furniture_catalog": ("catalog",),
+    "refresh_ikea_catalog": ("catalog",),
+    "add_catalog_furniture": ("catalog", "layout"),
+    "web_search": (),
+    "fetch_web_page": (),
+}
+_TOOL_POOL: ThreadPoolExecutor | None = None
+_TOOL_POOL_LOCK = threading.Lock()
+
+
+def _tool_footprint(name: str) -> tuple[str, ...]:
+    return _TOOL_FOOTPRINTS.get(name, ("layout",))
+
+
+@contextlib.contextmanager
+def _footprint_locks(footprint: tuple[str, ...]) -> Iterator[None]:
+    with contextlib.ExitStack() as stack:
+        for key in sorted(footprint):
+            stack.enter_context(_FOOTPRINT_LOCKS[key])
+        yield
+
+
+def _tool_pool() -> ThreadPoolExecutor:
+    global _TOOL_POOL
+    with _TOOL_POOL_LOCK:
+        if _TOOL_POOL is None:
+            try:
+                workers = int(os.environ.get("HAUS_TOOL_WORKERS", "4"))
+            except ValueError:
+                workers = 4
+            _TOOL_POOL = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="haus-tool")
+        return _TOOL_POOL
+
+
+class _ToolDispatcher:
+    """The ``dispatch`` callable handed to providers for one chat request.
+
+    ``many`` runs one model turn's tool calls. Consecutive read-only calls
+    (by ``_tool_safety``) form a batch, and the batch is split into lanes by
+    footprint: each lane runs its calls in order, and lanes run side by side
+    on the tool pool. Every other call waits for the batch before it and
+    runs alone. Results and ``tool_log`` entries keep the call order.
+    """
+
+    def __init__(
+        self,
+        *,
+        request_id: str,
+        tool_log: list[dict[str, Any]],
+        web_search_disabled: bool = False,
+        tools_spec: list[dict[str, Any]] | None = None,
+    ) -> None:
+        self.request_id = request_id
+        self.tool_log = tool_log
+        self.web_search_disabled = web_search_disabled
+        self.tools_spec = tools_spec
+
+    def __call__(self, name: str, args: dict[str, Any]) -> str:
+        return _dispatch(name, args, request_id=self.request_id, tool_log=self.tool_log, web_search_disabled=self.web_search_disabled)
+
+    def many(self, calls: list[tuple[str, dict[str, Any]]]) -> list[str]:
+        results = [""] * len(calls)
+        logs: list[list[dict[str, Any]]] = [[] for _ in calls]
+
+        def _run(index: int) -> None:
+            name, args = calls[index]
+            results[index] = _dispatch(name, args, request_id=self.request_id, tool_log=logs[index], web_search_disabled=self.web_search_disabled)
+
+        def _run_lane(lane: list[int]) -> None:
+            for index in lane:
+                _run(index)
+
+        batch: list[int] = []
+
+        def _flush() -> None:
+            lanes: dict[Any, list[int]] = {}
+            for index in batch:
+                footprint = _tool_footprint(calls[index][0])
+                lanes.setdefault(footprint or index, []).append(index)
+            if len(lanes) > 1:
+                pool = _tool_pool()
+                futures = [pool.submit(contextvars.copy_context().run, _run_lane, lane) for lane in lanes.values()]
+                for future in futures:
+                    future.result()
+            else:
+                for lane in lanes.values():
+                    _run_lane(lane)
+            batch.clear()
+
+        for index, (name, _) in enumerate(calls):
+            if _tool_safety(name) == "read":
+                batch.append(index)
+                continue
+            _flush()
+            _run(index)
+        _flush()
+        for entries in logs:
+            self.tool_log.extend(entries)
+        return results
+
+
 def _dispatch(
     name: str,
     args: dict[str, Any],
@@ -2011,6 +2184,26 @@ def _dispatch(
     tool_log: list[dict[str, Any]],
     confirmation_token: str | None = None,
     web_search_disabled: bool = False,
+) -> str:
+    with _footprint_locks(_tool_footprint(name)):
+        return _dispatch_locked(
+            name,
+            args,
+            request_id=request_id,
+            tool_log=tool_log,
+            confirmation_token=confirmation_token,
+            web_search_disabled=web_search_disabled,
+        )
+
+
+def _dispatch_locked(
+    name: str,
+    args: dict[str, Any],
+    *,
+    request_id: str,
+    tool_log: list[dict[str, Any]],
+    confirmation_token: str | None = None,
+    web_search_disabled: bool = False,
 ) -> str:
     fn = _DISPATCH_RAW.get(name)
     start = time.perf_counter()
@@ -2051,12 +2244,13 @@ def _dispatch(
         "result": result,
         "elapsed_ms": elapsed_ms,
     }
-    try:
-        parsed_result = json.loads(result)
-        if isinstance(parsed_result, (dict, list)):
-            entry["result_json"] = parsed_result
-    except json.JSONDecodeError:
-        pass
+    if result[:1] in {"{", "["}:
+        try:
+            parsed_result = jsonio.loads(result)
+            if isinstance(parsed_result, (dict, list)):
+                entry["result_json"] = parsed_result
+        except json.JSONDecodeError:
+            pass
     tool_log.append(entry)
 
     preview = result[:200] + "..." if len(result) > 200 else result
@@ -2126,8 +2320,8 @@ def _chat_anthropic(
             return text, messages
 
         results: list[dict[str, Any]] = []
-        for tu in tool_uses:
-            result = dispatch(tu.name, dict(tu.input))
+        outputs = dispatch_calls(dispatch, [(tu.name, dict(tu.input)) for tu in tool_uses])
+        for tu, result in zip(tool_uses, outputs):
             results.append({"type": "tool_result", "tool_use_id": tu.id, "content": result})
         messages.append({"role": "user", "content": results})
 
@@ -2310,13 +2504,15 @@ def _chat_openai(
             assistant_content.append({"type": "text", "text": msg.content})
 
         tool_results: list[dict[str, Any]] = []
+        requested: list[tuple[str, dict[str, Any]]] = []
         for tc in tool_calls:
             try:
                 args = json.loads(tc.function.arguments or "{}")
             except json.JSONDecodeError:
                 args = {}
+            requested.append((tc.function.name, args))
 
-            result = dispatch(tc.function.name, args)
+        for tc, (_, args), result in zip(tool_calls, requested, dispatch_calls(dispatch, requested)):
             oai_messages.append({"role": "tool", "tool_call_id": tc.id, "content": result})
 
             assistant_content.append(
@@ -2440,9 +2636,8 @@ def _chat_gemini(
             return text, messages
 
         func_responses = []
-        for call in func_calls:
-            args = dict(call.function_call.args)
-            result = dispatch(call.function_call.name, args)
+        outputs = dispatch_calls(dispatch, [(call.function_call.name, dict(call.function_call.args)) for call in func_calls])
+        for call, result in zip(func_calls, outputs):
             func_responses.append(
                 genai.protos.Part(
                     function_response=genai.protos.FunctionResponse(
@@ -2469,7 +2664,7 @@ def _run_anthropic(
         model,
         dispatch,
         system=_SYSTEM,
-        tools_spec=_TOOLS_SPEC,
+        tools_spec=_dispatch_tools(dispatch),
         max_tool_steps=_MAX_TOOL_STEPS,
     )
 
@@ -2486,7 +2681,7 @@ def _run_openai(
         model,
         dispatch,
         system=_SYSTEM,
-        tools_spec=_TOOLS_SPEC,
+        tools_spec=_dispatch_tools(dispatch),
         max_tool_steps=_MAX_TOOL_STEPS,
     )
 
@@ -2503,7 +2698,7 @@ def _run_gemini(
         model,
         dispatch,
         system=_SYSTEM,
-        tools_spec=_TOOLS_SPEC,
+        tools_spec=_dispatch_tools(dispatch),
         max_tool_steps=_MAX_TOOL_STEPS,
     )
 
@@ -2520,7 +2715,7 @@ def _run_ollama(
         model,
         dispatch,
         system=_SYSTEM,
-        tools_spec=_TOOLS_SPEC,
+        tools_spec=_dispatch_tools(dispatch),
         max_tool_steps=_MAX_TOOL_STEPS,
     )
 
@@ -2537,7 +2732,7 @@ def _run_codex(
         model,
         dispatch,
         system=_SYSTEM,
-        tools_spec=_TOOLS_SPEC,
+        tools_spec=_dispatch_tools(dispatch),
         max_tool_steps=_MAX_TOOL_STEPS,
     )
 
@@ -2554,7 +2749,7 @@ def _run_gemini_cli(
         model,
         dispatch,
         system=_SYSTEM,
-        tools_spec=_TOOLS_SPEC,
+        tools_spec=_dispatch_tools(dispatch),
         max_tool_steps=_MAX_TOOL_STEPS,
     )
 
@@ -2571,7 +2766,7 @@ def _run_claude_code(
         model,
         dispatch,
         system=_SYSTEM,
-        tools_spec=_TOOLS_SPEC,
+        tools_spec=_dispatch_tools(dispatch),
         max_tool_steps=_MAX_TOOL_STEPS,
     )
 
@@ -2588,7 +2783,7 @@ def _run_opencode(
         model,
         dispatch,
         system=_SYSTEM,
-        tools_spec=_TOOLS_SPEC,
+        tools_spec=_dispatch_tools(dispatch),
         max_tool_steps=_MAX_TOOL_STEPS,
     )
 
@@ -2605,7 +2800,7 @@ def _run_aider(
         model,
         dispatch,
         system=_SYSTEM,
-        tools_spec=_TOOLS_SPEC,
+        tools_spec=_dispatch_tools(dispatch),
         max_tool_steps=_MAX_TOOL_STEPS,
     )
 
@@ -2622,7 +2817,7 @@ def _run_openai_compatible_local(
         model,
         dispatch,
         system=_SYSTEM,
-        tools_spec=_TOOLS_SPEC,
+        tools_spec=_dispatch_tools(dispatch),
         max_tool_steps=_MAX_TOOL_STEPS,
     )
 
@@ -2654,10 +2849,33 @@ _STREAM_FNS: dict[
     Callable[[str, list[dict[str, Any]], str, Callable[[str, dict[str, Any]], str]], Iterator[ChatChunk]],
 ] = {
     "ollama": lambda api_key, messages, model, dispatch: ollama_provider.stream_chat(
-        api_key, messages, model, dispatch, system=_SYSTEM, tools_spec=_TOOLS_SPEC, max_tool_steps=_MAX_TOOL_STEPS
+        api_key, messages, model, dispatch, system=_SYSTEM, tools_spec=_dispatch_tools(dispatch), max_tool_steps=_MAX_TOOL_STEPS
     ),
 }
 
+
+def _local_runtime_stream(
+    fn: Callable[..., Iterator[ChatChunk]],
+) -> Callable[[str, list[dict[str, Any]], str, Callable[[str, dict[str, Any]], str]], Iterator[ChatChunk]]:
+    return lambda api_key, messages, model, dispatch: fn(
+        api_key, messages, model, dispatch, system=_SYSTEM, tools_spec=_dispatch_tools(dispatch), max_tool_steps=_MAX_TOOL_STEPS
+    )
+
+
+_STREAM_FNS.update(
+    {
+        provider: _local_runtime_stream(fn)
+        for provider, fn in {
+            "codex": local_cli_provider.stream_codex,
+            "gemini-cli": local_cli_provider.stream_gemini_cli,
+            "claude-code": local_cli_provider.stream_claude_code,
+            "opencode": local_cli_provider.stream_opencode,
+            "aider": local_cli_provider.stream_aider,
+        }.items()
+        if provider in _CHAT_FNS
+    }
+)
+
 def _resolve_provider_token(provider: str, client_key: str) -> str:
     if provider not in _CHAT_FNS:
         return ""
@@ -2735,7 +2953,6 @@ async def _chat_status(request: Request) -> JSONResponse:
 
 
 async def _health(request: Request) -> JSONResponse:
-    del request
     status = provider_status()
     return JSONResponse(
         {
@@ -2756,6 +2973,13 @@ async def _health(request: Request) -> JSONResponse:
                 "furniture_catalog": True,
                 "mcp_scratch_layout": True,
             },
+            "layout_cache": _mcp_server.layout_cache_stats(),
+            "layout_graph_cache": layout_graph_cache_stats(),
+            "layout_migration": migration_stats(),
+            "http_pool": http_pool_stats(),
+            "local_runtime": local_cli_provider.runtime_pool_stats(),
+            "chat_context": context_stats(),
+            "vectorize_jobs": _vectorize_jobs(request.app).stats(),
         }
     )
 
@@ -2818,15 +3042,18 @@ def _design_chat_payload(
 ) -> JSONResponse:
     start = time.perf_counter()
     references = [] if web_search_disabled else search_references(_design_search_query(user_msg), max_results=5)
-    plan = _draft_design_plan(
-        user_msg,
-        references=references,
-        attachments=attachments,
-        planner_mode=planner_mode,
-        standards_profile=standards_profile,
-        fallback_reason=fallback_reason,
-    )
-    raw_plan = _find_plan(str(plan["id"]))
+    # Drafting reads the layout and catalog outside ``_dispatch``, so it takes their locks;
+    # the web search above and the provider review below run without them.
+    with _footprint_locks(("catalog", "layout")):
+        plan = _draft_design_plan(
+            user_msg,
+            references=references,
+            attachments=attachments,
+            planner_mode=planner_mode,
+            standards_profile=standards_profile,
+            fallback_reason=fallback_reason,
+        )
+        raw_plan = _find_plan(str(plan["id"]))
     if raw_plan is not None and planner_mode in {"llm_reviewed", "llm_structured"}:
         review = _run_plan_llm_review(provider=provider, api_key=api_key, model=model, mode=planner_mode, plan=raw_plan)
         raw_plan["llm_review"] = review
@@ -2914,6 +3141,89 @@ def _revision_chat_payload(
     )
 
 
+_STREAM_END = object()
+
+
+def _start_worker(target: Callable[[], None], name: str) -> None:
+    """Run *target* on a daemon thread that sees the caller's context variables."""
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(target,), name=name, daemon=True).start()
+
+
+async def _call_in_thread(fn: Callable[[], Any], name: str = "haus-provider") -> Any:
+    """Await a blocking provider call on its own thread so the event loop keeps serving other requests.
+
+    A dedicated thread rather than the default executor: a model round trip
+    can take minutes, and concurrent chats must not queue behind a small pool.
+    """
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future[Any] = loop.create_future()
+
+    def _settle(result: Any, error: BaseException | None) -> None:
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _run() -> None:
+        try:
+            result, error = fn(), None
+        except Exception as exc:
+            result, error = None, exc
+        with contextlib.suppress(RuntimeError):
+            loop.call_soon_threadsafe(_settle, result, error)
+
+    _start_worker(_run, name)
+    return await future
+
+
+async def _iterate_in_thread(factory: Callable[[], Iterator[Any]], name: str = "haus-provider-stream") -> AsyncIterator[Any]:
+    """Drive a blocking generator on its own thread and yield its items through an asyncio queue.
+
+    When the consumer stops early (the client disconnected), the generator
+    is closed on its thread after the item it is producing.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[tuple[Any, BaseException | None]] = asyncio.Queue()
+    stopped = threading.Event()
+
+    def _put(item: Any, error: BaseException | None = None) -> None:
+        with contextlib.suppress(RuntimeError):
+            loop.call_soon_threadsafe(queue.put_nowait, (item, error))
+
+    def _run() -> None:
+        iterator: Iterator[Any] | None = None
+        try:
+            iterator = factory()
+            for item in iterator:
+                if stopped.is_set():
+                    break
+                _put(item)
+        except Exception as exc:
+            _put(_STREAM_END, exc)
+            return
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                with contextlib.suppress(Exception):
+                    close()
+        _put(_STREAM_END)
+
+    _start_worker(_run, name)
+    try:
+        while True:
+            item, error = await queue.get()
+            if item is _STREAM_END:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stopped.set()
+
+
 async def _chat(request: Request) -> JSONResponse:
     request_id = new_request_id("chat")
 
@@ -2966,19 +3276,21 @@ async def _chat(request: Request) -> JSONResponse:
         )
 
     if concept_request:
-        return _design_chat_payload(
-            user_msg=user_msg,
-            history=history,
-            attachments=attachments,
-            request_id=request_id,
-            conversation_id=conversation_id,
-            provider=provider,
-            api_key=concept_api_key,
-            model=concept_model,
-            planner_mode=resolved_planner_mode,
-            standards_profile=standards_profile,
-            fallback_reason=planner_fallback_reason,
-            web_search_disabled=web_search_disabled,
+        return await _call_in_thread(
+            lambda: _design_chat_payload(
+                user_msg=user_msg,
+                history=history,
+                attachments=attachments,
+                request_id=request_id,
+                conversation_id=conversation_id,
+                provider=provider,
+                api_key=concept_api_key,
+                model=concept_model,
+                planner_mode=resolved_planner_mode,
+                standards_profile=standards_profile,
+                fallback_reason=planner_fallback_reason,
+                web_search_disabled=web_search_disabled,
+            ),
         )
 
     if provider not in _CHAT_FNS:
@@ -3010,13 +3322,14 @@ async def _chat(request: Request) -> JSONResponse:
     tool_log: list[dict[str, Any]] = []
     messages = history + [{"role": "user", "content": _build_user_content(user_msg, attachments)}]
 
-    def dispatch(name: str, args: dict[str, Any]) -> str:
-        return _dispatch(name, args, request_id=request_id, tool_log=tool_log, web_search_disabled=web_search_disabled)
+    dispatch = _ToolDispatcher(
+        request_id=request_id, tool_log=tool_log, web_search_disabled=web_search_disabled, tools_spec=_route_tools_spec(user_msg)
+    )
 
     log.info("[%s] chat request provider=%s model=%s", request_id, provider, model)
 
     try:
-        text, updated_history = _CHAT_FNS[provider](api_key, messages, model, dispatch)
+        text, updated_history = await _call_in_thread(lambda: _CHAT_FNS[provider](api_key, messages, model, dispatch))
         return JSONResponse(
             {
                 "response": text,
@@ -3106,19 +3419,21 @@ async def _chat_stream(request: Request) -> StreamingResponse:
         if concept_request:
             resolved_planner_mode, fallback_reason = _resolve_planner_mode(planner_mode_requested, provider, api_key)
             payload = _json_response_body(
-                _design_chat_payload(
-                    user_msg=user_msg,
-                    history=history,
-                    attachments=attachments,
-                    request_id=request_id,
-                    conversation_id=conversation_id,
-                    provider=provider,
-                    api_key=api_key,
-                    model=model,
-                    planner_mode=resolved_planner_mode,
-                    standards_profile=standards_profile,
-                    fallback_reason=fallback_reason,
-                    web_search_disabled=web_search_disabled,
+                await _call_in_thread(
+                    lambda: _design_chat_payload(
+                        user_msg=user_msg,
+                        history=history,
+                        attachments=attachments,
+                        request_id=request_id,
+                        conversation_id=conversation_id,
+                        provider=provider,
+                        api_key=api_key,
+                        model=model,
+                        planner_mode=resolved_planner_mode,
+                        standards_profile=standards_profile,
+                        fallback_reason=fallback_reason,
+                        web_search_disabled=web_search_disabled,
+                    ),
                 )
             )
             yield ChatChunk("meta", {k: v for k, v in payload.items() if k not in {"response", "history"}}).sse_event()
@@ -3136,8 +3451,9 @@ async def _chat_stream(request: Request) -> StreamingResponse:
         tool_log: list[dict[str, Any]] = []
         messages = history + [{"role": "user", "content": _build_user_content(user_msg, attachments)}]
 
-        def dispatch(name: str, args: dict[str, Any]) -> str:
-            return _dispatch(name, args, request_id=request_id, tool_log=tool_log, web_search_disabled=web_search_disabled)
+        dispatch = _ToolDispatcher(
+            request_id=request_id, tool_log=tool_log, web_search_disabled=web_search_disabled, tools_spec=_route_tools_spec(user_msg)
+        )
 
         yield ChatChunk(
             "meta",
@@ -3151,7 +3467,7 @@ async def _chat_stream(request: Request) -> StreamingResponse:
         ).sse_event()
         try:
             if provider not in _STREAM_FNS:
-                text, updated_history = _CHAT_FNS[provider](api_key, messages, model, dispatch)
+                text, updated_history = await _call_in_thread(lambda: _CHAT_FNS[provider](api_key, messages, model, dispatch))
                 final = {
                     "response": text,
                     "history": _redact_history_for_client(updated_history),
@@ -3168,7 +3484,7 @@ async def _chat_stream(request: Request) -> StreamingResponse:
                 return
 
             final: dict[str, Any] = {}
-            for chunk in _STREAM_FNS[provider](api_key, messages, model, dispatch):
+            async for chunk in _iterate_in_thread(lambda: _STREAM_FNS[provider](api_key, messages, model, dispatch)):
                 if chunk.type == "done":
                     final = dict(chunk.data)
                     final["history"] = _redact_history_for_client(final.get("history", messages))
@@ -3336,6 +3652,16 @@ def _runtime_root() -> Path:
     return (Path.home() / ".haus").resolve()
 
 
+def _vectorize_cache() -> VectorizeCache | None:
+    try:
+        max_mb = float(os.environ.get("HAUS_VECTORIZE_CACHE_MB", "512"))
+    except ValueError:
+        max_mb = 512.0
+    if max_mb <= 0:
+        return None
+    return VectorizeCache(_runtime_root() / "vectorize-cache", max_bytes=int(max_mb * 1024 * 1024))
+
+
 def _form_bool(value: Any, default: bool = True) -> bool:
     if value is None:
         return default
@@ -3368,8 +3694,7 @@ def _floorplan_warnings(metadata: dict[str, Any], layout: dict[str, Any], scale_
     return warnings
 
 
-async def _floorplan_vectorize(request: Request) -> JSONResponse:
-    request_id = new_request_id("floorplan")
+async def _read_floorplan_upload(request: Request, request_id: str) -> dict[str, Any] | JSONResponse:
     try:
         form = await request.form()
     except Exception:
@@ -3396,39 +3721,34 @@ async def _floorplan_vectorize(request: Request) -> JSONResponse:
     if len(raw) > _MAX_FLOORPLAN_BYTES:
         return JSONResponse({"ok": False, "error": "Floor plan file exceeds 15MB.", "request_id": request_id}, 413)
 
-    upload_id = uuid.uuid4().hex[:12]
-    root = _runtime_root() / "uploads" / upload_id
-    root.mkdir(parents=True, exist_ok=True)
-    ext = _FLOORPLAN_EXTENSIONS[content_type]
-    image_path = root / f"source{ext}"
-    image_path.write_bytes(raw)
-    out_dir = root / "vectorized"
-    debug_dir = root / "debug"
-    scale_override = _form_float(form.get("scale_m_per_px"))
-    wall_height = _form_float(form.get("wall_height_m"), 2.6) or 2.6
-    clean = _form_bool(form.get("clean"), True)
+    return {
+        "raw": raw,
+        "filename": upload.filename,
+        "ext": _FLOORPLAN_EXTENSIONS[content_type],
+        "scale_override": _form_float(form.get("scale_m_per_px")),
+        "wall_height": _form_float(form.get("wall_height_m"), 2.6) or 2.6,
+        "clean": _form_bool(form.get("clean"), True),
+    }
 
-    try:
-        metadata = run_vectorize(
-            VectorizeConfig(
-                image_path=image_path,
-                out_dir=out_dir,
-                debug_dir=debug_dir,
-                wall_height=wall_height,
-                scale_override=scale_override,
-                clean=clean,
-            )
-        )
-        layout_path = Path(str(metadata["output_layout"]))
-        layout = json.loads(layout_path.read_text(encoding="utf-8"))
-    except Exception as exc:
-        log.exception("[%s] floor plan vectorization failed", request_id)
-        return JSONResponse({"ok": False, "error": str(exc), "request_id": request_id}, 500)
+
+def _floorplan_payload(
+    metadata: dict[str, Any],
+    upload: dict[str, Any],
+    *,
+    upload_id: str,
+    root: Path,
+    cached: bool,
+) -> dict[str, Any]:
+    out_dir = root / "vectorized"
+    image_path = Path(str(metadata.get("source_image") or root / f"source{upload['ext']}"))
+    layout_path = Path(str(metadata["output_layout"]))
+    layout = json.loads(layout_path.read_text(encoding="utf-8"))
+    scale_override = upload["scale_override"]
 
     layout_metadata = layout.setdefault("metadata", {})
     if isinstance(layout_metadata, dict):
         layout_metadata["source_type"] = "upload"
-        layout_metadata["source_filename"] = upload.filename or image_path.name
+        layout_metadata["source_filename"] = upload["filename"] or image_path.name
         layout_metadata["upload_id"] = upload_id
         if scale_override is not None:
             layout_metadata["calibration"] = {"scale_m_per_px": scale_override, "source": "user"}
@@ -3436,25 +3756,181 @@ async def _floorplan_vectorize(request: Request) -> JSONResponse:
     if warnings and isinstance(layout_metadata, dict):
         layout_metadata["extraction_warnings"] = warnings
 
-    return JSONResponse(
-        {
-            "ok": True,
-            "layout": layout,
-            "metadata": metadata,
-            "warnings": warnings,
-            "artifacts": {
-                "upload_id": upload_id,
-                "source": str(image_path),
-                "layout": str(layout_path),
-                "glb": str(out_dir / "model.glb"),
-                "vector_clean": str(out_dir / "vector_clean.png"),
-                "debug_dir": str(debug_dir),
-            },
-            "request_id": request_id,
-        }
+    return {
+        "layout": layout,
+        "metadata": metadata,
+        "warnings": warnings,
+        "cached": cached,
+        "artifacts": {
+            "upload_id": upload_id,
+            "source": str(image_path),
+            "layout": str(layout_path),
+            "glb": str(out_dir / "model.glb"),
+            "vector_clean": str(out_dir / "vector_clean.png"),
+            "debug_dir": str(root / "debug"),
+        },
+    }
+
+
+def _run_vectorize_inline(config: VectorizeConfig, progress: Callable[[str], None]) -> dict[str, Any]:
+    return cast(dict[str, Any], _to_serializable(run_vectorize(config, progress=progress)))
+
+
+def _vectorize_jobs(app: Starlette) -> VectorizeJobManager:
+    manager = getattr(app.state, "vectorize_jobs", None)
+    if manager is None:
+        try:
+            workers = int(os.environ.get("HAUS_VECTORIZE_WORKERS", "2"))
+            timeout_s = float(os.environ.get("HAUS_VECTORIZE_TIMEOUT_S", "120"))
+            max_queued = int(os.environ.get("HAUS_VECTORIZE_MAX_QUEUE", "16"))
+        except ValueError:
+            workers, timeout_s, max_queued = 2, 120.0, 16
+        # HAUS_VECTORIZE_WORKERS=0 runs jobs on one background thread in this process.
+        manager = VectorizeJobManager(
+            workers=max(1, workers),
+            timeout_s=timeout_s,
+            max_queued=max_queued,
+            use_processes=workers > 0,
+            runner=_run_vectorize_inline,
+        )
+        app.state.vectorize_jobs = manager
+    return manager
+
+
+def _start_floorplan_job(app: Starlette, upload: dict[str, Any], request_id: str) -> VectorizeJob:
+    manager = _vectorize_jobs(app)
+    cache = _vectorize_cache()
+    config_fields = {
+        "wall_height": upload["wall_height"],
+        "scale_override": upload["scale_override"],
+        "clean": upload["clean"],
+    }
+    key = cache_key(upload["raw"], **config_fields)
+
+    if cache is None:
+        upload_id = uuid.uuid4().hex[:12]
+        root = _runtime_root() / "uploads" / upload_id
+        root.mkdir(parents=True, exist_ok=True)
+    else:
+        # Identical uploads share one content-addressed result directory.
+        upload_id = key[:12]
+        root = cache.entry_dir(key)
+        entry = cache.lookup(key)
+        if entry is not None:
+            log.info("[%s] floor plan vectorize cache hit %s", request_id, upload_id)
+            return manager.completed(
+                _floorplan_payload(entry["metadata"], upload, upload_id=upload_id, root=root, cached=True)
+            )
+        running = manager.find(key)
+        if running is not None:
+            return running
+        cache.prepare(key)
+
+    image_path = root / f"source{upload['ext']}"
+    image_path.write_bytes(upload["raw"])
+
+    def finalize(metadata: dict[str, Any]) -> dict[str, Any]:
+        if cache is not None:
+            cache.commit(key, metadata, config_fields)
+        return _floorplan_payload(metadata, upload, upload_id=upload_id, root=root, cached=False)
+
+    def cleanup() -> None:
+        if cache is not None:
+            cache.discard(key)
+
+    return manager.submit(
+        VectorizeConfig(
+            image_path=image_path,
+            out_dir=root / "vectorized",
+            debug_dir=root / "debug",
+            **config_fields,
+        ),
+        finalize=finalize,
+        cleanup=cleanup,
+        dedupe_key=key if cache is not None else None,
     )
 
 
+_JOB_FAILURE_STATUS = {"failed": 500, "timeout": 504, "cancelled": 409}
+
+
+async def _floorplan_vectorize(request: Request) -> JSONResponse:
+    request_id = new_request_id("floorplan")
+    upload = await _read_floorplan_upload(request, request_id)
+    if isinstance(upload, JSONResponse):
+        return upload
+
+    try:
+        job = _start_floorplan_job(request.app, upload, request_id)
+    except JobQueueFull as exc:
+        return JSONResponse({"ok": False, "error": str(exc), "request_id": request_id}, 429)
+    except OSError as exc:
+        log.exception("[%s] could not stage floor plan upload", request_id)
+        return JSONResponse({"ok": False, "error": str(exc), "request_id": request_id}, 500)
+
+    while not job.terminal:
+        await asyncio.sleep(_JOB_POLL_SECONDS)
+    if job.status != "done" or job.result is None:
+        log.error("[%s] floor plan vectorization %s: %s", request_id, job.status, job.error)
+        error = job.error or f"Floor plan vectorization {job.status}."
+        return JSONResponse({"ok": False, "error": error, "request_id": request_id}, _JOB_FAILURE_STATUS.get(job.status, 500))
+    return JSONResponse({"ok": True, **job.result, "request_id": request_id})
+
+
+async def _floorplan_job_submit(request: Request) -> JSONResponse:
+    request_id = new_request_id("floorplan-job")
+    upload = await _read_floorplan_upload(request, request_id)
+    if isinstance(upload, JSONResponse):
+        return upload
+    try:
+        job = _start_floorplan_job(request.app, upload, request_id)
+    except JobQueueFull as exc:
+        return JSONResponse({"ok": False, "error": str(exc), "request_id": request_id}, 429)
+    except OSError as exc:
+        log.exception("[%s] could not stage floor plan upload", request_id)
+        return JSONResponse({"ok": False, "error": str(exc), "request_id": request_id}, 500)
+    return JSONResponse({"ok": True, "job": job.snapshot(), "request_id": request_id}, 202)
+
+
+def _find_floorplan_job(request: Request) -> VectorizeJob | None:
+    return _vectorize_jobs(request.app).get(str(request.path_params.get("job_id", "")))
+
+
+async def _floorplan_job_status(request: Request) -> JSONResponse:
+    job = _find_floorplan_job(request)
+    if job is None:
+        return JSONResponse({"ok": False, "error": "Floor plan job was not found."}, 404)
+    return JSONResponse({"ok": True, "job": job.snapshot()})
+
+
+async def _floorplan_job_events(request: Request) -> Response:
+    job = _find_floorplan_job(request)
+    if job is None:
+        return JSONResponse({"ok": False, "error": "Floor plan job was not found."}, 404)
+
+    async def events() -> AsyncIterator[str]:
+        seq = 0
+        while True:
+            for event in job.events_since(seq):
+                seq = event["seq"] + 1
+                yield job_sse_event(event)
+            if job.terminal and not job.events_since(seq):
+                yield ChatChunk("done", job.snapshot()).sse_event()
+                return
+            await asyncio.sleep(_JOB_POLL_SECONDS)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+async def _floorplan_job_cancel(request: Request) -> JSONResponse:
+    job = _find_floorplan_job(request)
+    if job is None:
+        return JSONResponse({"ok": False, "error": "Floor plan job was not found."}, 404)
+    if not _vectorize_jobs(request.app).cancel(job.id):
+        return JSONResponse({"ok": False, "error": f"Floor plan job is already {job.status}.", "job": job.snapshot()}, 409)
+    return JSONResponse({"ok": True, "job": job.snapshot()})
+
+
 async def _catalog_sources_route(request: Request) -> JSONResponse:
     del request
     return JSONResponse({"ok": True, "sources": catalog_sources(), "default": "all"})
@@ -3575,8 +4051,57 @@ def _cors_origins() -> list[str]:
     return [entry.strip() for entry in raw.split(",") if entry.strip()]
 
 
+def _configure_layout_persistence() -> None:
+    try:
+        write_behind_ms = float(os.environ.get("HAUS_LAYOUT_WRITE_BEHIND_MS", "0") or 0)
+    except ValueError:
+        write_behind_ms = 0.0
+    fsync = os.environ.get("HAUS_LAYOUT_FSYNC", "0").lower() in {"1", "true", "yes", "on"}
+    _mcp_server.configure_layout_persistence(write_behind_s=write_behind_ms / 1000, fsync=fsync)
+
+
+class _LayoutFlushMiddleware:
+    """Flush write-behind layout changes before an API response completes.
+
+    The browser reloads mcp-layout.json as soon as a chat or tool response
+    lands, so debounced writes must reach disk before the final body chunk.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or not str(scope.get("path", "")).startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_after_flush(message: dict[str, Any]) -> None:
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                err = await run_in_threadpool(_mcp_server.flush_layout)
+                if err:
+                    log.error("Deferred layout write failed: %s", err)
+            await send(message)
+
+        await self.app(scope, receive, send_after_flush)
+
+
+@contextlib.asynccontextmanager
+async def _lifespan(app: Starlette) -> AsyncIterator[None]:
+    _configure_layout_persistence()
+    try:
+        yield
+    finally:
+        manager = getattr(app.state, "vectorize_jobs", None)
+        if manager is not None:
+            manager.shutdown()
+        err = _mcp_server.flush_layout()
+        if err:
+            log.error("Deferred layout write failed on shutdown: %s", err)
+
+
 def create_app(root_dir: str) -> Starlette:
     app = Starlette(
+        lifespan=_lifespan,
         routes=[
             Route("/api/health", _health, methods=["GET"]),
             Route("/api/chat/status", _chat_status, methods=["GET"]),
@@ -3593,6 +4118,10 @@ def create_app(root_dir: str) -> Starlette:
             Route("/api/mcp/clear-layout", _mcp_clear_layout, methods=["POST"]),
             Route("/api/room-capture/layout", _room_capture_layout, methods=["POST"]),
             Route("/api/floorplans/vectorize", _floorplan_vectorize, methods=["POST"]),
+            Route("/api/floorplans/vectorize/jobs", _floorplan_job_submit, methods=["POST"]),
+            Route("/api/floorplans/vectorize/jobs/{job_id}", _floorplan_job_status, methods=["GET"]),
+            Route("/api/floorplans/vectorize/jobs/{job_id}/events", _floorplan_job_events, methods=["GET"]),
+            Route("/api/floorplans/vectorize/jobs/{job_id}/cancel", _floorplan_job_cancel, methods=["POST"]),
             Route("/api/catalog/sources", _catalog_sources_route, methods=["GET"]),
             Route("/api/catalog/search", _catalog_search, methods=["GET"]),
             Route("/api/catalog/items/{item_id}", _catalog_item, methods=["GET"]),
@@ -3610,6 +4139,7 @@ def create_app(root_dir: str) -> Starlette:
         allow_headers=["*"],
         allow_credentials=False,
     )
+    app.add_middleware(_LayoutFlushMiddleware)
     return app
 
 
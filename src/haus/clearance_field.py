@@ -0,0 +1,207 @@
+"""Rasterized clearance field over layout item footprints.
+
+Visible footprints are rasterized once per layout version and run through a
+Euclidean distance transform, so walkway and narrowest-gap queries become
+array lookups along the path. The raster is only a screen: samples whose
+lookup could still hold the minimum are re-measured against the exact
+polygons, so reported gaps match the scalar geometry.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable
+from typing import Any
+
+import cv2
+import numpy as np
+
+from . import geometry, placement
+from .spatial_index import LayoutSpatialIndex
+
+DEFAULT_RESOLUTION_M = 0.05
+# Cells kept around the footprints so gaps toward open floor stay on the raster.
+DEFAULT_MARGIN_M = 2.0
+# Rasters above this many cells are built at a coarser resolution instead.
+_MAX_CELLS = 4_000_000
+_MAX_CACHED_FIELDS = 4
+# Subpixel bits for cv2.fillConvexPoly, so footprints are not snapped to whole cells.
+_FILL_SHIFT = 4
+
+
+def _visible_rows(items: list[Any]) -> list[int]:
+    return [index for index, item in enumerate(items) if isinstance(item, dict) and item.get("visible", True)]
+
+
+class ClearanceField:
+    """Distance from every raster cell to the nearest visible footprint of one layout.
+
+    The field is built from a synced ``LayoutSpatialIndex`` and records the
+    index ``version`` it saw. ``clearance(points)`` returns metres; it is
+    within ``error`` of the exact point-to-polygon distance for points on the
+    raster and ``nan`` off it.
+    """
+
+    def __init__(
+        self,
+        index: LayoutSpatialIndex,
+        resolution: float = DEFAULT_RESOLUTION_M,
+        margin: float = DEFAULT_MARGIN_M,
+        *,
+        obstacles: list[int] | None = None,
+        openings: list[geometry.Polygon] | None = None,
+        extent: geometry.Rect | None = None,
+    ) -> None:
+        self.index = index
+        self.version = index.version
+        self.requested_resolution = float(resolution)
+        self.obstacles = _visible_rows(index.items) if obstacles is None else list(obstacles)
+        self.openings = list(openings or [])
+        self.extent = extent
+        self.polygons = [index.polygon(row) for row in self.obstacles]
+        self.packed = placement.pack_polygons(self.polygons)
+        self.boxes = placement.bounding_boxes(self.packed)
+        corners = [point for polygon in self.polygons + self.openings for point in polygon]
+        if extent is not None:
+            corners += [(extent[0], extent[1]), (extent[2], extent[3])]
+        if not corners:
+            self.resolution = max(0.005, float(resolution))
+            self.origin = (0.0, 0.0)
+            self.distances = np.zeros((0, 0), dtype=np.float32)
+            return
+        x_min = min(point[0] for point in corners) - margin
+        z_min = min(point[1] for point in corners) - margin
+        x_max = max(point[0] for point in corners) + margin
+        z_max = max(point[1] for point in corners) + margin
+        area = (x_max - x_min) * (z_max - z_min)
+        self.resolution = max(0.005, float(resolution), math.sqrt(area / _MAX_CELLS))
+        self.origin = (x_min, z_min)
+        cols = max(1, math.ceil((x_max - x_min) / self.resolution))
+        rows = max(1, math.ceil((z_max - z_min) / self.resolution))
+        if not self.polygons:
+            self.distances = np.full((rows, cols), np.inf, dtype=np.float32)
+            return
+        free = np.full((rows, cols), 255, dtype=np.uint8)
+        # One call per footprint: a single fillPoly would leave overlapping footprints unfilled.
+        for polygon in self.polygons:
+            cv2.fillConvexPoly(free, self._outline(polygon), 0, lineType=cv2.LINE_8, shift=_FILL_SHIFT)
+        # Openings such as doorways are cut back out of any wall drawn across them.
+        for polygon in self.openings:
+            cv2.fillConvexPoly(free, self._outline(polygon), 255, lineType=cv2.LINE_8, shift=_FILL_SHIFT)
+        self.distances = cv2.distanceTransform(free, cv2.DIST_L2, cv2.DIST_MASK_PRECISE) * self.resolution
+
+    def _outline(self, polygon: geometry.Polygon) -> np.ndarray:
+        """*polygon* in fixed-point raster coordinates for the cv2 fill calls."""
+        offset = np.array(self.origin) + self.resolution / 2
+        return np.round((np.asarray(polygon) - offset) * ((1 << _FILL_SHIFT) / self.resolution)).astype(np.int32)
+
+    def fill(self, polygons: list[geometry.Polygon]) -> np.ndarray:
+        """Boolean raster of the cells covered by any of *polygons* (which may be concave)."""
+        mask = np.zeros(self.distances.shape, dtype=np.uint8)
+        for polygon in polygons:
+            if len(polygon) >= 3:
+                cv2.fillPoly(mask, [self._outline(polygon)], 1, lineType=cv2.LINE_8, shift=_FILL_SHIFT)
+        return mask.astype(bool)
+
+    def cell_centers(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """``(N, 2)`` world coordinates of raster cell centers."""
+        return np.stack(
+            [self.origin[0] + (cols + 0.5) * self.resolution, self.origin[1] + (rows + 0.5) * self.resolution],
+            axis=1,
+        )
+
+    @property
+    def error(self) -> float:
+        """Bound on ``|clearance - exact distance|`` for points on the raster."""
+        return self.resolution * math.sqrt(2.0)
+
+    def clearance(self, points: np.ndarray) -> np.ndarray:
+        """Raster clearance in metres for an ``(N, 2)`` point array."""
+        result = np.full(len(points), np.nan)
+        if not len(points):
+            return result
+        if not self.polygons:
+            result[:] = np.inf
+            return result
+        rows, cols = self.distances.shape
+        col = np.floor((points[:, 0] - self.origin[0]) / self.resolution).astype(np.intp)
+        row = np.floor((points[:, 1] - self.origin[1]) / self.resolution).astype(np.intp)
+        inside = (col >= 0) & (col < cols) & (row >= 0) & (row < rows)
+        result[inside] = self.distances[row[inside], col[inside]]
+        return result
+
+    def encroaching(self, quad: geometry.Polygon) -> list[int]:
+        """Sorted item indices whose footprint touches the convex quadrilateral *quad*."""
+        if not self.polygons or len(quad) != 4:
+            return []
+        query = placement.pack_polygons([quad])
+        x_min, z_min, x_max, z_max = placement.bounding_boxes(query)[0]
+        boxes = self.boxes
+        near = np.flatnonzero((boxes[:, 0] <= x_max) & (x_min <= boxes[:, 2]) & (boxes[:, 1] <= z_max) & (z_min <= boxes[:, 3]))
+        hits = placement.pair_intersects(np.broadcast_to(query, (len(near), 4, 2)), self.packed[near])
+        return [self.obstacles[row] for row in near[hits]]
+
+    def narrowest(
+        self,
+        points: np.ndarray,
+        exact: Callable[[float, float], float],
+    ) -> tuple[float, int]:
+        """Return ``(distance, row)`` of the first point with the smallest exact clearance.
+
+        Only points whose raster lookup is within ``2 * error`` of the best
+        upper bound (and points off the raster) are passed to *exact*.
+        """
+        if not len(points) or not self.polygons:
+            return float("inf"), 0
+        approx = self.clearance(points)
+        error = self.error
+        on_raster = ~np.isnan(approx)
+        ceiling = float((approx[on_raster] + error).min()) if on_raster.any() else float("inf")
+        rows = np.flatnonzero(~on_raster | (approx - error <= ceiling))
+        best = float("inf")
+        best_row = int(rows[0]) if len(rows) else 0
+        for row in rows:
+            distance = exact(float(points[row, 0]), float(points[row, 1]))
+            if distance < best:
+                best = distance
+                best_row = int(row)
+                if best <= 0.0:
+                    break
+        return best, best_row
+
+
+_FIELDS: list[ClearanceField] = []
+
+
+def field_for(
+    index: LayoutSpatialIndex,
+    resolution: float = DEFAULT_RESOLUTION_M,
+    *,
+    obstacles: list[int] | None = None,
+    openings: list[geometry.Polygon] | None = None,
+    extent: geometry.Rect | None = None,
+) -> ClearanceField:
+    """Return the clearance field for a synced *index*, rasterizing again only after its footprints change.
+
+    *obstacles* defaults to every visible item; *openings* are polygons cut
+    back out of the obstacle raster; *extent* is an extra area the raster
+    must cover.
+    """
+    rows = _visible_rows(index.items) if obstacles is None else list(obstacles)
+    cut = list(openings or [])
+    for position, field in enumerate(_FIELDS):
+        if (
+            field.index is index
+            and field.version == index.version
+            and field.obstacles == rows
+            and field.openings == cut
+            and field.extent == extent
+            and field.requested_resolution == resolution
+        ):
+            if position:
+                _FIELDS.insert(0, _FIELDS.pop(position))
+            return field
+    field = ClearanceField(index, resolution=resolution, obstacles=rows, openings=cut, extent=extent)
+    _FIELDS.insert(0, field)
+    del _FIELDS[_MAX_CACHED_FIELDS:]
+    return field
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
 import os
 import shutil
 import sys
+from collections.abc import Iterator
 from importlib import resources
 from pathlib import Path
 from typing import NamedTuple
@@ -15,6 +17,8 @@ from .types import VectorizeConfig
 
 log = configure_logging("haus.cli")
 
+_PROFILE_TOP_N = 20
+
 class ViewEnvironment(NamedTuple):
     static_dir: Path
     layout_path: Path
@@ -139,6 +143,36 @@ def _build_manifest(out_dir: Path, project_root: Path) -> list[dict]:
     return manifest
 
 
+@contextlib.contextmanager
+def _profiled(profile_path: Path | None, trace_memory: bool) -> Iterator[None]:
+    """Optionally run the block under cProfile and/or tracemalloc, reporting to stderr."""
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    if trace_memory:
+        tracemalloc.start(10)
+    profiler = cProfile.Profile() if profile_path is not None else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None and profile_path is not None:
+            profiler.disable()
+            profile_path.parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(profile_path))
+            print(f"cProfile stats written to {profile_path}", file=sys.stderr)
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(_PROFILE_TOP_N)
+        if trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"tracemalloc peak: {peak / (1024 * 1024):.1f} MiB; top allocation sites:", file=sys.stderr)
+            for stat in snapshot.statistics("lineno")[:_PROFILE_TOP_N]:
+                print(f"  {stat}", file=sys.stderr)
+
+
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="haus",
@@ -151,6 +185,14 @@ def _build_parser() -> argparse.ArgumentParser:
     vec.add_argument("--out", required=True, type=Path, help="Output directory")
     vec.add_argument("--debug-dir", type=Path, default=None, help="Optional debug artifact directory")
     vec.add_argument("--no-clean", action="store_true", help="Skip floor plan pre-cleaning")
+    vec.add_argument(
+        "--clean-max-side",
+        type=int,
+        default=None,
+        help="Clean plans larger than this many pixels on the long side in pyramid mode (default: full resolution)",
+    )
+    vec.add_argument("--profile", type=Path, default=None, help="Write a cProfile dump here and print the top functions")
+    vec.add_argument("--tracemalloc", action="store_true", help="Trace Python allocations per stage and print top sites")
 
     build = subparsers.add_parser("build", help="Full pipeline: image -> vector + GLB mesh")
     build.add_argument("--image", required=True, type=Path, help="Path to floor plan image (PNG/JPEG)")
@@ -159,10 +201,47 @@ def _build_parser() -> argparse.ArgumentParser:
     build.add_argument("--wall-height", type=float, default=2.6, help="Wall extrusion height in meters (default: 2.6)")
     build.add_argument("--scale-override", type=float, default=None, help="Override m_per_px scale (bypass auto-detection)")
     build.add_argument("--no-clean", action="store_true", help="Skip floor plan pre-cleaning")
+    build.add_argument(
+        "--clean-max-side",
+        type=int,
+        default=None,
+        help="Clean plans larger than this many pixels on the long side in pyramid mode (default: full resolution)",
+    )
+    build.add_argument("--profile", type=Path, default=None, help="Write a cProfile dump here and print the top functions")
+    build.add_argument("--tracemalloc", action="store_true", help="Trace Python allocations per stage and print top sites")
+
+    batch = subparsers.add_parser("vectorize-batch", help="Vectorize every floor plan image in a directory in parallel")
+    batch.add_argument("--input", required=True, type=Path, help="Directory of floor plan images (searched recursively)")
+    batch.add_argument("--out", required=True, type=Path, help="Output root; one sub-directory per plan")
+    batch.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    batch.add_argument("--summary", type=Path, default=None, help="Timing JSONL path (default: <out>/batch-summary.jsonl)")
+    batch.add_argument("--wall-height", type=float, default=2.6, help="Wall extrusion height in meters (default: 2.6)")
+    batch.add_argument("--scale-override", type=float, default=None, help="Override m_per_px scale (bypass auto-detection)")
+    batch.add_argument("--no-clean", action="store_true", help="Skip floor plan pre-cleaning")
+    batch.add_argument(
+        "--clean-max-side",
+        type=int,
+        default=None,
+        help="Clean plans larger than this many pixels on the long side in pyramid mode (default: full resolution)",
+    )
+    batch.add_argument("--force", action="store_true", help="Reprocess plans whose source and config are unchanged")
+    batch.add_argument(
+        "--max-tasks-per-worker",
+        type=int,
+        default=20,
+        help="Restart each worker after this many plans to bound its memory (default: 20, 0 disables; Python 3.11+)",
+    )
+    batch.add_argument("--max-worker-memory-mb", type=int, default=None, help="Hard address-space cap per worker process")
 
     clean = subparsers.add_parser("clean", help="Pre-clean a floor plan image (remove arcs, ledges, annotations)")
     clean.add_argument("--image", required=True, type=Path, help="Path to floor plan image")
     clean.add_argument("--out", required=True, type=Path, help="Output cleaned image path")
+    clean.add_argument(
+        "--clean-max-side",
+        type=int,
+        default=None,
+        help="Clean plans larger than this many pixels on the long side in pyramid mode (default: full resolution)",
+    )
 
     mcp = subparsers.add_parser("mcp", help="Start MCP server for AI-assisted editing")
     mcp.add_argument(
@@ -176,6 +255,46 @@ def _build_parser() -> argparse.ArgumentParser:
     view.add_argument("--glb", required=False, type=Path, default=None, help="Path to GLB file (opens editor directly)")
     view.add_argument("--port", type=int, default=8080, help="HTTP server port (default: 8080)")
 
+    bench = subparsers.add_parser("bench", help="Run performance benchmarks and print a JSON report")
+    bench.add_argument("--suite", default="layout", help="Benchmark suite to run (default: layout)")
+    bench.add_argument(
+        "--sizes",
+        default=None,
+        help="Comma-separated layout item counts (default: the suite's own sizes)",
+    )
+    bench.add_argument(
+        "--repeat",
+        type=int,
+        default=None,
+        help="Runs per measurement; the best is reported (default: the suite's own, 3 for layout suites)",
+    )
+    bench.add_argument(
+        "--scales",
+        default=None,
+        help="Comma-separated upscale factors for the extraction suite (default: 1,2,4)",
+    )
+    bench.add_argument("--corpus", type=Path, default=None, help="Corpus directory for the extraction suite (default: ./corpus)")
+    bench.add_argument("--tracemalloc", action="store_true", help="Also record Python allocation peaks per stage")
+    bench.add_argument(
+        "--clean-max-side",
+        type=int,
+        default=None,
+        help="Pyramid-mode cleaning threshold for the extraction and pyramid suites (pyramid default: 1200)",
+    )
+    bench.add_argument("--out", type=Path, default=None, help="Optional path to write the JSON report")
+    bench.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        help="Earlier report to compare against; exits 1 when any measurement regressed",
+    )
+    bench.add_argument(
+        "--time-tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown per stage before --baseline flags it, as a fraction (default: 0.25)",
+    )
+
     return parser
 
 
@@ -195,12 +314,34 @@ def main(argv: list[str] | None = None) -> int:
                 wall_height=getattr(args, "wall_height", 2.6),
                 scale_override=getattr(args, "scale_override", None),
                 clean=not getattr(args, "no_clean", False),
+                clean_max_side=args.clean_max_side,
             )
-            metadata = run_vectorize(cfg)
+            with _profiled(args.profile, args.tracemalloc):
+                metadata = run_vectorize(cfg)
             print(json.dumps(metadata, indent=2))
             if args.command == "build" and "output_glb" in metadata:
                 print(metadata["output_glb"], file=sys.stderr)
             return 0
+        if args.command == "vectorize-batch":
+            from .batch import run_batch
+            if not args.input.is_dir():
+                print(f"error: input directory does not exist: {args.input}", file=sys.stderr)
+                return 2
+            summary = run_batch(
+                args.input,
+                args.out,
+                workers=args.workers,
+                summary_path=args.summary,
+                wall_height=args.wall_height,
+                scale_override=args.scale_override,
+                clean=not args.no_clean,
+                clean_max_side=args.clean_max_side,
+                force=args.force,
+                max_tasks_per_worker=args.max_tasks_per_worker or None,
+                max_memory_mb=args.max_worker_memory_mb,
+            )
+            print(json.dumps(summary, indent=2))
+            return 1 if summary["errors"] else 0
         if args.command == "clean":
             import cv2 as _cv2
             from .preprocess import clean_floor_plan
@@ -211,7 +352,7 @@ def main(argv: list[str] | None = None) -> int:
             if img_bgr is None:
                 raise ValueError(f"Could not read image: {args.image}")
             img_rgb = _cv2.cvtColor(img_bgr, _cv2.COLOR_BGR2RGB)
-            cleaned = clean_floor_plan(img_rgb)
+            cleaned = clean_floor_plan(img_rgb, max_side=args.clean_max_side)
             args.out.parent.mkdir(parents=True, exist_ok=True)
             _cv2.imwrite(str(args.out), _cv2.cvtColor(cleaned, _cv2.COLOR_RGB2BGR))
             print(f"Cleaned image saved to {args.out}", file=sys.stderr)
@@ -223,6 +364,38 @@ def main(argv: list[str] | None = None) -> int:
             from .mcp_server import run_server
             run_server()
             return 0
+        if args.command == "bench":
+            from .benchmarks import compare_benchmark, run_benchmark
+            kwargs: dict = {}
+            if args.repeat is not None:
+                kwargs["repeat"] = args.repeat
+            if args.sizes:
+                kwargs["sizes"] = [int(size) for size in args.sizes.split(",") if size.strip()]
+            if args.scales:
+                kwargs["scales"] = [int(scale) for scale in args.scales.split(",") if scale.strip()]
+            if args.corpus is not None:
+                kwargs["corpus_dir"] = args.corpus
+            if args.tracemalloc:
+                kwargs["trace_memory"] = True
+            if args.clean_max_side is not None:
+                kwargs["clean_max_side"] = args.clean_max_side
+            baseline = None
+            if args.baseline is not None:
+                if not args.baseline.exists():
+                    print(f"error: baseline does not exist: {args.baseline}", file=sys.stderr)
+                    return 2
+                baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+            report = run_benchmark(args.suite, **kwargs)
+            if baseline is not None:
+                report["regressions"] = compare_benchmark(report, baseline, time_tolerance=args.time_tolerance)
+            text = json.dumps(report, indent=2)
+            if args.out is not None:
+                args.out.parent.mkdir(parents=True, exist_ok=True)
+                args.out.write_text(text + "\n", encoding="utf-8")
+            print(text)
+            for regression in report.get("regressions", []):
+                print(f"regression: {regression}", file=sys.stderr)
+            return 1 if report.get("regressions") else 0
         if args.command == "view":
             import webbrowser
             env = _resolve_view_environment()
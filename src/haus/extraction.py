@@ -5,6 +5,7 @@ import warnings
 import cv2
 import numpy as np
 
+from .profiling import stage
 from .types import Column, FloorPlanData, Opening, WallSegment
 
 
@@ -420,16 +421,23 @@ def extract_floor_plan(img_rgb: np.ndarray) -> tuple[FloorPlanData, np.ndarray,
         fill_mask: binary fill mask (for debug/visualization)
     """
     h, w = img_rgb.shape[:2]
-    fill_mask = _build_fill_mask(img_rgb)
-    dark = _extract_dark(img_rgb, fill_mask)
-
-    walls, wall_mask = _extract_wall_segments(dark)
-    m_per_px = _estimate_scale_from_segments(walls)
-    columns = _detect_columns(img_rgb, fill_mask, wall_mask)
-    openings = _detect_openings(wall_mask, m_per_px)
+    with stage("fill_mask"):
+        fill_mask = _build_fill_mask(img_rgb)
+    with stage("dark"):
+        dark = _extract_dark(img_rgb, fill_mask)
+
+    with stage("wall_segments"):
+        walls, wall_mask = _extract_wall_segments(dark)
+    with stage("scale"):
+        m_per_px = _estimate_scale_from_segments(walls)
+    with stage("columns"):
+        columns = _detect_columns(img_rgb, fill_mask, wall_mask)
+    with stage("openings"):
+        openings = _detect_openings(wall_mask, m_per_px)
 
     if m_per_px is not None:
-        walls = [_classify_wall_hdb(w, m_per_px) for w in walls]
+        with stage("classify_walls"):
+            walls = [_classify_wall_hdb(w, m_per_px) for w in walls]
 
     data = FloorPlanData(
         walls=walls,
@@ -7,6 +7,12 @@ Rect = tuple[float, float, float, float]
 Point = tuple[float, float]
 Polygon = list[Point]
 
+# Footprints are cached on the raw fields they are computed from; the cache is
+# simply dropped when it fills, since layouts rarely hold this many footprints.
+_FOOTPRINT_CACHE_SIZE = 16384
+_POLYGONS: dict[tuple[Any, ...], tuple[Point, ...]] = {}
+_RECTS: dict[tuple[Any, ...], Rect] = {}
+
 
 def coerce_float(value: Any, default: float = 0.0) -> float:
     if isinstance(value, bool):
@@ -40,11 +46,40 @@ def item_center(item: dict[str, Any]) -> Point:
     return (coerce_float(item.get("x")), coerce_float(item.get("z")))
 
 
+def _footprint_key(item: dict[str, Any], padding: float) -> tuple[Any, ...] | None:
+    """Cache key over every field `item_polygon` reads, or None when it cannot be cached."""
+    pos = item.get("pos")
+    geo = item.get("geo")
+    pos_fields = pos if isinstance(pos, list) else [pos]
+    geo_fields = geo if isinstance(geo, list) else [geo]
+    scalars = (item.get("rot"), item.get("x"), item.get("z"), item.get("width_m"), item.get("depth_m"), padding)
+    # bools compare equal to 0/1 but coerce to the default, and lists are unhashable
+    for value in (*pos_fields, *geo_fields, *scalars):
+        if value is not None and value.__class__ not in (float, int, str):
+            return None
+    # lengths (-1 for a non-list) keep the two variable-length runs apart
+    return (
+        len(pos) if isinstance(pos, list) else -1,
+        *pos_fields,
+        len(geo) if isinstance(geo, list) else -1,
+        *geo_fields,
+        *scalars,
+    )
+
+
 def item_rect(item: dict[str, Any], padding: float = 0.0) -> Rect:
-    polygon = item_polygon(item, padding=padding)
-    xs = [point[0] for point in polygon]
-    zs = [point[1] for point in polygon]
-    return (min(xs), min(zs), max(xs), max(zs))
+    key = _footprint_key(item, padding)
+    rect = _RECTS.get(key) if key is not None else None
+    if rect is None:
+        polygon = item_polygon(item, padding=padding)
+        xs = [point[0] for point in polygon]
+        zs = [point[1] for point in polygon]
+        rect = (min(xs), min(zs), max(xs), max(zs))
+        if key is not None:
+            if len(_RECTS) >= _FOOTPRINT_CACHE_SIZE:
+                _RECTS.clear()
+            _RECTS[key] = rect
+    return rect
 
 
 def rect_intersects(a: Rect, b: Rect) -> bool:
@@ -58,6 +93,18 @@ def rect_gap(a: Rect, b: Rect) -> float:
 
 
 def item_polygon(item: dict[str, Any], padding: float = 0.0) -> Polygon:
+    key = _footprint_key(item, padding)
+    corners = _POLYGONS.get(key) if key is not None else None
+    if corners is None:
+        corners = tuple(_item_corners(item, padding))
+        if key is not None:
+            if len(_POLYGONS) >= _FOOTPRINT_CACHE_SIZE:
+                _POLYGONS.clear()
+            _POLYGONS[key] = corners
+    return list(corners)
+
+
+def _item_corners(item: dict[str, Any], padding: float) -> Polygon:
     width, _, depth = item_dimensions(item)
     cx, cz = item_center(item)
     rot = coerce_float(item.get("rot"), 0.0)
@@ -127,12 +174,34 @@ def point_in_polygon(point: Point, polygon: Polygon) -> bool:
         crosses = (z1 > pz) != (z2 > pz)
         if not crosses:
             continue
-        at_x = (x2 - x1) * (pz - z1) / max(z2 - z1, 1e-12) + x1
+        at_x = (x2 - x1) * (pz - z1) / (z2 - z1) + x1
         if px < at_x:
             inside = not inside
     return inside
 
 
+def distance_point_to_polygon(point: Point, polygon: Polygon) -> float:
+    if point_in_polygon(point, polygon):
+        return 0.0
+    return min(distance_point_to_segment(point, a, b) for a, b in polygon_edges(polygon))
+
+
+def polygon_bbox(polygon: Polygon) -> Rect:
+    xs = [point[0] for point in polygon]
+    zs = [point[1] for point in polygon]
+    return (min(xs), min(zs), max(xs), max(zs))
+
+
+def polygon_area(polygon: Polygon | tuple[Point, ...]) -> float:
+    if len(polygon) < 3:
+        return 0.0
+    total = 0.0
+    for index, (x1, z1) in enumerate(polygon):
+        x2, z2 = polygon[(index + 1) % len(polygon)]
+        total += x1 * z2 - x2 * z1
+    return abs(total) / 2
+
+
 def polygon_distance(a: Polygon, b: Polygon) -> float:
     if polygons_intersect(a, b):
         return 0.0
@@ -220,27 +289,36 @@ def door_swing_polygon(door: dict[str, Any]) -> Polygon:
     return polygon_from_bounds({"x_min": rect[0], "z_min": rect[1], "x_max": rect[2], "z_max": rect[3]})
 
 
-def door_swing_conflicts(layout: dict[str, Any]) -> list[dict[str, Any]]:
+def door_swing_conflicts(layout: dict[str, Any], involving: set[Any] | None = None) -> list[dict[str, Any]]:
+    """Items inside each hinged door's swing area; with *involving*, only pairs where the door or item has one of those ids."""
     items = [item for item in layout.get("items", []) if isinstance(item, dict) and item.get("visible", True)]
-    doors = [item for item in items if item.get("type") == "door" or item.get("swing_direction")]
+    doors = [
+        item
+        for item in items
+        if (item.get("type") == "door" or item.get("swing_direction"))
+        and str(item.get("swing_direction") or "").lower() != "sliding"
+    ]
     conflicts: list[dict[str, Any]] = []
-    for door in doors:
-        if str(door.get("swing_direction") or "").lower() == "sliding":
+    if not doors:
+        return conflicts
+    # placement imports this module, so its sweep-and-prune broad phase is imported here.
+    from .placement import box_contacts
+
+    swings = [door_swing_polygon(door) for door in doors]
+    for door_index, item_index in box_contacts([polygon_bbox(swing) for swing in swings], [item_rect(item) for item in items]).tolist():
+        door, swing, other = doors[door_index], swings[door_index], items[item_index]
+        if involving is not None and door.get("id") not in involving and other.get("id") not in involving:
             continue
-        swing = door_swing_polygon(door)
-        for other in items:
-            if other is door:
-                continue
-            if polygons_intersect(swing, item_polygon(other)):
-                conflicts.append(
-                    {
-                        "door_id": door.get("id"),
-                        "conflict_id": other.get("id"),
-                        "door": door.get("name") or door.get("id") or "door",
-                        "conflict": other.get("name") or other.get("furnitureType") or other.get("id") or "object",
-                        "swing_polygon": [{"x": round(x, 3), "z": round(z, 3)} for x, z in swing],
-                    }
-                )
+        if other is not door and polygons_intersect(swing, item_polygon(other)):
+            conflicts.append(
+                {
+                    "door_id": door.get("id"),
+                    "conflict_id": other.get("id"),
+                    "door": door.get("name") or door.get("id") or "door",
+                    "conflict": other.get("name") or other.get("furnitureType") or other.get("id") or "object",
+                    "swing_polygon": [{"x": round(x, 3), "z": round(z, 3)} for x, z in swing],
+                }
+            )
     return conflicts
 
 
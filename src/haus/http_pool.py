@@ -0,0 +1,246 @@
+"""Keep-alive HTTP connections shared across requests to the same host.
+
+Local model servers and search APIs are called several times per chat turn;
+reusing one connection per concurrent caller saves a TCP (and TLS) handshake
+on every call. ``request`` is a drop-in for the ``urlopen`` calls it replaces:
+responses of 400 and above raise ``HTTPError``, connection failures raise
+``URLError``, and hosts that go through a configured proxy still use
+``urlopen``.
+
+A connection returns to its host's idle list only once its response has been
+read to the end; a response closed early takes its connection with it.
+HTTP/1.1 pipelining is not attempted: servers handle at most one request per
+connection at a time, so concurrent callers each check out a connection.
+"""
+
+from __future__ import annotations
+
+import http.client
+import io
+import os
+import ssl
+import threading
+import time
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any
+from urllib.error import HTTPError, URLError
+from urllib.parse import urljoin, urlsplit
+from urllib.request import Request, getproxies, proxy_bypass, urlopen
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+DEFAULT_MAX_IDLE_PER_HOST = 4
+DEFAULT_IDLE_TIMEOUT_S = 30.0
+_MAX_REDIRECTS = 5
+_REDIRECT_CODES = {301, 302, 303, 307, 308}
+# Raised when a server closed an idle connection before our request reached it.
+_STALE_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError, ConnectionAbortedError)
+
+_Key = tuple[str, str, int]
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class PooledResponse:
+    """An ``http.client.HTTPResponse`` that gives its connection back to the pool when closed."""
+
+    def __init__(self, pool: ConnectionPool, key: _Key, connection: http.client.HTTPConnection, response: http.client.HTTPResponse) -> None:
+        self._pool = pool
+        self._key = key
+        self._connection: http.client.HTTPConnection | None = connection
+        self.response = response
+        self.status = response.status
+        self.headers = response.headers
+
+    def read(self, amt: int | None = None) -> bytes:
+        return self.response.read(amt)
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self.response)
+
+    def close(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        reusable = self.response.isclosed() and not self.response.will_close
+        if not reusable:
+            self.response.close()
+        self._pool._release(self._key, connection, reusable)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class ConnectionPool:
+    """Idle keep-alive connections per ``(scheme, host, port)``, with reuse counters."""
+
+    def __init__(self, max_idle_per_host: int = DEFAULT_MAX_IDLE_PER_HOST, idle_timeout_s: float = DEFAULT_IDLE_TIMEOUT_S) -> None:
+        self.max_idle_per_host = max(0, int(max_idle_per_host))
+        self.idle_timeout_s = float(idle_timeout_s)
+        self._idle: dict[_Key, list[tuple[float, http.client.HTTPConnection]]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context: ssl.SSLContext | None = None
+        self._counts = {"requests": 0, "opened": 0, "reused": 0, "stale_retries": 0, "discarded": 0, "unpooled": 0}
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float = 60.0,
+        follow_redirects: bool = True,
+    ) -> PooledResponse | Any:
+        """Send one request and return its response; use it as a context manager and read it to the end."""
+        for _ in range(_MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            scheme = parts.scheme.lower()
+            if scheme not in {"http", "https"} or not parts.hostname:
+                raise URLError(f"unsupported URL: {url}")
+            if self._proxied(scheme, parts.hostname):
+                self._count("unpooled")
+                return urlopen(Request(url, data=body, headers=headers or {}, method=method), timeout=timeout)
+            key = (scheme, parts.hostname.lower(), parts.port or (443 if scheme == "https" else 80))
+            target = parts.path or "/"
+            if parts.query:
+                target += f"?{parts.query}"
+            response = self._send(key, method, target, body, headers or {}, timeout)
+            location = response.headers.get("Location")
+            if follow_redirects and response.status in _REDIRECT_CODES and location:
+                response.read()
+                response.close()
+                url = urljoin(url, location)
+                if response.status == 303 or (response.status in {301, 302} and method == "POST"):
+                    method, body = "GET", None
+                continue
+            if response.status >= 400:
+                payload = response.read()
+                response.close()
+                raise HTTPError(url, response.status, response.response.reason, response.headers, io.BytesIO(payload))
+            return response
+        raise URLError(f"too many redirects: {url}")
+
+    def _send(self, key: _Key, method: str, target: str, body: bytes | None, headers: dict[str, str], timeout: float) -> PooledResponse:
+        self._count("requests")
+        while True:
+            connection, reused = self._acquire(key, timeout)
+            try:
+                connection.request(method, target, body=body, headers=headers)
+                response = connection.getresponse()
+            except _STALE_ERRORS as exc:
+                connection.close()
+                if reused:
+                    with self._lock:
+                        self._counts["reused"] -= 1
+                        self._counts["stale_retries"] += 1
+                    continue
+                raise URLError(exc) from exc
+            except OSError as exc:
+                connection.close()
+                if isinstance(exc, TimeoutError):
+                    raise
+                raise URLError(exc) from exc
+            except BaseException:
+                connection.close()
+                raise
+            return PooledResponse(self, key, connection, response)
+
+    def _acquire(self, key: _Key, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                released_at, connection = idle.pop()
+                if now - released_at <= self.idle_timeout_s:
+                    self._counts["reused"] += 1
+                    if connection.sock is not None:
+                        connection.sock.settimeout(timeout)
+                    connection.timeout = timeout
+                    return connection, True
+                connection.close()
+            self._counts["opened"] += 1
+        scheme, host, port = key
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            return http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context), False
+        return http.client.HTTPConnection(host, port, timeout=timeout), False
+
+    def _release(self, key: _Key, connection: http.client.HTTPConnection, reusable: bool) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if reusable and len(idle) < self.max_idle_per_host:
+                idle.append((time.monotonic(), connection))
+                return
+            self._counts["discarded"] += 1
+        connection.close()
+
+    def _proxied(self, scheme: str, host: str) -> bool:
+        return scheme in getproxies() and not proxy_bypass(host)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def clear(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for _, connection in connections:
+                connection.close()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+            idle = {f"{scheme}://{host}:{port}": len(connections) for (scheme, host, port), connections in self._idle.items() if connections}
+        pooled = counts["requests"]
+        return {
+            **counts,
+            "reuse_rate": round(counts["reused"] / pooled, 3) if pooled else 0.0,
+            "idle": idle,
+            "max_idle_per_host": self.max_idle_per_host,
+            "idle_timeout_s": self.idle_timeout_s,
+        }
+
+
+_POOL = ConnectionPool(
+    max_idle_per_host=int(_env_number("HAUS_HTTP_POOL_SIZE", DEFAULT_MAX_IDLE_PER_HOST)),
+    idle_timeout_s=_env_number("HAUS_HTTP_IDLE_S", DEFAULT_IDLE_TIMEOUT_S),
+)
+
+
+def request(
+    method: str,
+    url: str,
+    *,
+    body: bytes | None = None,
+    headers: dict[str, str] | None = None,
+    timeout: float = 60.0,
+    follow_redirects: bool = True,
+) -> PooledResponse | Any:
+    """Send a request through the shared pool; see ``ConnectionPool.request``."""
+    return _POOL.request(method, url, body=body, headers=headers, timeout=timeout, follow_redirects=follow_redirects)
+
+
+def configure_http_pool(*, max_idle_per_host: int | None = None, idle_timeout_s: float | None = None) -> None:
+    """Change the shared pool's limits; idle connections beyond a lowered limit close as they are released."""
+    if max_idle_per_host is not None:
+        _POOL.max_idle_per_host = max(0, int(max_idle_per_host))
+    if idle_timeout_s is not None:
+        _POOL.idle_timeout_s = float(idle_timeout_s)
+
+
+def http_pool_stats() -> dict[str, Any]:
+    """Requests, connections opened and reused, stale retries and idle connections per host."""
+    return _POOL.stats()
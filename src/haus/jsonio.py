@@ -0,0 +1,105 @@
+"""JSON encoding for tool results, layout files and project files.
+
+Output is minified unless a human asks for indentation, either per call with
+``pretty=True`` or for the whole process with ``HAUS_PRETTY_JSON=1``. When
+orjson is installed it encodes and decodes; values it cannot encode (integers
+beyond 64 bits, ``default`` hooks it rejects) fall back to the standard
+library, so output is always valid for ``json.loads``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Callable
+from typing import IO, Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None  # type: ignore[assignment]
+
+PRETTY_ENV = "HAUS_PRETTY_JSON"
+# Containers nested deeper than this are encoded in one call by write_stream.
+_STREAM_DEPTH = 2
+
+
+def backend() -> str:
+    """Name of the encoder in use: ``"orjson"`` or ``"json"``."""
+    return "orjson" if orjson is not None else "json"
+
+
+def pretty_requested() -> bool:
+    return os.environ.get(PRETTY_ENV, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def dumps(
+    value: Any,
+    *,
+    pretty: bool | None = None,
+    sort_keys: bool = False,
+    default: Callable[[Any], Any] | None = None,
+) -> str:
+    """Encode *value*, compact unless *pretty* (or ``HAUS_PRETTY_JSON``) asks for two-space indentation.
+
+    Pretty output also sorts keys, so files a human diffs stay stable.
+    """
+    if pretty is None:
+        pretty = pretty_requested()
+    sort_keys = sort_keys or pretty
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(value, default=default, option=option).decode("utf-8")
+        except (TypeError, orjson.JSONEncodeError):
+            pass
+    if pretty:
+        return json.dumps(value, indent=2, sort_keys=sort_keys, default=default)
+    return json.dumps(value, separators=(",", ":"), sort_keys=sort_keys, default=default)
+
+
+def loads(text: str | bytes) -> Any:
+    """Decode JSON text; raises ``json.JSONDecodeError`` on invalid input with either backend."""
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN and Infinity, which json.dumps writes; let json decide.
+            pass
+    return json.loads(text)
+
+
+def write_stream(value: Any, handle: IO[str], *, default: Callable[[Any], Any] | None = None) -> None:
+    """Write *value* to the text *handle* as compact JSON without building the whole document in memory.
+
+    The top two levels of dicts and lists are written piece by piece, and
+    each value below them is encoded in one ``dumps`` call, so peak memory
+    follows the largest single snapshot or item list rather than the file.
+    """
+    _write(value, handle, default, _STREAM_DEPTH)
+
+
+def _write(value: Any, handle: IO[str], default: Callable[[Any], Any] | None, depth: int) -> None:
+    if depth <= 0 or not isinstance(value, (dict, list)) or not value:
+        handle.write(dumps(value, pretty=False, default=default))
+        return
+    if isinstance(value, dict):
+        handle.write("{")
+        for position, (key, entry) in enumerate(value.items()):
+            if position:
+                handle.write(",")
+            handle.write(dumps(key if isinstance(key, str) else str(key), pretty=False))
+            handle.write(":")
+            _write(entry, handle, default, depth - 1)
+        handle.write("}")
+        return
+    handle.write("[")
+    for position, entry in enumerate(value):
+        if position:
+            handle.write(",")
+        _write(entry, handle, default, depth - 1)
+    handle.write("]")
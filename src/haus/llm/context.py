@@ -0,0 +1,186 @@
+"""Keep what each step of a provider tool loop resends small.
+
+Every step resends the system prompt, the tool list and the conversation so
+far, so a 150 KB ``get_semantic_layout_json`` result read once is paid for on
+every later step and, through the returned history, every later message.
+``prepare_step`` runs before each provider request: it returns the entries to
+send, with tool results older than the latest step compacted, and counts what
+the step sends. The caller's history is never rewritten; compacted entries
+are copies, so the client keeps every result it was sent. A compacted layout
+document becomes a reference by content hash with its room and object counts;
+other long results keep their head and say how much was cut. The latest
+results always go to the model whole.
+
+``HAUS_CONTEXT_RESULT_CHARS`` is the size above which an older result is
+compacted (default 2000, ``0`` keeps every result verbatim).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from functools import lru_cache
+from typing import Any
+
+from .. import jsonio
+
+RESULT_CHARS_ENV = "HAUS_CONTEXT_RESULT_CHARS"
+DEFAULT_RESULT_CHARS = 2000
+# A rough average for English prose and JSON across the supported model families.
+CHARS_PER_TOKEN = 4
+_LAYOUT_COUNT_KEYS = ("rooms", "objects", "items", "walls", "openings")
+
+_LOCK = threading.Lock()
+_STATS = {
+    "steps": 0,
+    "estimated_tokens": 0,
+    "max_step_tokens": 0,
+    "system_tokens": 0,
+    "tools_tokens": 0,
+    "messages_tokens": 0,
+    "results_compacted": 0,
+    "layouts_referenced": 0,
+    "chars_saved": 0,
+}
+
+
+def result_chars() -> int:
+    try:
+        return max(0, int(os.environ.get(RESULT_CHARS_ENV, DEFAULT_RESULT_CHARS)))
+    except ValueError:
+        return DEFAULT_RESULT_CHARS
+
+
+def estimate_tokens(value: Any) -> int:
+    """Approximate token count of *value* as sent to a provider, at ``CHARS_PER_TOKEN`` characters per token."""
+    text = value if isinstance(value, str) else jsonio.dumps(value, pretty=False, default=str)
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _layout_document(value: Any) -> dict[str, Any] | None:
+    if not isinstance(value, dict):
+        return None
+    if str(value.get("schema", "")).startswith("haus.semantic_layout"):
+        return value
+    layout = value.get("layout")
+    if isinstance(layout, dict) and any(isinstance(layout.get(key), list) for key in _LAYOUT_COUNT_KEYS):
+        return layout
+    return None
+
+
+def compact_result(text: str, limit: int | None = None) -> str:
+    """Shorten one older tool result to at most about *limit* characters.
+
+    Layout JSON is replaced by ``{"layout_ref": <hash>, ...counts}``; the hash
+    is of the result text, so two reads of an unchanged layout share it.
+    Anything else keeps its first characters and a note of what was cut.
+    """
+    limit = result_chars() if limit is None else limit
+    if not limit or len(text) <= limit:
+        return text
+    if text[:1] == "{":
+        try:
+            layout = _layout_document(jsonio.loads(text))
+        except ValueError:
+            layout = None
+        if layout is not None:
+            reference: dict[str, Any] = {"layout_ref": hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()}
+            if layout.get("schema"):
+                reference["schema"] = layout["schema"]
+            reference.update({key: len(layout[key]) for key in _LAYOUT_COUNT_KEYS if isinstance(layout.get(key), list)})
+            reference["omitted_chars"] = len(text)
+            reference["note"] = "Layout JSON from an earlier step; call the tool again for current data."
+            return jsonio.dumps(reference, pretty=False)
+    note = f"\n...[{len(text)} chars; the rest of this earlier tool result was omitted]"
+    return text[: max(0, limit - len(note))] + note
+
+
+@lru_cache(maxsize=256)
+def _compact_cached(text: str, limit: int) -> str:
+    # Each step compacts the same older results again; keep the layout parse off the repeat steps.
+    return compact_result(text, limit)
+
+
+def _compact_entry(entry: Any, limit: int, counts: dict[str, int]) -> Any:
+    """*entry* with its tool result text compacted, as a copy; *entry* itself when nothing changed."""
+
+    def compact(text: str) -> str:
+        compacted = _compact_cached(text, limit)
+        if compacted != text:
+            counts["results_compacted"] += 1
+            counts["layouts_referenced"] += compacted.startswith('{"layout_ref"')
+            counts["chars_saved"] += len(text) - len(compacted)
+        return compacted
+
+    if not isinstance(entry, dict):
+        return entry
+    if entry.get("role") == "tool" and isinstance(entry.get("content"), str):
+        return {**entry, "content": text} if (text := compact(entry["content"])) != entry["content"] else entry
+    if entry.get("type") == "function_call_output" and isinstance(entry.get("output"), str):
+        return {**entry, "output": text} if (text := compact(entry["output"])) != entry["output"] else entry
+    content = entry.get("content")
+    if entry.get("role") != "user" or not isinstance(content, list):
+        return entry
+    blocks = [
+        {**block, "content": compact(block["content"])}
+        if isinstance(block, dict) and block.get("type") == "tool_result" and isinstance(block.get("content"), str)
+        else block
+        for block in content
+    ]
+    return {**entry, "content": blocks} if blocks != content else entry
+
+
+def _is_result(entry: Any) -> bool:
+    if not isinstance(entry, dict):
+        return False
+    if entry.get("role") == "tool" or entry.get("type") == "function_call_output":
+        return True
+    content = entry.get("content")
+    return entry.get("role") == "user" and isinstance(content, list) and any(isinstance(block, dict) and block.get("type") == "tool_result" for block in content)
+
+
+def compact_messages(entries: list[Any], limit: int | None = None) -> tuple[list[Any], dict[str, int]]:
+    """Return *entries* with every tool result compacted except those after the last non-result message.
+
+    *entries* may be the chat server's history (``tool_result`` blocks),
+    OpenAI-style chat messages (``role: "tool"``) or Responses API input
+    (``function_call_output``). It is left as it is: changed messages are
+    copies in the returned list. Also returns how many results changed and
+    the characters saved.
+    """
+    limit = result_chars() if limit is None else limit
+    counts = {"results_compacted": 0, "layouts_referenced": 0, "chars_saved": 0}
+    if not limit:
+        return entries, counts
+    tail = len(entries)
+    while tail and _is_result(entries[tail - 1]):
+        tail -= 1
+    compacted = [_compact_entry(entry, limit, counts) for entry in entries[:tail]]
+    return [*compacted, *entries[tail:]], counts
+
+
+def prepare_step(system: str, tools: Any, entries: list[Any]) -> tuple[list[Any], dict[str, int]]:
+    """Return *entries* as this step should send them, and record and return the step's estimated token counts."""
+    sent, counts = compact_messages(entries)
+    step = {
+        "system_tokens": estimate_tokens(system),
+        "tools_tokens": estimate_tokens(tools),
+        "messages_tokens": estimate_tokens(sent),
+    }
+    step["estimated_tokens"] = sum(step.values())
+    with _LOCK:
+        _STATS["steps"] += 1
+        _STATS["max_step_tokens"] = max(_STATS["max_step_tokens"], step["estimated_tokens"])
+        for key, value in (*step.items(), *counts.items()):
+            _STATS[key] += value
+    return sent, {**step, **counts}
+
+
+def context_stats() -> dict[str, Any]:
+    """Provider steps, their estimated tokens by part, and what compaction saved."""
+    with _LOCK:
+        stats: dict[str, Any] = dict(_STATS)
+    stats["mean_step_tokens"] = round(stats["estimated_tokens"] / stats["steps"]) if stats["steps"] else 0
+    stats["result_chars"] = result_chars()
+    return stats
@@ -3,8 +3,9 @@ from __future__ import annotations
 from collections.abc import Callable, Iterator
 from typing import Any, cast
 
+from ..context import prepare_step
 from ..types import ChatChunk
-from .common import load_provider_module
+from .common import dispatch_calls, load_provider_module
 
 
 def chat(
@@ -22,12 +23,13 @@ def chat(
     tools = [{"name": t["name"], "description": t["description"], "input_schema": t["parameters"]} for t in tools_spec]
 
     for _ in range(max_tool_steps):
+        sent, _ = prepare_step(system, tools, messages)
         response = client.messages.create(
             model=model,
             max_tokens=1024,
             system=system,
             tools=cast(Any, tools),
-            messages=messages,
+            messages=sent,
         )
 
         content: list[dict[str, Any]] = []
@@ -43,9 +45,9 @@ def chat(
             text = "".join(b.text for b in response.content if b.type == "text")
             return text, messages
 
+        outputs = dispatch_calls(dispatch, [(tool_use.name, dict(tool_use.input)) for tool_use in tool_uses])
         results: list[dict[str, Any]] = []
-        for tool_use in tool_uses:
-            result = dispatch(tool_use.name, dict(tool_use.input))
+        for tool_use, result in zip(tool_uses, outputs):
             results.append({"type": "tool_result", "tool_use_id": tool_use.id, "content": result})
         messages.append({"role": "user", "content": results})
 
@@ -67,13 +69,14 @@ def stream_chat(
     tools = [{"name": t["name"], "description": t["description"], "input_schema": t["parameters"]} for t in tools_spec]
 
     for _ in range(max_tool_steps):
+        sent, _ = prepare_step(system, tools, messages)
         try:
             with client.messages.stream(
                 model=model,
                 max_tokens=1024,
                 system=system,
                 tools=cast(Any, tools),
-                messages=messages,
+                messages=sent,
             ) as stream:
                 for event in stream:
                     if getattr(event, "type", "") == "content_block_delta":
@@ -110,9 +113,9 @@ def stream_chat(
             yield ChatChunk("done", {"response": text, "history": messages})
             return
 
+        outputs = dispatch_calls(dispatch, [(tool_use.name, dict(tool_use.input)) for tool_use in tool_uses])
         results: list[dict[str, Any]] = []
-        for tool_use in tool_uses:
-            result = dispatch(tool_use.name, dict(tool_use.input))
+        for tool_use, result in zip(tool_uses, outputs):
             yield ChatChunk("tool_result", {"tool": tool_use.name, "result": result})
             results.append({"type": "tool_result", "tool_use_id": tool_use.id, "content": result})
         messages.append({"role": "user", "content": results})
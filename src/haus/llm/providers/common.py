@@ -3,8 +3,11 @@ from __future__ import annotations
 import base64
 import importlib
 import json
+from collections.abc import Callable, Iterable
 from typing import Any
 
+ToolCall = tuple[str, dict[str, Any]]
+
 
 def load_provider_module(module_name: str, provider_name: str) -> Any:
     try:
@@ -16,6 +19,19 @@ def load_provider_module(module_name: str, provider_name: str) -> Any:
         ) from exc
 
 
+def dispatch_calls(dispatch: Callable[[str, dict[str, Any]], str], calls: list[ToolCall]) -> list[str]:
+    """Run one model turn's tool calls and return their results in call order.
+
+    A dispatcher with a ``many`` method (the chat server's) may run
+    independent read-only calls concurrently; a plain callable runs them one
+    by one.
+    """
+    many: Callable[[list[ToolCall]], Iterable[str]] | None = getattr(dispatch, "many", None)
+    if callable(many) and len(calls) > 1:
+        return list(many(calls))
+    return [dispatch(name, args) for name, args in calls]
+
+
 def strict_parameters(schema: dict[str, Any]) -> dict[str, Any]:
     strict = json.loads(json.dumps(schema))
 
@@ -5,8 +5,9 @@ import importlib
 from collections.abc import Callable, Iterator
 from typing import Any
 
+from ..context import prepare_step
 from ..types import ChatChunk
-from .common import decode_image_source, load_provider_module
+from .common import decode_image_source, dispatch_calls, load_provider_module
 
 
 def _gemini_type(ptype: Any) -> str:
@@ -98,9 +99,8 @@ def _chat_legacy(
             messages.append({"role": "assistant", "content": [{"type": "text", "text": text}]})
             return text, messages
         func_responses = []
-        for call in func_calls:
-            args = dict(call.function_call.args)
-            result = dispatch(call.function_call.name, args)
+        outputs = dispatch_calls(dispatch, [(call.function_call.name, dict(call.function_call.args)) for call in func_calls])
+        for call, result in zip(func_calls, outputs):
             func_responses.append(
                 genai.protos.Part(
                     function_response=genai.protos.FunctionResponse(name=call.function_call.name, response={"result": result})
@@ -162,7 +162,8 @@ def _chat_google_genai(
     contents = _genai_contents(messages)
 
     for _ in range(max_tool_steps):
-        response = client.models.generate_content(model=model, contents=contents, config=config)
+        sent, _ = prepare_step(system, tools_spec, contents)
+        response = client.models.generate_content(model=model, contents=sent, config=config)
         parts = getattr(getattr(response.candidates[0], "content", None), "parts", []) if getattr(response, "candidates", None) else []
         calls = [part.function_call for part in parts if getattr(part, "function_call", None)]
         if not calls:
@@ -170,10 +171,8 @@ def _chat_google_genai(
             messages.append({"role": "assistant", "content": [{"type": "text", "text": text}]})
             return text, messages
         follow_parts: list[Any] = []
-        for call in calls:
-            args = dict(getattr(call, "args", {}) or {})
-            name = str(getattr(call, "name", ""))
-            result = dispatch(name, args)
+        requested = [(str(getattr(call, "name", "")), dict(getattr(call, "args", {}) or {})) for call in calls]
+        for (name, _), result in zip(requested, dispatch_calls(dispatch, requested)):
             follow_parts.append(types.Part.from_function_response(name=name, response={"result": result}))
         contents.append({"role": "model", "parts": parts})
         contents.append({"role": "user", "parts": follow_parts})
@@ -1,16 +1,27 @@
 from __future__ import annotations
 
+import atexit
+import codecs
+import io
 import os
 import json
 import shlex
 import subprocess
+import threading
+import time
 from collections.abc import Callable, Iterator
 from pathlib import Path
 from typing import Any
 
+from ..context import prepare_step
 from ..types import ChatChunk
+from .common import dispatch_calls
 
 _DEFAULT_TIMEOUT_SECONDS = 180
+_DEFAULT_WARM_PROCESSES = 1
+_DEFAULT_WARM_IDLE_SECONDS = 300.0
+# Reaper wake-ups land this much after a spare's idle time runs out, so it is past the cutoff.
+_REAP_SLACK_S = 0.05
 _MAX_PROMPT_CHARS = 90000
 _MAX_TOOL_SCHEMA_CHARS = 70000
 _SENTINEL_MODELS = {"", "default", "local", "runtime-default"}
@@ -25,6 +36,22 @@ def _timeout_seconds() -> int:
         return _DEFAULT_TIMEOUT_SECONDS
 
 
+def _warm_processes() -> int:
+    raw = os.environ.get("HAUS_LOCAL_RUNTIME_WARM", str(_DEFAULT_WARM_PROCESSES))
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return _DEFAULT_WARM_PROCESSES
+
+
+def _warm_idle_seconds() -> float:
+    raw = os.environ.get("HAUS_LOCAL_RUNTIME_WARM_IDLE_S", str(_DEFAULT_WARM_IDLE_SECONDS))
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return _DEFAULT_WARM_IDLE_SECONDS
+
+
 def _workspace() -> str:
     return os.environ.get("HAUS_LOCAL_RUNTIME_CWD", str(Path.cwd()))
 
@@ -276,29 +303,319 @@ def _parse_tool_call_response(raw: str) -> tuple[str, list[dict[str, Any]]]:
     return response, calls
 
 
+class _RuntimePool:
+    """Spare runtime processes, started ahead of the step that will use them.
+
+    Commands that read their prompt on stdin are the same for every step of a
+    chat, so when one step takes a process the pool starts the next one. The
+    CLI then loads and authenticates while the current step generates and
+    its tool calls run. Each process still answers exactly one prompt and
+    exits, as the CLIs' one-shot modes do. A timer stops spares that sit
+    idle longer than ``HAUS_LOCAL_RUNTIME_WARM_IDLE_S``, so the spare started
+    after a chat's last step does not outlive it by more than that.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._spares: dict[tuple[str, ...], list[tuple[float, subprocess.Popen[str]]]] = {}
+        self._steps: dict[str, dict[str, float]] = {}
+        self._reaper: threading.Timer | None = None
+
+    def take(self, cmd: list[str], *, stdin_prompt: bool, prewarm: bool) -> tuple[subprocess.Popen[str], bool]:
+        """Return a process for *cmd* and whether it was already running; start spares when *prewarm*."""
+        key = tuple(cmd)
+        spare: subprocess.Popen[str] | None = None
+        self._reap()
+        with self._lock:
+            spares = self._spares.get(key)
+            if spares:
+                spare = spares.pop()[1]
+        process = spare if spare is not None else self._spawn(cmd, stdin_prompt=stdin_prompt)
+        if prewarm:
+            self._fill(key)
+        return process, spare is not None
+
+    def record(self, runtime: str, seconds: float, *, warm: bool, ok: bool) -> None:
+        with self._lock:
+            row = self._row(runtime)
+            row["steps"] += 1
+            row["warm" if warm else "cold"] += 1
+            row["failed"] += 0 if ok else 1
+            row["total_s"] += seconds
+            row["max_s"] = max(row["max_s"], seconds)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            steps = {name: dict(row) for name, row in self._steps.items()}
+            spares = sum(len(procs) for procs in self._spares.values())
+        for row in steps.values():
+            row["mean_s"] = round(row["total_s"] / row["steps"], 4) if row["steps"] else 0.0
+            row["total_s"] = round(row["total_s"], 4)
+            row["max_s"] = round(row["max_s"], 4)
+        return {"warm_processes": _warm_processes(), "warm_idle_s": _warm_idle_seconds(), "spares": spares, "runtimes": steps}
+
+    def close(self) -> None:
+        """Stop every spare process."""
+        with self._lock:
+            spares, self._spares = self._spares, {}
+            reaper, self._reaper = self._reaper, None
+        if reaper is not None:
+            reaper.cancel()
+        for procs in spares.values():
+            for _, proc in procs:
+                _stop(proc)
+
+    def _spawn(self, cmd: list[str], *, stdin_prompt: bool) -> subprocess.Popen[str]:
+        return subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE if stdin_prompt else None,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+
+    def _fill(self, key: tuple[str, ...]) -> None:
+        wanted = _warm_processes()
+        while True:
+            with self._lock:
+                if len(self._spares.get(key, [])) >= wanted:
+                    return
+            try:
+                proc = self._spawn(list(key), stdin_prompt=True)
+            except OSError:
+                return
+            with self._lock:
+                self._spares.setdefault(key, []).append((time.monotonic(), proc))
+                self._schedule_reap()
+
+    def _reap(self) -> None:
+        cutoff = time.monotonic() - _warm_idle_seconds()
+        discarded: list[subprocess.Popen[str]] = []
+        with self._lock:
+            for key, procs in self._spares.items():
+                healthy: list[tuple[float, subprocess.Popen[str]]] = []
+                for started, proc in procs:
+                    if started >= cutoff and proc.poll() is None:
+                        healthy.append((started, proc))
+                    else:
+                        discarded.append(proc)
+                        self._row(key[0])["recycled"] += 1
+                procs[:] = healthy
+        for proc in discarded:
+            _stop(proc)
+
+    def _schedule_reap(self) -> None:
+        # Callers hold self._lock. Wakes when the oldest spare runs out of idle time.
+        if self._reaper is not None:
+            return
+        started = [started for procs in self._spares.values() for started, _ in procs]
+        if not started:
+            return
+        delay = max(0.0, min(started) + _warm_idle_seconds() - time.monotonic()) + _REAP_SLACK_S
+        self._reaper = threading.Timer(delay, self._reap_idle)
+        self._reaper.daemon = True
+        self._reaper.start()
+
+    def _reap_idle(self) -> None:
+        with self._lock:
+            self._reaper = None
+        self._reap()
+        with self._lock:
+            self._schedule_reap()
+
+    def _row(self, runtime: str) -> dict[str, float]:
+        return self._steps.setdefault(Path(runtime).name, {"steps": 0, "warm": 0, "cold": 0, "failed": 0, "recycled": 0, "total_s": 0.0, "max_s": 0.0})
+
+
+def _stop(proc: subprocess.Popen[str]) -> None:
+    if proc.poll() is None:
+        proc.kill()
+    proc.communicate()
+
+
+_RUNTIME_POOL = _RuntimePool()
+atexit.register(_RUNTIME_POOL.close)
+
+
+def runtime_pool_stats() -> dict[str, Any]:
+    """Per-runtime step counts and latency, warm vs cold starts, and spare processes waiting."""
+    return _RUNTIME_POOL.stats()
+
+
 def _run(cmd: list[str], prompt: str, *, prompt_as_arg: bool = False) -> str:
     run_cmd = [*cmd, prompt] if prompt_as_arg else cmd
+    # Only a command that leaves the prompt out of its arguments repeats from step to step.
+    prewarm = not prompt_as_arg and prompt not in cmd and _warm_processes() > 0
+    started = time.perf_counter()
     try:
-        proc = subprocess.run(
-            run_cmd,
-            input=None if prompt_as_arg else prompt,
-            text=True,
-            capture_output=True,
-            timeout=_timeout_seconds(),
-            check=False,
-        )
+        proc, warm = _RUNTIME_POOL.take(run_cmd, stdin_prompt=not prompt_as_arg, prewarm=prewarm)
     except FileNotFoundError as exc:
         raise RuntimeError(f"Local runtime command not found: {cmd[0]}") from exc
+    try:
+        stdout, stderr = proc.communicate(None if prompt_as_arg else prompt, timeout=_timeout_seconds())
     except subprocess.TimeoutExpired as exc:
+        _stop(proc)
+        _RUNTIME_POOL.record(cmd[0], time.perf_counter() - started, warm=warm, ok=False)
         raise RuntimeError(f"Local runtime timed out after {_timeout_seconds()}s.") from exc
-    stdout = proc.stdout.strip()
-    stderr = proc.stderr.strip()
+    _RUNTIME_POOL.record(cmd[0], time.perf_counter() - started, warm=warm, ok=proc.returncode == 0)
+    stdout = stdout.strip()
+    stderr = stderr.strip()
     if proc.returncode != 0:
         detail = stderr or stdout or f"exit {proc.returncode}"
         raise RuntimeError(f"Local runtime failed: {detail}")
     return stdout or stderr
 
 
+def _stream_run(cmd: list[str], prompt: str, *, prompt_as_arg: bool = False) -> Iterator[str]:
+    """Like ``_run``, but yield the runtime's stdout as it arrives instead of after it exits."""
+    run_cmd = [*cmd, prompt] if prompt_as_arg else cmd
+    prewarm = not prompt_as_arg and prompt not in cmd and _warm_processes() > 0
+    started = time.perf_counter()
+    try:
+        proc, warm = _RUNTIME_POOL.take(run_cmd, stdin_prompt=not prompt_as_arg, prewarm=prewarm)
+    except FileNotFoundError as exc:
+        raise RuntimeError(f"Local runtime command not found: {cmd[0]}") from exc
+    timed_out = threading.Event()
+
+    def _expire() -> None:
+        timed_out.set()
+        proc.kill()
+
+    stderr_parts: list[str] = []
+    helpers = [threading.Thread(target=lambda: stderr_parts.append(proc.stderr.read() if proc.stderr else ""), daemon=True)]
+    if not prompt_as_arg and proc.stdin is not None:
+        helpers.append(threading.Thread(target=_feed_prompt, args=(proc.stdin, prompt), daemon=True))
+    timer = threading.Timer(_timeout_seconds(), _expire)
+    timer.start()
+    for helper in helpers:
+        helper.start()
+    ok = False
+    try:
+        stdout = proc.stdout
+        assert isinstance(stdout, io.TextIOWrapper)
+        decoder = codecs.getincrementaldecoder(stdout.encoding or "utf-8")(errors="replace")
+        produced = False
+        while chunk := stdout.buffer.read1(8192):
+            if piece := decoder.decode(chunk):
+                produced = produced or bool(piece.strip())
+                yield piece
+        if piece := decoder.decode(b"", final=True):
+            produced = produced or bool(piece.strip())
+            yield piece
+        proc.wait()
+        for helper in helpers:
+            helper.join()
+        if timed_out.is_set():
+            raise RuntimeError(f"Local runtime timed out after {_timeout_seconds()}s.")
+        stderr = "".join(stderr_parts).strip()
+        if proc.returncode != 0:
+            raise RuntimeError(f"Local runtime failed: {stderr or f'exit {proc.returncode}'}")
+        ok = True
+        if not produced and stderr:
+            yield stderr
+    finally:
+        timer.cancel()
+        if proc.poll() is None:
+            _stop(proc)
+        _RUNTIME_POOL.record(cmd[0], time.perf_counter() - started, warm=warm, ok=ok)
+
+
+def _feed_prompt(stdin: Any, prompt: str) -> None:
+    try:
+        stdin.write(prompt)
+        stdin.close()
+    except (BrokenPipeError, ValueError):
+        pass
+
+
+class _ResponseStream:
+    """Pull the ``"response"`` string out of a tool-protocol JSON reply while it is still arriving.
+
+    ``feed`` takes raw runtime output and returns the newly decoded part of
+    the top-level ``response`` value, so the answer streams as the model
+    writes it. Prose before the first ``{`` and every other key are skipped.
+    """
+
+    def __init__(self) -> None:
+        self.text = ""
+        self._state = "seek"
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._token: list[str] = []
+        self._last_key = ""
+        self._raw: list[str] = []
+
+    def feed(self, piece: str) -> str:
+        if self._state == "done":
+            return ""
+        for char in piece:
+            if self._state == "seek":
+                if char == "{":
+                    self._state, self._depth = "object", 1
+            elif self._state == "object":
+                self._scan(char)
+            elif self._state == "value":
+                if char == '"':
+                    self._state = "response"
+                elif not char.isspace():
+                    self._state = "object"
+                    self._scan(char)
+            elif self._state == "response":
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._state = "done"
+                    break
+                self._raw.append(char)
+        return self._emit()
+
+    def _scan(self, char: str) -> None:
+        if self._in_string:
+            if self._escaped:
+                self._escaped = False
+            elif char == "\\":
+                self._escaped = True
+            elif char == '"':
+                self._in_string = False
+                self._last_key = "".join(self._token)
+                return
+            self._token.append(char)
+        elif char == '"':
+            self._in_string, self._token = True, []
+        elif char in "{[":
+            self._depth += 1
+        elif char in "}]":
+            self._depth -= 1
+            if self._depth == 0:
+                self._state = "done"
+        elif char == ":" and self._depth == 1 and self._last_key == "response":
+            self._state = "value"
+        elif not char.isspace():
+            self._last_key = ""
+
+    def _emit(self) -> str:
+        raw = "".join(self._raw)
+        if self._state == "response":
+            # Hold back an escape sequence that has not fully arrived.
+            if (len(raw) - len(raw.rstrip("\\"))) % 2 == 1:
+                raw = raw[:-1]
+            elif (cut := raw.rfind("\\u")) != -1 and len(raw) - cut < 6:
+                raw = raw[:cut]
+        try:
+            decoded = json.loads(f'"{raw}"')
+        except json.JSONDecodeError:
+            return ""
+        if decoded and "\ud800" <= decoded[-1] <= "\udbff":
+            decoded = decoded[:-1]
+        if not decoded.startswith(self.text):
+            return ""
+        delta, self.text = decoded[len(self.text) :], decoded
+        return delta
+
+
 def _run_gemini(cmd: list[str], prompt: str) -> str:
     return _extract_json_text(_run(_with_prompt_arg(cmd, prompt, {"-p", "--prompt"}), prompt, prompt_as_arg=False))
 
@@ -329,9 +646,62 @@ def _chat_with_tool_protocol(
     tools_spec: list[dict[str, Any]],
     max_tool_steps: int,
 ) -> tuple[str, list[dict[str, Any]]]:
+    chunks = _stream_with_tool_protocol(
+        lambda prompt: iter([run_once(prompt)]),
+        messages,
+        dispatch=dispatch,
+        system=system,
+        tools_spec=tools_spec,
+        max_tool_steps=max_tool_steps,
+        live=False,
+    )
+    for chunk in chunks:
+        if chunk.type == "done":
+            return str(chunk.data["response"]), chunk.data["history"]
+    raise RuntimeError("Too many tool iterations")
+
+
+def _settle_streamed(streamed: str, text: str) -> ChatChunk | None:
+    """Return the chunk that turns the already streamed *streamed* into the step's final *text*.
+
+    A reply that continues the streamed prefix only needs its tail; anything
+    else carries ``retract`` so the client drops what it showed before
+    appending the replacement.
+    """
+    shown = streamed.lstrip()
+    if text.startswith(shown):
+        return ChatChunk("text", {"delta": text[len(shown) :]}) if text != shown else None
+    return ChatChunk("text", {"delta": text, "retract": streamed})
+
+
+def _stream_with_tool_protocol(
+    stream_once: Callable[[str], Iterator[str]],
+    messages: list[dict[str, Any]],
+    *,
+    dispatch: Callable[[str, dict[str, Any]], str],
+    system: str,
+    tools_spec: list[dict[str, Any]],
+    max_tool_steps: int,
+    live: bool,
+) -> Iterator[ChatChunk]:
+    """Run the JSON tool protocol, yielding text, tool-call and tool-result chunks as each step completes.
+
+    With *live*, the ``response`` text of each step streams while the
+    runtime is still writing it; otherwise it is yielded once the step ends.
+    Streamed text that does not survive the step (an invalid reply that is
+    retried, or one replaced by the protocol error) is withdrawn through a
+    ``retract`` field on the next text chunk.
+    """
     invalid_json_seen = False
     for step in range(max_tool_steps):
-        raw = run_once(_tool_prompt(system, messages, tools_spec))
+        sent, _ = prepare_step(system, tools_spec, messages)
+        stream = _ResponseStream()
+        pieces: list[str] = []
+        for piece in stream_once(_tool_prompt(system, sent, tools_spec)):
+            pieces.append(piece)
+            if live and (delta := stream.feed(piece)):
+                yield ChatChunk("text", {"delta": delta})
+        raw = "".join(pieces).strip()
         parsed = _extract_json_object(raw)
         text, calls = _parse_tool_call_response(raw)
         if not calls:
@@ -349,22 +719,30 @@ def _chat_with_tool_protocol(
                             ],
                         }
                     )
+                    if stream.text:
+                        yield ChatChunk("text", {"delta": "", "retract": stream.text})
                     continue
                 final_text = _INVALID_PROTOCOL_RESPONSE
             else:
                 final_text = text.strip() or _INVALID_PROTOCOL_RESPONSE
+            if settle := _settle_streamed(stream.text, final_text):
+                yield settle
             messages.append({"role": "assistant", "content": [{"type": "text", "text": final_text}]})
-            return final_text, messages
+            yield ChatChunk("done", {"response": final_text, "history": messages})
+            return
 
+        if settle := _settle_streamed(stream.text, text):
+            yield settle
         assistant_content: list[dict[str, Any]] = []
         if text:
             assistant_content.append({"type": "text", "text": text})
         tool_results: list[dict[str, Any]] = []
-        for index, call in enumerate(calls):
-            name = str(call["name"])
-            args = dict(call.get("arguments", {}))
+        requested = [(str(call["name"]), dict(call.get("arguments", {}))) for call in calls]
+        for name, args in requested:
+            yield ChatChunk("tool_call", {"tool": name, "args": args})
+        for index, ((name, args), result) in enumerate(zip(requested, dispatch_calls(dispatch, requested))):
             call_id = f"local-runtime-call-{step}-{index}"
-            result = dispatch(name, args)
+            yield ChatChunk("tool_result", {"tool": name, "args": args, "result": result})
             assistant_content.append({"type": "tool_use", "id": call_id, "name": name, "input": args})
             tool_results.append({"type": "tool_result", "tool_use_id": call_id, "content": result})
         messages.append({"role": "assistant", "content": assistant_content})
@@ -414,7 +792,7 @@ def chat_claude_code(
 ) -> tuple[str, list[dict[str, Any]]]:
     del api_key
     cmd = _claude_cmd(model)
-    return _chat_with_tool_protocol(lambda prompt: _run(cmd, prompt, prompt_as_arg=True), messages, dispatch=dispatch, system=system, tools_spec=tools_spec, max_tool_steps=max_tool_steps)
+    return _chat_with_tool_protocol(lambda prompt: _run(cmd, prompt), messages, dispatch=dispatch, system=system, tools_spec=tools_spec, max_tool_steps=max_tool_steps)
 
 
 def chat_opencode(
@@ -447,6 +825,83 @@ def chat_aider(
     return _chat_with_tool_protocol(lambda prompt: _run_aider(cmd, prompt), messages, dispatch=dispatch, system=system, tools_spec=tools_spec, max_tool_steps=max_tool_steps)
 
 
+def stream_codex(
+    api_key: str,
+    messages: list[dict[str, Any]],
+    model: str,
+    dispatch: Callable[[str, dict[str, Any]], str],
+    *,
+    system: str,
+    tools_spec: list[dict[str, Any]],
+    max_tool_steps: int,
+) -> Iterator[ChatChunk]:
+    del api_key
+    cmd = _codex_cmd(model)
+    return _stream_with_tool_protocol(lambda prompt: _stream_run(cmd, prompt), messages, dispatch=dispatch, system=system, tools_spec=tools_spec, max_tool_steps=max_tool_steps, live=True)
+
+
+def stream_gemini_cli(
+    api_key: str,
+    messages: list[dict[str, Any]],
+    model: str,
+    dispatch: Callable[[str, dict[str, Any]], str],
+    *,
+    system: str,
+    tools_spec: list[dict[str, Any]],
+    max_tool_steps: int,
+) -> Iterator[ChatChunk]:
+    # Gemini wraps the reply in its own JSON envelope, so each step is unwrapped once it ends.
+    del api_key
+    cmd = _gemini_cmd(model)
+    return _stream_with_tool_protocol(lambda prompt: iter([_run_gemini(cmd, prompt)]), messages, dispatch=dispatch, system=system, tools_spec=tools_spec, max_tool_steps=max_tool_steps, live=False)
+
+
+def stream_claude_code(
+    api_key: str,
+    messages: list[dict[str, Any]],
+    model: str,
+    dispatch: Callable[[str, dict[str, Any]], str],
+    *,
+    system: str,
+    tools_spec: list[dict[str, Any]],
+    max_tool_steps: int,
+) -> Iterator[ChatChunk]:
+    del api_key
+    cmd = _claude_cmd(model)
+    return _stream_with_tool_protocol(lambda prompt: _stream_run(cmd, prompt), messages, dispatch=dispatch, system=system, tools_spec=tools_spec, max_tool_steps=max_tool_steps, live=True)
+
+
+def stream_opencode(
+    api_key: str,
+    messages: list[dict[str, Any]],
+    model: str,
+    dispatch: Callable[[str, dict[str, Any]], str],
+    *,
+    system: str,
+    tools_spec: list[dict[str, Any]],
+    max_tool_steps: int,
+) -> Iterator[ChatChunk]:
+    del api_key
+    cmd = _opencode_cmd(model)
+    return _stream_with_tool_protocol(lambda prompt: _stream_run(cmd, prompt, prompt_as_arg=True), messages, dispatch=dispatch, system=system, tools_spec=tools_spec, max_tool_steps=max_tool_steps, live=True)
+
+
+def stream_aider(
+    api_key: str,
+    messages: list[dict[str, Any]],
+    model: str,
+    dispatch: Callable[[str, dict[str, Any]], str],
+    *,
+    system: str,
+    tools_spec: list[dict[str, Any]],
+    max_tool_steps: int,
+) -> Iterator[ChatChunk]:
+    # Aider runs with --no-stream and prints its own status lines, so each step is yielded once it ends.
+    del api_key
+    cmd = _aider_cmd(model)
+    return _stream_with_tool_protocol(lambda prompt: iter([_run_aider(cmd, prompt)]), messages, dispatch=dispatch, system=system, tools_spec=tools_spec, max_tool_steps=max_tool_steps, live=False)
+
+
 def stream_from_chat(
     fn: Callable[..., tuple[str, list[dict[str, Any]]]],
     api_key: str,
@@ -4,9 +4,11 @@ import json
 import os
 from collections.abc import Callable, Iterator
 from typing import Any
-from urllib.request import Request, urlopen
 
+from ... import http_pool
+from ..context import prepare_step
 from ..types import ChatChunk
+from .common import dispatch_calls
 
 
 def _base_url() -> str:
@@ -59,8 +61,7 @@ def _messages(system: str, messages: list[dict[str, Any]]) -> list[dict[str, Any
 
 def _post_chat(payload: dict[str, Any]) -> dict[str, Any]:
     data = json.dumps(payload).encode("utf-8")
-    req = Request(f"{_base_url()}/api/chat", data=data, headers={"Content-Type": "application/json"}, method="POST")
-    with urlopen(req, timeout=120) as response:  # noqa: S310 - local configurable Ollama endpoint.
+    with http_pool.request("POST", f"{_base_url()}/api/chat", body=data, headers={"Content-Type": "application/json"}, timeout=120) as response:
         return json.loads(response.read().decode("utf-8"))
 
 
@@ -88,7 +89,8 @@ def chat(
     ollama_messages = _messages(system, messages)
     tools = _tools(tools_spec)
     for _ in range(max_tool_steps):
-        body = _post_chat({"model": model, "messages": ollama_messages, "tools": tools, "stream": False})
+        sent, _ = prepare_step("", tools, ollama_messages)
+        body = _post_chat({"model": model, "messages": sent, "tools": tools, "stream": False})
         msg = body.get("message", {})
         tool_calls = msg.get("tool_calls") or []
         text = str(msg.get("content", ""))
@@ -100,11 +102,10 @@ def chat(
             assistant_content.append({"type": "text", "text": text})
         ollama_messages.append(msg)
         tool_results: list[dict[str, Any]] = []
-        for index, call in enumerate(tool_calls):
-            fn = call.get("function", {}) if isinstance(call, dict) else {}
-            name = str(fn.get("name", ""))
-            args = _call_args(fn.get("arguments", {}))
-            result = dispatch(name, args)
+        functions = [call.get("function", {}) if isinstance(call, dict) else {} for call in tool_calls]
+        requested = [(str(fn.get("name", "")), _call_args(fn.get("arguments", {}))) for fn in functions]
+        outputs = dispatch_calls(dispatch, requested)
+        for index, (call, (name, args), result) in enumerate(zip(tool_calls, requested, outputs)):
             call_id = str(call.get("id", f"ollama-call-{index}")) if isinstance(call, dict) else f"ollama-call-{index}"
             assistant_content.append({"type": "tool_use", "id": call_id, "name": name, "input": args})
             tool_results.append({"type": "tool_result", "tool_use_id": call_id, "content": result})
@@ -126,12 +127,15 @@ def stream_chat(
 ) -> Iterator[ChatChunk]:
     del api_key
     payload = {"model": model, "messages": _messages(system, messages), "tools": _tools(tools_spec), "stream": True}
-    req = Request(f"{_base_url()}/api/chat", data=json.dumps(payload).encode("utf-8"), headers={"Content-Type": "application/json"}, method="POST")
+    payload["messages"], _ = prepare_step("", payload["tools"], payload["messages"])
+    data = json.dumps(payload).encode("utf-8")
     text_parts: list[str] = []
-    with urlopen(req, timeout=120) as response:  # noqa: S310 - local configurable Ollama endpoint.
+    done = False
+    with http_pool.request("POST", f"{_base_url()}/api/chat", body=data, headers={"Content-Type": "application/json"}, timeout=120) as response:
+        # Read through the end of the chunked body, even after "done", so the connection can be reused.
         for raw_line in response:
             line = raw_line.decode("utf-8").strip()
-            if not line:
+            if not line or done:
                 continue
             event = json.loads(line)
             msg = event.get("message", {})
@@ -139,8 +143,7 @@ def stream_chat(
             if delta:
                 text_parts.append(delta)
                 yield ChatChunk("text", {"delta": delta})
-            if event.get("done"):
-                break
+            done = bool(event.get("done"))
     text = "".join(text_parts)
     messages.append({"role": "assistant", "content": [{"type": "text", "text": text}]})
     yield ChatChunk("done", {"response": text, "history": messages})
@@ -4,8 +4,9 @@ import json
 from collections.abc import Callable, Iterator
 from typing import Any, cast
 
+from ..context import prepare_step
 from ..types import ChatChunk
-from .common import image_data_url, load_provider_module, safe_json_args, strict_parameters, text_blocks
+from .common import dispatch_calls, image_data_url, load_provider_module, safe_json_args, strict_parameters, text_blocks
 
 
 def _responses_tools(tools_spec: list[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -158,7 +159,8 @@ def _chat_completions(
     tools = _chat_completion_tools(tools_spec)
     oai_messages = _to_chat_completion_messages(system, messages)
     for _ in range(max_tool_steps):
-        response = client.chat.completions.create(model=model, messages=oai_messages, tools=cast(Any, tools), max_tokens=1024)
+        sent, _ = prepare_step("", tools, oai_messages)
+        response = client.chat.completions.create(model=model, messages=sent, tools=cast(Any, tools), max_tokens=1024)
         msg = response.choices[0].message
         tool_calls = cast(list[Any], msg.tool_calls or [])
         if not tool_calls:
@@ -183,9 +185,8 @@ def _chat_completions(
         if msg.content:
             assistant_content.append({"type": "text", "text": msg.content})
         tool_results: list[dict[str, Any]] = []
-        for tool_call in tool_calls:
-            args = safe_json_args(tool_call.function.arguments)
-            result = dispatch(tool_call.function.name, args)
+        requested = [(tool_call.function.name, safe_json_args(tool_call.function.arguments)) for tool_call in tool_calls]
+        for tool_call, (_, args), result in zip(tool_calls, requested, dispatch_calls(dispatch, requested)):
             oai_messages.append({"role": "tool", "tool_call_id": tool_call.id, "content": result})
             assistant_content.append({"type": "tool_use", "id": tool_call.id, "name": tool_call.function.name, "input": args})
             tool_results.append({"type": "tool_result", "tool_use_id": tool_call.id, "content": result})
@@ -212,10 +213,11 @@ def chat(
     tools = _responses_tools(tools_spec)
     response_input = _to_response_input(messages)
     for _ in range(max_tool_steps):
+        sent, _ = prepare_step(system, tools, response_input)
         response = client.responses.create(
             model=model,
             instructions=system,
-            input=response_input,
+            input=sent,
             tools=cast(Any, tools),
             max_output_tokens=1024,
         )
@@ -231,11 +233,9 @@ def chat(
         if text:
             assistant_content.append({"type": "text", "text": text})
         tool_results: list[dict[str, Any]] = []
-        for call in calls:
-            args = safe_json_args(getattr(call, "arguments", "{}"))
+        requested = [(str(getattr(call, "name", "")), safe_json_args(getattr(call, "arguments", "{}"))) for call in calls]
+        for call, (name, args), result in zip(calls, requested, dispatch_calls(dispatch, requested)):
             call_id = str(getattr(call, "call_id", getattr(call, "id", "")))
-            name = str(getattr(call, "name", ""))
-            result = dispatch(name, args)
             response_input.append({"type": "function_call_output", "call_id": call_id, "output": result})
             assistant_content.append({"type": "tool_use", "id": call_id, "name": name, "input": args})
             tool_results.append({"type": "tool_result", "tool_use_id": call_id, "content": result})
@@ -275,6 +275,7 @@ def stream_chat(
     tools = _responses_tools(tools_spec)
     response_input = _to_response_input(messages)
     for _ in range(max_tool_steps):
+        sent, _ = prepare_step(system, tools, response_input)
         calls: list[Any] = []
         output_items: list[Any] = []
         text_parts: list[str] = []
@@ -282,7 +283,7 @@ def stream_chat(
             stream = client.responses.create(
                 model=model,
                 instructions=system,
-                input=response_input,
+                input=sent,
                 tools=cast(Any, tools),
                 max_output_tokens=1024,
                 stream=True,
@@ -337,11 +338,9 @@ def stream_chat(
             assistant_content.append({"type": "text", "text": text})
         response_input.extend(output_items)
         tool_results: list[dict[str, Any]] = []
-        for call in calls:
-            args = safe_json_args(getattr(call, "arguments", "{}"))
+        requested = [(str(getattr(call, "name", "")), safe_json_args(getattr(call, "arguments", "{}"))) for call in calls]
+        for call, (name, args), result in zip(calls, requested, dispatch_calls(dispatch, requested)):
             call_id = str(getattr(call, "call_id", getattr(call, "id", "")))
-            name = str(getattr(call, "name", ""))
-            result = dispatch(name, args)
             yield ChatChunk("tool_result", {"tool": name, "args": args, "result": result})
             response_input.append({"type": "function_call_output", "call_id": call_id, "output": result})
             assistant_content.append({"type": "tool_use", "id": call_id, "name": name, "input": args})
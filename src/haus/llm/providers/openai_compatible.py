@@ -4,9 +4,10 @@ import json
 import os
 from collections.abc import Callable
 from typing import Any, cast
-from urllib.request import Request, urlopen
 
-from .common import image_data_url, safe_json_args, strict_parameters
+from ... import http_pool
+from ..context import prepare_step
+from .common import dispatch_calls, image_data_url, safe_json_args, strict_parameters
 
 
 def _base_url() -> str:
@@ -107,13 +108,8 @@ def _post_chat(payload: dict[str, Any], api_key: str) -> dict[str, Any]:
     headers = {"Content-Type": "application/json"}
     if api_key:
         headers["Authorization"] = f"Bearer {api_key}"
-    req = Request(
-        f"{_base_url()}/chat/completions",
-        data=json.dumps(payload).encode("utf-8"),
-        headers=headers,
-        method="POST",
-    )
-    with urlopen(req, timeout=120) as response:  # noqa: S310 - user-configured local endpoint.
+    data = json.dumps(payload).encode("utf-8")
+    with http_pool.request("POST", f"{_base_url()}/chat/completions", body=data, headers=headers, timeout=120) as response:
         return json.loads(response.read().decode("utf-8"))
 
 
@@ -137,7 +133,8 @@ def chat(
     tools = _tools(tools_spec)
     token = _api_key(api_key)
     for _ in range(max_tool_steps):
-        body = _post_chat({"model": model, "messages": local_messages, "tools": tools, "stream": False, "max_tokens": 1024}, token)
+        sent, _ = prepare_step("", tools, local_messages)
+        body = _post_chat({"model": model, "messages": sent, "tools": tools, "stream": False, "max_tokens": 1024}, token)
         choice = (body.get("choices") or [{}])[0]
         msg = choice.get("message", {}) if isinstance(choice, dict) else {}
         tool_calls = msg.get("tool_calls") or []
@@ -157,11 +154,10 @@ def chat(
             }
         )
         tool_results: list[dict[str, Any]] = []
-        for index, call in enumerate(tool_calls):
-            fn = call.get("function", {}) if isinstance(call, dict) else {}
-            name = str(fn.get("name", ""))
-            args = _call_args(fn.get("arguments", {}))
-            result = dispatch(name, args)
+        functions = [call.get("function", {}) if isinstance(call, dict) else {} for call in tool_calls]
+        requested = [(str(fn.get("name", "")), _call_args(fn.get("arguments", {}))) for fn in functions]
+        outputs = dispatch_calls(dispatch, requested)
+        for index, (call, (name, args), result) in enumerate(zip(tool_calls, requested, outputs)):
             call_id = str(call.get("id", f"local-call-{index}")) if isinstance(call, dict) else f"local-call-{index}"
             local_messages.append({"role": "tool", "tool_call_id": call_id, "content": result})
             assistant_content.append({"type": "tool_use", "id": call_id, "name": name, "input": args})
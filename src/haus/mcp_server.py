@@ -6,14 +6,20 @@ Reads/writes a JSON layout file that the browser editor can import.
 
 from __future__ import annotations
 
+import atexit
+import contextlib
+import contextvars
 import json
 import math
 import os
 import re
+import threading
 import time
+from collections.abc import Iterator
 from pathlib import Path
-from typing import Any
+from typing import Any, NoReturn
 
+import numpy as np
 from mcp.server import FastMCP
 
 from .agent_loop import RoomPlan, RoomZone, plan_flat, plan_room
@@ -26,12 +32,13 @@ from .catalog import (
     search_furniture_catalog as _search_furniture_catalog,
     search_ikea_catalog as _search_ikea_catalog,
 )
-from . import geometry
+from . import clearance_field, geometry, jsonio, placement, routing
 from .constraints import (
     get_constraint_pack as _get_constraint_pack,
     list_constraint_packs as _list_constraint_packs,
 )
 from .logging_utils import configure_logging
+from .spatial_index import LayoutSpatialIndex, index_for
 from .semantic_ir import (
     SEMANTIC_SCHEMA_ID,
     apply_scenario_patch,
@@ -45,14 +52,19 @@ from .semantic_ir import (
     schema_catalog,
 )
 from .workbench import (
+    ACCESSIBILITY_PROFILES,
+    SNAPSHOT_BLOBS_KEY,
     accessibility_report,
     check_product_fit,
     client_brief_object,
     duplicate_scenario as duplicate_project_scenario,
+    editable_layout,
     manual_product_entry,
     new_project,
+    pack_snapshots,
     renovation_scenarios,
     render_journey_report,
+    unpack_snapshots,
     validate_layout_schema,
     migrate_layout,
 )
@@ -402,6 +414,7 @@ def _normalize_layout(raw: Any) -> dict[str, Any]:
         "layout_versions",
         "scenarios",
         "semantic",
+        SNAPSHOT_BLOBS_KEY,
     ):
         if key in raw:
             layout[key] = raw[key]
@@ -409,16 +422,93 @@ def _normalize_layout(raw: Any) -> dict[str, Any]:
     if "_stamp" in raw:
         layout["_stamp"] = _coerce_int(raw.get("_stamp", 0), 0)
 
-    return migrate_layout(layout)
+    # The result is cached and shared, so it must not alias metadata or scenarios from *raw*.
+    return editable_layout(layout)
 
 
-def _load_layout() -> dict[str, Any]:
-    if not LAYOUT_PATH.exists():
+# The current entry lives under "entry" and is replaced whole, so a reader on another
+# thread (the debounced flush runs off the tool lock) never sees a half-written one.
+_LAYOUT_CACHE: dict[str, dict[str, Any]] = {}
+_LAYOUT_CACHE_STATS: dict[str, dict[str, float]] = {}
+# Writes closer together than this can share an mtime on coarse filesystems,
+# so recent entries are confirmed against the file bytes before reuse.
+_LAYOUT_RACY_WINDOW_NS = 2_000_000_000
+
+_PERSISTENCE: dict[str, Any] = {"write_behind_s": 0.0, "fsync": False}
+_PENDING_WRITE: dict[str, Any] = {}
+_PERSIST_LOCK = threading.RLock()
+_ACTIVE_SESSION: contextvars.ContextVar[LayoutSession | None] = contextvars.ContextVar(
+    "haus_layout_session", default=None
+)
+
+
+def _layout_signature(path: Path | None = None) -> tuple[int, int, int] | None:
+    try:
+        stat = (path or LAYOUT_PATH).stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _store_layout_cache(
+    path: Path,
+    signature: tuple[int, int, int],
+    text: str,
+    layout: dict[str, Any],
+) -> None:
+    _LAYOUT_CACHE["entry"] = {
+        "path": path,
+        "signature": signature,
+        "stamp": layout.get("_stamp"),
+        "text": text,
+        "layout": _freeze_layout(layout),
+    }
+
+
+def _cached_layout(signature: tuple[int, int, int]) -> dict[str, Any] | None:
+    entry = _LAYOUT_CACHE.get("entry")
+    if entry is None or entry["path"] != LAYOUT_PATH or entry["signature"] != signature:
+        return None
+    if time.time_ns() - signature[0] < _LAYOUT_RACY_WINDOW_NS:
+        try:
+            if LAYOUT_PATH.read_text(encoding="utf-8") != entry["text"]:
+                return None
+        except OSError:
+            return None
+    return entry["layout"]
+
+
+def _record_layout_load(tool: str, hit: bool, started: float) -> None:
+    stats = _LAYOUT_CACHE_STATS.setdefault(tool, {"calls": 0, "hits": 0, "misses": 0, "load_ms": 0.0})
+    stats["calls"] += 1
+    stats["hits" if hit else "misses"] += 1
+    stats["load_ms"] += (time.perf_counter() - started) * 1000
+
+
+def _layout_snapshot(tool: str) -> dict[str, Any]:
+    started = time.perf_counter()
+    session = _ACTIVE_SESSION.get()
+    if session is not None:
+        _record_layout_load(tool, True, started)
+        return session.layout
+    with _PERSIST_LOCK:
+        if _PENDING_WRITE.get("path") == LAYOUT_PATH:
+            _record_layout_load(tool, True, started)
+            return _PENDING_WRITE["layout"]
+
+    signature = _layout_signature()
+    if signature is None:
+        _record_layout_load(tool, False, started)
         return _empty_layout()
 
+    cached = _cached_layout(signature)
+    if cached is not None:
+        _record_layout_load(tool, True, started)
+        return cached
+
     try:
         raw_text = LAYOUT_PATH.read_text(encoding="utf-8")
-        raw = json.loads(raw_text)
+        raw = jsonio.loads(raw_text)
     except json.JSONDecodeError:
         backup = LAYOUT_PATH.with_suffix(f".corrupt-{int(time.time())}.json")
         try:
@@ -426,42 +516,274 @@ def _load_layout() -> dict[str, Any]:
             log.exception("Layout JSON was corrupt, moved to %s", backup)
         except OSError:
             log.exception("Layout JSON was corrupt and could not be backed up")
+        _record_layout_load(tool, False, started)
         return _empty_layout()
     except OSError:
         log.exception("Failed reading layout file")
+        _record_layout_load(tool, False, started)
         return _empty_layout()
 
-    return _normalize_layout(raw)
+    layout = _normalize_layout(unpack_snapshots(raw))
+    _store_layout_cache(LAYOUT_PATH, signature, raw_text, layout)
+    _record_layout_load(tool, False, started)
+    return layout
 
 
-def _save_layout(data: dict[str, Any]) -> str | None:
-    validation = validate_layout_schema(data)
-    if not validation["ok"]:
-        return "Error: layout schema validation failed: " + "; ".join(validation["errors"])
-    normalized = _normalize_layout(data)
-    LAYOUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    tmp = LAYOUT_PATH.with_suffix(".tmp")
+def _copy_layout(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _copy_layout(entry) for key, entry in value.items()}
+    if isinstance(value, list):
+        return [_copy_layout(entry) for entry in value]
+    return value
+
+
+def _read_only(*_: Any, **__: Any) -> NoReturn:
+    raise TypeError("the shared layout is read-only; use _load_layout() for a mutable copy")
+
+
+class _FrozenDict(dict):
+    """A ``dict`` that refuses mutation; copies of it are plain, mutable dicts."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[str, Any]:
+        return _copy_layout(self)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (dict, (_copy_layout(self),))
+
+
+class _FrozenList(list):
+    """A ``list`` that refuses mutation; copies of it are plain, mutable lists."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __copy__(self) -> list[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> list[Any]:
+        return _copy_layout(self)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (list, (_copy_layout(self),))
+
+
+def _freeze_layout(value: Any) -> Any:
+    """Deep read-only copy of *value*, shared by every `_read_layout` caller until the layout changes."""
+    if isinstance(value, (_FrozenDict, _FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return _FrozenDict((key, _freeze_layout(entry)) for key, entry in value.items())
+    if isinstance(value, list):
+        return _FrozenList(_freeze_layout(entry) for entry in value)
+    return value
+
+
+def _load_layout(tool: str = "internal") -> dict[str, Any]:
+    """Return a private, mutable copy of the current layout, counted under *tool*."""
+    return _copy_layout(_layout_snapshot(tool))
+
 
+def _read_layout(tool: str = "internal") -> dict[str, Any]:
+    """Return the shared cached layout for read-only tools, counted under *tool*.
+
+    The result is a read-only view: mutating it raises ``TypeError``.
+    """
+    return _layout_snapshot(tool)
+
+
+def layout_cache_stats() -> dict[str, Any]:
+    """Layout load counters per calling tool, with hit rates."""
+    tools = {
+        tool: {
+            "calls": int(stats["calls"]),
+            "hits": int(stats["hits"]),
+            "misses": int(stats["misses"]),
+            "hit_rate": round(stats["hits"] / stats["calls"], 3) if stats["calls"] else 0.0,
+            "avg_load_ms": round(stats["load_ms"] / stats["calls"], 3) if stats["calls"] else 0.0,
+        }
+        for tool, stats in sorted(_LAYOUT_CACHE_STATS.items())
+    }
+    calls = sum(entry["calls"] for entry in tools.values())
+    hits = sum(entry["hits"] for entry in tools.values())
+    return {
+        "calls": calls,
+        "hits": hits,
+        "hit_rate": round(hits / calls, 3) if calls else 0.0,
+        "stamp": _LAYOUT_CACHE.get("entry", {}).get("stamp"),
+        "pending_write": bool(_PENDING_WRITE),
+        "tools": tools,
+    }
+
+
+def _fsync_directory(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
     try:
-        tmp.write_text(json.dumps(normalized, indent=2), encoding="utf-8")
-        tmp.replace(LAYOUT_PATH)
+        os.fsync(fd)
     except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _write_layout_file(path: Path, normalized: dict[str, Any]) -> str | None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    text = jsonio.dumps(pack_snapshots(normalized))
+
+    try:
+        with tmp.open("w", encoding="utf-8") as handle:
+            handle.write(text)
+            if _PERSISTENCE["fsync"]:
+                handle.flush()
+                os.fsync(handle.fileno())
+        tmp.replace(path)
+        if _PERSISTENCE["fsync"]:
+            _fsync_directory(path.parent)
+    except OSError:
+        _LAYOUT_CACHE.pop("entry", None)
         log.exception("Failed writing layout file")
         return "Error: failed to persist layout to disk."
 
+    signature = _layout_signature(path)
+    if signature is None:
+        _LAYOUT_CACHE.pop("entry", None)
+    else:
+        _store_layout_cache(path, signature, text, normalized)
+    return None
+
+
+def flush_layout() -> str | None:
+    """Write any debounced layout change to disk now."""
+    with _PERSIST_LOCK:
+        if not _PENDING_WRITE:
+            return None
+        timer = _PENDING_WRITE.get("timer")
+        if timer is not None:
+            timer.cancel()
+        path = _PENDING_WRITE["path"]
+        normalized = _PENDING_WRITE["layout"]
+        _PENDING_WRITE.clear()
+        return _write_layout_file(path, normalized)
+
+
+def _flush_layout_quietly() -> None:
+    err = flush_layout()
+    if err:
+        log.error("Deferred layout write failed: %s", err)
+
+
+def configure_layout_persistence(*, write_behind_s: float = 0.0, fsync: bool = False) -> None:
+    """Choose how `_save_layout` reaches disk.
+
+    With *write_behind_s* > 0, saves are validated and visible to later loads
+    immediately but written once the layout has been quiet for that long.
+    Pending changes are flushed on reconfiguration and at interpreter exit.
+    *fsync* forces file and directory syncs so a write survives power loss.
+    """
+    flush_layout()
+    with _PERSIST_LOCK:
+        _PERSISTENCE["write_behind_s"] = max(0.0, float(write_behind_s))
+        _PERSISTENCE["fsync"] = bool(fsync)
+
+
+atexit.register(_flush_layout_quietly)
+
+
+def _save_layout(data: dict[str, Any]) -> str | None:
+    session = _ACTIVE_SESSION.get()
+    if session is not None:
+        session.stage(data)
+        return None
+
+    validation = validate_layout_schema(data)
+    if not validation["ok"]:
+        return "Error: layout schema validation failed: " + "; ".join(validation["errors"])
+    normalized = _normalize_layout(unpack_snapshots(data))
+
+    delay = _PERSISTENCE["write_behind_s"]
+    if delay <= 0:
+        flush_layout()
+        return _write_layout_file(LAYOUT_PATH, normalized)
+
+    with _PERSIST_LOCK:
+        if _PENDING_WRITE and _PENDING_WRITE["path"] != LAYOUT_PATH:
+            err = flush_layout()
+            if err:
+                return err
+        timer = _PENDING_WRITE.get("timer")
+        if timer is not None:
+            timer.cancel()
+        timer = threading.Timer(delay, _flush_layout_quietly)
+        timer.daemon = True
+        _PENDING_WRITE.update({"path": LAYOUT_PATH, "layout": _freeze_layout(normalized), "timer": timer})
+        timer.start()
     return None
 
 
+class LayoutSession:
+    """Stage several layout mutations in memory and persist them once.
+
+    While a session is active in the current context, `_load_layout` and
+    `_read_layout` see the staged layout and `_save_layout` only records it;
+    `commit()` runs a single validation pass and one atomic write.
+    """
+
+    def __init__(self) -> None:
+        # The snapshot is read-only and shared; the first staged save replaces it.
+        self.layout = _layout_snapshot("layout_session")
+        self.saves = 0
+        self.error: str | None = None
+        self._committed = False
+
+    def stage(self, data: dict[str, Any]) -> None:
+        self.layout = data
+        self.saves += 1
+
+    def commit(self) -> str | None:
+        if self._committed:
+            return self.error
+        self._committed = True
+        if self.saves:
+            self.error = _save_layout(self.layout)
+        return self.error
+
+
+@contextlib.contextmanager
+def layout_session() -> Iterator[LayoutSession]:
+    """Batch the layout saves made inside the block into one commit.
+
+    The session commits when the block exits normally and discards staged
+    changes if it raises. Check ``session.error`` for a failed commit.
+    """
+    session = LayoutSession()
+    token = _ACTIVE_SESSION.set(session)
+    try:
+        yield session
+    finally:
+        _ACTIVE_SESSION.reset(token)
+    session.commit()
+
+
 def _read_project(project_id: str) -> dict[str, Any] | None:
     path = _project_path(project_id)
     if not path.exists():
         return None
     try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
+        payload = jsonio.loads(path.read_text(encoding="utf-8"))
     except json.JSONDecodeError:
         return None
     if not isinstance(payload, dict):
         return None
+    unpack_snapshots(payload)
     payload["layout"] = migrate_layout(payload.get("layout", {}))
     payload["scenarios"] = payload.get("scenarios") if isinstance(payload.get("scenarios"), list) else []
     return payload
@@ -472,12 +794,12 @@ def _write_project(project: dict[str, Any]) -> Path:
     project["layout"] = migrate_layout(project.get("layout", {}))
     path = _project_path(project_id)
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(project, indent=2, sort_keys=True), encoding="utf-8")
+    path.write_text(jsonio.dumps(pack_snapshots(project)), encoding="utf-8")
     return path
 
 
 def _json_result(payload: dict[str, Any]) -> str:
-    return json.dumps(payload, indent=2, sort_keys=True)
+    return jsonio.dumps(payload)
 
 
 def _parse_json_object(raw: str, label: str) -> tuple[dict[str, Any] | None, str | None]:
@@ -493,13 +815,14 @@ def _parse_json_object(raw: str, label: str) -> tuple[dict[str, Any] | None, str
 def _find_scenario_by_id(scenario_id: str) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
     for path in sorted(_projects_root().glob("*.haus-project.json")):
         try:
-            project = json.loads(path.read_text(encoding="utf-8"))
+            project = jsonio.loads(path.read_text(encoding="utf-8"))
         except json.JSONDecodeError:
             continue
         if not isinstance(project, dict):
             continue
         for scenario in project.get("scenarios", []):
             if isinstance(scenario, dict) and scenario.get("id") == scenario_id:
+                unpack_snapshots(project)
                 project["layout"] = migrate_layout(project.get("layout", {}))
                 return project, scenario
     return None, None
@@ -507,12 +830,12 @@ def _find_scenario_by_id(scenario_id: str) -> tuple[dict[str, Any] | None, dict[
 
 @mcp.resource("haus://layout/current", name="Current Haus layout", mime_type="application/json")
 def haus_current_layout_resource() -> str:
-    return _json_result(_load_layout())
+    return _json_result(_read_layout("haus_current_layout_resource"))
 
 
 @mcp.resource("haus://layout/graph", name="Current Haus layout graph", mime_type="application/json")
 def haus_layout_graph_resource() -> str:
-    return _json_result(build_layout_graph(_load_layout()))
+    return _json_result(build_layout_graph(_read_layout("haus_layout_graph_resource")))
 
 
 @mcp.resource("haus://schema/semantic_layout.v1", name="Haus semantic schema", mime_type="application/json")
@@ -599,23 +922,10 @@ def _validate_index(data: dict[str, Any], index: int) -> str | None:
     return None
 
 
-def _item_extents(item: dict[str, Any]) -> tuple[float, float]:
-    geo = item.get("geo", [1.0, 1.0, 1.0])
-    rot = _coerce_float(item.get("rot", 0.0), 0.0)
-    half_x = (abs(geo[0] * math.cos(rot)) + abs(geo[2] * math.sin(rot))) / 2
-    half_z = (abs(geo[0] * math.sin(rot)) + abs(geo[2] * math.cos(rot))) / 2
-    return half_x, half_z
-
-
 def _item_rect(item: dict[str, Any], padding: float = 0.0) -> tuple[float, float, float, float]:
-    p = item.get("pos", [0.0, 0.0, 0.0])
-    half_x, half_z = _item_extents(item)
-    return (
-        p[0] - half_x - padding,
-        p[0] + half_x + padding,
-        p[2] - half_z - padding,
-        p[2] + half_z + padding,
-    )
+    """Padded AABB as ``(x_min, x_max, z_min, z_max)``."""
+    x_min, z_min, x_max, z_max = geometry.item_rect(item)
+    return (x_min - padding, x_max + padding, z_min - padding, z_max + padding)
 
 
 def _distance_xz(a: dict[str, Any], b: dict[str, Any]) -> float:
@@ -636,30 +946,16 @@ def _item_polygon(item: dict[str, Any], padding: float = 0.0) -> list[tuple[floa
     return geometry.item_polygon(item, padding=padding)
 
 
-def _polygon_edges(polygon: list[tuple[float, float]]) -> list[tuple[tuple[float, float], tuple[float, float]]]:
-    if len(polygon) < 2:
-        return []
-    return [(polygon[i], polygon[(i + 1) % len(polygon)]) for i in range(len(polygon))]
+def _layout_index(data: dict[str, Any]) -> LayoutSpatialIndex:
+    return index_for(data["items"])
 
 
-def _polygon_axes(polygon: list[tuple[float, float]]) -> list[tuple[float, float]]:
-    axes: list[tuple[float, float]] = []
-    for a, b in _polygon_edges(polygon):
-        edge_x = b[0] - a[0]
-        edge_z = b[1] - a[1]
-        axis = (-edge_z, edge_x)
-        length = math.hypot(axis[0], axis[1])
-        if length > 1e-9:
-            axes.append((axis[0] / length, axis[1] / length))
-    return axes
+def _polygon_bbox(polygon: list[tuple[float, float]]) -> tuple[float, float, float, float]:
+    return geometry.polygon_bbox(polygon)
 
 
-def _project_polygon(
-    polygon: list[tuple[float, float]],
-    axis: tuple[float, float],
-) -> tuple[float, float]:
-    dots = [point[0] * axis[0] + point[1] * axis[1] for point in polygon]
-    return min(dots), max(dots)
+def _polygon_edges(polygon: list[tuple[float, float]]) -> list[tuple[tuple[float, float], tuple[float, float]]]:
+    return geometry.polygon_edges(polygon)
 
 
 def _polygons_intersect(a: list[tuple[float, float]], b: list[tuple[float, float]]) -> bool:
@@ -750,13 +1046,7 @@ def _segment_intersects_polygon(
 
 
 def _polygon_area(polygon: list[tuple[float, float]] | tuple[tuple[float, float], ...]) -> float:
-    if len(polygon) < 3:
-        return 0.0
-    total = 0.0
-    for i, (x1, z1) in enumerate(polygon):
-        x2, z2 = polygon[(i + 1) % len(polygon)]
-        total += x1 * z2 - x2 * z1
-    return abs(total) / 2
+    return geometry.polygon_area(polygon)
 
 
 def _item_inside_polygon(
@@ -813,6 +1103,7 @@ def _collect_sightline_blockers(
     index_to: int,
     safety_margin: float,
     include_hidden: bool,
+    index: LayoutSpatialIndex | None = None,
 ) -> list[dict[str, Any]]:
     items = data["items"]
     src = items[index_from]
@@ -821,14 +1112,22 @@ def _collect_sightline_blockers(
     start = (src["pos"][0], src["pos"][2])
     end = (dst["pos"][0], dst["pos"][2])
     line_len = math.hypot(end[0] - start[0], end[1] - start[1])
+    margin = max(0.0, safety_margin)
+    if index is None:
+        index = _layout_index(data)
+    segment_bbox = (min(start[0], end[0]), min(start[1], end[1]), max(start[0], end[0]), max(start[1], end[1]))
+    # The index may cover a prefix of ``items`` (candidate items appended for simulation).
+    nearby = [i for i in index.query_rect(segment_bbox, padding=margin) if i < len(items)]
+    nearby.extend(range(len(index), len(items)))
 
     blockers: list[dict[str, Any]] = []
-    for i, item in enumerate(items):
+    for i in nearby:
+        item = items[i]
         if i in (index_from, index_to):
             continue
         if not include_hidden and not item.get("visible", True):
             continue
-        polygon = _item_polygon(item, padding=max(0.0, safety_margin))
+        polygon = index.polygon(i, margin) if i < len(index) else _item_polygon(item, padding=margin)
         if _segment_intersects_polygon(start, end, polygon):
             center = (item["pos"][0], item["pos"][2])
             line_t = _segment_progress(start, end, center)
@@ -1048,6 +1347,170 @@ def _best_candidate_rot_deg(
     return math.degrees(-math.atan2(dz, dx))
 
 
+def _screen_candidates_scalar(
+    *,
+    items: list[dict[str, Any]],
+    index: LayoutSpatialIndex,
+    furniture_type: str,
+    points: list[tuple[float, float]],
+    rot_degs: list[float],
+    room_zone: RoomZone | None,
+    room_bounds: tuple[float, float, float, float] | None,
+    near_index: int | None,
+    near_item: dict[str, Any] | None,
+    min_distance: float,
+    max_distance: float,
+) -> list[tuple[float, float, float, dict[str, Any], float, float]]:
+    def _visible(idx: int) -> bool:
+        return items[idx].get("visible", True)
+
+    screened: list[tuple[float, float, float, dict[str, Any], float, float]] = []
+    for (x, z), rot_deg in zip(points, rot_degs):
+        candidate = _build_furniture_item(furniture_type, x, z, rot_deg)
+        if room_zone is not None and not _item_inside_room_zone(candidate, room_zone, inset=0.02):
+            continue
+        if room_zone is None and room_bounds is not None and not _item_inside_bounds(candidate, room_bounds, inset=0.02):
+            continue
+        cand_polygon = _item_polygon(candidate, padding=0.02)
+        cand_bbox = _polygon_bbox(cand_polygon)
+
+        overlap = any(
+            _visible(idx) and _polygons_intersect(cand_polygon, index.polygon(idx, 0.02))
+            for idx in index.query_rect(cand_bbox, padding=0.02)
+        )
+        if overlap:
+            continue
+
+        if near_item is not None:
+            near_dist = _distance_xz(candidate, near_item)
+            if near_dist < min_distance or near_dist > max_distance:
+                continue
+        else:
+            near_dist = 0.0
+
+        nearest = index.nearest(
+            cand_bbox,
+            lambda idx, cand_polygon=cand_polygon: _polygon_distance(cand_polygon, index.polygon(idx, 0.02)),
+            padding=0.02,
+            accept=lambda idx: idx != near_index and _visible(idx),
+        )
+        nearest_clearance = nearest[0][0] if nearest else float("inf")
+        screened.append((x, z, rot_deg, candidate, near_dist, nearest_clearance))
+    return screened
+
+
+def _screen_candidates_batched(
+    *,
+    items: list[dict[str, Any]],
+    index: LayoutSpatialIndex,
+    furniture_type: str,
+    points: list[tuple[float, float]],
+    rot_degs: list[float],
+    room_zone: RoomZone | None,
+    room_bounds: tuple[float, float, float, float] | None,
+    near_index: int | None,
+    near_item: dict[str, Any] | None,
+    min_distance: float,
+    max_distance: float,
+) -> list[tuple[float, float, float, dict[str, Any], float, float]]:
+    if not points:
+        return []
+    spec = FURNITURE_CATALOG[furniture_type]
+    width, depth = float(spec["w"]), float(spec["d"])
+    rots = [math.radians(rot_deg) for rot_deg in rot_degs]
+    xs = np.array([point[0] for point in points], dtype=float)
+    zs = np.array([point[1] for point in points], dtype=float)
+    cos_r = np.array([math.cos(rot) for rot in rots])
+    sin_r = np.array([math.sin(rot) for rot in rots])
+    polygons = placement.oriented_rects(xs, zs, cos_r, sin_r, width / 2 + 0.02, depth / 2 + 0.02)
+
+    keep = np.ones(len(points), dtype=bool)
+    bounds = room_zone.bounds if room_zone is not None else room_bounds
+    if bounds is not None:
+        half_x = (np.abs(width * cos_r) + np.abs(depth * sin_r)) / 2
+        half_z = (np.abs(width * sin_r) + np.abs(depth * cos_r)) / 2
+        keep &= (
+            (xs - half_x >= bounds[0] + 0.02)
+            & (xs + half_x <= bounds[2] - 0.02)
+            & (zs - half_z >= bounds[1] + 0.02)
+            & (zs + half_z <= bounds[3] - 0.02)
+        )
+    if room_zone is not None and room_zone.polygon:
+        corners_inside = placement.points_in_polygon(polygons[keep].reshape(-1, 2), room_zone.polygon)
+        keep[keep] = corners_inside.reshape(-1, 4).all(axis=1)
+
+    visible = [i for i, item in enumerate(items) if item.get("visible", True)]
+    obstacles = placement.pack_polygons([index.polygon(i, 0.02) for i in visible])
+    keep[keep] = ~placement.any_intersection(polygons[keep], obstacles)
+
+    near_dists = np.zeros(len(points))
+    if near_item is not None:
+        near_dists = np.sqrt((xs - near_item["pos"][0]) ** 2 + (zs - near_item["pos"][2]) ** 2)
+        keep &= (near_dists >= min_distance) & (near_dists <= max_distance)
+
+    survivors = np.nonzero(keep)[0]
+    clearance_rows = [row for row, idx in enumerate(visible) if idx != near_index]
+    clearances = placement.min_distances(polygons[survivors], obstacles[clearance_rows])
+    return [
+        (
+            points[row][0],
+            points[row][1],
+            rot_degs[row],
+            _build_furniture_item(furniture_type, points[row][0], points[row][1], rot_degs[row]),
+            float(near_dists[row]),
+            float(clearance),
+        )
+        for row, clearance in zip(survivors.tolist(), clearances.tolist())
+    ]
+
+
+def _sightline_obstacle_rows(items: list[dict[str, Any]], face_index: int) -> list[int]:
+    return [i for i, item in enumerate(items) if i != face_index and item.get("visible", True)]
+
+
+def _batched_sightline_hits(
+    items: list[dict[str, Any]],
+    index: LayoutSpatialIndex,
+    starts: list[tuple[float, float]],
+    face_index: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    face = items[face_index]
+    rows = _sightline_obstacle_rows(items, face_index)
+    start_array = np.array(starts, dtype=float).reshape(-1, 2)
+    return placement.segment_hits(
+        start_array,
+        np.broadcast_to(np.array((face["pos"][0], face["pos"][2]), dtype=float), start_array.shape),
+        placement.pack_polygons([index.polygon(i, 0.02) for i in rows]),
+    )
+
+
+def _sightline_blockers_for_row(
+    items: list[dict[str, Any]],
+    hits: tuple[np.ndarray, np.ndarray],
+    row: int,
+    start: tuple[float, float],
+    face_index: int,
+) -> list[dict[str, Any]]:
+    face = items[face_index]
+    end = (face["pos"][0], face["pos"][2])
+    line_len = math.hypot(end[0] - start[0], end[1] - start[1])
+    rows = _sightline_obstacle_rows(items, face_index)
+    blockers: list[dict[str, Any]] = []
+    for col in hits[1][hits[0] == row].tolist():
+        item = items[rows[col]]
+        line_t = _segment_progress(start, end, (item["pos"][0], item["pos"][2]))
+        blockers.append(
+            {
+                "index": rows[col],
+                "type": _item_label(item),
+                "distance": line_t * line_len,
+                "line_t": line_t,
+            }
+        )
+    blockers.sort(key=lambda b: b["distance"])
+    return blockers
+
+
 def _simulate_candidates(
     *,
     data: dict[str, Any],
@@ -1060,6 +1523,7 @@ def _simulate_candidates(
     require_clear_sightline: bool,
     max_candidates: int,
     grid_size: float,
+    batched: bool = True,
 ) -> tuple[list[dict[str, Any]], str | None]:
     if furniture_type not in FURNITURE_CATALOG:
         return [], f"Error: unknown type '{furniture_type}'. Use list_furniture_catalog()."
@@ -1083,80 +1547,86 @@ def _simulate_candidates(
     points = _iter_grid_points(bounds, grid_size)
     face_item = data["items"][face_index] if face_index is not None else None
     near_item = data["items"][near_index] if near_index is not None else None
+    items = data["items"]
+    index = _layout_index(data)
 
-    candidates: list[dict[str, Any]] = []
-
-    for x, z in points:
-        rot_deg = _best_candidate_rot_deg(x, z, face_item)
-        candidate = _build_furniture_item(furniture_type, x, z, rot_deg)
-        if room_zone is not None and not _item_inside_room_zone(candidate, room_zone, inset=0.02):
-            continue
-        if room_zone is None and room_bounds is not None and not _item_inside_bounds(candidate, room_bounds, inset=0.02):
-            continue
-        cand_polygon = _item_polygon(candidate, padding=0.02)
-
-        overlap = False
-        nearest_clearance = float("inf")
-        for idx, other in enumerate(data["items"]):
-            if not other.get("visible", True):
-                continue
-            other_polygon = _item_polygon(other, padding=0.02)
-            if _polygons_intersect(cand_polygon, other_polygon):
-                overlap = True
-                break
-            if idx != near_index:
-                nearest_clearance = min(nearest_clearance, _polygon_distance(cand_polygon, other_polygon))
-
-        if overlap:
-            continue
-
-        if near_item is not None:
-            near_dist = _distance_xz(candidate, near_item)
-            if near_dist < min_distance or near_dist > max_distance:
-                continue
-        else:
-            near_dist = 0.0
+    screen = _screen_candidates_batched if batched else _screen_candidates_scalar
+    screened = screen(
+        items=items,
+        index=index,
+        furniture_type=furniture_type,
+        points=points,
+        rot_degs=[_best_candidate_rot_deg(x, z, face_item) for x, z in points],
+        room_zone=room_zone,
+        room_bounds=room_bounds,
+        near_index=near_index,
+        near_item=near_item,
+        min_distance=min_distance,
+        max_distance=max_distance,
+    )
 
-        blockers: list[dict[str, Any]] = []
-        if face_index is not None:
-            tmp_layout = {"version": 1, "items": data["items"] + [candidate]}
-            from_idx = len(tmp_layout["items"]) - 1
+    screened = [entry for entry in screened if not entry[5] < 0.35]
+    sightline_hits: tuple[np.ndarray, np.ndarray] | None = None
+    sightlines: list[list[dict[str, Any]]] = []
+    if face_index is None:
+        blocker_counts = [0] * len(screened)
+    elif batched:
+        sightline_hits = _batched_sightline_hits(items, index, [(entry[0], entry[1]) for entry in screened], face_index)
+        blocker_counts = np.bincount(sightline_hits[0], minlength=len(screened)).tolist()
+    else:
+        for entry in screened:
+            tmp_layout = {"version": 1, "items": items + [entry[3]]}
             blockers = _collect_sightline_blockers(
                 tmp_layout,
-                from_idx,
+                len(tmp_layout["items"]) - 1,
                 face_index,
                 safety_margin=0.02,
                 include_hidden=False,
+                index=index,
             )
-            blockers = [b for b in blockers if b["index"] != face_index]
-            if require_clear_sightline and blockers:
-                continue
+            sightlines.append([b for b in blockers if b["index"] != face_index])
+        blocker_counts = [len(blockers) for blockers in sightlines]
+
+    ranked: list[tuple[float, int, float | None]] = []
+    for row, (_, _, _, _, near_dist, nearest_clearance) in enumerate(screened):
+        blocker_count = blocker_counts[row]
+        if require_clear_sightline and blocker_count:
+            continue
 
         accessibility_clearance = (
             nearest_clearance if nearest_clearance < float("inf") else None
         )
-        if accessibility_clearance is not None and accessibility_clearance < 0.35:
-            continue
-
         score = 0.0
         if near_item is not None:
             target = (min_distance + max_distance) / 2
             score += max(0.0, 1.0 - abs(near_dist - target) / max(target, 0.1)) * 0.45
         if face_index is not None:
-            score += 0.35 if not blockers else max(0.0, 0.22 - 0.03 * len(blockers))
+            score += 0.35 if not blocker_count else max(0.0, 0.22 - 0.03 * blocker_count)
 
         if accessibility_clearance is not None:
             accessibility_score = min(accessibility_clearance, 1.2) / 1.2
             score += accessibility_score * 0.20
         else:
             accessibility_score = None
+        ranked.append((round(score, 4), row, accessibility_score))
 
+    ranked.sort(key=lambda r: r[0], reverse=True)
+    candidates: list[dict[str, Any]] = []
+    for score, row, accessibility_score in ranked[: max(1, max_candidates)]:
+        x, z, rot_deg, _, near_dist, nearest_clearance = screened[row]
+        accessibility_clearance = (
+            nearest_clearance if nearest_clearance < float("inf") else None
+        )
+        if sightline_hits is not None and face_index is not None:
+            blockers = _sightline_blockers_for_row(items, sightline_hits, row, (x, z), face_index)
+        else:
+            blockers = sightlines[row] if sightlines else []
         candidates.append(
             {
                 "x": round(x, 3),
                 "z": round(z, 3),
                 "rotation_deg": round(rot_deg, 1),
-                "score": round(score, 4),
+                "score": score,
                 "distance_to_reference_m": round(near_dist, 3) if near_item is not None else None,
                 "blockers": blockers,
                 "nearest_clearance_m": (
@@ -1170,9 +1640,7 @@ def _simulate_candidates(
                 ),
             }
         )
-
-    candidates.sort(key=lambda c: c["score"], reverse=True)
-    return candidates[: max(1, max_candidates)], None
+    return candidates, None
 
 
 def _snap_value(value: float, grid_size: float = 0.25) -> float:
@@ -1443,13 +1911,13 @@ def get_constraint_pack(pack_id: str) -> str:
 @mcp.tool()
 def get_layout_graph_json(constraint_pack_ids: list[str] | None = None) -> str:
     """Return graph-native Haus layout JSON for agents."""
-    return _json_result(build_layout_graph(_load_layout(), constraint_pack_ids))
+    return _json_result(build_layout_graph(_read_layout("get_layout_graph_json"), constraint_pack_ids))
 
 
 @mcp.tool()
 def reason_about_layout(constraint_pack_ids: list[str] | None = None) -> str:
     """Return structured graph findings and next actions for the current layout."""
-    return _json_result(reasoning_report(_load_layout(), constraint_pack_ids))
+    return _json_result(reasoning_report(_read_layout("reason_about_layout"), constraint_pack_ids))
 
 
 @mcp.tool()
@@ -1476,7 +1944,7 @@ def create_scenario_transaction(
     if err:
         return _json_result({"ok": False, "error": err})
     project = _read_project(project_id) if project_id else None
-    before = project.get("layout", {}) if project else _load_layout()
+    before = project.get("layout", {}) if project else _load_layout("create_scenario_transaction")
     txn = scenario_transaction(before, proposed or {}, scenario_id=scenario_id, intent=intent, actor="mcp")
     return _json_result({"ok": True, "project_id": project_id or None, "transaction": txn})
 
@@ -1490,7 +1958,7 @@ def apply_scenario_transaction(transaction_json: str, project_id: str = "") -> s
     if transaction is None:
         return _json_result({"ok": False, "error": "Transaction JSON must be an object."})
     project = _read_project(project_id) if project_id else None
-    base = project.get("layout", {}) if project else _load_layout()
+    base = project.get("layout", {}) if project else _load_layout("apply_scenario_transaction")
     updated = apply_scenario_patch(base, transaction)
     save_err = None
     path = None
@@ -1512,7 +1980,7 @@ def revert_scenario_transaction(transaction_json: str, project_id: str = "") ->
     if transaction is None:
         return _json_result({"ok": False, "error": "Transaction JSON must be an object."})
     project = _read_project(project_id) if project_id else None
-    base = project.get("layout", {}) if project else _load_layout()
+    base = project.get("layout", {}) if project else _load_layout("revert_scenario_transaction")
     updated = revert_scenario_patch(base, transaction)
     save_err = None
     path = None
@@ -1567,7 +2035,7 @@ def get_ikea_catalog_item(item_id: str, refresh: bool = False) -> str:
     item = refresh_catalog_item(item_id) if refresh else get_catalog_item(item_id)
     if item is None:
         return f"Error: IKEA catalog item '{item_id}' was not found. Use search_ikea_catalog()."
-    return json.dumps(item, indent=2)
+    return jsonio.dumps(item)
 
 
 @mcp.tool()
@@ -1576,7 +2044,7 @@ def get_furniture_catalog_item(item_id: str, refresh: bool = False) -> str:
     item = refresh_catalog_item(item_id) if refresh else get_catalog_item(item_id)
     if item is None:
         return f"Error: catalog item '{item_id}' was not found. Use search_furniture_catalog()."
-    return json.dumps(item, indent=2)
+    return jsonio.dumps(item)
 
 
 @mcp.tool()
@@ -1585,7 +2053,7 @@ def add_catalog_furniture(item_id: str, x: float = 0.0, z: float = 0.0, rotation
     item = get_catalog_item(item_id)
     if item is None:
         return f"Error: catalog item '{item_id}' was not found. Use search_furniture_catalog()."
-    data = _load_layout()
+    data = _load_layout("add_catalog_furniture")
     layout_item = catalog_item_to_layout_item(item, x=x, z=z, rotation_deg=rotation_deg)
     data["items"].append(layout_item)
     err = _save_layout(data)
@@ -1618,7 +2086,7 @@ def refresh_furniture_catalog(query: str, max_results: int = 12, region: str = "
 @mcp.tool()
 def create_project(title: str = "Untitled Haus Project", journey: str = "blank") -> str:
     """Create a local Haus project from the current layout."""
-    project = new_project(title=title, journey=journey, layout=_load_layout())
+    project = new_project(title=title, journey=journey, layout=_load_layout("create_project"))
     path = _write_project(project)
     return _json_result({"ok": True, "project": project, "path": str(path)})
 
@@ -1629,7 +2097,7 @@ def list_projects() -> str:
     projects = []
     for path in sorted(_projects_root().glob("*.haus-project.json")):
         try:
-            project = json.loads(path.read_text(encoding="utf-8"))
+            project = jsonio.loads(path.read_text(encoding="utf-8"))
         except json.JSONDecodeError:
             continue
         if isinstance(project, dict):
@@ -1666,9 +2134,9 @@ def save_project(project_json: str = "") -> str:
         if not isinstance(project, dict):
             return _json_result({"ok": False, "error": "Project JSON must be an object."})
         if project.get("schema") != "haus.project.v1":
-            project = new_project(project.get("title", "MCP Project"), project.get("journey", "blank"), project.get("layout", _load_layout()))
+            project = new_project(project.get("title", "MCP Project"), project.get("journey", "blank"), project.get("layout", _load_layout("save_project")))
     else:
-        project = new_project(title="MCP Saved Project", journey="blank", layout=_load_layout())
+        project = new_project(title="MCP Saved Project", journey="blank", layout=_load_layout("save_project"))
     path = _write_project(project)
     return _json_result({"ok": True, "project_id": project.get("id"), "path": str(path)})
 
@@ -1718,7 +2186,7 @@ def export_report(project_id: str, journey: str = "", selected_scenario_ids: lis
 def draft_renovation_options(project_id: str = "") -> str:
     """Draft conservative, balanced, and ambitious renovation options as structured JSON."""
     project = _read_project(project_id) if project_id else None
-    layout = project.get("layout", {}) if project else _load_layout()
+    layout = project.get("layout", {}) if project else _load_layout("draft_renovation_options")
     scenarios = renovation_scenarios(layout)
     if project:
         project["scenarios"] = scenarios
@@ -1730,7 +2198,7 @@ def draft_renovation_options(project_id: str = "") -> str:
 def draft_accessibility_review(project_id: str = "", profile: str = "general_aging_ready") -> str:
     """Draft a structured accessibility review for a project or the current layout."""
     project = _read_project(project_id) if project_id else None
-    layout = project.get("layout", {}) if project else _load_layout()
+    layout = project.get("layout", {}) if project else _load_layout("draft_accessibility_review")
     report = accessibility_report(layout, profile)
     if project:
         project.setdefault("validation_reports", []).append(report)
@@ -1748,7 +2216,7 @@ def check_furniture_fit(product_json: str, room_name: str = "") -> str:
     if not isinstance(raw_product, dict):
         return _json_result({"ok": False, "error": "Product JSON must be an object."})
     product = manual_product_entry(raw_product)
-    fit = check_product_fit(_load_layout(), product, room_name=room_name)
+    fit = check_product_fit(_load_layout("check_furniture_fit"), product, room_name=room_name)
     return _json_result({"ok": True, "product": product, "fit": fit})
 
 
@@ -1797,7 +2265,7 @@ def design_room(
     Provide both *origin_x* and *origin_z* to force the room center; otherwise
     an existing room tag or the layout center is used.
     """
-    data = _load_layout()
+    data = _load_layout("design_room")
     origin_x_resolved, origin_z_resolved, err = _resolve_design_origin(data, room_id, origin_x, origin_z)
     if err:
         return err
@@ -1854,37 +2322,37 @@ def design_flat(
     if normalized_target not in {"whole_flat", "flat", "home", "apartment", "hdb", "bto"}:
         return "Error: target must be a whole-flat target such as 'whole_flat', 'flat', 'hdb', or 'bto'."
 
-    data = _load_layout()
-    bounds = _layout_bounds(data)
-    zones = _layout_room_zones(data)
-    trace: list[dict[str, Any]] = [
-        {
-            "tool": "get_layout_summary",
-            "args": {},
-            "result": (
-                f"read {len(data['items'])} existing layout item(s), bounds={bounds}, "
-                f"room_zones={len(zones)}"
-            ),
-        }
-    ]
-    plans = plan_flat(
-        style_prompt=style_prompt,
-        constraints=constraints,
-        target=target,
-        bounds=bounds,
-        room_zones=zones,
-    )
-
-    applied_by_room: dict[str, list[int]] = {}
-    skipped_by_room: dict[str, list[str]] = {}
-    for plan in plans:
-        applied, skipped = _apply_room_plan(data, plan, trace)
-        applied_by_room[plan.room_id] = applied
-        skipped_by_room[plan.room_id] = skipped
+    with layout_session() as session:
+        data = _load_layout("design_flat")
+        bounds = _layout_bounds(data)
+        zones = _layout_room_zones(data)
+        trace: list[dict[str, Any]] = [
+            {
+                "tool": "get_layout_summary",
+                "args": {},
+                "result": (
+                    f"read {len(data['items'])} existing layout item(s), bounds={bounds}, "
+                    f"room_zones={len(zones)}"
+                ),
+            }
+        ]
+        plans = plan_flat(
+            style_prompt=style_prompt,
+            constraints=constraints,
+            target=target,
+            bounds=bounds,
+            room_zones=zones,
+        )
 
-    save_err = _save_layout(data)
-    if save_err:
-        return save_err
+        applied_by_room: dict[str, list[int]] = {}
+        skipped_by_room: dict[str, list[str]] = {}
+        for plan in plans:
+            applied, skipped = _apply_room_plan(data, plan, trace)
+            applied_by_room[plan.room_id] = applied
+            skipped_by_room[plan.room_id] = skipped
+        _save_layout(data)
+    if session.error:
+        return session.error
 
     return _format_design_result(
         plans=plans,
@@ -1897,7 +2365,7 @@ def design_flat(
 @mcp.tool()
 def list_objects() -> str:
     """List all objects currently in the layout with their index, type, and position."""
-    data = _load_layout()
+    data = _load_layout("list_objects")
     if not data["items"]:
         return "Layout is empty. No objects placed yet."
 
@@ -1921,7 +2389,7 @@ def add_furniture(
     if furniture_type not in FURNITURE_CATALOG:
         return f"Error: unknown type '{furniture_type}'. Use list_furniture_catalog() to see options."
 
-    data = _load_layout()
+    data = _load_layout("add_furniture")
     item = _build_furniture_item(furniture_type, x, z, rotation_deg)
     data["items"].append(item)
 
@@ -1952,7 +2420,7 @@ def add_wall(
     cx, cz = (x1 + x2) / 2, (z1 + z2) / 2
     angle = -math.atan2(dz, dx)
 
-    data = _load_layout()
+    data = _load_layout("add_wall")
     item = {
         "type": "wall",
         "pos": [cx, max(0.05, height) / 2, cz],
@@ -1975,7 +2443,7 @@ def add_wall(
 @mcp.tool()
 def move_object(index: int, x: float, z: float) -> str:
     """Move an object to a new XZ position."""
-    data = _load_layout()
+    data = _load_layout("move_object")
     if msg := _validate_index(data, index):
         return msg
 
@@ -1993,7 +2461,7 @@ def move_object(index: int, x: float, z: float) -> str:
 @mcp.tool()
 def rotate_object(index: int, rotation_deg: float) -> str:
     """Set an object's rotation in degrees."""
-    data = _load_layout()
+    data = _load_layout("rotate_object")
     if msg := _validate_index(data, index):
         return msg
 
@@ -2008,7 +2476,7 @@ def rotate_object(index: int, rotation_deg: float) -> str:
 @mcp.tool()
 def remove_object(index: int) -> str:
     """Remove an object from the layout by index."""
-    data = _load_layout()
+    data = _load_layout("remove_object")
     if msg := _validate_index(data, index):
         return msg
 
@@ -2023,7 +2491,7 @@ def remove_object(index: int) -> str:
 @mcp.tool()
 def remove_objects_by_type(object_type: str) -> str:
     """Remove all objects of a given type."""
-    data = _load_layout()
+    data = _load_layout("remove_objects_by_type")
     before = len(data["items"])
     data["items"] = [
         item
@@ -2052,13 +2520,13 @@ def clear_layout() -> str:
 @mcp.tool()
 def get_layout_json() -> str:
     """Get the full layout as JSON (for importing into the editor)."""
-    return json.dumps(_load_layout(), indent=2)
+    return jsonio.dumps(_read_layout("get_layout_json"))
 
 
 @mcp.tool()
 def get_object_details(index: int) -> str:
     """Get full details for one object."""
-    data = _load_layout()
+    data = _read_layout("get_object_details")
     if msg := _validate_index(data, index):
         return msg
 
@@ -2082,7 +2550,7 @@ def get_object_details(index: int) -> str:
 @mcp.tool()
 def get_layout_summary() -> str:
     """Get a layout summary: counts, furniture breakdown, hidden count, bounding box."""
-    data = _load_layout()
+    data = _read_layout("get_layout_summary")
     items = data["items"]
     if not items:
         return "Layout is empty."
@@ -2132,7 +2600,7 @@ def resize_object(
     depth: float | None = None,
 ) -> str:
     """Resize an object. Only provided dimensions are changed. Minimum 0.05m."""
-    data = _load_layout()
+    data = _load_layout("resize_object")
     if msg := _validate_index(data, index):
         return msg
 
@@ -2158,7 +2626,7 @@ def resize_object(
 @mcp.tool()
 def set_color(index: int, color: str) -> str:
     """Set an object's color via hex string (e.g. '#ff0000')."""
-    data = _load_layout()
+    data = _load_layout("set_color")
     if msg := _validate_index(data, index):
         return msg
 
@@ -2178,7 +2646,7 @@ def set_color(index: int, color: str) -> str:
 @mcp.tool()
 def set_visibility(index: int, visible: bool) -> str:
     """Show or hide an object."""
-    data = _load_layout()
+    data = _load_layout("set_visibility")
     if msg := _validate_index(data, index):
         return msg
 
@@ -2194,7 +2662,7 @@ def set_visibility(index: int, visible: bool) -> str:
 @mcp.tool()
 def duplicate_object(index: int, x: float, z: float) -> str:
     """Duplicate an object to a new position, preserving all properties."""
-    data = _load_layout()
+    data = _load_layout("duplicate_object")
     if msg := _validate_index(data, index):
         return msg
 
@@ -2214,18 +2682,18 @@ def duplicate_object(index: int, x: float, z: float) -> str:
 @mcp.tool()
 def batch_move(indices: list[int], dx: float, dz: float) -> str:
     """Move multiple objects by a relative offset."""
-    data = _load_layout()
-    for idx in indices:
-        if msg := _validate_index(data, idx):
-            return f"{msg} No objects moved."
-
-    for idx in indices:
-        data["items"][idx]["pos"][0] += dx
-        data["items"][idx]["pos"][2] += dz
-
-    err = _save_layout(data)
-    if err:
-        return err
+    with layout_session() as session:
+        data = _load_layout("batch_move")
+        for idx in indices:
+            if msg := _validate_index(data, idx):
+                return f"{msg} No objects moved."
+
+        for idx in indices:
+            data["items"][idx]["pos"][0] += dx
+            data["items"][idx]["pos"][2] += dz
+        _save_layout(data)
+    if session.error:
+        return session.error
 
     return f"Moved {len(indices)} objects by dx={dx}, dz={dz}."
 
@@ -2233,7 +2701,7 @@ def batch_move(indices: list[int], dx: float, dz: float) -> str:
 @mcp.tool()
 def measure_distance(index1: int, index2: int) -> str:
     """XZ Euclidean distance between two object centers."""
-    data = _load_layout()
+    data = _read_layout("measure_distance")
     if msg := _validate_index(data, index1):
         return msg
     if msg := _validate_index(data, index2):
@@ -2247,10 +2715,11 @@ def measure_distance(index1: int, index2: int) -> str:
 @mcp.tool()
 def find_objects_in_area(x_min: float, z_min: float, x_max: float, z_max: float) -> str:
     """Find all objects whose center falls within an XZ bounding box."""
-    data = _load_layout()
+    data = _read_layout("find_objects_in_area")
     found: list[str] = []
 
-    for i, item in enumerate(data["items"]):
+    for i in _layout_index(data).query_rect((x_min, z_min, x_max, z_max)):
+        item = data["items"][i]
         x, _, z = item["pos"]
         if x_min <= x <= x_max and z_min <= z <= z_max:
             found.append(f"  [{i}] {_item_label(item)} at ({x:.2f}, {z:.2f})")
@@ -2263,7 +2732,7 @@ def find_objects_in_area(x_min: float, z_min: float, x_max: float, z_max: float)
 @mcp.tool()
 def check_overlap(index1: int, index2: int) -> str:
     """AABB overlap check on XZ plane between two objects."""
-    data = _load_layout()
+    data = _read_layout("check_overlap")
     if msg := _validate_index(data, index1):
         return msg
     if msg := _validate_index(data, index2):
@@ -2278,19 +2747,18 @@ def check_overlap(index1: int, index2: int) -> str:
 @mcp.tool()
 def find_nearest(index: int, count: int = 3) -> str:
     """Find N nearest objects by XZ distance, sorted."""
-    data = _load_layout()
+    data = _read_layout("find_nearest")
     if msg := _validate_index(data, index):
         return msg
 
     base = data["items"][index]
-    distances: list[tuple[float, int]] = []
-    for i, item in enumerate(data["items"]):
-        if i == index:
-            continue
-        distances.append((_distance_xz(base, item), i))
-
-    distances.sort(key=lambda d: d[0])
-    results = distances[: max(0, count)]
+    base_x, _, base_z = base["pos"]
+    results = _layout_index(data).nearest(
+        (base_x, base_z, base_x, base_z),
+        lambda i: _distance_xz(base, data["items"][i]),
+        count=max(0, count),
+        accept=lambda i: i != index,
+    )
 
     if not results:
         return "No other objects in layout."
@@ -2311,7 +2779,7 @@ def align_objects(indices: list[int], axis: str, reference: str = "center") -> s
     if not indices:
         return "Error: indices must not be empty."
 
-    data = _load_layout()
+    data = _load_layout("align_objects")
     for idx in indices:
         if msg := _validate_index(data, idx):
             return f"{msg} No changes made."
@@ -2344,7 +2812,7 @@ def distribute_objects(indices: list[int], axis: str) -> str:
     if len(indices) < 3:
         return "Error: need at least 3 objects to distribute."
 
-    data = _load_layout()
+    data = _load_layout("distribute_objects")
     for idx in indices:
         if msg := _validate_index(data, idx):
             return f"{msg} No changes made."
@@ -2372,7 +2840,7 @@ def snap_to_grid(indices: list[int], grid_size: float = 0.25) -> str:
     if grid_size <= 0:
         return "Error: grid_size must be positive."
 
-    data = _load_layout()
+    data = _load_layout("snap_to_grid")
     for idx in indices:
         if msg := _validate_index(data, idx):
             return f"{msg} No changes made."
@@ -2392,7 +2860,7 @@ def snap_to_grid(indices: list[int], grid_size: float = 0.25) -> str:
 @mcp.tool()
 def rename_object(index: int, name: str) -> str:
     """Assign a human-readable label to an object. Empty string removes it."""
-    data = _load_layout()
+    data = _load_layout("rename_object")
     if msg := _validate_index(data, index):
         return msg
 
@@ -2413,7 +2881,7 @@ def rename_object(index: int, name: str) -> str:
 @mcp.tool()
 def find_by_name(name: str) -> str:
     """Case-insensitive substring search on object names."""
-    data = _load_layout()
+    data = _read_layout("find_by_name")
     found: list[str] = []
 
     for i, item in enumerate(data["items"]):
@@ -2430,7 +2898,7 @@ def find_by_name(name: str) -> str:
 @mcp.tool()
 def tag_room(indices: list[int], room_name: str) -> str:
     """Assign a room label to objects."""
-    data = _load_layout()
+    data = _load_layout("tag_room")
     for idx in indices:
         if msg := _validate_index(data, idx):
             return f"{msg} No changes made."
@@ -2448,7 +2916,7 @@ def tag_room(indices: list[int], room_name: str) -> str:
 @mcp.tool()
 def list_rooms() -> str:
     """List all room labels with their object indices and bounding-box area."""
-    data = _load_layout()
+    data = _read_layout("list_rooms")
     rooms: dict[str, list[str]] = {}
 
     for i, item in enumerate(data["items"]):
@@ -2473,7 +2941,7 @@ def list_rooms() -> str:
 @mcp.tool()
 def compute_room_area(room_name: str) -> str:
     """Compute room area from a curated room polygon/bounds or tagged-object bounds."""
-    data = _load_layout()
+    data = _read_layout("compute_room_area")
     zone = _find_room_zone(data, room_name)
     if zone is not None:
         area = _zone_area(zone)
@@ -2507,7 +2975,7 @@ def swap_furniture(index: int, new_type: str) -> str:
     if new_type not in FURNITURE_CATALOG:
         return f"Error: unknown type '{new_type}'. Use list_furniture_catalog()."
 
-    data = _load_layout()
+    data = _load_layout("swap_furniture")
     if msg := _validate_index(data, index):
         return msg
 
@@ -2536,7 +3004,7 @@ def check_sightline(
     include_hidden: bool = False,
 ) -> str:
     """Check if the line of sight between two objects is blocked by others."""
-    data = _load_layout()
+    data = _read_layout("check_sightline")
     if msg := _validate_index(data, index_from):
         return msg
     if msg := _validate_index(data, index_to):
@@ -2579,7 +3047,7 @@ def suggest_furniture_placement(
     if max_distance <= 0 or max_distance < min_distance:
         return "Error: max_distance must be >= min_distance and > 0."
 
-    data = _load_layout()
+    data = _read_layout("suggest_furniture_placement")
     candidates, err = _simulate_candidates(
         data=data,
         furniture_type=furniture_type,
@@ -2629,40 +3097,40 @@ def auto_place_furniture(
     grid_size: float = 0.25,
 ) -> str:
     """Auto-place furniture using the best simulated candidate."""
-    data = _load_layout()
-    candidates, err = _simulate_candidates(
-        data=data,
-        furniture_type=furniture_type,
-        room_name=room_name,
-        near_index=near_index,
-        face_index=face_index,
-        min_distance=min_distance,
-        max_distance=max_distance,
-        require_clear_sightline=require_clear_sightline,
-        max_candidates=max(1, candidate_rank),
-        grid_size=max(0.1, grid_size),
-    )
-    if err:
-        return err
-    if not candidates:
-        return "No valid placements found for the requested constraints."
-
-    idx = max(1, candidate_rank) - 1
-    if idx >= len(candidates):
-        return f"Error: candidate_rank {candidate_rank} exceeds {len(candidates)} available candidate(s)."
-
-    chosen = candidates[idx]
-    item = _build_furniture_item(
-        furniture_type=furniture_type,
-        x=chosen["x"],
-        z=chosen["z"],
-        rotation_deg=chosen["rotation_deg"],
-    )
-    data["items"].append(item)
-
-    save_err = _save_layout(data)
-    if save_err:
-        return save_err
+    with layout_session() as session:
+        data = _load_layout("auto_place_furniture")
+        candidates, err = _simulate_candidates(
+            data=data,
+            furniture_type=furniture_type,
+            room_name=room_name,
+            near_index=near_index,
+            face_index=face_index,
+            min_distance=min_distance,
+            max_distance=max_distance,
+            require_clear_sightline=require_clear_sightline,
+            max_candidates=max(1, candidate_rank),
+            grid_size=max(0.1, grid_size),
+        )
+        if err:
+            return err
+        if not candidates:
+            return "No valid placements found for the requested constraints."
+
+        idx = max(1, candidate_rank) - 1
+        if idx >= len(candidates):
+            return f"Error: candidate_rank {candidate_rank} exceeds {len(candidates)} available candidate(s)."
+
+        chosen = candidates[idx]
+        item = _build_furniture_item(
+            furniture_type=furniture_type,
+            x=chosen["x"],
+            z=chosen["z"],
+            rotation_deg=chosen["rotation_deg"],
+        )
+        data["items"].append(item)
+        _save_layout(data)
+    if session.error:
+        return session.error
 
     new_index = len(data["items"]) - 1
     return (
@@ -2675,7 +3143,7 @@ def auto_place_furniture(
 def simulate_layout_options(requirement: str, room_name: str = "", max_options: int = 3) -> str:
     """Generate simulated multi-object layout options for vague natural-language intents."""
     req = requirement.lower().strip()
-    data = _load_layout()
+    data = _read_layout("simulate_layout_options")
 
     if not req:
         return "Error: requirement must not be empty."
@@ -2783,7 +3251,7 @@ def apply_simulated_option(option_index: int = 1) -> str:
     if idx >= len(_SIMULATION_CACHE):
         return f"Error: option_index {option_index} out of range (1-{len(_SIMULATION_CACHE)})."
 
-    data = _load_layout()
+    data = _load_layout("apply_simulated_option")
     option = _SIMULATION_CACHE[idx]
     items_to_add = option["items"]
 
@@ -2887,7 +3355,7 @@ def apply_room_template(
         return f"Error: unknown template '{template_name}'. Available: {available}"
 
     tpl = ROOM_TEMPLATES[template_name]
-    data = _load_layout()
+    data = _load_layout("apply_room_template")
     placed: list[str] = []
 
     for entry in tpl["items"]:
@@ -2947,7 +3415,7 @@ def suggest_placement_json(
     if max_distance <= 0 or max_distance < min_distance:
         return json.dumps({"error": "max_distance must be >= min_distance and > 0"})
 
-    data = _load_layout()
+    data = _read_layout("suggest_placement_json")
     candidates, err = _simulate_candidates(
         data=data,
         furniture_type=furniture_type,
@@ -3001,7 +3469,7 @@ def suggest_placement_json(
             ],
         })
 
-    return json.dumps({"candidates": enriched}, indent=2)
+    return jsonio.dumps({"candidates": enriched})
 
 
 @mcp.tool()
@@ -3018,7 +3486,7 @@ def score_doorway_accessibility(
     expected on each side — 0.9 m is a common wheelchair-accessible
     standard.
     """
-    data = _load_layout()
+    data = _read_layout("score_doorway_accessibility")
     items = data["items"]
     if door_width <= 0 or required_clearance <= 0:
         return "Error: door_width and required_clearance must be > 0."
@@ -3082,15 +3550,6 @@ def _walkway_corridor_polygon(
     ]
 
 
-def _distance_point_to_polygon(point: tuple[float, float], polygon: list[tuple[float, float]]) -> float:
-    if _point_in_polygon(point, polygon):
-        return 0.0
-    return min(
-        _distance_point_to_segment(point, edge_a, edge_b)
-        for edge_a, edge_b in _polygon_edges(polygon)
-    )
-
-
 @mcp.tool()
 def score_walkway(
     x1: float,
@@ -3098,17 +3557,50 @@ def score_walkway(
     x2: float,
     z2: float,
     min_width: float = 0.9,
+    resolution: float = clearance_field.DEFAULT_RESOLUTION_M,
 ) -> str:
     """Score a walkway/corridor between two points.
 
     Casts a line from (x1,z1) to (x2,z2) and measures the narrowest gap
     on either side.  Returns a 0-1 score based on whether *min_width* is
-    maintained along the full path.
+    maintained along the full path.  *resolution* is the clearance-field
+    cell size in metres; the reported gap is exact at the sampled points.
     """
-    data = _load_layout()
+    return _walkway_report(_read_layout("score_walkway"), x1, z1, x2, z2, min_width, resolution)
+
+
+@mcp.tool()
+def plan_accessible_route(start: str, end: str, profile: str = "wheelchair", width_m: float = 0.0) -> str:
+    """Find the shortest clear route between two rooms, doors or fixtures for a mobility profile.
+
+    *start* and *end* name a room (id, label or kind) or an item (id, name
+    or furniture type). *profile* is an accessibility profile such as
+    ``walker``, ``wheelchair`` or ``caregiver_assisted``; a positive
+    *width_m* overrides its clear path width. Returns JSON with the route
+    status, length, bottleneck width, pinch point and path.
+    """
+    spec = ACCESSIBILITY_PROFILES.get(profile.strip().lower().replace("-", "_").replace(" ", "_"))
+    if spec is None:
+        return _json_result({"ok": False, "error": f"Unknown profile '{profile}'.", "profiles": sorted(ACCESSIBILITY_PROFILES)})
+    width = width_m if width_m > 0 else float(spec["path_min_m"])
+    route = routing.find_route(_read_layout("plan_accessible_route"), start, end, width)
+    return _json_result({"ok": route["status"] != "needs_inputs", "profile": spec["label"], "route": route})
+
+
+def _walkway_report(
+    data: dict[str, Any],
+    x1: float,
+    z1: float,
+    x2: float,
+    z2: float,
+    min_width: float,
+    resolution: float = clearance_field.DEFAULT_RESOLUTION_M,
+) -> str:
     items = data["items"]
     if min_width <= 0:
         return "Error: min_width must be > 0."
+    if resolution <= 0:
+        return "Error: resolution must be > 0."
 
     dx = x2 - x1
     dz = z2 - z1
@@ -3117,32 +3609,26 @@ def score_walkway(
         return "Error: walkway start and end are the same point."
 
     corridor = _walkway_corridor_polygon(x1, z1, x2, z2, min_width)
-    steps = max(2, int(length / 0.25))
-    narrowest = float("inf")
-    narrowest_pos: tuple[float, float] = (x1, z1)
-    obstructions: list[str] = []
+    index = _layout_index(data)
+    field = clearance_field.field_for(index, resolution=resolution)
+    obstructions = [f"[{i}] {_item_label(items[i])}" for i in field.encroaching(corridor)]
+
+    def _visible(i: int) -> bool:
+        return items[i].get("visible", True)
+
+    def _exact(px: float, pz: float) -> float:
+        nearest = index.nearest(
+            (px, pz, px, pz),
+            lambda i: geometry.distance_point_to_polygon((px, pz), index.polygon(i)),
+            accept=_visible,
+        )
+        return nearest[0][0] if nearest else float("inf")
 
-    polygons: list[tuple[int, dict[str, Any], list[tuple[float, float]]]] = []
-    for i, item in enumerate(items):
-        if item.get("visible", True):
-            polygons.append((i, item, _item_polygon(item)))
-
-    for s in range(steps + 1):
-        t = s / steps
-        px = x1 + dx * t
-        pz = z1 + dz * t
-        local_min = float("inf")
-        for i, item, poly in polygons:
-            d = _distance_point_to_polygon((px, pz), poly)
-            if d < local_min:
-                local_min = d
-            if corridor and _polygons_intersect(corridor, poly):
-                label = f"[{i}] {_item_label(item)}"
-                if label not in obstructions:
-                    obstructions.append(label)
-        if local_min < narrowest:
-            narrowest = local_min
-            narrowest_pos = (px, pz)
+    steps = max(2, math.ceil(length / field.resolution))
+    samples = np.linspace(0.0, 1.0, steps + 1)
+    points = np.stack([x1 + dx * samples, z1 + dz * samples], axis=1)
+    narrowest, row = field.narrowest(points, _exact)
+    narrowest_pos = (float(points[row, 0]), float(points[row, 1]))
 
     effective_width = narrowest * 2
     score = round(min(effective_width / min_width, 1.0), 3) if narrowest < float("inf") else 1.0
@@ -3150,7 +3636,7 @@ def score_walkway(
     lines = [
         f"Walkway ({x1:.2f},{z1:.2f}) -> ({x2:.2f},{z2:.2f}), length={length:.2f}m",
         f"Required width: {min_width:.2f}m",
-        "Method: swept corridor polygon with sampled centerline clearance",
+        f"Method: {field.resolution:.3f}m clearance field along the centerline, refined with exact geometry near the minimum",
         f"Narrowest gap: {effective_width:.2f}m at ({narrowest_pos[0]:.2f}, {narrowest_pos[1]:.2f})" if narrowest < float("inf") else "No obstructions detected",
         f"Walkway score: {score}",
     ]
@@ -3170,31 +3656,36 @@ def _profile(profile: str) -> tuple[str, dict[str, Any]]:
     return normalized, STANDARD_PROFILES[normalized]
 
 
-def _visible_layout_polygons(data: dict[str, Any]) -> list[tuple[int, dict[str, Any], list[tuple[float, float]]]]:
-    return [
-        (i, item, _item_polygon(item))
-        for i, item in enumerate(data["items"])
-        if item.get("visible", True) and item.get("type") != "model_part"
-    ]
+def _visible_layout_pairs(data: dict[str, Any], max_gap: float = 0.0) -> list[tuple[int, int]]:
+    items = data["items"]
+    return _layout_index(data).candidate_pairs(
+        max_gap,
+        include=lambda i: items[i].get("visible", True) and items[i].get("type") != "model_part",
+    )
 
 
 def _overlap_warnings(data: dict[str, Any]) -> list[str]:
     warnings: list[str] = []
-    polygons = _visible_layout_polygons(data)
-    for pos, (left_idx, left, left_poly) in enumerate(polygons):
-        for right_idx, right, right_poly in polygons[pos + 1 :]:
-            if _polygons_intersect(left_poly, right_poly):
-                warnings.append(f"[{left_idx}] {_item_label(left)} overlaps [{right_idx}] {_item_label(right)}")
+    items = data["items"]
+    index = _layout_index(data)
+    for left_idx, right_idx in _visible_layout_pairs(data):
+        if _polygons_intersect(index.polygon(left_idx), index.polygon(right_idx)):
+            warnings.append(
+                f"[{left_idx}] {_item_label(items[left_idx])} overlaps [{right_idx}] {_item_label(items[right_idx])}"
+            )
     return warnings
 
 
 def _room_fit_warnings(data: dict[str, Any]) -> list[str]:
     warnings: list[str] = []
+    zones: dict[str, RoomZone | None] = {}
     for i, item in enumerate(data["items"]):
         room_name = str(item.get("room") or "")
         if not room_name:
             continue
-        zone = _find_room_zone(data, room_name)
+        if room_name not in zones:
+            zones[room_name] = _find_room_zone(data, room_name)
+        zone = zones[room_name]
         if zone is None:
             continue
         if not _item_inside_room_zone(item, zone, inset=0.02):
@@ -3204,35 +3695,65 @@ def _room_fit_warnings(data: dict[str, Any]) -> list[str]:
 
 def _clearance_warnings(data: dict[str, Any], clearance_m: float, profile_name: str) -> list[str]:
     warnings: list[str] = []
-    polygons = _visible_layout_polygons(data)
-    for pos, (left_idx, left, left_poly) in enumerate(polygons):
-        for right_idx, right, right_poly in polygons[pos + 1 :]:
-            distance = _polygon_distance(left_poly, right_poly)
-            if distance >= clearance_m:
-                continue
-            left_type = _item_label(left)
-            right_type = _item_label(right)
-            pair = {left_type, right_type}
-            furniture_pair = any(kind in pair for kind in {"bed_queen", "bed_king", "bed_single", "wardrobe", "desk", "chair"})
-            kitchen_pair = any(kind in pair for kind in {"fridge", "sink", "kitchen_counter", "washer"})
-            bathroom_pair = any(kind in pair for kind in {"toilet", "shower", "sink"})
-            if profile_name == "bedroom_basic" and not furniture_pair:
-                continue
-            if profile_name == "kitchen_basic" and not kitchen_pair:
-                continue
-            if profile_name == "bathroom_basic" and not bathroom_pair:
-                continue
-            warnings.append(
-                f"[{left_idx}] {left_type} and [{right_idx}] {right_type} have {distance:.2f}m clearance; target is {clearance_m:.2f}m"
-            )
+    items = data["items"]
+    index = _layout_index(data)
+    for left_idx, right_idx in _visible_layout_pairs(data, clearance_m):
+        distance = _polygon_distance(index.polygon(left_idx), index.polygon(right_idx))
+        if distance >= clearance_m:
+            continue
+        left = items[left_idx]
+        right = items[right_idx]
+        left_type = _item_label(left)
+        right_type = _item_label(right)
+        pair = {left_type, right_type}
+        furniture_pair = any(kind in pair for kind in {"bed_queen", "bed_king", "bed_single", "wardrobe", "desk", "chair"})
+        kitchen_pair = any(kind in pair for kind in {"fridge", "sink", "kitchen_counter", "washer"})
+        bathroom_pair = any(kind in pair for kind in {"toilet", "shower", "sink"})
+        if profile_name == "bedroom_basic" and not furniture_pair:
+            continue
+        if profile_name == "kitchen_basic" and not kitchen_pair:
+            continue
+        if profile_name == "bathroom_basic" and not bathroom_pair:
+            continue
+        warnings.append(
+            f"[{left_idx}] {left_type} and [{right_idx}] {right_type} have {distance:.2f}m clearance; target is {clearance_m:.2f}m"
+        )
     return warnings
 
 
+_HUB_ROOM_KINDS = ("entry", "foyer", "hall", "living")
+
+
+def _room_routes_summary(data: dict[str, Any], min_width: float) -> tuple[float, str] | None:
+    """Score circulation from the hub room to every other room, or None with fewer than two rooms."""
+    rooms = [room for room in data.get("rooms", []) if isinstance(room, dict) and geometry.room_polygon(room)]
+    if len(rooms) < 2:
+        return None
+    hub = next((room for kind in _HUB_ROOM_KINDS for room in rooms if room.get("kind") == kind), rooms[0])
+    hub_name = str(hub.get("id") or hub.get("label"))
+    lines = [f"Room-to-room routes from {hub.get('label') or hub_name} at {min_width:.2f}m clear width:"]
+    score = 1.0
+    for room in rooms:
+        if room is hub:
+            continue
+        name = str(room.get("id") or room.get("label"))
+        route = routing.find_route(data, hub_name, name, min_width)
+        bottleneck = float(route.get("bottleneck_m", 0.0))
+        score = min(score, round(min(bottleneck / min_width, 1.0), 3))
+        detail = f"length={route['length_m']:.2f}m, bottleneck={bottleneck:.2f}m" if "length_m" in route else "no connected route"
+        lines.append(f"  -> {room.get('label') or name}: {route['status']} ({detail})")
+    lines.append(f"Walkway score: {score}")
+    return score, "\n".join(lines)
+
+
 def _walkway_summary_for_profile(data: dict[str, Any], min_width: float) -> tuple[float, str]:
+    routed = _room_routes_summary(data, min_width)
+    if routed is not None:
+        return routed
     x_min, z_min, x_max, z_max = _layout_bounds(data)
     if abs(x_max - x_min) <= 0.01 and abs(z_max - z_min) <= 0.01:
         return 1.0, "No walkway corridor available because the layout is empty or degenerate."
-    result = score_walkway(x_min, z_min, x_max, z_max, min_width=min_width)
+    result = _walkway_report(data, x_min, z_min, x_max, z_max, min_width)
     match = None
     for line in result.splitlines():
         if line.startswith("Walkway score:"):
@@ -3245,9 +3766,9 @@ def _walkway_summary_for_profile(data: dict[str, Any], min_width: float) -> tupl
     return score, result
 
 
-def _layout_quality_assessment(profile: str = "compact_hdb") -> dict[str, Any]:
+def _layout_quality_assessment(tool: str, profile: str = "compact_hdb") -> dict[str, Any]:
     profile_name, spec = _profile(profile)
-    data = _load_layout()
+    data = _read_layout(tool)
     min_walkway = float(spec["min_walkway_m"])
     clearance = float(spec["clearance_m"])
     walkway_score, walkway_text = _walkway_summary_for_profile(data, min_walkway)
@@ -3283,7 +3804,7 @@ def _layout_quality_assessment(profile: str = "compact_hdb") -> dict[str, Any]:
 @mcp.tool()
 def score_layout(profile: str = "compact_hdb") -> str:
     """Score the current layout against a usability/standards profile."""
-    assessment = _layout_quality_assessment(profile)
+    assessment = _layout_quality_assessment("score_layout", profile)
     lines = [
         f"Layout profile: {assessment['label']} ({assessment['profile']})",
         f"Status: {assessment['status'].replace('_', ' ')}",
@@ -3314,20 +3835,20 @@ def _semantic_kind(item: dict[str, Any]) -> str:
     return "furniture"
 
 
-def _semantic_layout() -> dict[str, Any]:
-    return build_semantic_layout(_load_layout())
+def _semantic_layout(tool: str) -> dict[str, Any]:
+    return build_semantic_layout(_read_layout(tool))
 
 
 @mcp.tool()
 def get_semantic_layout_json() -> str:
     """Return semantic layout JSON for future BIM/IFC mapping."""
-    return json.dumps(_semantic_layout(), indent=2)
+    return jsonio.dumps(_semantic_layout("get_semantic_layout_json"))
 
 
 @mcp.tool()
 def bim_readiness_report() -> str:
     """Report how ready the current layout is for BIM/IFC-style mapping."""
-    semantic = _semantic_layout()
+    semantic = _semantic_layout("bim_readiness_report")
     readiness = semantic["bim_readiness"]
     findings = semantic.get("reasoning", {}).get("findings", [])
     quality_status = "needs_revision" if findings else "ready"
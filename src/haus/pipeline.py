@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import contextlib
 import json
+import time
+from collections.abc import Callable, Iterator
 from pathlib import Path
 from typing import Any
 
@@ -10,9 +13,13 @@ import numpy as np
 from .extraction import extract_floor_plan
 from .mesh import extrude_floor_plan, export_glb, floor_plan_to_layout
 from .preprocess import clean_floor_plan
+from .profiling import StageTrace, stage, tracing
 from .render import render_vector_clean
 from .types import FloorPlanData, MetadataDict, VectorizeConfig
 
+# What an unreadable or malformed plan can make the pipeline raise.
+PIPELINE_ERRORS: tuple[type[Exception], ...] = (cv2.error, OSError, ValueError, LookupError, RuntimeError)
+
 
 def _to_serializable(value: Any) -> Any:
     if isinstance(value, Path):
@@ -75,16 +82,57 @@ def _data_to_metadata(
     }
 
 
-def run_vectorize(config: VectorizeConfig) -> MetadataDict:
+@contextlib.contextmanager
+def _timed(
+    timings: dict[str, float] | None,
+    name: str,
+    progress: Callable[[str], None] | None = None,
+) -> Iterator[None]:
+    if progress is not None:
+        progress(name)
+    started = time.perf_counter()
+    try:
+        with stage(name):
+            yield
+    finally:
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+
+
+def run_vectorize(
+    config: VectorizeConfig,
+    timings: dict[str, float] | None = None,
+    progress: Callable[[str], None] | None = None,
+) -> MetadataDict:
+    """Vectorize one floor plan image into *config.out_dir*.
+
+    The returned metadata, and vector.metadata.json, carry a ``trace`` of
+    per-stage and sub-stage timings and memory. When *timings* is given,
+    wall-clock seconds per top-level stage are also accumulated into it.
+    *progress* is called with each stage name as the stage starts.
+    """
+    trace = StageTrace()
+    with tracing(trace):
+        return _run_stages(config, trace, timings, progress)
+
+
+def _run_stages(
+    config: VectorizeConfig,
+    trace: StageTrace,
+    timings: dict[str, float] | None,
+    progress: Callable[[str], None] | None,
+) -> MetadataDict:
     config.out_dir.mkdir(parents=True, exist_ok=True)
 
-    img_bgr = cv2.imread(str(config.image_path))
-    if img_bgr is None:
-        raise ValueError(f"Could not read image: {config.image_path}")
-    img_rgb = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB)
+    with _timed(timings, "read", progress):
+        img_bgr = cv2.imread(str(config.image_path))
+        if img_bgr is None:
+            raise ValueError(f"Could not read image: {config.image_path}")
+        img_rgb = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB)
 
     if config.clean:
-        img_rgb = clean_floor_plan(img_rgb)
+        with _timed(timings, "clean", progress):
+            img_rgb = clean_floor_plan(img_rgb, max_side=config.clean_max_side)
         if config.debug_dir is not None:
             config.debug_dir.mkdir(parents=True, exist_ok=True)
             cv2.imwrite(
@@ -92,18 +140,22 @@ def run_vectorize(config: VectorizeConfig) -> MetadataDict:
                 cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR),
             )
 
-    data, wall_mask, fill_mask = extract_floor_plan(img_rgb)
+    with _timed(timings, "extract", progress):
+        data, wall_mask, fill_mask = extract_floor_plan(img_rgb)
 
     vector_clean_path = config.out_dir / "vector_clean.png"
-    render_vector_clean(data, vector_clean_path)
+    with _timed(timings, "render", progress):
+        render_vector_clean(data, vector_clean_path)
 
     glb_path = config.out_dir / "model.glb"
-    scene = extrude_floor_plan(
-        data,
-        wall_height_m=config.wall_height,
-        scale_override=config.scale_override,
-    )
-    export_glb(scene, glb_path)
+    with _timed(timings, "extrude", progress):
+        scene = extrude_floor_plan(
+            data,
+            wall_height_m=config.wall_height,
+            scale_override=config.scale_override,
+        )
+    with _timed(timings, "export_glb", progress):
+        export_glb(scene, glb_path)
 
     metadata = _data_to_metadata(
         data, config, vector_clean_path,
@@ -122,47 +174,60 @@ def run_vectorize(config: VectorizeConfig) -> MetadataDict:
         "column_count": len(data.columns),
         "opening_count": len(data.openings),
     }
-    layout = floor_plan_to_layout(
-        data,
-        wall_height_m=config.wall_height,
-        scale_override=config.scale_override,
-        metadata=_to_serializable(layout_metadata),
-    )
-    layout_path = config.out_dir / "layout.json"
-    with layout_path.open("w", encoding="utf-8") as f:
-        json.dump(_to_serializable(layout), f, indent=2)
+    with _timed(timings, "layout", progress):
+        layout = floor_plan_to_layout(
+            data,
+            wall_height_m=config.wall_height,
+            scale_override=config.scale_override,
+            metadata=_to_serializable(layout_metadata),
+        )
+        layout_path = config.out_dir / "layout.json"
+        with layout_path.open("w", encoding="utf-8") as f:
+            json.dump(_to_serializable(layout), f, indent=2)
     metadata["output_layout"] = str(layout_path)
 
+    if config.debug_dir is not None:
+        with _timed(timings, "debug_artifacts"):
+            _write_debug_artifacts(config.debug_dir, img_rgb, data, wall_mask, fill_mask)
+
+    metadata["trace"] = trace.to_dict()
     metadata_path = config.out_dir / "vector.metadata.json"
     with metadata_path.open("w", encoding="utf-8") as f:
         json.dump(_to_serializable(metadata), f, indent=2)
 
-    if config.debug_dir is not None:
-        config.debug_dir.mkdir(parents=True, exist_ok=True)
-        cv2.imwrite(str(config.debug_dir / "wall_mask.png"), wall_mask * 255)
-        cv2.imwrite(str(config.debug_dir / "fill_mask.png"), fill_mask * 255)
-
-        overlay = img_rgb.copy()
-        overlay2 = overlay.copy()
-        overlay2[fill_mask > 0] = (255, 0, 0)
-        overlay2[wall_mask > 0] = (0, 255, 0)
-        blend = cv2.addWeighted(overlay, 0.65, overlay2, 0.35, 0.0)
-        cv2.imwrite(str(config.debug_dir / "overlay.png"), cv2.cvtColor(blend, cv2.COLOR_RGB2BGR))
-
-        seg_img = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR)
-        for w in data.walls:
-            color = (0, 255, 0) if w.wall_type == "structural" else (255, 0, 0)
-            cv2.line(seg_img, (w.x1, w.y1), (w.x2, w.y2), color, 2)
-        for o in data.openings:
-            if o.label == "Door":
-                color = (0, 0, 255)
-            elif o.label == "Window":
-                color = (255, 255, 0)
-            else:
-                color = (0, 255, 255)
-            cv2.rectangle(seg_img, (o.x, o.y), (o.x + o.w, o.y + o.h), color, 2)
-        for c in data.columns:
-            cv2.rectangle(seg_img, (c.x, c.y), (c.x + c.w, c.y + c.h), (255, 0, 255), -1)
-        cv2.imwrite(str(config.debug_dir / "segments_overlay.png"), seg_img)
-
     return metadata
+
+
+def _write_debug_artifacts(
+    debug_dir: Path,
+    img_rgb: np.ndarray,
+    data: FloorPlanData,
+    wall_mask: np.ndarray,
+    fill_mask: np.ndarray,
+) -> None:
+    debug_dir.mkdir(parents=True, exist_ok=True)
+    cv2.imwrite(str(debug_dir / "wall_mask.png"), wall_mask * 255)
+    cv2.imwrite(str(debug_dir / "fill_mask.png"), fill_mask * 255)
+
+    overlay = img_rgb.copy()
+    overlay2 = overlay.copy()
+    overlay2[fill_mask > 0] = (255, 0, 0)
+    overlay2[wall_mask > 0] = (0, 255, 0)
+    blend = cv2.addWeighted(overlay, 0.65, overlay2, 0.35, 0.0)
+    cv2.imwrite(str(debug_dir / "overlay.png"), cv2.cvtColor(blend, cv2.COLOR_RGB2BGR))
+
+    seg_img = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR)
+    for w in data.walls:
+        color = (0, 255, 0) if w.wall_type == "structural" else (255, 0, 0)
+        cv2.line(seg_img, (w.x1, w.y1), (w.x2, w.y2), color, 2)
+    for o in data.openings:
+        if o.label == "Door":
+            color = (0, 0, 255)
+        elif o.label == "Window":
+            color = (255, 255, 0)
+        else:
+            color = (0, 255, 255)
+        cv2.rectangle(seg_img, (o.x, o.y), (o.x + o.w, o.y + o.h), color, 2)
+    for c in data.columns:
+        cv2.rectangle(seg_img, (c.x, c.y), (c.x + c.w, c.y + c.h), (255, 0, 255), -1)
+    cv2.imwrite(str(debug_dir / "segments_overlay.png"), seg_img)
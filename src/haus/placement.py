@@ -0,0 +1,347 @@
+"""Batched NumPy geometry for placement candidate screening.
+
+Polygons are packed as ``(N, 4, 2)`` float arrays of oriented-rectangle
+corners in the same winding as ``geometry.item_polygon``. Every kernel
+repeats the scalar arithmetic of ``haus.geometry`` operation for operation,
+so batched and scalar screening agree on which candidates survive.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from . import geometry
+
+_CHUNK_ROWS = 2048
+_SWEEP_BATCH = 1 << 20
+
+
+def oriented_rects(
+    cx: np.ndarray,
+    cz: np.ndarray,
+    cos_r: np.ndarray,
+    sin_r: np.ndarray,
+    half_w: float,
+    half_d: float,
+) -> np.ndarray:
+    """Corner array for rectangles of one size at many centers and rotations."""
+    local_x = np.array([-half_w, half_w, half_w, -half_w])
+    local_z = np.array([-half_d, -half_d, half_d, half_d])
+    cx = cx[:, None]
+    cz = cz[:, None]
+    cos_r = cos_r[:, None]
+    sin_r = sin_r[:, None]
+    xs = cx + local_x * cos_r + local_z * sin_r
+    zs = cz - local_x * sin_r + local_z * cos_r
+    return np.stack([xs, zs], axis=-1)
+
+
+def pack_polygons(polygons: Sequence[geometry.Polygon]) -> np.ndarray:
+    if not polygons:
+        return np.zeros((0, 4, 2))
+    return np.asarray(polygons, dtype=float).reshape(len(polygons), 4, 2)
+
+
+def bounding_boxes(polygons: np.ndarray) -> np.ndarray:
+    """``(N, 4)`` array of ``(x_min, z_min, x_max, z_max)``."""
+    return np.concatenate([polygons.min(axis=1), polygons.max(axis=1)], axis=1)
+
+
+def _axes(polygons: np.ndarray) -> np.ndarray:
+    edges = np.roll(polygons, -1, axis=1) - polygons
+    axis_x = -edges[..., 1]
+    axis_z = edges[..., 0]
+    length = np.hypot(axis_x, axis_z)
+    return np.stack([axis_x / length, axis_z / length], axis=-1)
+
+
+def _project(polygons: np.ndarray, axes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    values = polygons[:, None, :, 0] * axes[:, :, None, 0] + polygons[:, None, :, 1] * axes[:, :, None, 1]
+    return values.min(axis=2), values.max(axis=2)
+
+
+def pair_intersects(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Separating-axis test for aligned pairs ``a[k]`` / ``b[k]``; touching counts."""
+    if not len(a):
+        return np.zeros(0, dtype=bool)
+    axes = np.concatenate([_axes(a), _axes(b)], axis=1)
+    a0, a1 = _project(a, axes)
+    b0, b1 = _project(b, axes)
+    return np.asarray(~((a1 < b0) | (b1 < a0)).any(axis=1), dtype=bool)
+
+
+def _points_to_edges(points: np.ndarray, polygons: np.ndarray) -> np.ndarray:
+    start = polygons[:, None, :, :]
+    end = np.roll(polygons, -1, axis=1)[:, None, :, :]
+    ab_x = end[..., 0] - start[..., 0]
+    ab_z = end[..., 1] - start[..., 1]
+    ab_len_sq = ab_x * ab_x + ab_z * ab_z
+    ap_x = points[:, :, None, 0] - start[..., 0]
+    ap_z = points[:, :, None, 1] - start[..., 1]
+    safe_len_sq = np.where(ab_len_sq <= 1e-12, 1.0, ab_len_sq)
+    t = np.clip((ap_x * ab_x + ap_z * ab_z) / safe_len_sq, 0.0, 1.0)
+    t = np.where(ab_len_sq <= 1e-12, 0.0, t)
+    proj_x = start[..., 0] + t * ab_x
+    proj_z = start[..., 1] + t * ab_z
+    return np.hypot(points[:, :, None, 0] - proj_x, points[:, :, None, 1] - proj_z)
+
+
+def pair_distances(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """``geometry.polygon_distance`` for aligned pairs ``a[k]`` / ``b[k]``."""
+    if not len(a):
+        return np.zeros(0)
+    best = np.minimum(
+        _points_to_edges(a, b).min(axis=(1, 2)),
+        _points_to_edges(b, a).min(axis=(1, 2)),
+    )
+    return np.where(pair_intersects(a, b), 0.0, best)
+
+
+def _touching(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    return (
+        (boxes_a[:, None, 0] <= boxes_b[None, :, 2])
+        & (boxes_b[None, :, 0] <= boxes_a[:, None, 2])
+        & (boxes_a[:, None, 1] <= boxes_b[None, :, 3])
+        & (boxes_b[None, :, 1] <= boxes_a[:, None, 3])
+    )
+
+
+def pair_box_gaps(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """Row-wise ``geometry.rect_gap`` between ``boxes_a[k]`` and ``boxes_b[k]``."""
+    dx = np.maximum(np.maximum(boxes_b[..., 0] - boxes_a[..., 2], boxes_a[..., 0] - boxes_b[..., 2]), 0.0)
+    dz = np.maximum(np.maximum(boxes_b[..., 1] - boxes_a[..., 3], boxes_a[..., 1] - boxes_b[..., 3]), 0.0)
+    return np.hypot(dx, dz)
+
+
+def box_gaps(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """``(N, M)`` ``geometry.rect_gap`` between every box in *boxes_a* and every box in *boxes_b*."""
+    return pair_box_gaps(boxes_a[:, None, :], boxes_b[None, :, :])
+
+
+def pair_boxes_overlap(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """Row-wise ``geometry.rect_intersects``; unlike ``_touching``, shared edges do not count."""
+    return (
+        (boxes_a[..., 0] < boxes_b[..., 2])
+        & (boxes_b[..., 0] < boxes_a[..., 2])
+        & (boxes_a[..., 1] < boxes_b[..., 3])
+        & (boxes_b[..., 1] < boxes_a[..., 3])
+    )
+
+
+def boxes_overlap(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """``(N, M)`` ``geometry.rect_intersects`` between every box in *boxes_a* and every box in *boxes_b*."""
+    return pair_boxes_overlap(boxes_a[:, None, :], boxes_b[None, :, :])
+
+
+def sweep_pairs(boxes: np.ndarray, max_gap: float = 0.0) -> np.ndarray:
+    """``(K, 2)`` index pairs ``i < j`` whose boxes come within *max_gap* on both axes, sorted by ``(i, j)``.
+
+    Sort-and-sweep broad phase: boxes are sorted on ``x_min`` and each one is
+    paired only with the boxes that start before its ``x_max + max_gap``, so
+    the z test runs on those short runs instead of on every pair. Touching
+    boxes are included; callers apply the exact test they need to the pairs.
+    """
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    count = len(boxes)
+    if count < 2:
+        return np.zeros((0, 2), dtype=np.intp)
+    order = np.argsort(boxes[:, 0], kind="stable")
+    ordered = boxes[order]
+    stops = np.searchsorted(ordered[:, 0], ordered[:, 2] + max_gap, side="right")
+    runs = np.maximum(stops - np.arange(1, count + 1), 0)
+    found = [np.zeros((0, 2), dtype=np.intp)]
+    start = 0
+    while start < count:
+        # Rows are taken in batches of about _SWEEP_BATCH candidates to bound memory on crowded axes.
+        stop = start + max(1, int(np.searchsorted(np.cumsum(runs[start:]), _SWEEP_BATCH, side="right")))
+        lengths = runs[start:stop]
+        left = np.repeat(np.arange(start, stop), lengths)
+        right = left + 1 + np.arange(len(left)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        near = (ordered[right, 1] <= ordered[left, 3] + max_gap) & (ordered[left, 1] <= ordered[right, 3] + max_gap)
+        found.append(np.stack([order[left[near]], order[right[near]]], axis=1))
+        start = stop
+    pairs = np.sort(np.concatenate(found), axis=1)
+    return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+
+def box_contacts(boxes_a: ArrayLike, boxes_b: ArrayLike, max_gap: float = 0.0) -> np.ndarray:
+    """``(K, 2)`` ``(a, b)`` pairs of a box from *boxes_a* and one from *boxes_b* within *max_gap*, sorted."""
+    first = np.asarray(boxes_a, dtype=float).reshape(-1, 4)
+    second = np.asarray(boxes_b, dtype=float).reshape(-1, 4)
+    split = len(first)
+    pairs = sweep_pairs(np.concatenate([first, second]), max_gap)
+    pairs = pairs[(pairs[:, 0] < split) & (pairs[:, 1] >= split)]
+    pairs[:, 1] -= split
+    return pairs
+
+
+def any_intersection(candidates: np.ndarray, obstacles: np.ndarray) -> np.ndarray:
+    """Per-candidate flag: does it intersect any obstacle polygon?"""
+    hit = np.zeros(len(candidates), dtype=bool)
+    if not len(candidates) or not len(obstacles):
+        return hit
+    obstacle_boxes = bounding_boxes(obstacles)
+    for start in range(0, len(candidates), _CHUNK_ROWS):
+        chunk = candidates[start : start + _CHUNK_ROWS]
+        rows, cols = np.nonzero(_touching(bounding_boxes(chunk), obstacle_boxes))
+        overlapping = rows[pair_intersects(chunk[rows], obstacles[cols])]
+        hit[start + overlapping] = True
+    return hit
+
+
+def min_distances(candidates: np.ndarray, obstacles: np.ndarray) -> np.ndarray:
+    """Per-candidate minimum polygon distance to any obstacle (``inf`` when there are none).
+
+    The AABB gap bounds polygon distance from below, so exact distances are
+    only evaluated for obstacles whose gap does not exceed the distance to the
+    candidate's nearest-by-AABB obstacle.
+    """
+    result = np.full(len(candidates), np.inf)
+    if not len(candidates) or not len(obstacles):
+        return result
+    obstacle_boxes = bounding_boxes(obstacles)
+    for start in range(0, len(candidates), _CHUNK_ROWS):
+        chunk = candidates[start : start + _CHUNK_ROWS]
+        gaps = box_gaps(bounding_boxes(chunk), obstacle_boxes)
+        rows = np.arange(len(chunk))
+        upper = pair_distances(chunk, obstacles[gaps.argmin(axis=1)])
+        pair_rows, pair_cols = np.nonzero(gaps <= upper[:, None])
+        best = upper.copy()
+        np.minimum.at(best, pair_rows, pair_distances(chunk[pair_rows], obstacles[pair_cols]))
+        result[start + rows] = best
+    return result
+
+
+def pack_items(items: Sequence[dict], padding: float = 0.0) -> np.ndarray:
+    """Corner array for layout item footprints, built from the cached scalar polygons."""
+    return pack_polygons([geometry.item_polygon(item, padding=padding) for item in items])
+
+
+def point_polygon_distances(points: np.ndarray, polygons: np.ndarray) -> np.ndarray:
+    """``(N, M)`` ``geometry.distance_point_to_polygon`` of every point to every polygon."""
+    result = np.zeros((len(points), len(polygons)))
+    if not len(points) or not len(polygons):
+        return result
+    px = points[None, :, None, 0]
+    pz = points[None, :, None, 1]
+    for start in range(0, len(polygons), _CHUNK_ROWS):
+        chunk = polygons[start : start + _CHUNK_ROWS]
+        edge_gap = _points_to_edges(np.broadcast_to(points, (len(chunk), *points.shape)), chunk).min(axis=2)
+        x1 = chunk[:, None, :, 0]
+        z1 = chunk[:, None, :, 1]
+        x2 = np.roll(chunk, -1, axis=1)[:, None, :, 0]
+        z2 = np.roll(chunk, -1, axis=1)[:, None, :, 1]
+        crosses = (z1 > pz) != (z2 > pz)
+        at_x = (x2 - x1) * (pz - z1) / np.where(crosses, z2 - z1, 1.0) + x1
+        inside = (edge_gap <= 1e-9) | (np.count_nonzero(crosses & (px < at_x), axis=2) % 2).astype(bool)
+        result[:, start : start + len(chunk)] = np.where(inside, 0.0, edge_gap).T
+    return result
+
+
+def points_in_polygon(points: np.ndarray, polygon: Sequence[geometry.Point]) -> np.ndarray:
+    """Vectorized ``geometry.point_in_polygon`` for an ``(N, 2)`` point array."""
+    if len(polygon) < 3:
+        return np.zeros(len(points), dtype=bool)
+    vertices = np.asarray(polygon, dtype=float)
+    on_edge = _points_to_edges(points[None, :, :], vertices[None, :, :])[0].min(axis=1) <= 1e-9
+    px = points[:, None, 0]
+    pz = points[:, None, 1]
+    x1 = vertices[None, :, 0]
+    z1 = vertices[None, :, 1]
+    x2 = np.roll(vertices, -1, axis=0)[None, :, 0]
+    z2 = np.roll(vertices, -1, axis=0)[None, :, 1]
+    crosses = (z1 > pz) != (z2 > pz)
+    dz = np.where(crosses, z2 - z1, 1.0)
+    at_x = (x2 - x1) * (pz - z1) / dz + x1
+    inside = (np.count_nonzero(crosses & (px < at_x), axis=1) % 2).astype(bool)
+    return on_edge | inside
+
+
+def _orientation(a_x, a_z, b_x, b_z, c_x, c_z) -> np.ndarray:
+    val = (b_x - a_x) * (c_z - a_z) - (b_z - a_z) * (c_x - a_x)
+    return np.where(np.abs(val) <= 1e-9, 0, np.where(val > 0, 1, -1))
+
+
+def _on_segment(a_x, a_z, p_x, p_z, b_x, b_z) -> np.ndarray:
+    return (
+        (np.minimum(a_x, b_x) - 1e-9 <= p_x)
+        & (p_x <= np.maximum(a_x, b_x) + 1e-9)
+        & (np.minimum(a_z, b_z) - 1e-9 <= p_z)
+        & (p_z <= np.maximum(a_z, b_z) + 1e-9)
+    )
+
+
+def _pair_points_in_polygons(points: np.ndarray, polygons: np.ndarray) -> np.ndarray:
+    on_edge = _points_to_edges(points[:, None, :], polygons)[:, 0, :].min(axis=1) <= 1e-9
+    px = points[:, None, 0]
+    pz = points[:, None, 1]
+    x1 = polygons[..., 0]
+    z1 = polygons[..., 1]
+    x2 = np.roll(polygons, -1, axis=1)[..., 0]
+    z2 = np.roll(polygons, -1, axis=1)[..., 1]
+    crosses = (z1 > pz) != (z2 > pz)
+    at_x = (x2 - x1) * (pz - z1) / np.where(crosses, z2 - z1, 1.0) + x1
+    return on_edge | (np.count_nonzero(crosses & (px < at_x), axis=1) % 2).astype(bool)
+
+
+def segment_hits(starts: np.ndarray, ends: np.ndarray, polygons: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return ``(segment_rows, polygon_rows)`` for every segment that touches a polygon.
+
+    Matches the scalar segment/polygon test used for sightlines: either end
+    inside the polygon, or a proper or collinear crossing of any edge.
+    Pairs are ordered by segment row, then polygon row.
+    """
+    empty = np.zeros(0, dtype=np.intp)
+    if not len(starts) or not len(polygons):
+        return empty, empty
+    polygon_boxes = bounding_boxes(polygons)
+    centers = polygons.mean(axis=1)
+    radii = np.hypot(polygons[..., 0] - centers[:, None, 0], polygons[..., 1] - centers[:, None, 1]).max(axis=1)
+    all_rows: list[np.ndarray] = []
+    all_cols: list[np.ndarray] = []
+    for offset in range(0, len(starts), _CHUNK_ROWS):
+        chunk_starts = starts[offset : offset + _CHUNK_ROWS]
+        chunk_ends = ends[offset : offset + _CHUNK_ROWS]
+        segment_boxes = np.concatenate([np.minimum(chunk_starts, chunk_ends), np.maximum(chunk_starts, chunk_ends)], axis=1)
+        rows, cols = np.nonzero(_touching(segment_boxes, polygon_boxes))
+        # Drop pairs whose polygon lies clearly off the segment's supporting line.
+        seg = chunk_ends[rows] - chunk_starts[rows]
+        offset_to_center = centers[cols] - chunk_starts[rows]
+        seg_len = np.hypot(seg[:, 0], seg[:, 1])
+        line_gap = np.abs(seg[:, 0] * offset_to_center[:, 1] - seg[:, 1] * offset_to_center[:, 0])
+        near_line = (seg_len <= 1e-9) | (line_gap <= (radii[cols] + 1e-6) * seg_len)
+        rows = rows[near_line]
+        cols = cols[near_line]
+        if not len(rows):
+            continue
+        a1 = chunk_starts[rows]
+        a2 = chunk_ends[rows]
+        pairs = polygons[cols]
+
+        a1_x, a1_z = a1[:, None, 0], a1[:, None, 1]
+        a2_x, a2_z = a2[:, None, 0], a2[:, None, 1]
+        b1_x, b1_z = pairs[..., 0], pairs[..., 1]
+        b2 = np.roll(pairs, -1, axis=1)
+        b2_x, b2_z = b2[..., 0], b2[..., 1]
+        o1 = _orientation(a1_x, a1_z, a2_x, a2_z, b1_x, b1_z)
+        o2 = _orientation(a1_x, a1_z, a2_x, a2_z, b2_x, b2_z)
+        o3 = _orientation(b1_x, b1_z, b2_x, b2_z, a1_x, a1_z)
+        o4 = _orientation(b1_x, b1_z, b2_x, b2_z, a2_x, a2_z)
+        crossing = (
+            ((o1 != o2) & (o3 != o4))
+            | ((o1 == 0) & _on_segment(a1_x, a1_z, b1_x, b1_z, a2_x, a2_z))
+            | ((o2 == 0) & _on_segment(a1_x, a1_z, b2_x, b2_z, a2_x, a2_z))
+            | ((o3 == 0) & _on_segment(b1_x, b1_z, a1_x, a1_z, b2_x, b2_z))
+            | ((o4 == 0) & _on_segment(b1_x, b1_z, a2_x, a2_z, b2_x, b2_z))
+        )
+        hit = crossing.any(axis=1)
+        rest = ~hit
+        hit[rest] = _pair_points_in_polygons(a1[rest], pairs[rest]) | _pair_points_in_polygons(a2[rest], pairs[rest])
+        all_rows.append(offset + rows[hit])
+        all_cols.append(cols[hit])
+    if not all_rows:
+        return empty, empty
+    return np.concatenate(all_rows), np.concatenate(all_cols)
@@ -1,7 +1,12 @@
 from __future__ import annotations
+import math
+from collections.abc import Iterator
+
 import cv2
 import numpy as np
 
+from .profiling import stage
+
 _DARK_THRESH = 150
 _FILL_SAT_MIN = 35
 _FILL_VAL_MIN = 60
@@ -14,18 +19,100 @@ _PROT_MIN_AREA = 2000 # primary area threshold for protrusions
 _PROT_DARK_AREA = 1000 # secondary: smaller protrusions with high dark content
 _PROT_DARK_RATIO = 0.35 # secondary: internal dark pixel ratio threshold
 _INPAINT_RADIUS = 5 # radius for Telea inpainting
+_SHELTER_BORDER_REACH = 6 # px _is_shelter's two 7x7 dilations reach past a component
+
 
+def clean_floor_plan(img_rgb: np.ndarray, max_side: int | None = None) -> np.ndarray:
+    """Remove door arcs, AC ledges, service yards, and exterior annotations.
 
-def clean_floor_plan(img_rgb: np.ndarray) -> np.ndarray:
-    """Remove door arcs, AC ledges, service yards, and exterior annotations."""
+    With *max_side*, a plan whose longer side exceeds it is cleaned in pyramid
+    mode: detection runs on a copy downscaled to *max_side*, and each detected
+    region is mapped back and refined at full resolution within its own box.
+    """
     img = img_rgb.copy()
-    img = _erase_hatching(img)
-    img = _erase_protrusions(img)
-    img = _erase_door_arcs(img)
-    img = _erase_exterior_marks(img)
+    if max_side is not None and max(img.shape[:2]) > max_side:
+        return _clean_pyramid(img, max_side)
+    with stage("erase_hatching"):
+        img = _erase_hatching(img)
+    with stage("erase_protrusions"):
+        img = _erase_protrusions(img)
+    with stage("erase_door_arcs"):
+        img = _erase_door_arcs(img)
+    with stage("erase_exterior_marks"):
+        img = _erase_exterior_marks(img)
+    return img
+
+
+def _clean_pyramid(img: np.ndarray, max_side: int) -> np.ndarray:
+    h, w = img.shape[:2]
+    factor = max(h, w) / max_side
+    with stage("downscale"):
+        small = cv2.resize(
+            img, (max(1, round(w / factor)), max(1, round(h / factor))), interpolation=cv2.INTER_AREA
+        )
+    with stage("erase_hatching"):
+        mask = _hatching_mask(small)
+        if np.count_nonzero(mask):
+            small[mask > 0] = 255
+            for box, region in _upscaled_regions(mask, (h, w)):
+                img[box][region > 0] = 255
+    with stage("erase_protrusions"):
+        sh, sw = small.shape[:2]
+        for x0, y0, x1, y1 in _protrusion_boxes(small):
+            x1, y1 = min(x1, sw), min(y1, sh)
+            small[y0:y1, x0:x1] = 255
+            img[
+                math.floor(y0 * h / sh):math.ceil(y1 * h / sh),
+                math.floor(x0 * w / sw):math.ceil(x1 * w / sw),
+            ] = 255
+    with stage("erase_door_arcs"):
+        mask = _door_arc_mask(small)
+        if np.count_nonzero(mask):
+            small = _inpaint_erase(small, mask)
+            # keep only full-res stroke pixels (plus their anti-aliased edge)
+            # of each arc region, then inpaint that region's box
+            pad = 2 * _INPAINT_RADIUS
+            for box, region in _upscaled_regions(mask, (h, w), pad=pad):
+                crop = img[box]
+                dark = (cv2.cvtColor(crop, cv2.COLOR_RGB2GRAY) < _DARK_THRESH).astype(np.uint8)
+                refined = region & cv2.dilate(dark, np.ones((3, 3), np.uint8), iterations=1)
+                img[box] = _inpaint_erase(crop.copy(), refined)
+    with stage("erase_exterior_marks"):
+        mask = _exterior_mark_mask(small)
+        for box, region in _upscaled_regions(mask, (h, w)):
+            img[box][region > 0] = 255
     return img
 
 
+def _upscaled_regions(
+    mask: np.ndarray,
+    shape_hw: tuple[int, int],
+    pad: int = 0,
+) -> Iterator[tuple[tuple[slice, slice], np.ndarray]]:
+    """Yield each component of a downscaled *mask* as a full-resolution box and region.
+
+    The region is the nearest-neighbour upscale of *mask* over the box, which
+    is padded by *pad* full-resolution pixels; nothing outside the boxes is
+    touched.
+    """
+    if not np.count_nonzero(mask):
+        return
+    h, w = shape_hw
+    sh, sw = mask.shape[:2]
+    num, _, stats, _ = cv2.connectedComponentsWithStats((mask > 0).astype(np.uint8), connectivity=8)
+    for i in range(1, num):
+        x, y = int(stats[i, cv2.CC_STAT_LEFT]), int(stats[i, cv2.CC_STAT_TOP])
+        bw, bh = int(stats[i, cv2.CC_STAT_WIDTH]), int(stats[i, cv2.CC_STAT_HEIGHT])
+        x0 = max(0, math.floor(x * w / sw) - pad)
+        y0 = max(0, math.floor(y * h / sh) - pad)
+        x1 = min(w, math.ceil((x + bw) * w / sw) + pad)
+        y1 = min(h, math.ceil((y + bh) * h / sh) + pad)
+        rows = np.minimum(np.arange(y0, y1) * sh // h, sh - 1)
+        cols = np.minimum(np.arange(x0, x1) * sw // w, sw - 1)
+        region = (mask[np.ix_(rows, cols)] > 0).astype(np.uint8)
+        yield (slice(y0, y1), slice(x0, x1)), region
+
+
 def _inpaint_erase(img: np.ndarray, mask: np.ndarray) -> np.ndarray:
     """Erase masked pixels by inpainting from surrounding colors."""
     if np.count_nonzero(mask) == 0:
@@ -43,23 +130,28 @@ def _build_fill_solid(img_rgb: np.ndarray) -> np.ndarray:
         (hsv[:, :, 1] > _FILL_SAT_MIN) & (hsv[:, :, 2] > _FILL_VAL_MIN)
     ).astype(np.uint8)
     sat = cv2.morphologyEx(sat, cv2.MORPH_CLOSE, np.ones((7, 1), np.uint8))
-    num, labels, stats, _ = cv2.connectedComponentsWithStats(sat, connectivity=8)
-    fill = np.zeros_like(sat)
-    for i in range(1, num):
-        if int(stats[i, cv2.CC_STAT_AREA]) >= _FILL_MIN_AREA:
-            fill[labels == i] = 1
+    _, labels, stats, _ = cv2.connectedComponentsWithStats(sat, connectivity=8)
+    fill = _select_components(labels, stats[:, cv2.CC_STAT_AREA] >= _FILL_MIN_AREA)
+    # Components under 100 px never reach here: they are below _FILL_MIN_AREA.
+    # Filling the outer contours of the whole mask solidifies every component;
+    # one nested in another's hole is covered by the outer fill anyway.
     solid = np.zeros_like(fill)
-    num2, labels2, stats2, _ = cv2.connectedComponentsWithStats(fill, connectivity=8)
-    for i in range(1, num2):
-        if int(stats2[i, cv2.CC_STAT_AREA]) < 100:
-            continue
-        comp = (labels2 == i).astype(np.uint8)
-        contours, _ = cv2.findContours(comp, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        for c in contours:
-            cv2.drawContours(solid, [c], -1, 1, thickness=-1)
+    contours, _ = cv2.findContours(fill, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    cv2.drawContours(solid, contours, -1, 1, thickness=-1)
     return solid
 
 
+def _select_components(labels: np.ndarray, keep: np.ndarray) -> np.ndarray:
+    """Mask of the connected components whose label is flagged in *keep*.
+
+    One table lookup over the label image, instead of a ``labels == i`` pass
+    per component.
+    """
+    table = np.asarray(keep, dtype=np.uint8).copy()
+    table[0] = 0
+    return table[labels]
+
+
 def _build_wall_mask(dark: np.ndarray) -> np.ndarray:
     """Wall pixels: survive directional morphological opening."""
     k_h = np.ones((1, _WALL_OPEN_LEN), np.uint8)
@@ -71,7 +163,14 @@ def _build_wall_mask(dark: np.ndarray) -> np.ndarray:
 
 
 def _erase_door_arcs(img: np.ndarray) -> np.ndarray:
-    """Erase quarter-circle door swing arcs (solid and dashed).
+    erase = _door_arc_mask(img)
+    if np.count_nonzero(erase):
+        img = _inpaint_erase(img, erase)
+    return img
+
+
+def _door_arc_mask(img: np.ndarray) -> np.ndarray:
+    """Mask quarter-circle door swing arcs (solid and dashed).
 
     Phase 1: HoughCircles on original + closed image. Only erases pixels
              from CCs whose majority lies on the detected ring (prevents
@@ -85,15 +184,14 @@ def _erase_door_arcs(img: np.ndarray) -> np.ndarray:
     min_r = max(20, min(h, w) // 20)
     max_r = max(60, min(h, w) // 5)
 
-    # precompute residual CCs (non-wall dark) for per-CC ring validation
+    # precompute residual CCs (non-wall dark) for per-CC ring validation;
+    # every residual pixel is dark and off-wall by construction
     residual = cv2.bitwise_and(dark, cv2.bitwise_not(walls))
     num, labels, stats, _ = cv2.connectedComponentsWithStats(residual, connectivity=8)
-    # cache CC areas
-    cc_areas = np.zeros(num, dtype=np.int32)
-    for i in range(1, num):
-        cc_areas[i] = int(stats[i, cv2.CC_STAT_AREA])
-
-    erase = np.zeros((h, w), dtype=np.uint8)
+    cc_areas = stats[:, cv2.CC_STAT_AREA]
+    arc_pixels = residual > 0
+    # components confirmed as arcs, erased in one lookup at the end
+    arc_ids = np.zeros(num, dtype=bool)
 
     def _detect_hough_arcs(src_gray):
         blurred = cv2.GaussianBlur(src_gray, (9, 9), 2)
@@ -106,23 +204,28 @@ def _erase_door_arcs(img: np.ndarray) -> np.ndarray:
             return
         for cx, cy, r in circles[0]:
             cx, cy, r = int(cx), int(cy), int(r)
-            ring = np.zeros_like(erase)
-            cv2.circle(ring, (cx, cy), r, 1, max(4, int(r * 0.15)))
-            ring_mask = (ring > 0) & (dark > 0) & (walls == 0)
+            thickness = max(4, int(r * 0.15))
+            # draw the ring into its bounding box only, not a full frame
+            pad = r + thickness
+            x0, y0 = max(0, cx - pad), max(0, cy - pad)
+            x1, y1 = min(w, cx + pad + 1), min(h, cy + pad + 1)
+            if x0 >= x1 or y0 >= y1:
+                continue
+            ring = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+            cv2.circle(ring, (cx - x0, cy - y0), r, 1, thickness)
+            ring_mask = (ring > 0) & arc_pixels[y0:y1, x0:x1]
             if np.count_nonzero(ring_mask) < 20:
                 continue
             # per-CC validation: only erase CCs where >40% of their pixels
             # lie on the ring (true arc segments). skip text CCs that just
             # happen to intersect the ring.
-            ring_labels = labels[ring_mask]
-            hit_ids = set(ring_labels) - {0}
-            for cc_id in hit_ids:
+            hit_ids, on_ring = np.unique(labels[y0:y1, x0:x1][ring_mask], return_counts=True)
+            for cc_id, count in zip(hit_ids, on_ring):
                 total = cc_areas[cc_id]
-                if total < 5:
+                if cc_id == 0 or total < 5:
                     continue
-                on_ring = np.count_nonzero(ring_labels == cc_id)
-                if on_ring / total > 0.4:
-                    erase[(labels == cc_id) & (dark > 0) & (walls == 0)] = 1
+                if count / total > 0.4:
+                    arc_ids[cc_id] = True
 
     # phase 1a: solid arcs
     _detect_hough_arcs(gray)
@@ -134,20 +237,18 @@ def _erase_door_arcs(img: np.ndarray) -> np.ndarray:
     _detect_hough_arcs(gray_closed)
 
     # phase 2: residual non-wall dark CCs that look like arcs
-    for i in range(1, num):
-        a = int(stats[i, cv2.CC_STAT_AREA])
-        bw = int(stats[i, cv2.CC_STAT_WIDTH])
-        bh = int(stats[i, cv2.CC_STAT_HEIGHT])
-        fr = a / max(bw * bh, 1)
-        aspect = max(bw, bh) / max(min(bw, bh), 1)
-        # arcs: low fill ratio, near-square bbox, reasonable size
-        if fr < 0.18 and aspect < 2.0 and 80 < a < 15000 and min(bw, bh) > 15:
-            erase[labels == i] = 1
+    a = stats[:, cv2.CC_STAT_AREA].astype(np.float64)
+    bw = stats[:, cv2.CC_STAT_WIDTH]
+    bh = stats[:, cv2.CC_STAT_HEIGHT]
+    fr = a / np.maximum(bw * bh, 1)
+    aspect = np.maximum(bw, bh) / np.maximum(np.minimum(bw, bh), 1)
+    # arcs: low fill ratio, near-square bbox, reasonable size
+    arc_ids |= (fr < 0.18) & (aspect < 2.0) & (a > 80) & (a < 15000) & (np.minimum(bw, bh) > 15)
 
+    erase = _select_components(labels, arc_ids)
     if np.count_nonzero(erase):
         erase = cv2.dilate(erase, np.ones((3, 3), np.uint8), iterations=1)
-        img = _inpaint_erase(img, erase)
-    return img
+    return erase
 
 
 def _is_shelter(comp: np.ndarray, dark: np.ndarray) -> bool:
@@ -180,44 +281,56 @@ def _detect_hatching(img_rgb: np.ndarray) -> np.ndarray:
     hatch_raw = (density > 0.25).astype(np.uint8)
     hatch_raw = cv2.morphologyEx(hatch_raw, cv2.MORPH_CLOSE,
                                  np.ones((5, 5), np.uint8))
-    num, labels, stats, _ = cv2.connectedComponentsWithStats(hatch_raw, connectivity=8)
+    _, labels, stats, _ = cv2.connectedComponentsWithStats(hatch_raw, connectivity=8)
     h, w = gray.shape
     max_dim = max(100, min(h, w) // 3)
-    hatch = np.zeros(gray.shape, dtype=np.uint8)
-    for i in range(1, num):
-        area = int(stats[i, cv2.CC_STAT_AREA])
-        bw = int(stats[i, cv2.CC_STAT_WIDTH])
-        bh = int(stats[i, cv2.CC_STAT_HEIGHT])
-        if area > 200 and bw > 10 and bh > 10 and max(bw, bh) < max_dim:
-            hatch[labels == i] = 1
-    return hatch
+    area = stats[:, cv2.CC_STAT_AREA]
+    bw = stats[:, cv2.CC_STAT_WIDTH]
+    bh = stats[:, cv2.CC_STAT_HEIGHT]
+    return _select_components(labels, (area > 200) & (bw > 10) & (bh > 10) & (np.maximum(bw, bh) < max_dim))
 
 
 def _erase_hatching(img: np.ndarray) -> np.ndarray:
     """Erase AC ledge rooms identified by hatching at the floor plan boundary."""
+    erase = _hatching_mask(img)
+    if np.count_nonzero(erase):
+        img[erase > 0] = 255
+    return img
+
+
+def _hatching_mask(img: np.ndarray) -> np.ndarray:
     hatching = _detect_hatching(img)
     if np.count_nonzero(hatching) == 0:
-        return img
+        return hatching
     solid = _build_fill_solid(img)
     gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
     dark = (gray < _DARK_THRESH).astype(np.uint8) * 255
     h, w = img.shape[:2]
     num, labels, stats, _ = cv2.connectedComponentsWithStats(hatching, connectivity=8)
     erase = np.zeros(img.shape[:2], dtype=np.uint8)
+    walls: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
     for i in range(1, num):
-        comp = (labels == i).astype(np.uint8)
-        hatch_area = np.count_nonzero(comp)
-        fill_overlap = np.count_nonzero((comp > 0) & (solid > 0))
+        x = int(stats[i, cv2.CC_STAT_LEFT])
+        y = int(stats[i, cv2.CC_STAT_TOP])
+        bw = int(stats[i, cv2.CC_STAT_WIDTH])
+        bh = int(stats[i, cv2.CC_STAT_HEIGHT])
+        comp_box = labels[y:y + bh, x:x + bw] == i
+        hatch_area = int(stats[i, cv2.CC_STAT_AREA])
+        fill_overlap = np.count_nonzero(comp_box & (solid[y:y + bh, x:x + bw] > 0))
         fill_ratio = fill_overlap / max(hatch_area, 1)
         if fill_ratio < 0.35: # boundary hatching (AC ledge)
-            ys, xs = np.where(comp > 0)
-            seed = (int(xs.mean()), int(ys.mean()))
-            v_walls = cv2.morphologyEx(dark, cv2.MORPH_OPEN,
-                                       np.ones((_WALL_OPEN_LEN, 1), np.uint8))
-            h_walls = cv2.morphologyEx(dark, cv2.MORPH_OPEN,
-                                       np.ones((1, _WALL_OPEN_LEN), np.uint8))
+            ys, xs = np.nonzero(comp_box)
+            seed = (int((xs + x).mean()), int((ys + y).mean()))
+            if walls is None:
+                # the wall split depends only on the image, so build it once
+                v_open = cv2.morphologyEx(dark, cv2.MORPH_OPEN,
+                                          np.ones((_WALL_OPEN_LEN, 1), np.uint8))
+                h_open = cv2.morphologyEx(dark, cv2.MORPH_OPEN,
+                                          np.ones((1, _WALL_OPEN_LEN), np.uint8))
+                walls = (v_open, h_open, ((v_open > 0) & (h_open == 0)).astype(np.uint8))
+            v_walls, h_walls, vert_only = walls
             barrier = cv2.bitwise_or(v_walls, h_walls)
-            vert_only = ((v_walls > 0) & (h_walls == 0)).astype(np.uint8)
+            comp = (labels == i).astype(np.uint8)
             comp_exp = cv2.dilate(comp, np.ones((3, 15), np.uint8), iterations=2)
             barrier[(comp_exp > 0) & (vert_only > 0)] = 0
             # thicken barrier to close small gaps that cause flood leaks
@@ -232,16 +345,22 @@ def _erase_hatching(img: np.ndarray) -> np.ndarray:
             if 100 < room_area < max_room:
                 room_dilated = cv2.dilate(room, np.ones((7, 7), np.uint8), iterations=2)
                 erase = cv2.bitwise_or(erase, room_dilated)
-    if np.count_nonzero(erase):
-        img[erase > 0] = 255
-    return img
+    return erase
 
 
 def _erase_protrusions(img: np.ndarray) -> np.ndarray:
     """Erase AC ledges and service yards using two-pass close+open."""
+    h, w = img.shape[:2]
+    for x0, y0, x1, y1 in _protrusion_boxes(img):
+        img[y0:min(y1, h), x0:min(x1, w)] = 255
+    return img
+
+
+def _protrusion_boxes(img: np.ndarray) -> list[tuple[int, int, int, int]]:
+    """Bounding boxes ``(x0, y0, x1, y1)``, with margin, around protrusions to blank."""
     solid = _build_fill_solid(img)
     if np.count_nonzero(solid) < 1000:
-        return img
+        return []
     gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
     dark = (gray < _DARK_THRESH).astype(np.uint8) * 255
     h, w = solid.shape
@@ -261,48 +380,55 @@ def _erase_protrusions(img: np.ndarray) -> np.ndarray:
         num, labels, stats, _ = cv2.connectedComponentsWithStats(prot, connectivity=8)
         for i in range(1, num):
             area = int(stats[i, cv2.CC_STAT_AREA])
-            comp = (labels == i).astype(np.uint8)
             if area < _PROT_DARK_AREA:
                 continue
-            if _is_shelter(comp, dark):
+            # work in the component's box, padded by the shelter border's reach
+            pad = _SHELTER_BORDER_REACH
+            x0 = max(0, int(stats[i, cv2.CC_STAT_LEFT]) - pad)
+            y0 = max(0, int(stats[i, cv2.CC_STAT_TOP]) - pad)
+            x1 = min(w, int(stats[i, cv2.CC_STAT_LEFT] + stats[i, cv2.CC_STAT_WIDTH]) + pad)
+            y1 = min(h, int(stats[i, cv2.CC_STAT_TOP] + stats[i, cv2.CC_STAT_HEIGHT]) + pad)
+            comp = (labels[y0:y1, x0:x1] == i).astype(np.uint8)
+            dark_box = dark[y0:y1, x0:x1]
+            if _is_shelter(comp, dark_box):
                 continue
-            if area >= _PROT_MIN_AREA or _dark_ratio(comp, dark) >= _PROT_DARK_RATIO:
-                erase = cv2.bitwise_or(erase, comp)
+            if area >= _PROT_MIN_AREA or _dark_ratio(comp, dark_box) >= _PROT_DARK_RATIO:
+                erase[y0:y1, x0:x1] |= comp
     if np.count_nonzero(erase) == 0:
-        return img
-    num_e, labels_e, stats_e, _ = cv2.connectedComponentsWithStats(erase, connectivity=8)
-    zone = np.zeros_like(erase)
+        return []
+    num_e, _, stats_e, _ = cv2.connectedComponentsWithStats(erase, connectivity=8)
+    boxes = []
     for i in range(1, num_e):
         cw = int(stats_e[i, cv2.CC_STAT_WIDTH])
         ch = int(stats_e[i, cv2.CC_STAT_HEIGHT])
         margin = min(max(20, cw // 3, ch // 3), 45)
         x = max(0, int(stats_e[i, cv2.CC_STAT_LEFT]) - margin)
         y = max(0, int(stats_e[i, cv2.CC_STAT_TOP]) - margin)
-        bw_e = cw + 2 * margin
-        bh_e = ch + 2 * margin
-        zone[y:min(y + bh_e, h), x:min(x + bw_e, w)] = 1
-    img[zone > 0] = 255
-    return img
+        boxes.append((x, y, x + cw + 2 * margin, y + ch + 2 * margin))
+    return boxes
 
 
 def _erase_exterior_marks(img: np.ndarray) -> np.ndarray:
     """Erase dark marks (text, arrows, dimension labels) outside the unit."""
+    mask = _exterior_mark_mask(img)
+    if np.count_nonzero(mask):
+        img[mask > 0] = 255
+    return img
+
+
+def _exterior_mark_mask(img: np.ndarray) -> np.ndarray:
     solid = _build_fill_solid(img)
     if np.count_nonzero(solid) < 1000:
-        return img
+        return np.zeros(img.shape[:2], dtype=np.uint8)
     interior = cv2.dilate(
         solid, np.ones((_EXTERIOR_DILATE, _EXTERIOR_DILATE), np.uint8), iterations=1
     )
     gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
     exterior_dark = ((gray < _DARK_THRESH) & (interior == 0)).astype(np.uint8)
     if np.count_nonzero(exterior_dark) == 0:
-        return img
-    num, labels, stats, _ = cv2.connectedComponentsWithStats(exterior_dark, connectivity=8)
-    erase = np.zeros_like(exterior_dark)
-    for i in range(1, num):
-        if int(stats[i, cv2.CC_STAT_AREA]) < _EXTERIOR_MAX_AREA:
-            erase[labels == i] = 1
+        return exterior_dark
+    _, labels, stats, _ = cv2.connectedComponentsWithStats(exterior_dark, connectivity=8)
+    erase = _select_components(labels, stats[:, cv2.CC_STAT_AREA] < _EXTERIOR_MAX_AREA)
     if np.count_nonzero(erase):
-        mask = cv2.dilate(erase, np.ones((3, 3), np.uint8), iterations=1)
-        img[mask > 0] = 255
-    return img
+        erase = cv2.dilate(erase, np.ones((3, 3), np.uint8), iterations=1)
+    return erase
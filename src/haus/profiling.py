@@ -0,0 +1,145 @@
+"""Nested stage timing and memory traces for the image pipeline.
+
+Pipeline code marks its steps with ``with stage("name"):``. The marks cost a
+context-variable lookup unless a `StageTrace` is active, in which case each
+span records wall-clock time, the process peak RSS when it ended and, while
+`tracemalloc` is tracing, the Python allocation peak inside the span.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import sys
+import time
+import tracemalloc
+from collections.abc import Iterator
+from typing import Any
+
+_ACTIVE_TRACE: contextvars.ContextVar[StageTrace | None] = contextvars.ContextVar("haus_stage_trace", default=None)
+
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+class _Span:
+    __slots__ = ("children", "elapsed_s", "mem_peak", "mem_start", "name", "record", "started")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.started = time.perf_counter()
+        self.elapsed_s = 0.0
+        self.children: list[_Span] = []
+        self.mem_start = 0
+        self.mem_peak = 0
+        self.record: dict[str, Any] = {}
+
+    def to_dict(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {"name": self.name, "elapsed_s": round(self.elapsed_s, 6), **self.record}
+        if self.children:
+            payload["children"] = [child.to_dict() for child in self.children]
+        return payload
+
+
+class StageTrace:
+    """Tree of timed spans for one pipeline run."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.spans: list[_Span] = []
+        self._stack: list[_Span] = []
+
+    @contextlib.contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        parent = self._stack[-1] if self._stack else None
+        node = _Span(name)
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            # tracemalloc keeps a single peak, so fold it into the parent before
+            # resetting it for this span.
+            current, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent.mem_peak = max(parent.mem_peak, peak)
+            tracemalloc.reset_peak()
+            node.mem_start = node.mem_peak = current
+        (parent.children if parent is not None else self.spans).append(node)
+        self._stack.append(node)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            node.elapsed_s = time.perf_counter() - node.started
+            rss = _peak_rss_mb()
+            if rss is not None:
+                node.record["peak_rss_mb"] = rss
+            if tracing and tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                node.mem_peak = max(node.mem_peak, peak)
+                node.record["alloc_peak_kb"] = round((node.mem_peak - node.mem_start) / 1024, 1)
+                node.record["alloc_net_kb"] = round((current - node.mem_start) / 1024, 1)
+                if parent is not None:
+                    parent.mem_peak = max(parent.mem_peak, node.mem_peak)
+                tracemalloc.reset_peak()
+
+    def to_dict(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {
+            "total_s": round(time.perf_counter() - self.started, 6),
+            "stages": [span.to_dict() for span in self.spans],
+        }
+        rss = _peak_rss_mb()
+        if rss is not None:
+            payload["peak_rss_mb"] = rss
+        payload["tracemalloc"] = tracemalloc.is_tracing()
+        return payload
+
+
+@contextlib.contextmanager
+def tracing(trace: StageTrace) -> Iterator[StageTrace]:
+    """Make *trace* collect the `stage` marks run inside the block."""
+    token = _ACTIVE_TRACE.set(trace)
+    try:
+        yield trace
+    finally:
+        _ACTIVE_TRACE.reset(token)
+
+
+@contextlib.contextmanager
+def stage(name: str) -> Iterator[None]:
+    trace = _ACTIVE_TRACE.get()
+    if trace is None:
+        yield
+        return
+    with trace.span(name):
+        yield
+
+
+def flatten(trace: dict[str, Any], field: str = "elapsed_s") -> dict[str, float]:
+    """Map dotted stage paths such as ``clean.erase_door_arcs`` to *field*.
+
+    Repeated spans at the same path add their times; other fields, such as
+    ``peak_rss_mb``, keep the largest value.
+    """
+    flat: dict[str, float] = {}
+
+    def walk(spans: list[dict[str, Any]], prefix: str) -> None:
+        for span in spans:
+            path = f"{prefix}{span['name']}"
+            if field in span:
+                value = float(span[field])
+                if path not in flat:
+                    flat[path] = value
+                elif field == "elapsed_s":
+                    flat[path] += value
+                else:
+                    flat[path] = max(flat[path], value)
+            walk(span.get("children", []), f"{path}.")
+
+    walk(trace.get("stages", []), "")
+    return flat
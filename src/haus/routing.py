@@ -0,0 +1,417 @@
+"""Grid path-finding for circulation and accessibility routes.
+
+A layout is rasterized once per version into a clearance field whose
+obstacles are the visible furniture, fixtures and walls, with doorways cut
+back through any wall drawn across them. A route for a mobility profile
+only uses cells whose clearance is at least half the profile's width, so
+the grid is effectively inflated by the profile. A* finds the shortest such
+route between two endpoints (rooms, doors or fixtures), and thresholded
+connected components give the widest width any route between them allows.
+"""
+
+from __future__ import annotations
+
+import copy
+import heapq
+import itertools
+import math
+from collections import OrderedDict
+from typing import Any
+
+import cv2
+import numpy as np
+
+from . import clearance_field, geometry, placement
+from .spatial_index import LayoutSpatialIndex, item_key
+
+DEFAULT_NAV_RESOLUTION_M = 0.05
+# Doorways are cut through walls at least this deep, so a thin door leaf still opens the wall.
+_OPENING_DEPTH_M = 0.6
+# Gaps up to this wide between rooms (shared walls, drafting slop) are closed so they do not split the plan.
+_ROOM_TOLERANCE_M = 0.3
+# Room endpoints stop this far inside the room, so neighbouring rooms only meet through a doorway.
+_ROOM_INSET_M = 0.15
+# How close a route must come to a fixture's footprint to count as reaching it.
+_REACH_M = 0.3
+# Fixture approach areas are precomputed for route radii up to this size.
+_MAX_RADIUS_M = 1.5
+_OPENING_TYPES = {"door", "opening"}
+_WALKABLE_TYPES = {"door", "opening", "window", "rug", "threshold"}
+_MAX_CACHED_NAVIGATORS = 4
+_MAX_CACHED_ROUTES = 256
+# Octile steps: (row offset, column offset, length in cells).
+_STEPS = tuple((dr, dc, math.hypot(dr, dc)) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc)
+
+
+def _key(text: Any) -> str:
+    return str(text or "").strip().lower().replace("_", " ").replace("-", " ")
+
+
+def _blocks(item: Any) -> bool:
+    return (
+        isinstance(item, dict)
+        and bool(item.get("visible", True))
+        and item.get("type") not in _WALKABLE_TYPES
+        and item.get("furnitureType") not in _WALKABLE_TYPES
+    )
+
+
+def _is_opening(item: Any) -> bool:
+    return isinstance(item, dict) and item.get("type") in _OPENING_TYPES
+
+
+def _opening_polygon(item: dict[str, Any], inset: float = 0.0) -> geometry.Polygon:
+    _, height, depth = geometry.item_dimensions(item)
+    cx, cz = geometry.item_center(item)
+    width = max(0.0, (geometry.door_width(item) or geometry.item_dimensions(item)[0]) - inset)
+    cutout = {"pos": [cx, 0.0, cz], "rot": item.get("rot", 0.0), "geo": [width, height, max(depth, _OPENING_DEPTH_M)]}
+    return geometry.item_polygon(cutout)
+
+
+def _label(item: dict[str, Any]) -> str:
+    return str(item.get("name") or item.get("furnitureType") or item.get("type") or item.get("id") or "object")
+
+
+def _navigation_key(layout: dict[str, Any]) -> tuple[Any, ...]:
+    items = layout.get("items", [])
+    rooms = layout.get("rooms", [])
+    return (
+        tuple(
+            (
+                item_key(item),
+                item.get("type"),
+                item.get("furnitureType"),
+                item.get("visible", True),
+                item.get("id"),
+                item.get("name"),
+                geometry.door_width(item) if _is_opening(item) else None,
+            )
+            if isinstance(item, dict)
+            else None
+            for item in (items if isinstance(items, list) else [])
+        ),
+        tuple(
+            (room.get("id"), room.get("label"), room.get("kind"), tuple(geometry.room_polygon(room) or ()))
+            for room in (rooms if isinstance(rooms, list) else [])
+            if isinstance(room, dict)
+        ),
+    )
+
+
+class Navigator:
+    """Navigation raster and route cache for one version of a layout.
+
+    The navigator copies what it needs at build time, so later edits to the
+    layout never leak into cached routes; ``navigator_for`` builds a new one
+    when the layout's geometry changes.
+    """
+
+    def __init__(self, layout: dict[str, Any], resolution: float = DEFAULT_NAV_RESOLUTION_M) -> None:
+        items = [item for item in layout.get("items", []) if isinstance(item, dict)]
+        self.items = [
+            {"id": item.get("id"), "label": _label(item), "keys": self._item_names(item), "opening": _is_opening(item)}
+            for item in items
+        ]
+        self.footprints = [
+            _opening_polygon(item) if _is_opening(item) else geometry.item_polygon(item) for item in items
+        ]
+        self.rooms = [
+            (room, polygon)
+            for room in layout.get("rooms", [])
+            if isinstance(room, dict) and (polygon := geometry.room_polygon(room))
+        ]
+        # Cut one cell narrower than the opening: raster fills include their boundary cells,
+        # which would otherwise widen every doorway by a cell.
+        openings = [_opening_polygon(item, inset=resolution) for item in items if _is_opening(item)]
+        extent = None
+        if self.rooms:
+            corners = [point for _, polygon in self.rooms for point in polygon]
+            extent = (
+                min(point[0] for point in corners),
+                min(point[1] for point in corners),
+                max(point[0] for point in corners),
+                max(point[1] for point in corners),
+            )
+        index = LayoutSpatialIndex(items)
+        self.field = clearance_field.ClearanceField(
+            index,
+            resolution=resolution,
+            margin=1.0,
+            obstacles=[row for row, item in enumerate(items) if _blocks(item)],
+            openings=openings,
+            extent=extent,
+        )
+        self.resolution = self.field.resolution
+        if self.rooms:
+            region = self.field.fill([polygon for _, polygon in self.rooms]).astype(np.uint8)
+            radius = max(1, round(_ROOM_TOLERANCE_M / self.resolution))
+            kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2 * radius + 1, 2 * radius + 1))
+            self.region = cv2.morphologyEx(region, cv2.MORPH_CLOSE, kernel).astype(bool) | self.field.fill(openings)
+            # The edge of the plan bounds a route just like a wall does.
+            edge = cv2.distanceTransform(self.region.astype(np.uint8), cv2.DIST_L2, cv2.DIST_MASK_PRECISE)
+            self.clearance = np.minimum(self.field.distances, edge * self.resolution)
+        else:
+            self.region = np.ones(self.field.distances.shape, dtype=bool)
+            self.clearance = self.field.distances
+        self._item_gaps: dict[int, tuple[tuple[slice, slice], np.ndarray]] = {}
+        self._room_cells: dict[str, np.ndarray] = {}
+        self._components: dict[float, np.ndarray] = {}
+        self.routes: OrderedDict[tuple[str, str, float], dict[str, Any]] = OrderedDict()
+
+    @staticmethod
+    def _item_names(item: dict[str, Any]) -> list[str]:
+        return [_key(item.get(field)) for field in ("id", "name", "furnitureType", "type") if item.get(field)]
+
+    def passable(self, radius: float) -> np.ndarray:
+        return self.region & (self.clearance >= max(radius, 1e-6))
+
+    def _labels(self, radius: float) -> np.ndarray:
+        labels = self._components.get(radius)
+        if labels is None:
+            _, labels = cv2.connectedComponents(self.passable(radius).astype(np.uint8), connectivity=8)
+            self._components[radius] = labels
+        return labels
+
+    def _room_match(self, spec: str) -> geometry.Polygon | None:
+        wanted = _key(spec)
+        for room, polygon in self.rooms:
+            if wanted in {_key(room.get("id")), _key(room.get("label")), _key(room.get("kind"))}:
+                return polygon
+        return None
+
+    def _item_match(self, spec: str) -> int | None:
+        wanted = _key(spec)
+        tests = (
+            lambda names: names[:1] == [wanted],
+            lambda names: wanted in names,
+            lambda names: any(name.startswith(wanted) for name in names),
+            lambda names: any(wanted in name for name in names),
+        )
+        for test in tests:
+            for row, item in enumerate(self.items):
+                if test(item["keys"]):
+                    return row
+        return None
+
+    def _gaps_to(self, row: int) -> tuple[tuple[slice, slice], np.ndarray]:
+        """Distance from the cells around item *row* to its footprint, within the widest reach used."""
+        cached = self._item_gaps.get(row)
+        if cached is None:
+            field = self.field
+            polygon = self.footprints[row]
+            reach = _REACH_M + _MAX_RADIUS_M + field.resolution
+            x_min, z_min, x_max, z_max = geometry.polygon_bbox(polygon)
+            rows, cols = field.distances.shape
+            r0 = max(0, math.floor((z_min - reach - field.origin[1]) / field.resolution))
+            r1 = min(rows, math.ceil((z_max + reach - field.origin[1]) / field.resolution) + 1)
+            c0 = max(0, math.floor((x_min - reach - field.origin[0]) / field.resolution))
+            c1 = min(cols, math.ceil((x_max + reach - field.origin[0]) / field.resolution) + 1)
+            grid_r, grid_c = np.mgrid[r0:r1, c0:c1]
+            centers = field.cell_centers(grid_r.ravel(), grid_c.ravel())
+            gaps = placement.point_polygon_distances(centers, placement.pack_polygons([polygon]))[:, 0]
+            cached = ((slice(r0, r1), slice(c0, c1)), gaps.reshape(grid_r.shape))
+            self._item_gaps[row] = cached
+        return cached
+
+    def endpoint(self, spec: str, radius: float) -> np.ndarray | None:
+        """Cells a route of *radius* may start or end on for *spec*, or None if nothing matches."""
+        polygon = self._room_match(spec)
+        if polygon is not None:
+            cells = self._room_cells.get(_key(spec))
+            if cells is None:
+                inset = max(1, round(_ROOM_INSET_M / self.resolution))
+                kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2 * inset + 1, 2 * inset + 1))
+                cells = cv2.erode(self.field.fill([polygon]).astype(np.uint8), kernel).astype(bool)
+                self._room_cells[_key(spec)] = cells
+            return cells & self.passable(radius)
+        row = self._item_match(spec)
+        if row is None:
+            return None
+        window, gaps = self._gaps_to(row)
+        mask = np.zeros(self.field.distances.shape, dtype=bool)
+        mask[window] = gaps <= radius + _REACH_M
+        return mask & self.passable(radius)
+
+    def widest(self, start: str, end: str) -> float:
+        """Largest clearance radius at which *start* and *end* are still connected (0 if never)."""
+        distances = self.clearance[self.region]
+        thresholds = np.unique(distances[np.isfinite(distances) & (distances > 0)])
+        if np.isinf(distances).any():
+            thresholds = np.append(thresholds, np.inf)
+        lo, hi, best = 0, len(thresholds) - 1, 0.0
+        while lo <= hi:
+            middle = (lo + hi) // 2
+            radius = float(thresholds[middle])
+            if self._connected(start, end, radius):
+                best = radius
+                lo = middle + 1
+            else:
+                hi = middle - 1
+        return best
+
+    def _connected(self, start: str, end: str, radius: float) -> bool:
+        sources = self.endpoint(start, radius)
+        goals = self.endpoint(end, radius)
+        if sources is None or goals is None or not sources.any() or not goals.any():
+            return False
+        labels = self._labels(radius)
+        return bool(np.intersect1d(labels[sources], labels[goals]).size)
+
+    def shortest_path(self, start: str, end: str, radius: float) -> list[tuple[int, int]]:
+        """A* over cells with at least *radius* clearance; empty when the endpoints are not connected."""
+        sources = self.endpoint(start, radius)
+        goals = self.endpoint(end, radius)
+        if sources is None or goals is None or not sources.any() or not goals.any():
+            return []
+        rows, cols = sources.shape
+        # Flat Python lists: per-cell numpy indexing dominates the search otherwise.
+        passable = self.passable(radius).ravel().tolist()
+        goal_cells = goals.ravel().tolist()
+        # Octile distance to the goal cells' bounding box never overestimates the remaining cost.
+        goal_rows, goal_cols = np.nonzero(goals)
+        grid_r, grid_c = np.indices((rows, cols))
+        dr = np.maximum(np.maximum(goal_rows.min() - grid_r, grid_r - goal_rows.max()), 0)
+        dc = np.maximum(np.maximum(goal_cols.min() - grid_c, grid_c - goal_cols.max()), 0)
+        heuristic = (np.maximum(dr, dc) + (math.sqrt(2.0) - 1.0) * np.minimum(dr, dc)).ravel().tolist()
+
+        best = [math.inf] * (rows * cols)
+        came_from = [-1] * (rows * cols)
+        heap: list[tuple[float, float, int]] = []
+        for flat in np.flatnonzero(sources).tolist():
+            best[flat] = 0.0
+            heap.append((heuristic[flat], 0.0, flat))
+        heapq.heapify(heap)
+        while heap:
+            _, cost, flat = heapq.heappop(heap)
+            if cost > best[flat]:
+                continue
+            if goal_cells[flat]:
+                path = [divmod(flat, cols)]
+                while came_from[flat] >= 0:
+                    flat = came_from[flat]
+                    path.append(divmod(flat, cols))
+                return path[::-1]
+            r, c = divmod(flat, cols)
+            for dr, dc, step in _STEPS:
+                nr, nc = r + dr, c + dc
+                if not (0 <= nr < rows and 0 <= nc < cols):
+                    continue
+                neighbour = nr * cols + nc
+                if not passable[neighbour]:
+                    continue
+                # No cutting corners past an obstacle cell.
+                if dr and dc and not (passable[r * cols + nc] and passable[nr * cols + c]):
+                    continue
+                candidate = cost + step
+                if candidate < best[neighbour]:
+                    best[neighbour] = candidate
+                    came_from[neighbour] = flat
+                    heapq.heappush(heap, (candidate + heuristic[neighbour], candidate, neighbour))
+        return []
+
+    def route(self, start: str, end: str, width_m: float) -> dict[str, Any]:
+        """Shortest route of at least *width_m* clear width, or the widest route when none fits."""
+        cache_key = (_key(start), _key(end), round(width_m, 4))
+        cached = self.routes.get(cache_key)
+        if cached is not None:
+            self.routes.move_to_end(cache_key)
+            return cached
+        result: dict[str, Any] = {
+            "start": start,
+            "end": end,
+            "required_width_m": round(width_m, 3),
+            "resolution_m": round(self.resolution, 3),
+        }
+        missing = [spec for spec in (start, end) if self._room_match(spec) is None and self._item_match(spec) is None]
+        if missing:
+            result.update(status="needs_inputs", missing=missing, path=[], blockers=[])
+            return self._remember(cache_key, result)
+        widest = self.widest(start, end)
+        radius = min(width_m / 2, widest)
+        cells = self.shortest_path(start, end, radius) if widest > 0 else []
+        if not cells:
+            result.update(status="no_route", bottleneck_m=0.0, path=[], blockers=[])
+            return self._remember(cache_key, result)
+        path_rows = np.array([cell[0] for cell in cells])
+        path_cols = np.array([cell[1] for cell in cells])
+        clearance = self.clearance[path_rows, path_cols]
+        pinch = int(np.argmin(clearance))
+        pinch_point = self.field.cell_centers(path_rows[pinch : pinch + 1], path_cols[pinch : pinch + 1])
+        length = sum(math.hypot(a[0] - b[0], a[1] - b[1]) for a, b in itertools.pairwise(cells)) * self.resolution
+        result.update(
+            status="clear" if widest >= width_m / 2 else "blocked",
+            length_m=round(length, 2),
+            bottleneck_m=round(min(2 * widest, 99.0), 2),
+            clear_width_m=round(min(2 * float(clearance[pinch]), 99.0), 2),
+            pinch_point={"x": round(float(pinch_point[0, 0]), 3), "z": round(float(pinch_point[0, 1]), 3)},
+            path=self._polyline(path_rows, path_cols),
+            blockers=self._blockers(pinch_point, float(clearance[pinch])) if widest < width_m / 2 else [],
+        )
+        return self._remember(cache_key, result)
+
+    def _remember(self, key: tuple[str, str, float], result: dict[str, Any]) -> dict[str, Any]:
+        self.routes[key] = result
+        while len(self.routes) > _MAX_CACHED_ROUTES:
+            self.routes.popitem(last=False)
+        return result
+
+    def _polyline(self, rows: np.ndarray, cols: np.ndarray) -> list[dict[str, float]]:
+        """Cell path reduced to its turning points."""
+        keep = [0]
+        for i in range(1, len(rows) - 1):
+            if (rows[i] - rows[i - 1], cols[i] - cols[i - 1]) != (rows[i + 1] - rows[i], cols[i + 1] - cols[i]):
+                keep.append(i)
+        if len(rows) > 1:
+            keep.append(len(rows) - 1)
+        points = self.field.cell_centers(rows[keep], cols[keep])
+        return [{"x": round(float(x), 3), "z": round(float(z), 3)} for x, z in points]
+
+    def _blockers(self, point: np.ndarray, clearance: float) -> list[dict[str, Any]]:
+        """Obstacles that pinch the route at *point*, nearest first."""
+        field = self.field
+        if not field.polygons:
+            return []
+        gaps = placement.point_polygon_distances(point, field.packed)[0]
+        near = np.flatnonzero(gaps <= clearance + 2 * field.error)
+        ordered = near[np.argsort(gaps[near], kind="stable")]
+        return [
+            {"item_id": self.items[field.obstacles[row]]["id"], "label": self.items[field.obstacles[row]]["label"]}
+            for row in ordered[:5]
+        ]
+
+
+_NAVIGATORS: OrderedDict[tuple[Any, ...], Navigator] = OrderedDict()
+
+
+def navigator_for(layout: dict[str, Any], resolution: float = DEFAULT_NAV_RESOLUTION_M) -> Navigator:
+    """Return the navigator for this version of *layout*, building it on first use."""
+    key = (_navigation_key(layout), resolution)
+    navigator = _NAVIGATORS.get(key)
+    if navigator is None:
+        navigator = Navigator(layout, resolution=resolution)
+        _NAVIGATORS[key] = navigator
+        while len(_NAVIGATORS) > _MAX_CACHED_NAVIGATORS:
+            _NAVIGATORS.popitem(last=False)
+    else:
+        _NAVIGATORS.move_to_end(key)
+    return navigator
+
+
+def find_route(
+    layout: dict[str, Any],
+    start: str,
+    end: str,
+    width_m: float,
+    *,
+    resolution: float = DEFAULT_NAV_RESOLUTION_M,
+) -> dict[str, Any]:
+    """Shortest clear route between two rooms, doors or fixtures for a *width_m* wide user.
+
+    ``status`` is ``clear`` when a route of the full width exists,
+    ``blocked`` when only a narrower one does (the path returned is then the
+    widest route), ``no_route`` when the endpoints are not connected at all
+    and ``needs_inputs`` when an endpoint names nothing in the layout.
+    ``bottleneck_m`` is the widest width any route between the endpoints
+    allows; ``clear_width_m`` is the narrowest point of the returned path.
+    """
+    return copy.deepcopy(navigator_for(layout, resolution=resolution).route(start, end, width_m))
@@ -1,16 +1,20 @@
 from __future__ import annotations
 
 import copy
+import hashlib
 import json
+import threading
 import uuid
-from collections import deque
+from collections import OrderedDict, deque
+from collections.abc import Callable
 from datetime import datetime, timezone
 from importlib.resources import files
 from typing import Any, cast
 
 from . import geometry
 from .constraints import DEFAULT_CONSTRAINT_PACKS, load_constraint_packs, merge_constraint_targets
-from .workbench import build_validation_report, migrate_layout, validate_layout_schema
+from .spatial_index import LayoutSpatialIndex
+from .workbench import build_validation_report, migrate_item, migrate_layout, migrate_room, validate_layout_schema
 
 SEMANTIC_SCHEMA_ID = "haus.semantic_layout.v1"
 LAYOUT_GRAPH_SCHEMA_ID = "haus.layout_graph.v1"
@@ -19,6 +23,9 @@ MULTIMODAL_INTAKE_SCHEMA_ID = "haus.multimodal_intake.v1"
 AGENT_EVAL_SUITE_SCHEMA_ID = "haus.agent_eval_suite.v1"
 
 SEVERITY_ORDER = {"info": 0, "warning": 1, "serious": 2, "blocked": 3}
+_GRAPH_MEMO_SIZE = 8
+
+_PairDistance = Callable[[Any, Any], float]
 
 
 def _now_iso() -> str:
@@ -46,22 +53,6 @@ def _rect_dict(rect: geometry.Rect) -> dict[str, float]:
     return {"x_min": _round(rect[0]), "z_min": _round(rect[1]), "x_max": _round(rect[2]), "z_max": _round(rect[3])}
 
 
-def _bounds_from_polygon(polygon: geometry.Polygon) -> geometry.Rect:
-    xs = [point[0] for point in polygon]
-    zs = [point[1] for point in polygon]
-    return (min(xs), min(zs), max(xs), max(zs))
-
-
-def _polygon_area(polygon: geometry.Polygon) -> float:
-    if len(polygon) < 3:
-        return 0.0
-    total = 0.0
-    for index, (x1, z1) in enumerate(polygon):
-        x2, z2 = polygon[(index + 1) % len(polygon)]
-        total += x1 * z2 - x2 * z1
-    return abs(total) / 2
-
-
 def _room_label(room: dict[str, Any]) -> str:
     return _text(room.get("label") or room.get("name") or room.get("id"), "Room")
 
@@ -82,7 +73,7 @@ def _rooms(layout: dict[str, Any]) -> list[dict[str, Any]]:
         polygon = geometry.room_polygon(room)
         if polygon is None:
             continue
-        bounds = _bounds_from_polygon(polygon)
+        bounds = geometry.polygon_bbox(polygon)
         room_id = _room_id(room, index)
         rooms.append(
             {
@@ -127,7 +118,7 @@ def _public_rooms(rooms: list[dict[str, Any]]) -> list[dict[str, Any]]:
                 "kind": room["kind"],
                 "bounds": _rect_dict(room["bounds"]),
                 "polygon": [_point_dict(point) for point in polygon],
-                "area_m2": _round(_polygon_area(polygon)),
+                "area_m2": _round(geometry.polygon_area(polygon)),
                 "source": room["source"],
                 "confidence": room["confidence"],
                 "locked": room["locked"],
@@ -197,36 +188,33 @@ def _item_id(item: dict[str, Any], index: int) -> str:
     return _text(item.get("id"), f"item-{index + 1}")
 
 
+def _public_object(item: dict[str, Any], index: int, rooms: list[dict[str, Any]]) -> dict[str, Any]:
+    width, height, depth = geometry.item_dimensions(item)
+    center = geometry.item_center(item)
+    return {
+        "id": _item_id(item, index),
+        "index": index,
+        "label": _item_label(item),
+        "semantic_kind": _semantic_kind(item),
+        "type": item.get("type", "object"),
+        "furniture_type": item.get("furnitureType"),
+        "room_id": _assigned_room_id(item, rooms),
+        "position_m": {"x": _round(center[0]), "y": _round(_num(item.get("pos", [0, 0, 0])[1] if isinstance(item.get("pos"), list) and len(item.get("pos", [])) > 1 else 0.0)), "z": _round(center[1])},
+        "rotation_y_rad": _round(_num(item.get("rot"), 0.0)),
+        "dimensions_m": {"width": _round(width), "height": _round(height), "depth": _round(depth)},
+        "footprint": [_point_dict(point) for point in geometry.item_polygon(item)],
+        "bounds": _rect_dict(geometry.item_rect(item)),
+        "visible": bool(item.get("visible", True)),
+        "locked": bool(item.get("locked", False)),
+        "movable": bool(item.get("movable", True)),
+        "confidence": _text(item.get("confidence"), "estimated"),
+        "structural_status": item.get("structural_status") if item.get("type") == "wall" else None,
+        "source": _text(item.get("source"), "layout"),
+    }
+
+
 def _public_objects(layout: dict[str, Any], rooms: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    objects = []
-    for index, item in enumerate(layout.get("items", [])):
-        if not isinstance(item, dict):
-            continue
-        width, height, depth = geometry.item_dimensions(item)
-        center = geometry.item_center(item)
-        objects.append(
-            {
-                "id": _item_id(item, index),
-                "index": index,
-                "label": _item_label(item),
-                "semantic_kind": _semantic_kind(item),
-                "type": item.get("type", "object"),
-                "furniture_type": item.get("furnitureType"),
-                "room_id": _assigned_room_id(item, rooms),
-                "position_m": {"x": _round(center[0]), "y": _round(_num(item.get("pos", [0, 0, 0])[1] if isinstance(item.get("pos"), list) and len(item.get("pos", [])) > 1 else 0.0)), "z": _round(center[1])},
-                "rotation_y_rad": _round(_num(item.get("rot"), 0.0)),
-                "dimensions_m": {"width": _round(width), "height": _round(height), "depth": _round(depth)},
-                "footprint": [_point_dict(point) for point in geometry.item_polygon(item)],
-                "bounds": _rect_dict(geometry.item_rect(item)),
-                "visible": bool(item.get("visible", True)),
-                "locked": bool(item.get("locked", False)),
-                "movable": bool(item.get("movable", True)),
-                "confidence": _text(item.get("confidence"), "estimated"),
-                "structural_status": item.get("structural_status") if item.get("type") == "wall" else None,
-                "source": _text(item.get("source"), "layout"),
-            }
-        )
-    return objects
+    return [_public_object(item, index, rooms) for index, item in enumerate(layout.get("items", [])) if isinstance(item, dict)]
 
 
 def _openings(layout: dict[str, Any], rooms: list[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -278,19 +266,31 @@ def _openings(layout: dict[str, Any], rooms: list[dict[str, Any]]) -> list[dict[
     return openings
 
 
-def _adjacency_edges(rooms: list[dict[str, Any]], openings: list[dict[str, Any]]) -> list[dict[str, Any]]:
+def _room_distance(left: dict[str, Any], right: dict[str, Any]) -> float:
+    return geometry.polygon_distance(left["polygon"], right["polygon"])
+
+
+def _item_distance(left: dict[str, Any], right: dict[str, Any]) -> float:
+    return geometry.polygon_distance(geometry.item_polygon(left), geometry.item_polygon(right))
+
+
+def _adjacency_edges(
+    rooms: list[dict[str, Any]],
+    openings: list[dict[str, Any]],
+    distance: _PairDistance = _room_distance,
+) -> list[dict[str, Any]]:
     edges: dict[tuple[str, str], dict[str, Any]] = {}
     for index, left in enumerate(rooms):
         for right in rooms[index + 1 :]:
-            distance = geometry.polygon_distance(left["polygon"], right["polygon"])
-            if distance <= 0.08:
+            distance_m = distance(left, right)
+            if distance_m <= 0.08:
                 left_id, right_id = sorted((str(left["id"]), str(right["id"])))
                 key = (left_id, right_id)
                 edges[key] = {
                     "from": key[0],
                     "to": key[1],
                     "relation": "adjacent",
-                    "distance_m": _round(distance),
+                    "distance_m": _round(distance_m),
                     "evidence": "room_boundary",
                 }
     for opening in openings:
@@ -333,17 +333,22 @@ def _affordance_for_item(item: dict[str, Any]) -> str | None:
 
 def _zones(layout: dict[str, Any], rooms: list[dict[str, Any]], objects: list[dict[str, Any]], openings: list[dict[str, Any]]) -> list[dict[str, Any]]:
     zones = []
-    object_by_id = {obj["id"]: obj for obj in objects}
+    objects_by_room: dict[Any, list[dict[str, Any]]] = {}
+    for obj in objects:
+        objects_by_room.setdefault(obj.get("room_id"), []).append(obj)
+    window_room_ids = {
+        room_id
+        for opening in openings
+        if "window" in str(opening.get("type", "")).lower()
+        for room_id in opening.get("room_ids", [])
+    }
     for room in rooms:
-        room_objects = [obj for obj in objects if obj.get("room_id") == room["id"]]
+        room_objects = objects_by_room.get(room["id"], [])
         affordances = sorted({aff for obj in room_objects if (aff := _affordance_for_item(layout["items"][obj["index"]]))})
         kind = str(room["kind"])
         service = any(aff in {"cook", "bathe", "laundry"} for aff in affordances) or any(word in kind for word in ("kitchen", "bath", "wc", "laundry"))
-        daylight = any(
-            "window" in str(opening.get("type", "")).lower() and room["id"] in opening.get("room_ids", [])
-            for opening in openings
-        )
-        daylight = daylight or any("window" in str(object_by_id[obj["id"]].get("label", "")).lower() for obj in room_objects)
+        daylight = room["id"] in window_room_ids
+        daylight = daylight or any("window" in str(obj.get("label", "")).lower() for obj in room_objects)
         zones.append(
             {
                 "id": f"zone-{room['id']}",
@@ -373,7 +378,13 @@ def _constraint_disclaimers(packs: list[dict[str, Any]]) -> list[str]:
     return [str(pack.get("disclaimer")) for pack in packs if pack.get("disclaimer")]
 
 
-def _constraint_findings(layout: dict[str, Any], rooms: list[dict[str, Any]], objects: list[dict[str, Any]], targets: dict[str, Any]) -> list[dict[str, Any]]:
+def _constraint_findings(
+    layout: dict[str, Any],
+    rooms: list[dict[str, Any]],
+    objects: list[dict[str, Any]],
+    targets: dict[str, Any],
+    distance: _PairDistance = _item_distance,
+) -> list[dict[str, Any]]:
     findings: list[dict[str, Any]] = []
     calibration = layout.get("metadata", {}).get("calibration", {})
     if not isinstance(calibration, dict) or not calibration.get("scale_m_per_px") or not calibration.get("user_confirmed"):
@@ -430,33 +441,34 @@ def _constraint_findings(layout: dict[str, Any], rooms: list[dict[str, Any]], ob
                 )
             )
 
-    for left_index, left in enumerate(items):
-        for right in items[left_index + 1 :]:
-            if left.get("type") in {"reference_image", "model_part"} or right.get("type") in {"reference_image", "model_part"}:
-                continue
-            distance = geometry.polygon_distance(geometry.item_polygon(left), geometry.item_polygon(right))
-            if distance == 0.0:
-                findings.append(
-                    _finding(
-                        "serious",
-                        "overlap",
-                        f"{_item_label(left)} overlaps {_item_label(right)}.",
-                        "Move, resize, or remove one item before applying the scenario.",
-                        target="geometry",
-                        evidence={"item_ids": [left.get("id"), right.get("id")]},
-                    )
+    # footprints further apart than the clearance target can never produce a
+    # finding, so only pairs the grid index reports within it are measured
+    solid = [item.get("type") not in {"reference_image", "model_part"} for item in items]
+    for left_index, right_index in LayoutSpatialIndex(items).candidate_pairs(clearance, include=solid.__getitem__):
+        left, right = items[left_index], items[right_index]
+        distance_m = distance(left, right)
+        if distance_m == 0.0:
+            findings.append(
+                _finding(
+                    "serious",
+                    "overlap",
+                    f"{_item_label(left)} overlaps {_item_label(right)}.",
+                    "Move, resize, or remove one item before applying the scenario.",
+                    target="geometry",
+                    evidence={"item_ids": [left.get("id"), right.get("id")]},
                 )
-            elif clearance and distance < clearance:
-                findings.append(
-                    _finding(
-                        "warning",
-                        "tight_clearance",
-                        f"{_item_label(left)} is {distance:.2f}m from {_item_label(right)}; target is {clearance:.2f}m.",
-                        "Move furniture or lower the selected profile target if the tight gap is intentional.",
-                        target="clearance_m",
-                        evidence={"item_ids": [left.get("id"), right.get("id")], "clearance_m": _round(distance), "target_m": clearance},
-                    )
+            )
+        elif clearance and distance_m < clearance:
+            findings.append(
+                _finding(
+                    "warning",
+                    "tight_clearance",
+                    f"{_item_label(left)} is {distance_m:.2f}m from {_item_label(right)}; target is {clearance:.2f}m.",
+                    "Move furniture or lower the selected profile target if the tight gap is intentional.",
+                    target="clearance_m",
+                    evidence={"item_ids": [left.get("id"), right.get("id")], "clearance_m": _round(distance_m), "target_m": clearance},
                 )
+            )
 
     if turning:
         for room in rooms:
@@ -558,18 +570,13 @@ def _bfs_path(graph: dict[str, set[str]], start: str, target: str) -> list[str]:
     return []
 
 
-def build_layout_graph(layout: dict[str, Any], constraint_pack_ids: list[str] | tuple[str, ...] | None = None) -> dict[str, Any]:
-    migrated = migrate_layout(layout)
-    packs = load_constraint_packs(constraint_pack_ids)
-    targets = merge_constraint_targets(tuple(str(pack["id"]) for pack in packs))
-    rooms = _rooms(migrated)
-    objects = _public_objects(migrated, rooms)
-    openings = _openings(migrated, rooms)
-    adjacency = _adjacency_edges(rooms, openings)
-    zones = _zones(migrated, rooms, objects, openings)
-    findings = _constraint_findings(migrated, rooms, objects, targets)
-    validation = build_validation_report(migrated)
-    for warning in validation.get("warnings", []):
+def _digest(value: Any) -> str:
+    return hashlib.blake2b(json.dumps(value, sort_keys=True, default=str).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _validation_findings(report: dict[str, Any]) -> list[dict[str, Any]]:
+    findings = []
+    for warning in report.get("warnings", []):
         if isinstance(warning, dict):
             findings.append(
                 _finding(
@@ -581,22 +588,227 @@ def build_layout_graph(layout: dict[str, Any], constraint_pack_ids: list[str] |
                     evidence=warning.get("geometry") if isinstance(warning.get("geometry"), dict) else {},
                 )
             )
-    return {
-        "schema": LAYOUT_GRAPH_SCHEMA_ID,
-        "semantic_schema": SEMANTIC_SCHEMA_ID,
-        "generated_at": _now_iso(),
-        "units": "meters",
-        "constraint_pack_ids": [pack["id"] for pack in packs],
-        "constraint_targets": targets,
-        "rooms": _public_rooms(rooms),
-        "objects": objects,
-        "openings": openings,
-        "adjacency": adjacency,
-        "zones": zones,
-        "routes": _routes(rooms, adjacency),
-        "findings": _dedupe_findings(findings),
-        "disclaimers": sorted(set(_constraint_disclaimers(packs))),
-    }
+    return findings
+
+
+# The item fields geometry.item_rect measures a footprint from.
+_FOOTPRINT_FIELDS = ("id", "pos", "geo", "rot", "x", "z", "width_m", "depth_m")
+
+
+def _footprint(item: dict[str, Any]) -> dict[str, Any]:
+    return {field: copy.copy(item[field]) for field in _FOOTPRINT_FIELDS if field in item}
+
+
+class LayoutGraphEngine:
+    """Builds layout graphs, reusing the work of earlier builds.
+
+    Whole graphs are memoized on a digest of the layout's items, rooms and
+    metadata plus the constraint packs, so re-reading an unchanged layout
+    costs one hash. After an edit, public objects, room-pair and item-pair
+    distances are looked up by the digests of the entries involved, so only
+    the rooms and items that changed are measured again; validation findings
+    are reused while the content digest is unchanged across pack selections,
+    and otherwise re-checked only for the items changed since the last report.
+    """
+
+    def __init__(self, memo_size: int = _GRAPH_MEMO_SIZE) -> None:
+        self.memo_size = memo_size
+        self._lock = threading.Lock()
+        self._graphs: OrderedDict[tuple[str, tuple[str, ...]], dict[str, Any]] = OrderedDict()
+        self._objects: dict[tuple[str, str], dict[str, Any]] = {}
+        self._room_distances: dict[tuple[str, str], float] = {}
+        self._item_distances: dict[tuple[str, str], float] = {}
+        self._validation: tuple[str, list[dict[str, Any]]] | None = None
+        # rooms digest, report and id -> (digest, item) of the last validated layout
+        self._validation_state: tuple[str, dict[str, Any], dict[Any, tuple[str, dict[str, Any]]]] | None = None
+        self._counters = {"hits": 0, "misses": 0, "reused": 0, "computed": 0}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._graphs.clear()
+            self._objects.clear()
+            self._room_distances.clear()
+            self._item_distances.clear()
+            self._validation = None
+            self._validation_state = None
+
+    def stats(self) -> dict[str, Any]:
+        """Graph memo hits and misses, and how many pieces misses reused versus computed."""
+        with self._lock:
+            counters = dict(self._counters)
+            cached = len(self._graphs)
+        builds = counters["hits"] + counters["misses"]
+        pieces = counters["reused"] + counters["computed"]
+        return {
+            **counters,
+            "hit_rate": round(counters["hits"] / builds, 3) if builds else 0.0,
+            "reuse_rate": round(counters["reused"] / pieces, 3) if pieces else 0.0,
+            "cached_graphs": cached,
+        }
+
+    def build(
+        self,
+        layout: dict[str, Any],
+        constraint_pack_ids: list[str] | tuple[str, ...] | None = None,
+        *,
+        share: bool = False,
+    ) -> dict[str, Any]:
+        """Return the graph for *layout*; with *share*, the cached graph itself, which must not be mutated."""
+        migrated = migrate_layout(layout)
+        packs = load_constraint_packs(constraint_pack_ids)
+        pack_ids = tuple(str(pack["id"]) for pack in packs)
+        items = migrated.get("items", [])
+        item_digests = [_digest(item) for item in items]
+        content_key = _digest([item_digests, [_digest(room) for room in migrated.get("rooms", [])], migrated.get("metadata")])
+        with self._lock:
+            graph = self._graphs.get((content_key, pack_ids))
+            if graph is not None:
+                self._graphs.move_to_end((content_key, pack_ids))
+                self._counters["hits"] += 1
+            else:
+                self._counters["misses"] += 1
+                graph = self._build(migrated, packs, item_digests, content_key)
+                self._graphs[(content_key, pack_ids)] = graph
+                while len(self._graphs) > self.memo_size:
+                    self._graphs.popitem(last=False)
+        if share:
+            return graph
+        fresh = copy.deepcopy(graph)
+        fresh["generated_at"] = _now_iso()
+        return fresh
+
+    def _build(
+        self,
+        migrated: dict[str, Any],
+        packs: list[dict[str, Any]],
+        item_digests: list[str],
+        content_key: str,
+    ) -> dict[str, Any]:
+        targets = merge_constraint_targets(tuple(str(pack["id"]) for pack in packs))
+        rooms = _rooms(migrated)
+        room_digests = {id(room): _digest(room) for room in rooms}
+        rooms_key = _digest(sorted(room_digests.values()))
+        digest_of = {id(item): digest for item, digest in zip(migrated.get("items", []), item_digests)}
+
+        objects: list[dict[str, Any]] = []
+        objects_seen: dict[tuple[str, str], dict[str, Any]] = {}
+        for index, item in enumerate(migrated.get("items", [])):
+            if not isinstance(item, dict):
+                continue
+            key = (digest_of[id(item)], rooms_key)
+            cached = self._objects.get(key)
+            # an id-less item's public id is derived from its position
+            if cached is None or (cached["index"] != index and not _text(item.get("id"))):
+                cached = _public_object(item, index, rooms)
+                self._counters["computed"] += 1
+            else:
+                self._counters["reused"] += 1
+            objects_seen[key] = cached
+            obj = dict(cached)
+            obj["index"] = index
+            objects.append(obj)
+        self._objects = objects_seen
+
+        openings = _openings(migrated, rooms)
+        adjacency = _adjacency_edges(rooms, openings, self._pair_distance(self._room_distances, room_digests, _room_distance))
+        zones = _zones(migrated, rooms, objects, openings)
+        findings = _constraint_findings(migrated, rooms, objects, targets, self._pair_distance(self._item_distances, digest_of, _item_distance))
+
+        if self._validation is not None and self._validation[0] == content_key:
+            validation = self._validation[1]
+            self._counters["reused"] += 1
+        else:
+            validation = self._validate(migrated, item_digests, content_key)
+            self._counters["computed"] += 1
+        findings.extend(copy.deepcopy(validation))
+
+        return {
+            "schema": LAYOUT_GRAPH_SCHEMA_ID,
+            "semantic_schema": SEMANTIC_SCHEMA_ID,
+            "generated_at": _now_iso(),
+            "units": "meters",
+            "constraint_pack_ids": [pack["id"] for pack in packs],
+            "constraint_targets": targets,
+            "rooms": _public_rooms(rooms),
+            "objects": objects,
+            "openings": openings,
+            "adjacency": adjacency,
+            "zones": zones,
+            "routes": _routes(rooms, adjacency),
+            "findings": _dedupe_findings(findings),
+            "disclaimers": sorted(set(_constraint_disclaimers(packs))),
+        }
+
+    def _validate(self, migrated: dict[str, Any], item_digests: list[str], content_key: str) -> list[dict[str, Any]]:
+        """Validation findings for *migrated*, re-checking only the items changed since the last report."""
+        rooms_key = _digest(migrated.get("rooms", []))
+        items: dict[Any, tuple[str, dict[str, Any]]] | None = {}
+        for item, digest in zip(migrated.get("items", []), item_digests):
+            if isinstance(item, dict):
+                try:
+                    items[item.get("id")] = (digest, item)
+                except TypeError:
+                    items = None
+                    break
+        previous_report = None
+        changes: list[dict[str, Any]] | None = None
+        if items is not None and self._validation_state is not None and self._validation_state[0] == rooms_key:
+            previous_report, previous_items = self._validation_state[1], self._validation_state[2]
+            changes = [
+                {"op": "remove", "collection": "items", "id": item_id, "before": entry[1]}
+                for item_id, entry in previous_items.items()
+                if item_id not in items
+            ]
+            for item_id, (digest, item) in items.items():
+                before = previous_items.get(item_id)
+                if before is None:
+                    changes.append({"op": "add", "collection": "items", "id": item_id, "after": item})
+                elif before[0] != digest:
+                    changes.append({"op": "replace", "collection": "items", "id": item_id, "before": before[1], "after": item})
+        report = build_validation_report(migrated, previous=previous_report, changes=changes)
+        validation = _validation_findings(report)
+        self._validation = (content_key, validation)
+        # migrate_layout does not copy current layouts, so *items* may belong to the caller:
+        # keep detached footprints for the next diff.
+        self._validation_state = None
+        if items is not None:
+            self._validation_state = (rooms_key, report, {item_id: (digest, _footprint(item)) for item_id, (digest, item) in items.items()})
+        return validation
+
+    def _pair_distance(
+        self,
+        cache: dict[tuple[str, str], float],
+        digest_of: dict[int, str],
+        measure: _PairDistance,
+    ) -> _PairDistance:
+        previous = dict(cache)
+        cache.clear()
+
+        def distance(left: Any, right: Any) -> float:
+            key = (digest_of[id(left)], digest_of[id(right)])
+            value = previous.get(key)
+            if value is None:
+                value = cache.get(key)
+            if value is None:
+                value = measure(left, right)
+                self._counters["computed"] += 1
+            else:
+                self._counters["reused"] += 1
+            cache[key] = value
+            return value
+
+        return distance
+
+
+_GRAPH_ENGINE = LayoutGraphEngine()
+
+
+def layout_graph_cache_stats() -> dict[str, Any]:
+    return _GRAPH_ENGINE.stats()
+
+
+def build_layout_graph(layout: dict[str, Any], constraint_pack_ids: list[str] | tuple[str, ...] | None = None) -> dict[str, Any]:
+    return _GRAPH_ENGINE.build(layout, constraint_pack_ids)
 
 
 def build_semantic_layout(layout: dict[str, Any], constraint_pack_ids: list[str] | tuple[str, ...] | None = None) -> dict[str, Any]:
@@ -627,22 +839,22 @@ def build_semantic_layout(layout: dict[str, Any], constraint_pack_ids: list[str]
 
 
 def reasoning_report(layout: dict[str, Any], constraint_pack_ids: list[str] | tuple[str, ...] | None = None) -> dict[str, Any]:
-    graph = build_layout_graph(layout, constraint_pack_ids)
+    graph = _GRAPH_ENGINE.build(layout, constraint_pack_ids, share=True)
     counts = {severity: 0 for severity in SEVERITY_ORDER}
     for finding in graph["findings"]:
         counts[finding["severity"]] += 1
     worst = max((finding["severity"] for finding in graph["findings"]), key=lambda value: SEVERITY_ORDER[value], default="info")
     return {
         "schema": "haus.reasoning_report.v1",
-        "generated_at": graph["generated_at"],
+        "generated_at": _now_iso(),
         "status": "blocked" if worst == "blocked" else "needs_revision" if worst in {"serious", "warning"} else "ready",
         "severity_counts": counts,
-        "constraint_pack_ids": graph["constraint_pack_ids"],
-        "top_findings": graph["findings"][:8],
-        "routes": graph["routes"],
+        "constraint_pack_ids": list(graph["constraint_pack_ids"]),
+        "top_findings": copy.deepcopy(graph["findings"][:8]),
+        "routes": copy.deepcopy(graph["routes"]),
         "adjacency_count": len(graph["adjacency"]),
         "agent_next_actions": _agent_next_actions(graph["findings"]),
-        "disclaimers": graph["disclaimers"],
+        "disclaimers": list(graph["disclaimers"]),
     }
 
 
@@ -659,16 +871,96 @@ def _agent_next_actions(findings: list[dict[str, Any]]) -> list[str]:
     return actions
 
 
-def _indexed(entries: list[Any], prefix: str) -> dict[str, dict[str, Any]]:
-    indexed: dict[str, dict[str, Any]] = {}
-    for index, entry in enumerate(entries):
-        if not isinstance(entry, dict):
-            continue
-        item = copy.deepcopy(entry)
-        item_id = _text(item.get("id"), f"{prefix}-{index + 1}")
-        item["id"] = item_id
-        indexed[item_id] = item
-    return indexed
+_PATCH_COLLECTIONS = ("rooms", "items")
+_MIGRATE_ENTRY = {"items": migrate_item, "rooms": migrate_room}
+
+
+class IndexedLayout:
+    """A migrated layout with its rooms and items indexed by id, for diffs and scenario patches.
+
+    Each collection is an insertion-ordered dict from id to entry, so an op
+    costs O(1) and layout order is kept: a replaced entry stays in place and
+    an added one goes last. An entry whose id repeats an earlier one is kept
+    under ``(id, n)`` and follows every op on that id. Several patches can be
+    applied in turn; only the entries they add are migrated, and ``layout()``
+    assembles the result. Unchanged entries are shared with the source
+    layout, so the result is read-only, like ``migrate_layout``'s.
+    """
+
+    def __init__(self, layout: dict[str, Any]) -> None:
+        self.base = migrate_layout(layout)
+        self._entries: dict[str, dict[Any, dict[str, Any]]] = {}
+        self._repeats: dict[str, dict[str, list[tuple[str, int]]]] = {}
+        self._changed: set[str] = set()
+        for collection in _PATCH_COLLECTIONS:
+            entries: dict[Any, dict[str, Any]] = {}
+            repeats: dict[str, list[tuple[str, int]]] = {}
+            for index, entry in enumerate(self.base.get(collection, [])):
+                if not isinstance(entry, dict):
+                    continue
+                entry_id = _text(entry.get("id"), f"{collection[:-1]}-{index + 1}")
+                if entry_id in entries:
+                    extra = repeats.setdefault(entry_id, [])
+                    extra.append((entry_id, len(extra) + 1))
+                    entries[extra[-1]] = entry
+                else:
+                    entries[entry_id] = entry
+            self._entries[collection] = entries
+            self._repeats[collection] = repeats
+
+    def by_id(self, collection: str) -> dict[str, dict[str, Any]]:
+        """The first entry for each id in *collection*, in layout order."""
+        return {key: entry for key, entry in self._entries[collection].items() if isinstance(key, str)}
+
+    def apply(self, ops: list[dict[str, Any]]) -> IndexedLayout:
+        """Apply add, remove and replace *ops* in order; other ops and collections are ignored."""
+        for op in ops:
+            if not isinstance(op, dict) or op.get("collection") not in self._entries:
+                continue
+            collection = str(op["collection"])
+            entries, repeats = self._entries[collection], self._repeats[collection]
+            entry_id = _text(op.get("id"))
+            if op.get("op") == "remove":
+                self._remove(collection, entry_id)
+            elif op.get("op") in {"add", "replace"}:
+                after = copy.deepcopy(op.get("after"))
+                if not isinstance(after, dict):
+                    continue
+                if op.get("id") is not None:
+                    after.setdefault("id", op["id"])
+                _MIGRATE_ENTRY[collection](after, len(entries))
+                if op["op"] == "add" or entry_id not in entries:
+                    self._remove(collection, entry_id)
+                    entries[entry_id] = after
+                else:
+                    for key in (entry_id, *repeats.get(entry_id, [])):
+                        entries[key] = after
+            else:
+                continue
+            self._changed.add(collection)
+        return self
+
+    def apply_patch(self, patch: dict[str, Any]) -> IndexedLayout:
+        return self.apply([op for op in patch.get("ops", []) if isinstance(op, dict)])
+
+    def revert_patch(self, patch: dict[str, Any]) -> IndexedLayout:
+        inverse = patch.get("inverse_ops")
+        if not isinstance(inverse, list):
+            inverse = _inverse_ops([op for op in patch.get("ops", []) if isinstance(op, dict)])
+        return self.apply([op for op in inverse if isinstance(op, dict)])
+
+    def layout(self) -> dict[str, Any]:
+        """The patched layout; collections no op changed are the source lists themselves."""
+        result = dict(self.base)
+        for collection in self._changed:
+            result[collection] = list(self._entries[collection].values())
+        return result
+
+    def _remove(self, collection: str, entry_id: str) -> None:
+        entries = self._entries[collection]
+        entries.pop(entry_id, None)
+        for key in self._repeats[collection].pop(entry_id, []):
+            del entries[key]
 
 
 def _changed_fields(before: dict[str, Any], after: dict[str, Any]) -> list[str]:
@@ -676,35 +968,46 @@ def _changed_fields(before: dict[str, Any], after: dict[str, Any]) -> list[str]:
     return [key for key in keys if before.get(key) != after.get(key)]
 
 
+def _op_entry(entry: dict[str, Any], entry_id: str) -> dict[str, Any]:
+    """A detached copy of *entry* for a diff op, carrying the id it is indexed under."""
+    detached = copy.deepcopy(entry)
+    detached["id"] = entry_id
+    return detached
+
+
 def layout_diff(before: dict[str, Any], after: dict[str, Any]) -> dict[str, Any]:
-    left = migrate_layout(before)
-    right = migrate_layout(after)
+    left = IndexedLayout(before)
+    right = IndexedLayout(after)
     ops: list[dict[str, Any]] = []
-    for collection in ("rooms", "items"):
-        before_map = _indexed(left.get(collection, []), collection[:-1])
-        after_map = _indexed(right.get(collection, []), collection[:-1])
+    for collection in _PATCH_COLLECTIONS:
+        before_map = left.by_id(collection)
+        after_map = right.by_id(collection)
         for item_id in sorted(before_map.keys() - after_map.keys()):
-            ops.append({"op": "remove", "collection": collection, "id": item_id, "path": f"/{collection}/{item_id}", "before": before_map[item_id]})
+            ops.append({"op": "remove", "collection": collection, "id": item_id, "path": f"/{collection}/{item_id}", "before": _op_entry(before_map[item_id], item_id)})
         for item_id in sorted(after_map.keys() - before_map.keys()):
-            ops.append({"op": "add", "collection": collection, "id": item_id, "path": f"/{collection}/{item_id}", "after": after_map[item_id]})
+            ops.append({"op": "add", "collection": collection, "id": item_id, "path": f"/{collection}/{item_id}", "after": _op_entry(after_map[item_id], item_id)})
         for item_id in sorted(before_map.keys() & after_map.keys()):
-            if before_map[item_id] != after_map[item_id]:
-                ops.append(
-                    {
-                        "op": "replace",
-                        "collection": collection,
-                        "id": item_id,
-                        "path": f"/{collection}/{item_id}",
-                        "before": before_map[item_id],
-                        "after": after_map[item_id],
-                        "changed_fields": _changed_fields(before_map[item_id], after_map[item_id]),
-                    }
-                )
+            old, new = before_map[item_id], after_map[item_id]
+            # entries shared by both layouts (see IndexedLayout.layout) are unchanged without comparing
+            if old is new or old == new or {**old, "id": item_id} == {**new, "id": item_id}:
+                continue
+            old, new = _op_entry(old, item_id), _op_entry(new, item_id)
+            ops.append(
+                {
+                    "op": "replace",
+                    "collection": collection,
+                    "id": item_id,
+                    "path": f"/{collection}/{item_id}",
+                    "before": old,
+                    "after": new,
+                    "changed_fields": _changed_fields(old, new),
+                }
+            )
     return {
         "schema": "haus.layout_diff.v1",
         "generated_at": _now_iso(),
-        "before": {"item_count": len(left.get("items", [])), "room_count": len(left.get("rooms", []))},
-        "after": {"item_count": len(right.get("items", [])), "room_count": len(right.get("rooms", []))},
+        "before": {"item_count": len(left.base.get("items", [])), "room_count": len(left.base.get("rooms", []))},
+        "after": {"item_count": len(right.base.get("items", [])), "room_count": len(right.base.get("rooms", []))},
         "change_counts": {
             "add": sum(1 for op in ops if op["op"] == "add"),
             "remove": sum(1 for op in ops if op["op"] == "remove"),
@@ -775,47 +1078,16 @@ def _inverse_ops(ops: list[dict[str, Any]]) -> list[dict[str, Any]]:
     return inverse
 
 
-def apply_scenario_patch(layout: dict[str, Any], patch: dict[str, Any]) -> dict[str, Any]:
-    return _apply_ops(layout, [op for op in patch.get("ops", []) if isinstance(op, dict)])
+def apply_scenario_patch(layout: dict[str, Any] | IndexedLayout, patch: dict[str, Any]) -> dict[str, Any]:
+    return _indexed_layout(layout).apply_patch(patch).layout()
 
 
-def revert_scenario_patch(layout: dict[str, Any], patch: dict[str, Any]) -> dict[str, Any]:
-    inverse = patch.get("inverse_ops")
-    if not isinstance(inverse, list):
-        inverse = _inverse_ops([op for op in patch.get("ops", []) if isinstance(op, dict)])
-    return _apply_ops(layout, [op for op in inverse if isinstance(op, dict)])
+def revert_scenario_patch(layout: dict[str, Any] | IndexedLayout, patch: dict[str, Any]) -> dict[str, Any]:
+    return _indexed_layout(layout).revert_patch(patch).layout()
 
 
-def _apply_ops(layout: dict[str, Any], ops: list[dict[str, Any]]) -> dict[str, Any]:
-    migrated = migrate_layout(layout)
-    for op in ops:
-        collection = op.get("collection")
-        if collection not in {"items", "rooms"}:
-            continue
-        entries = [entry for entry in migrated.get(collection, []) if isinstance(entry, dict)]
-        item_id = str(op.get("id"))
-        if op.get("op") == "remove":
-            migrated[collection] = [entry for entry in entries if str(entry.get("id")) != item_id]
-        elif op.get("op") == "add":
-            after = copy.deepcopy(op.get("after"))
-            if isinstance(after, dict):
-                migrated[collection] = [entry for entry in entries if str(entry.get("id")) != item_id]
-                migrated[collection].append(after)
-        elif op.get("op") == "replace":
-            after = copy.deepcopy(op.get("after"))
-            if isinstance(after, dict):
-                replaced = False
-                next_entries = []
-                for entry in entries:
-                    if str(entry.get("id")) == item_id:
-                        next_entries.append(after)
-                        replaced = True
-                    else:
-                        next_entries.append(entry)
-                if not replaced:
-                    next_entries.append(after)
-                migrated[collection] = next_entries
-    return migrate_layout(migrated)
+def _indexed_layout(layout: dict[str, Any] | IndexedLayout) -> IndexedLayout:
+    return layout if isinstance(layout, IndexedLayout) else IndexedLayout(layout)
 
 
 def multimodal_intake_contract() -> dict[str, Any]:
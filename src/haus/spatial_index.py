@@ -0,0 +1,261 @@
+"""Uniform-grid spatial index over layout item footprints.
+
+Geometry tools use the index as a broad phase: it returns the item indices
+whose axis-aligned footprint can possibly interact with a query shape, and the
+caller runs the exact polygon test on that short list. Item polygons are cached
+per padding so repeated tool calls do not rebuild them.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable
+from typing import Any
+
+from . import geometry
+
+DEFAULT_CELL_SIZE_M = 1.0
+_MAX_CACHED_INDEXES = 4
+# A rotated footprint padded by p grows its AABB by at most p * sqrt(2).
+_PADDING_GROWTH = math.sqrt(2.0)
+
+_ItemKey = tuple[Any, ...]
+
+
+def item_key(item: Any) -> _ItemKey:
+    """The fields of *item* that decide its footprint; equal keys mean equal geometry."""
+    if not isinstance(item, dict):
+        return (None,)
+    pos = item.get("pos")
+    geo = item.get("geo")
+    return (
+        tuple(pos) if isinstance(pos, list) else pos,
+        item.get("rot"),
+        tuple(geo) if isinstance(geo, list) else geo,
+        item.get("x"),
+        item.get("z"),
+        item.get("width_m"),
+        item.get("depth_m"),
+    )
+
+
+def _expand(rect: geometry.Rect, margin: float) -> geometry.Rect:
+    return (rect[0] - margin, rect[1] - margin, rect[2] + margin, rect[3] + margin)
+
+
+def _touches(a: geometry.Rect, b: geometry.Rect) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _contains(outer: geometry.Rect, inner: geometry.Rect) -> bool:
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and outer[2] >= inner[2] and outer[3] >= inner[3]
+
+
+class _Entry:
+    __slots__ = ("cells", "key", "polygons", "rect")
+
+    def __init__(self, key: _ItemKey, rect: geometry.Rect, cells: list[tuple[int, int]]) -> None:
+        self.key = key
+        self.rect = rect
+        self.cells = cells
+        self.polygons: dict[float, geometry.Polygon] = {}
+
+
+class LayoutSpatialIndex:
+    """Grid of item AABBs for one layout ``items`` list.
+
+    The index keeps a reference to the list it was built from. ``sync()``
+    re-indexes only entries whose position, rotation or size changed, so
+    moves, appends and removals are picked up incrementally. ``version``
+    increases whenever a sync changes any footprint.
+    """
+
+    def __init__(self, items: list[Any], cell_size: float = DEFAULT_CELL_SIZE_M) -> None:
+        self.items = items
+        self.cell_size = max(0.05, float(cell_size))
+        self._entries: list[_Entry | None] = []
+        self._cells: dict[tuple[int, int], set[int]] = {}
+        self._bounds: geometry.Rect | None = None
+        self.version = 0
+        self.sync()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _cell_range(self, rect: geometry.Rect) -> tuple[int, int, int, int]:
+        size = self.cell_size
+        return (
+            math.floor(rect[0] / size),
+            math.floor(rect[1] / size),
+            math.floor(rect[2] / size),
+            math.floor(rect[3] / size),
+        )
+
+    def _insert(self, index: int, item: Any, key: _ItemKey) -> None:
+        if not isinstance(item, dict):
+            self._entries[index] = None
+            return
+        rect = geometry.item_rect(item)
+        cx0, cz0, cx1, cz1 = self._cell_range(rect)
+        cells = [(cx, cz) for cx in range(cx0, cx1 + 1) for cz in range(cz0, cz1 + 1)]
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(index)
+        self._entries[index] = _Entry(key, rect, cells)
+        self._bounds = None
+
+    def _remove(self, index: int) -> None:
+        entry = self._entries[index]
+        if entry is None:
+            return
+        for cell in entry.cells:
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(index)
+                if not bucket:
+                    del self._cells[cell]
+        self._entries[index] = None
+        self._bounds = None
+
+    def sync(self) -> int:
+        """Bring the index up to date with ``self.items``; return entries re-indexed."""
+        changed = 0
+        while len(self._entries) > len(self.items):
+            self._remove(len(self._entries) - 1)
+            self._entries.pop()
+            changed += 1
+        for index, item in enumerate(self.items):
+            key = item_key(item)
+            if index >= len(self._entries):
+                self._entries.append(None)
+            else:
+                entry = self._entries[index]
+                if entry is not None and entry.key == key:
+                    continue
+                if entry is None and not isinstance(item, dict):
+                    continue
+                self._remove(index)
+            self._insert(index, item, key)
+            changed += 1
+        if changed:
+            self.version += 1
+        return changed
+
+    @property
+    def bounds(self) -> geometry.Rect | None:
+        if self._bounds is None:
+            rects = [entry.rect for entry in self._entries if entry is not None]
+            if rects:
+                self._bounds = (
+                    min(rect[0] for rect in rects),
+                    min(rect[1] for rect in rects),
+                    max(rect[2] for rect in rects),
+                    max(rect[3] for rect in rects),
+                )
+        return self._bounds
+
+    def rect(self, index: int) -> geometry.Rect:
+        entry = self._entries[index]
+        if entry is None:
+            raise IndexError(f"layout item {index} has no footprint")
+        return entry.rect
+
+    def polygon(self, index: int, padding: float = 0.0) -> geometry.Polygon:
+        entry = self._entries[index]
+        if entry is None:
+            raise IndexError(f"layout item {index} has no footprint")
+        polygon = entry.polygons.get(padding)
+        if polygon is None:
+            polygon = geometry.item_polygon(self.items[index], padding=padding)
+            entry.polygons[padding] = polygon
+        return polygon
+
+    def query_rect(self, rect: geometry.Rect, padding: float = 0.0) -> list[int]:
+        """Return sorted indices whose footprint, padded by *padding*, may touch *rect*."""
+        if not self._cells:
+            return []
+        query = _expand(rect, max(0.0, padding) * _PADDING_GROWTH)
+        cx0, cz0, cx1, cz1 = self._cell_range(query)
+        found: set[int] = set()
+        if (cx1 - cx0 + 1) * (cz1 - cz0 + 1) > len(self._cells):
+            for bucket in self._cells.values():
+                found.update(bucket)
+        else:
+            for cx in range(cx0, cx1 + 1):
+                for cz in range(cz0, cz1 + 1):
+                    bucket = self._cells.get((cx, cz))
+                    if bucket:
+                        found.update(bucket)
+        entries = self._entries
+        return sorted(index for index in found if _touches(query, entries[index].rect))  # type: ignore[union-attr]
+
+    def candidate_pairs(
+        self,
+        max_gap: float = 0.0,
+        *,
+        padding: float = 0.0,
+        include: Callable[[int], bool] | None = None,
+    ) -> list[tuple[int, int]]:
+        """Return sorted ``(i, j)`` pairs, ``i < j``, whose footprints may be within *max_gap*."""
+        pairs: list[tuple[int, int]] = []
+        margin = max(0.0, max_gap) + 2 * max(0.0, padding) * _PADDING_GROWTH
+        for left, entry in enumerate(self._entries):
+            if entry is None or (include is not None and not include(left)):
+                continue
+            for right in self.query_rect(_expand(entry.rect, margin)):
+                if right <= left or (include is not None and not include(right)):
+                    continue
+                pairs.append((left, right))
+        return pairs
+
+    def nearest(
+        self,
+        bbox: geometry.Rect,
+        distance: Callable[[int], float],
+        *,
+        count: int = 1,
+        padding: float = 0.0,
+        accept: Callable[[int], bool] | None = None,
+    ) -> list[tuple[float, int]]:
+        """Return the *count* smallest ``(distance(i), i)`` pairs, searching outward from *bbox*.
+
+        *distance* must never be smaller than the gap between *bbox* and the
+        item's padded footprint; polygon, point and center distances all
+        satisfy this, so the result matches a full scan.
+        """
+        bounds = self.bounds
+        if bounds is None or count <= 0:
+            return []
+        everything = _expand(bounds, max(0.0, padding) * _PADDING_GROWTH)
+        radius = self.cell_size
+        seen: set[int] = set()
+        found: list[tuple[float, int]] = []
+        while True:
+            query = _expand(bbox, radius)
+            for index in self.query_rect(query, padding=padding):
+                if index in seen:
+                    continue
+                seen.add(index)
+                if accept is None or accept(index):
+                    found.append((distance(index), index))
+            within = sum(1 for value, _ in found if value <= radius)
+            if within >= count or _contains(query, everything):
+                found.sort()
+                return found[:count]
+            radius *= 2
+
+
+_INDEXES: list[LayoutSpatialIndex] = []
+
+
+def index_for(items: list[Any], cell_size: float = DEFAULT_CELL_SIZE_M) -> LayoutSpatialIndex:
+    """Return the synced index for *items*, building it on first use."""
+    for position, index in enumerate(_INDEXES):
+        if index.items is items and index.cell_size == cell_size:
+            if position:
+                _INDEXES.insert(0, _INDEXES.pop(position))
+            index.sync()
+            return index
+    index = LayoutSpatialIndex(items, cell_size=cell_size)
+    _INDEXES.insert(0, index)
+    del _INDEXES[_MAX_CACHED_INDEXES:]
+    return index
@@ -17,6 +17,7 @@ class VectorizeConfig:
     wall_height: float = 2.6
     scale_override: Optional[float] = None
     clean: bool = True
+    clean_max_side: int | None = None
 
 
 @dataclass(frozen=True)
@@ -0,0 +1,139 @@
+"""Content-addressed cache of floor plan vectorization results.
+
+Entries are keyed on the sha256 of the uploaded image bytes plus every
+setting that changes the pipeline output, so re-uploading the same plan
+returns the stored layout, metadata and GLB without rerunning OpenCV. Each
+entry directory holds the source image, the pipeline outputs and an
+``entry.json`` written last; a directory without it is an unfinished run
+and is discarded. Least recently used entries are evicted once the cache
+exceeds its byte budget.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any
+
+from .logging_utils import configure_logging
+
+log = configure_logging("haus.vectorize_cache")
+
+ENTRY_FILE = "entry.json"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Bump when pipeline changes make previously cached outputs stale.
+PIPELINE_VERSION = 1
+
+
+def cache_key(raw: bytes, *, wall_height: float, scale_override: float | None, clean: bool) -> str:
+    digest = hashlib.sha256(raw)
+    digest.update(json.dumps([PIPELINE_VERSION, wall_height, scale_override, clean]).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _tree_size(path: Path) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                continue
+    return total
+
+
+class VectorizeCache:
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = root
+        self.max_bytes = max(0, int(max_bytes))
+
+    def entry_dir(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def _read_entry(self, entry_dir: Path) -> dict[str, Any] | None:
+        try:
+            entry = json.loads((entry_dir / ENTRY_FILE).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        return entry if isinstance(entry, dict) else None
+
+    def lookup(self, key: str) -> dict[str, Any] | None:
+        """Return the stored entry for *key* and mark it as recently used."""
+        entry_dir = self.entry_dir(key)
+        entry = self._read_entry(entry_dir)
+        if entry is None:
+            return None
+        layout_path = Path(str(entry.get("metadata", {}).get("output_layout", "")))
+        if not layout_path.is_file():
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+        entry["last_used"] = time.time()
+        self._write_entry(entry_dir, entry)
+        return entry
+
+    def prepare(self, key: str) -> Path:
+        """Return an empty directory to vectorize into for *key*."""
+        entry_dir = self.entry_dir(key)
+        if entry_dir.exists():
+            shutil.rmtree(entry_dir, ignore_errors=True)
+        entry_dir.mkdir(parents=True, exist_ok=True)
+        return entry_dir
+
+    def discard(self, key: str) -> None:
+        shutil.rmtree(self.entry_dir(key), ignore_errors=True)
+
+    def _write_entry(self, entry_dir: Path, entry: dict[str, Any]) -> None:
+        tmp = entry_dir / f"{ENTRY_FILE}.tmp"
+        tmp.write_text(json.dumps(entry, indent=2), encoding="utf-8")
+        tmp.replace(entry_dir / ENTRY_FILE)
+
+    def commit(self, key: str, metadata: dict[str, Any], config: dict[str, Any]) -> dict[str, Any]:
+        """Seal the entry prepared for *key*, then evict down to the byte budget."""
+        entry_dir = self.entry_dir(key)
+        now = time.time()
+        entry = {
+            "key": key,
+            "created": now,
+            "last_used": now,
+            "size_bytes": _tree_size(entry_dir),
+            "config": config,
+            "metadata": metadata,
+        }
+        self._write_entry(entry_dir, entry)
+        self.evict(keep=key)
+        return entry
+
+    def entries(self) -> list[dict[str, Any]]:
+        if not self.root.is_dir():
+            return []
+        found = []
+        for shard in self.root.iterdir():
+            if not shard.is_dir():
+                continue
+            for entry_dir in shard.iterdir():
+                entry = self._read_entry(entry_dir)
+                if entry is not None:
+                    found.append(entry)
+        return found
+
+    def evict(self, keep: str | None = None) -> list[str]:
+        """Drop least recently used entries until the cache fits in *max_bytes*."""
+        entries = sorted(self.entries(), key=lambda entry: float(entry.get("last_used", 0.0)))
+        total = sum(int(entry.get("size_bytes", 0)) for entry in entries)
+        evicted = []
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            key = str(entry.get("key", ""))
+            if not key or key == keep:
+                continue
+            self.discard(key)
+            total -= int(entry.get("size_bytes", 0))
+            evicted.append(key)
+        if evicted:
+            log.info("Evicted %s vectorize cache entr%s", len(evicted), "y" if len(evicted) == 1 else "ies")
+        return evicted
@@ -0,0 +1,425 @@
+"""Background floor plan vectorization jobs.
+
+`VectorizeJobManager` keeps the CPU-heavy OpenCV pipeline off the server's
+event loop. Jobs wait in a bounded queue and run on a fixed number of worker
+slots; each slot owns one long-lived spawned worker process, so a job that
+hits its timeout or is cancelled can be stopped by killing that process and
+starting a fresh one. Workers report each pipeline stage as it starts, and
+every state change is appended to the job's event list for polling or SSE.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import queue
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from multiprocessing.connection import Connection
+from typing import Any, Literal
+
+from . import jsonio
+from .logging_utils import configure_logging
+from .types import VectorizeConfig
+
+log = configure_logging("haus.vectorize_jobs")
+
+TERMINAL_STATUSES = frozenset({"done", "failed", "cancelled", "timeout"})
+_POLL_INTERVAL_S = 0.1
+_MAX_FINISHED_JOBS = 200
+
+Runner = Callable[[VectorizeConfig, Callable[[str], None]], dict[str, Any]]
+JobEventType = Literal["status", "stage"]
+
+
+def sse_event(event: dict[str, Any]) -> str:
+    """Format one job event as a server-sent event named after its ``type``."""
+    return f"event: {event['type']}\ndata: {jsonio.dumps(event, pretty=False)}\n\n"
+
+
+class JobQueueFull(RuntimeError):
+    pass
+
+
+def _run_pipeline(config: VectorizeConfig, progress: Callable[[str], None]) -> dict[str, Any]:
+    from .pipeline import _to_serializable, run_vectorize
+
+    return _to_serializable(run_vectorize(config, progress=progress))
+
+
+def _worker_main(conn: Connection) -> None:
+    # Import OpenCV and the mesh stack once per worker, not once per job.
+    from .pipeline import PIPELINE_ERRORS
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            return
+        if message is None:
+            return
+        try:
+            metadata = _run_pipeline(message, lambda stage: conn.send(("stage", stage)))
+        except PIPELINE_ERRORS as exc:
+            conn.send(("error", str(exc) or type(exc).__name__))
+        except Exception as exc:
+            log.exception("Vectorize worker failed unexpectedly")
+            conn.send(("error", str(exc) or type(exc).__name__))
+        else:
+            conn.send(("done", metadata))
+
+
+class _Worker:
+    def __init__(self, context: Any) -> None:
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class VectorizeJob:
+    def __init__(
+        self,
+        config: VectorizeConfig | None,
+        *,
+        finalize: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+        cleanup: Callable[[], None] | None = None,
+        dedupe_key: str | None = None,
+    ) -> None:
+        self.id = uuid.uuid4().hex[:12]
+        self.config = config
+        self.finalize = finalize
+        self.cleanup = cleanup
+        self.dedupe_key = dedupe_key
+        self.status = "queued"
+        self.stage: str | None = None
+        self.stages: list[dict[str, Any]] = []
+        self.events: list[dict[str, Any]] = []
+        self.result: dict[str, Any] | None = None
+        self.error: str | None = None
+        self.created = time.time()
+        self.started: float | None = None
+        self.finished: float | None = None
+        self.cancel_requested = False
+        self.changed = threading.Condition()
+
+    @property
+    def terminal(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def _emit(self, kind: JobEventType, **fields: Any) -> None:
+        # Callers hold self.changed.
+        self.events.append({"seq": len(self.events), "type": kind, "status": self.status, "at": time.time(), **fields})
+        self.changed.notify_all()
+
+    def snapshot(self, *, include_result: bool = True) -> dict[str, Any]:
+        with self.changed:
+            payload: dict[str, Any] = {
+                "id": self.id,
+                "status": self.status,
+                "stage": self.stage,
+                "stages": [dict(stage) for stage in self.stages],
+                "created": self.created,
+                "started": self.started,
+                "finished": self.finished,
+                "error": self.error,
+            }
+            if include_result and self.result is not None:
+                payload["result"] = self.result
+            return payload
+
+    def events_since(self, seq: int) -> list[dict[str, Any]]:
+        with self.changed:
+            return [dict(event) for event in self.events[seq:]]
+
+    def wait(self, timeout: float | None = None) -> bool:
+        with self.changed:
+            return self.changed.wait_for(lambda: self.terminal, timeout=timeout)
+
+
+class VectorizeJobManager:
+    """Bounded queue of vectorize jobs served by *workers* slots.
+
+    With ``use_processes=False`` jobs run on the slot threads themselves: the
+    event loop still stays free, but a running job cannot be interrupted, so a
+    timeout or cancel only discards its result.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = 2,
+        timeout_s: float = 120.0,
+        max_queued: int = 16,
+        use_processes: bool = True,
+        runner: Runner | None = None,
+    ) -> None:
+        self.workers = max(1, int(workers))
+        self.timeout_s = max(0.01, float(timeout_s))
+        self.max_queued = max(1, int(max_queued))
+        self.use_processes = use_processes
+        self.runner = runner or _run_pipeline
+        self._queue: queue.Queue[VectorizeJob | None] = queue.Queue()
+        self._jobs: dict[str, VectorizeJob] = {}
+        self._lock = threading.Lock()
+        self._slots: list[threading.Thread] = []
+        self._closed = False
+        self._context = multiprocessing.get_context("spawn")
+
+    def _start_slots(self) -> None:
+        if self._slots:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._slot_loop, name=f"haus-vectorize-{index}", daemon=True)
+            thread.start()
+            self._slots.append(thread)
+
+    def _remember(self, job: VectorizeJob) -> None:
+        self._jobs[job.id] = job
+        finished = sorted(
+            (other for other in self._jobs.values() if other.terminal),
+            key=lambda other: other.finished or 0.0,
+        )
+        for other in finished[: max(0, len(finished) - _MAX_FINISHED_JOBS)]:
+            del self._jobs[other.id]
+
+    def submit(
+        self,
+        config: VectorizeConfig,
+        *,
+        finalize: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+        cleanup: Callable[[], None] | None = None,
+        dedupe_key: str | None = None,
+    ) -> VectorizeJob:
+        """Queue *config*; a pending job with the same *dedupe_key* is returned instead."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("vectorize job manager is shut down")
+            if dedupe_key is not None:
+                for job in self._jobs.values():
+                    if job.dedupe_key == dedupe_key and not job.terminal:
+                        return job
+            queued = sum(1 for job in self._jobs.values() if job.status == "queued")
+            if queued >= self.max_queued:
+                raise JobQueueFull(f"{queued} floor plans are already queued; try again shortly.")
+            job = VectorizeJob(config, finalize=finalize, cleanup=cleanup, dedupe_key=dedupe_key)
+            with job.changed:
+                job._emit("status")
+            self._remember(job)
+            self._start_slots()
+        self._queue.put(job)
+        return job
+
+    def completed(self, result: dict[str, Any]) -> VectorizeJob:
+        """Record a job that needed no work, such as a cache hit."""
+        job = VectorizeJob(None)
+        with job.changed:
+            job.status = "done"
+            job.result = result
+            job.started = job.finished = time.time()
+            job._emit("status")
+        with self._lock:
+            self._remember(job)
+        return job
+
+    def find(self, dedupe_key: str) -> VectorizeJob | None:
+        """Return the queued or running job submitted with *dedupe_key*, if any."""
+        with self._lock:
+            for job in self._jobs.values():
+                if job.dedupe_key == dedupe_key and not job.terminal:
+                    return job
+        return None
+
+    def get(self, job_id: str) -> VectorizeJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        if job is None:
+            return False
+        with job.changed:
+            if job.terminal:
+                return False
+            job.cancel_requested = True
+            if job.status == "queued" or not self.use_processes:
+                self._finish(job, "cancelled")
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {
+            "workers": self.workers,
+            "mode": "process" if self.use_processes else "thread",
+            "timeout_s": self.timeout_s,
+            "max_queued": self.max_queued,
+            **{status: statuses.count(status) for status in ("queued", "running", *sorted(TERMINAL_STATUSES))},
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+            pending = [job for job in self._jobs.values() if not job.terminal]
+        for job in pending:
+            self.cancel(job.id)
+        for _ in self._slots:
+            self._queue.put(None)
+        for thread in self._slots:
+            thread.join(timeout=5)
+
+    def _finish(
+        self,
+        job: VectorizeJob,
+        status: str,
+        *,
+        result: dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> None:
+        # Callers hold job.changed.
+        if job.terminal:
+            return
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished = time.time()
+        if job.stages and "elapsed_s" not in job.stages[-1]:
+            job.stages[-1]["elapsed_s"] = round(job.finished - job.stages[-1]["started"], 6)
+        if error:
+            job._emit("status", error=error)
+        else:
+            job._emit("status")
+        if status != "done" and job.cleanup is not None:
+            try:
+                job.cleanup()
+            except Exception:
+                log.exception("Cleanup failed for vectorize job %s", job.id)
+
+    def _record_stage(self, job: VectorizeJob, stage: str) -> None:
+        with job.changed:
+            if job.terminal:
+                return
+            now = time.time()
+            if job.stages and "elapsed_s" not in job.stages[-1]:
+                job.stages[-1]["elapsed_s"] = round(now - job.stages[-1]["started"], 6)
+            job.stage = stage
+            job.stages.append({"stage": stage, "started": now})
+            job._emit("stage", stage=stage)
+
+    def _complete(self, job: VectorizeJob, metadata: dict[str, Any]) -> None:
+        if job.terminal:
+            return
+        try:
+            result = job.finalize(metadata) if job.finalize is not None else metadata
+        except Exception as exc:
+            log.exception("Finalizing vectorize job %s failed", job.id)
+            with job.changed:
+                self._finish(job, "failed", error=str(exc) or type(exc).__name__)
+            return
+        with job.changed:
+            self._finish(job, "done", result=result)
+
+    def _slot_loop(self) -> None:
+        worker: _Worker | None = None
+        try:
+            while True:
+                job = self._queue.get()
+                if job is None:
+                    return
+                with job.changed:
+                    if job.status != "queued":
+                        continue
+                    job.status = "running"
+                    job.started = time.time()
+                    job._emit("status")
+                if self.use_processes:
+                    worker = self._run_in_process(job, worker)
+                else:
+                    self._run_inline(job)
+        finally:
+            if worker is not None:
+                worker.stop()
+
+    def _run_inline(self, job: VectorizeJob) -> None:
+        from .pipeline import PIPELINE_ERRORS
+
+        assert job.config is not None
+        started = time.monotonic()
+        try:
+            metadata = self.runner(job.config, lambda stage: self._record_stage(job, stage))
+        except PIPELINE_ERRORS as exc:
+            with job.changed:
+                self._finish(job, "failed", error=str(exc) or type(exc).__name__)
+            return
+        except Exception as exc:
+            log.exception("Vectorize job %s failed unexpectedly", job.id)
+            with job.changed:
+                self._finish(job, "failed", error=str(exc) or type(exc).__name__)
+            return
+        if time.monotonic() - started > self.timeout_s:
+            with job.changed:
+                self._finish(job, "timeout", error=f"Vectorization exceeded {self.timeout_s:g}s.")
+            return
+        self._complete(job, metadata)
+
+    def _run_in_process(self, job: VectorizeJob, worker: _Worker | None) -> _Worker | None:
+        if worker is None or not worker.alive():
+            worker = _Worker(self._context)
+        try:
+            worker.conn.send(job.config)
+        except (BrokenPipeError, OSError):
+            worker.kill()
+            worker = _Worker(self._context)
+            worker.conn.send(job.config)
+
+        deadline = time.monotonic() + self.timeout_s
+        while True:
+            if job.cancel_requested:
+                worker.kill()
+                with job.changed:
+                    self._finish(job, "cancelled")
+                return None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                worker.kill()
+                with job.changed:
+                    self._finish(job, "timeout", error=f"Vectorization exceeded {self.timeout_s:g}s.")
+                return None
+            try:
+                if not worker.conn.poll(min(_POLL_INTERVAL_S, remaining)):
+                    continue
+                kind, payload = worker.conn.recv()
+            except (EOFError, OSError):
+                worker.kill()
+                with job.changed:
+                    self._finish(job, "failed", error="Vectorize worker exited unexpectedly.")
+                return None
+            if kind == "stage":
+                self._record_stage(job, str(payload))
+            elif kind == "error":
+                with job.changed:
+                    self._finish(job, "failed", error=str(payload))
+                return worker
+            else:
+                self._complete(job, payload)
+                return worker
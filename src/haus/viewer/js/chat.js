@@ -1134,6 +1134,8 @@ async function sendStream(payload, loading) {
       const parsed = parseSseBlock(block);
       if (!parsed) continue;
       if (parsed.event === 'text') {
+        const retract = parsed.data.retract || '';
+        if (retract && responseText.endsWith(retract)) responseText = responseText.slice(0, -retract.length);
         responseText += parsed.data.delta || '';
         assistantEl.textContent = responseText;
         messagesEl.scrollTop = messagesEl.scrollHeight;
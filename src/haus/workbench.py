@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import copy
+import hashlib
 import html
+import io
 import json
 import re
 import uuid
+from collections import OrderedDict
 from collections.abc import Iterable
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -14,7 +18,9 @@ from urllib.parse import urlparse
 from urllib.request import Request, urlopen
 from zipfile import ZIP_DEFLATED, ZipFile
 
-from . import geometry
+import numpy as np
+
+from . import geometry, jsonio, placement, routing
 
 LAYOUT_SCHEMA_ID = "haus.layout.v2"
 PROJECT_SCHEMA_ID = "haus.project.v1"
@@ -213,10 +219,38 @@ def _rect_intersects(
     return geometry.rect_intersects(a, b)
 
 
-def _rect_gap(
-    a: tuple[float, float, float, float], b: tuple[float, float, float, float]
-) -> float:
-    return geometry.rect_gap(a, b)
+def _item_boxes(items: list[dict[str, Any]]) -> np.ndarray:
+    """``(N, 4)`` array of ``item_rect`` footprints for the batched rect kernels."""
+    return np.asarray([item_rect(item) for item in items], dtype=float).reshape(len(items), 4)
+
+
+def _scoped_rows(items: list[dict[str, Any]], scope: _Scope | None) -> np.ndarray | None:
+    """Rows of the touched items in *items*, or None to check every row."""
+    if scope is None:
+        return None
+    return np.asarray([row for row, item in enumerate(items) if item.get("id") in scope.touched], dtype=np.intp)
+
+
+def _candidate_pairs(boxes: np.ndarray, max_gap: float, rows: np.ndarray | None = None) -> np.ndarray:
+    """Sorted ``(i, j)`` box pairs within *max_gap* per axis; with *rows*, only pairs involving one of them."""
+    if rows is None:
+        return placement.sweep_pairs(boxes, max_gap)
+    contacts = placement.box_contacts(boxes[rows], boxes, max_gap)
+    pairs = np.sort(np.stack([rows[contacts[:, 0]], contacts[:, 1]], axis=1), axis=1)
+    return np.unique(pairs[pairs[:, 0] != pairs[:, 1]], axis=0).reshape(-1, 2)
+
+
+def _overlap_pairs(boxes: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+    """Sorted ``(i, j)`` pairs of overlapping boxes."""
+    pairs = _candidate_pairs(boxes, 0.0, rows)
+    return pairs[placement.pair_boxes_overlap(boxes[pairs[:, 0]], boxes[pairs[:, 1]])]
+
+
+def _close_pairs(boxes: np.ndarray, max_gap: float, rows: np.ndarray | None = None) -> np.ndarray:
+    """Sorted ``(i, j)`` pairs of separate boxes whose ``rect_gap`` is below *max_gap*."""
+    pairs = _candidate_pairs(boxes, max_gap, rows)
+    gaps = placement.pair_box_gaps(boxes[pairs[:, 0]], boxes[pairs[:, 1]])
+    return pairs[(gaps > 0) & (gaps < max_gap)]
 
 
 def _layout_bounds(layout: dict[str, Any]) -> tuple[float, float, float, float]:
@@ -227,7 +261,73 @@ def _room_label(room: dict[str, Any]) -> str:
     return _text(room.get("label") or room.get("name") or room.get("id"), "Unassigned")
 
 
+# Keys migrate_layout fills in, so a layout that has them all is already current.
+_LAYOUT_KEYS = frozenset(
+    {"version", "items", "rooms", "metadata", "assumptions", "validation_reports", "exports", "layout_versions", "scenarios"}
+)
+_ITEM_KEYS = frozenset(
+    {"id", "confidence", "movable", "fixed", "existing", "proposed", "removed", "locked", "source", "scenario_status"}
+)
+_WALL_KEYS = frozenset({"structural_status", "structural_confidence"})
+_OPENING_KEYS = frozenset({"opening_type", "width_m", "swing_direction", "threshold_height_m"})
+_ROOM_KEYS = frozenset({"id", "label", "kind", "occupancy", "priority", "confidence", "locked"})
+_ROOM_OPENING_KEYS = frozenset({"id", "type", "width_m", "swing_direction", "threshold_height_m", "confidence"})
+_SCENARIO_KEYS = frozenset({"journey", "status", "score", "warnings", "created_at", "applied_at", "parent_scenario_id"})
+
+
+_MIGRATION_COUNTS = {"copied": 0, "reused": 0}
+
+
+def migration_stats() -> dict[str, int]:
+    """How many migrations copied the layout (``editable_layout`` always does) and how many returned it unchanged."""
+    return dict(_MIGRATION_COUNTS)
+
+
+def is_current_layout(raw: Any) -> bool:
+    """Whether *raw* is on the current schema with every default filled in, so migrating it would change nothing."""
+    if not isinstance(raw, dict) or not _LAYOUT_KEYS <= raw.keys():
+        return False
+    if raw.get("schema") != LAYOUT_SCHEMA_ID or raw.get("layout_schema_version") != CURRENT_LAYOUT_SCHEMA_VERSION:
+        return False
+    items, rooms, metadata, scenarios = raw["items"], raw["rooms"], raw["metadata"], raw["scenarios"]
+    if not (isinstance(items, list) and isinstance(rooms, list) and isinstance(metadata, dict) and isinstance(scenarios, list)):
+        return False
+    calibration = metadata.get("calibration")
+    if not isinstance(calibration, dict) or "confidence" not in calibration or "units" not in metadata:
+        return False
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        keys = item.keys()
+        if not _ITEM_KEYS <= keys:
+            return False
+        if item.get("type") == "wall" and not _WALL_KEYS <= keys:
+            return False
+        if (item.get("type") in {"door", "opening"} or item.get("room_capture_opening")) and not _OPENING_KEYS <= keys:
+            return False
+    for room in rooms:
+        if not isinstance(room, dict):
+            continue
+        if not _ROOM_KEYS <= room.keys():
+            return False
+        openings = room.get("openings")
+        if isinstance(openings, list) and not all(_ROOM_OPENING_KEYS <= opening.keys() for opening in openings if isinstance(opening, dict)):
+            return False
+    return all(_SCENARIO_KEYS <= scenario.keys() for scenario in scenarios if isinstance(scenario, dict))
+
+
 def migrate_layout(raw: Any) -> dict[str, Any]:
+    """Return *raw* on the current layout schema.
+
+    A layout that is already current (``is_current_layout``) comes back as
+    the same object, uncopied, so the result must be treated as read-only;
+    callers that modify it use ``editable_layout``. Anything else is
+    deep-copied before the defaults are filled in.
+    """
+    if is_current_layout(raw):
+        _MIGRATION_COUNTS["reused"] += 1
+        return raw
+    _MIGRATION_COUNTS["copied"] += 1
     layout = copy.deepcopy(raw) if isinstance(raw, dict) else {}
     layout.setdefault("version", 1)
     layout["schema"] = LAYOUT_SCHEMA_ID
@@ -263,47 +363,11 @@ def migrate_layout(raw: Any) -> dict[str, Any]:
     metadata.setdefault("units", "m")
 
     for index, item in enumerate(layout["items"]):
-        if not isinstance(item, dict):
-            continue
-        item.setdefault("id", f"item-{index + 1}")
-        item.setdefault("confidence", "estimated")
-        item.setdefault("movable", item.get("type") not in {"wall", "fixed_element", "reference_image", "model_part"})
-        item.setdefault("fixed", item.get("type") in {"wall", "fixed_element"} or bool(item.get("locked")))
-        item.setdefault("existing", True)
-        item.setdefault("proposed", False)
-        item.setdefault("removed", False)
-        item.setdefault("locked", bool(item.get("locked", False)))
-        item.setdefault("source", item.get("source_confidence") or item.get("source_type") or "layout")
-        item.setdefault("scenario_status", "existing")
-        if item.get("type") == "wall":
-            item.setdefault("structural_status", "unknown")
-            item.setdefault("structural_confidence", "unknown")
-        if item.get("type") in {"door", "opening"} or item.get("room_capture_opening"):
-            item.setdefault("confidence", "estimated")
-            item.setdefault("opening_type", item.get("type", "opening"))
-            item.setdefault("width_m", geometry.door_width(item) or None)
-            item.setdefault("swing_direction", item.get("swing_direction") or "unknown")
-            item.setdefault("threshold_height_m", item.get("threshold_height_m", 0.0))
-
+        if isinstance(item, dict):
+            migrate_item(item, index)
     for index, room in enumerate(layout["rooms"]):
-        if not isinstance(room, dict):
-            continue
-        room.setdefault("id", f"room-{index + 1}")
-        room.setdefault("label", _room_label(room))
-        room.setdefault("kind", "room")
-        room.setdefault("occupancy", "unknown")
-        room.setdefault("priority", "normal")
-        room.setdefault("confidence", "estimated")
-        room.setdefault("locked", False)
-        if isinstance(room.get("openings"), list):
-            for opening_index, opening in enumerate(room["openings"]):
-                if isinstance(opening, dict):
-                    opening.setdefault("id", f"{room['id']}-opening-{opening_index + 1}")
-                    opening.setdefault("type", opening.get("kind", "opening"))
-                    opening.setdefault("width_m", opening.get("width_m") or opening.get("width"))
-                    opening.setdefault("swing_direction", opening.get("swing_direction") or "unknown")
-                    opening.setdefault("threshold_height_m", opening.get("threshold_height_m", 0.0))
-                    opening.setdefault("confidence", "estimated")
+        if isinstance(room, dict):
+            migrate_room(room, index)
 
     for scenario in layout["scenarios"]:
         if not isinstance(scenario, dict):
@@ -319,6 +383,58 @@ def migrate_layout(raw: Any) -> dict[str, Any]:
     return layout
 
 
+def migrate_item(item: dict[str, Any], index: int) -> None:
+    """Fill in *item*'s current-schema defaults in place; *index* is its list position, used for a missing id."""
+    item.setdefault("id", f"item-{index + 1}")
+    item.setdefault("confidence", "estimated")
+    item.setdefault("movable", item.get("type") not in {"wall", "fixed_element", "reference_image", "model_part"})
+    item.setdefault("fixed", item.get("type") in {"wall", "fixed_element"} or bool(item.get("locked")))
+    item.setdefault("existing", True)
+    item.setdefault("proposed", False)
+    item.setdefault("removed", False)
+    item.setdefault("locked", bool(item.get("locked", False)))
+    item.setdefault("source", item.get("source_confidence") or item.get("source_type") or "layout")
+    item.setdefault("scenario_status", "existing")
+    if item.get("type") == "wall":
+        item.setdefault("structural_status", "unknown")
+        item.setdefault("structural_confidence", "unknown")
+    if item.get("type") in {"door", "opening"} or item.get("room_capture_opening"):
+        item.setdefault("confidence", "estimated")
+        item.setdefault("opening_type", item.get("type", "opening"))
+        item.setdefault("width_m", geometry.door_width(item) or None)
+        item.setdefault("swing_direction", item.get("swing_direction") or "unknown")
+        item.setdefault("threshold_height_m", item.get("threshold_height_m", 0.0))
+
+
+def migrate_room(room: dict[str, Any], index: int) -> None:
+    """Fill in *room*'s current-schema defaults in place; *index* is its list position, used for a missing id."""
+    room.setdefault("id", f"room-{index + 1}")
+    room.setdefault("label", _room_label(room))
+    room.setdefault("kind", "room")
+    room.setdefault("occupancy", "unknown")
+    room.setdefault("priority", "normal")
+    room.setdefault("confidence", "estimated")
+    room.setdefault("locked", False)
+    if isinstance(room.get("openings"), list):
+        for opening_index, opening in enumerate(room["openings"]):
+            if isinstance(opening, dict):
+                opening.setdefault("id", f"{room['id']}-opening-{opening_index + 1}")
+                opening.setdefault("type", opening.get("kind", "opening"))
+                opening.setdefault("width_m", opening.get("width_m") or opening.get("width"))
+                opening.setdefault("swing_direction", opening.get("swing_direction") or "unknown")
+                opening.setdefault("threshold_height_m", opening.get("threshold_height_m", 0.0))
+                opening.setdefault("confidence", "estimated")
+
+
+def editable_layout(raw: Any) -> dict[str, Any]:
+    """Return *raw* migrated into a copy the caller owns and may modify."""
+    layout = migrate_layout(raw)
+    if layout is not raw:
+        return layout
+    _MIGRATION_COUNTS["copied"] += 1
+    return copy.deepcopy(layout)
+
+
 def validate_layout_schema(raw: Any) -> dict[str, Any]:
     layout = migrate_layout(raw)
     errors: list[str] = []
@@ -356,7 +472,7 @@ def validate_layout_schema(raw: Any) -> dict[str, Any]:
 
 def new_project(title: str = "Untitled Haus Project", journey: str = "blank", layout: dict[str, Any] | None = None) -> dict[str, Any]:
     clean_journey = journey if journey in JOURNEYS else "blank"
-    migrated = migrate_layout(layout or {"version": 1, "items": []})
+    migrated = editable_layout(layout or {"version": 1, "items": []})
     project = {
         "schema": PROJECT_SCHEMA_ID,
         "project_schema_version": CURRENT_PROJECT_SCHEMA_VERSION,
@@ -397,7 +513,7 @@ def capture_project_version(
     project: dict[str, Any], status: str, layout: dict[str, Any], note: str = ""
 ) -> dict[str, Any]:
     clean_status = status if status in PROJECT_STATUSES else "draft"
-    migrated = migrate_layout(layout)
+    migrated = editable_layout(layout)
     entry = {
         "id": f"version-{uuid.uuid4().hex[:8]}",
         "status": clean_status,
@@ -420,7 +536,7 @@ def create_scenario(
     status: str = "draft",
     parent_scenario_id: str | None = None,
 ) -> dict[str, Any]:
-    migrated = migrate_layout(layout)
+    migrated = editable_layout(layout)
     scores = scenario_scores(migrated, journey)
     return {
         "id": f"scenario-{uuid.uuid4().hex[:8]}",
@@ -447,6 +563,120 @@ def duplicate_scenario(scenario: dict[str, Any], name: str | None = None) -> dic
     return clone
 
 
+SNAPSHOT_BLOBS_KEY = "layout_blobs"
+_SNAPSHOT_LISTS = ("layout_versions", "scenarios")
+_BLOB_COLLECTIONS = ("items", "rooms")
+
+
+def _blob_digest(entry: Any) -> str:
+    text = json.dumps(entry, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def _pack_document(document: dict[str, Any], blobs: dict[str, Any], digests: dict[int, str]) -> dict[str, Any]:
+    packed = dict(document)
+    for key in _SNAPSHOT_LISTS:
+        entries = document.get(key)
+        if isinstance(entries, list):
+            packed[key] = [_pack_snapshot(entry, blobs, digests) for entry in entries]
+    return packed
+
+
+def _pack_snapshot(entry: Any, blobs: dict[str, Any], digests: dict[int, str]) -> Any:
+    if not isinstance(entry, dict) or not isinstance(entry.get("layout"), dict):
+        return entry
+    layout = entry["layout"]
+    ref: dict[str, Any] = {"layout": _pack_document({key: value for key, value in layout.items() if key not in _BLOB_COLLECTIONS}, blobs, digests)}
+    for key in _BLOB_COLLECTIONS:
+        values = layout.get(key)
+        if not isinstance(values, list):
+            continue
+        refs = []
+        for value in values:
+            # Snapshots unpacked from the same file share their blob dicts, so each is hashed once.
+            digest = digests.get(id(value))
+            if digest is None:
+                digest = digests[id(value)] = _blob_digest(value)
+            blobs.setdefault(digest, value)
+            refs.append(digest)
+        ref[key] = refs
+    packed = {key: value for key, value in entry.items() if key != "layout"}
+    packed["layout_ref"] = ref
+    return packed
+
+
+def pack_snapshots(document: dict[str, Any]) -> dict[str, Any]:
+    """Storage form of a project or layout: stored versions and scenarios reference shared item and room blobs.
+
+    Each distinct item or room is written once under ``layout_blobs`` by
+    content digest, and every snapshot's ``layout`` becomes a ``layout_ref``
+    listing digests. The live ``layout`` of a project stays inline. The
+    input is not modified; ``unpack_snapshots`` reverses this.
+    """
+    if not isinstance(document, dict):
+        return document
+    # Blobs kept by an unresolved load still back that snapshot's ``layout_ref``.
+    carried = document.get(SNAPSHOT_BLOBS_KEY)
+    blobs: dict[str, Any] = dict(carried) if isinstance(carried, dict) else {}
+    digests: dict[int, str] = {}
+    packed = _pack_document(document, blobs, digests)
+    if isinstance(document.get("layout"), dict):
+        packed["layout"] = _pack_document(document["layout"], blobs, digests)
+    packed.pop(SNAPSHOT_BLOBS_KEY, None)
+    if blobs:
+        packed[SNAPSHOT_BLOBS_KEY] = blobs
+    return packed
+
+
+def _unpack_document(document: dict[str, Any], blobs: dict[str, Any]) -> int:
+    unresolved = 0
+    for key in _SNAPSHOT_LISTS:
+        entries = document.get(key)
+        if not isinstance(entries, list):
+            continue
+        for entry in entries:
+            if not isinstance(entry, dict) or not isinstance(entry.get("layout_ref"), dict):
+                continue
+            ref = entry["layout_ref"]
+            try:
+                resolved = {
+                    collection: [blobs[digest] for digest in ref[collection]]
+                    for collection in _BLOB_COLLECTIONS
+                    if isinstance(ref.get(collection), list)
+                }
+            except (KeyError, TypeError):
+                # Blobs dropped by another writer: keep the stored ref so the next save writes it back as read.
+                unresolved += 1
+                continue
+            layout = ref.get("layout") if isinstance(ref.get("layout"), dict) else {}
+            unresolved += _unpack_document(layout, blobs)
+            layout.update(resolved)
+            del entry["layout_ref"]
+            entry["layout"] = layout
+    return unresolved
+
+
+def unpack_snapshots(document: dict[str, Any]) -> dict[str, Any]:
+    """Resolve the ``layout_ref`` snapshots of a parsed project or layout in place and return it.
+
+    Snapshots that stored the same item share one dict, so resolving is a
+    reference walk rather than a copy; treat snapshot layouts as read-only
+    and take ``editable_layout`` before changing one. Documents without
+    blobs are returned unchanged. A snapshot whose blobs are missing keeps
+    its ``layout_ref``, and the document keeps ``layout_blobs`` so that
+    ``pack_snapshots`` writes the ref back as it was read.
+    """
+    if not isinstance(document, dict) or not isinstance(document.get(SNAPSHOT_BLOBS_KEY), dict):
+        return document
+    blobs = document.pop(SNAPSHOT_BLOBS_KEY)
+    unresolved = _unpack_document(document, blobs)
+    if isinstance(document.get("layout"), dict):
+        unresolved += _unpack_document(document["layout"], blobs)
+    if unresolved:
+        document[SNAPSHOT_BLOBS_KEY] = blobs
+    return document
+
+
 def scenario_scores(layout: dict[str, Any], journey: str = "blank") -> dict[str, Any]:
     report = build_validation_report(layout, journey=journey)
     warnings = report["warnings"]
@@ -531,95 +761,51 @@ def _warning(
     }
 
 
+# A report warning and the ids of the items it involves (empty for layout-wide warnings).
+_Entry = tuple[tuple[Any, ...], dict[str, Any]]
+_Section = tuple[str, list[_Entry]]
+_BATHROOM_TARGETS = {"toilet": "toilet_transfer", "shower": "shower_access", "sink": "vanity_approach"}
+_KITCHEN_TYPES = {"fridge", "sink", "kitchen_counter", "stove", "washer"}
+# Sections of recent reports by report id, so a follow-up report can reuse them.
+_MAX_REMEMBERED_REPORTS = 16
+_VALIDATION_SECTIONS: OrderedDict[str, tuple[tuple[str, str], list[_Section]]] = OrderedDict()
+
+
+@dataclass(frozen=True)
+class _Scope:
+    """Items an incremental validation run re-checks."""
+
+    touched: set[Any]
+    # touched items plus fixtures whose nearest neighbour may have changed
+    near: set[Any]
+
+
 def build_validation_report(
     layout: dict[str, Any],
     *,
     journey: str = "blank",
     accessibility_profile: str = "general_aging_ready",
+    previous: dict[str, Any] | None = None,
+    changes: list[dict[str, Any]] | None = None,
 ) -> dict[str, Any]:
+    """Validate *layout* for a journey and accessibility profile.
+
+    Given the *previous* report and, as *changes*, the ``ops`` of
+    ``semantic_ir.layout_diff`` from that report's layout to this one, only
+    warnings involving the items the ops touch are re-checked and the rest
+    are reused (shared, not copied). Room edits, or a previous report this
+    process did not build, fall back to a full run.
+    """
     migrated = migrate_layout(layout)
-    warnings: list[dict[str, Any]] = []
     unknowns = unknowns_for_layout(migrated)
-    items = [item for item in migrated.get("items", []) if isinstance(item, dict) and item.get("visible", True)]
-
-    if unknowns:
-        warnings.append(
-            _warning(
-                "warning",
-                "missing_measurements",
-                "Some measurements are missing or unconfirmed.",
-                "Haus can still plan, but spatial checks become less reliable when scale, rooms, door widths, or product dimensions are unknown.",
-                "Open the assumptions and unknowns panels, then confirm scale, doors, room boundaries, and product dimensions.",
-                geometry={"unknowns": unknowns},
-            )
-        )
-
-    for i, item in enumerate(items):
-        for j, other in enumerate(items[i + 1 :], start=i + 1):
-            if _rect_intersects(item_rect(item), item_rect(other)):
-                room = _text(item.get("room") or other.get("room"), "Unassigned")
-                warnings.append(
-                    _warning(
-                        "serious",
-                        "overlap",
-                        f"{_object_label(item)} overlaps {_object_label(other)}.",
-                        "Overlapping footprints can mean the plan is impossible or needs manual adjustment.",
-                        "Move, resize, or remove one of the overlapping objects, then regenerate validation.",
-                        room=room,
-                        geometry={
-                            "items": [item.get("id"), other.get("id")],
-                            "blocked_area": _union_rect(item_rect(item), item_rect(other)),
-                        },
-                    )
-                )
+    key = (journey, accessibility_profile)
+    scope = _validation_scope(migrated, key, previous, changes)
+    sections = _validation_sections(migrated, journey, accessibility_profile, unknowns, scope)
+    if scope is not None and previous is not None:
+        sections = _merge_sections(migrated, _VALIDATION_SECTIONS[str(previous.get("id"))][1], sections, scope)
+    warnings = [warning for _, entries in sections for _, warning in entries]
 
     profile = ACCESSIBILITY_PROFILES.get(accessibility_profile, ACCESSIBILITY_PROFILES["general_aging_ready"])
-    if journey == "accessibility":
-        warnings.extend(accessibility_warnings(migrated, profile_name=accessibility_profile))
-    else:
-        min_gap = 0.75
-        for i, item in enumerate(items):
-            for other in items[i + 1 :]:
-                gap = _rect_gap(item_rect(item), item_rect(other))
-                if 0 < gap < min_gap:
-                    warnings.append(
-                        _warning(
-                            "warning",
-                            "tight_clearance",
-                            f"{_object_label(item)} is only {gap:.2f}m from {_object_label(other)}.",
-                            "Narrow gaps reduce comfortable circulation and make cleaning or furniture use harder.",
-                            "Target at least 0.75m for everyday compact circulation unless this is intentional.",
-                            room=_text(item.get("room") or other.get("room"), "Unassigned"),
-                            geometry={"clearance_m": round(gap, 2), "target_m": min_gap},
-                        )
-                    )
-
-    for conflict in geometry.door_swing_conflicts(migrated):
-        warnings.append(
-            _warning(
-                "warning",
-                "door_swing_conflict",
-                f"{conflict['door']} swing conflicts with {conflict['conflict']}.",
-                "Door swings can block bathroom, bedroom, or corridor routes.",
-                "Reverse the swing, use a sliding/no-door opening, or move the obstruction.",
-                geometry=conflict,
-            )
-        )
-
-    if journey == "renovation":
-        for item in items:
-            if item.get("type") == "wall" and item.get("structural_status", "unknown") == "unknown":
-                warnings.append(
-                    _warning(
-                        "serious",
-                        "structural_unknown",
-                        "A wall has unknown structural status.",
-                        "Floor-plan images do not prove whether a wall is structural.",
-                        "Treat wall changes as concept-only until a qualified professional verifies the wall.",
-                        geometry={"item_id": item.get("id"), "footprint": _rect_dict(item_rect(item))},
-                    )
-                )
-
     room_summaries = summarize_rooms(migrated, warnings)
     report = {
         "id": f"validation-{uuid.uuid4().hex[:8]}",
@@ -640,9 +826,181 @@ def build_validation_report(
         report["disclaimers"].append(ACCESSIBILITY_DISCLAIMER)
     if journey == "renovation":
         report["disclaimers"].append(RENOVATION_DISCLAIMER)
+    if _unique_item_ids(migrated) is not None:
+        _VALIDATION_SECTIONS[report["id"]] = (key, sections)
+        while len(_VALIDATION_SECTIONS) > _MAX_REMEMBERED_REPORTS:
+            _VALIDATION_SECTIONS.popitem(last=False)
     return report
 
 
+def _validation_sections(
+    migrated: dict[str, Any],
+    journey: str,
+    accessibility_profile: str,
+    unknowns: list[dict[str, str]],
+    scope: _Scope | None,
+) -> list[_Section]:
+    """Report warnings as ``(kind, entries)`` sections in report order; see ``_merge_sections``."""
+    missing: list[_Entry] = []
+    if unknowns:
+        missing.append(
+            (
+                (),
+                _warning(
+                    "warning",
+                    "missing_measurements",
+                    "Some measurements are missing or unconfirmed.",
+                    "Haus can still plan, but spatial checks become less reliable when scale, rooms, door widths, or product dimensions are unknown.",
+                    "Open the assumptions and unknowns panels, then confirm scale, doors, room boundaries, and product dimensions.",
+                    geometry={"unknowns": unknowns},
+                ),
+            )
+        )
+    sections: list[_Section] = [("global", missing)]
+
+    items = [item for item in migrated.get("items", []) if isinstance(item, dict) and item.get("visible", True)]
+    boxes = _item_boxes(items)
+    rows = _scoped_rows(items, scope)
+    overlaps: list[_Entry] = []
+    for i, j in _overlap_pairs(boxes, rows).tolist():
+        item, other = items[i], items[j]
+        room = _text(item.get("room") or other.get("room"), "Unassigned")
+        overlaps.append(
+            (
+                (item.get("id"), other.get("id")),
+                _warning(
+                    "serious",
+                    "overlap",
+                    f"{_object_label(item)} overlaps {_object_label(other)}.",
+                    "Overlapping footprints can mean the plan is impossible or needs manual adjustment.",
+                    "Move, resize, or remove one of the overlapping objects, then regenerate validation.",
+                    room=room,
+                    geometry={
+                        "items": [item.get("id"), other.get("id")],
+                        "blocked_area": _union_rect(item_rect(item), item_rect(other)),
+                    },
+                ),
+            )
+        )
+    sections.append(("items", overlaps))
+
+    if journey == "accessibility":
+        sections.extend(_accessibility_sections(migrated, accessibility_profile, scope))
+    else:
+        min_gap = 0.75
+        tight: list[_Entry] = []
+        for i, j in _close_pairs(boxes, min_gap, rows).tolist():
+            item, other = items[i], items[j]
+            gap = geometry.rect_gap(item_rect(item), item_rect(other))
+            tight.append(
+                (
+                    (item.get("id"), other.get("id")),
+                    _warning(
+                        "warning",
+                        "tight_clearance",
+                        f"{_object_label(item)} is only {gap:.2f}m from {_object_label(other)}.",
+                        "Narrow gaps reduce comfortable circulation and make cleaning or furniture use harder.",
+                        "Target at least 0.75m for everyday compact circulation unless this is intentional.",
+                        room=_text(item.get("room") or other.get("room"), "Unassigned"),
+                        geometry={"clearance_m": round(gap, 2), "target_m": min_gap},
+                    ),
+                )
+            )
+        sections.append(("items", tight))
+
+    sections.append(("items", _door_swing_warnings(migrated.get("items", []), scope)))
+
+    structural: list[_Entry] = []
+    if journey == "renovation":
+        for item in items:
+            if scope is not None and item.get("id") not in scope.touched:
+                continue
+            if item.get("type") == "wall" and item.get("structural_status", "unknown") == "unknown":
+                structural.append(
+                    (
+                        (item.get("id"),),
+                        _warning(
+                            "serious",
+                            "structural_unknown",
+                            "A wall has unknown structural status.",
+                            "Floor-plan images do not prove whether a wall is structural.",
+                            "Treat wall changes as concept-only until a qualified professional verifies the wall.",
+                            geometry={"item_id": item.get("id"), "footprint": _rect_dict(item_rect(item))},
+                        ),
+                    )
+                )
+    sections.append(("items", structural))
+    return sections
+
+
+def _unique_item_ids(layout: dict[str, Any]) -> dict[Any, int] | None:
+    """Position of each item by id, or None when ids are missing, repeated or unhashable."""
+    positions: dict[Any, int] = {}
+    for index, item in enumerate(layout.get("items", [])):
+        if not isinstance(item, dict):
+            continue
+        item_id = item.get("id")
+        try:
+            if item_id is None or item_id in positions:
+                return None
+        except TypeError:
+            return None
+        positions[item_id] = index
+    return positions
+
+
+def _validation_scope(
+    migrated: dict[str, Any],
+    key: tuple[str, str],
+    previous: dict[str, Any] | None,
+    changes: list[dict[str, Any]] | None,
+) -> _Scope | None:
+    """What an incremental run must re-check, or None when it has to run in full."""
+    if previous is None or changes is None:
+        return None
+    remembered = _VALIDATION_SECTIONS.get(str(previous.get("id")))
+    if remembered is None or remembered[0] != key or _unique_item_ids(migrated) is None:
+        return None
+    if any(not isinstance(op, dict) or op.get("collection") != "items" for op in changes):
+        return None
+    touched = {op.get("id") for op in changes}
+    # A fixture's approach clearance is its gap to the nearest item, so it changes when
+    # a touched item's old or new footprint comes within the widest clearance target.
+    profile = ACCESSIBILITY_PROFILES.get(key[1], ACCESSIBILITY_PROFILES["general_aging_ready"])
+    reach = max(0.75, _num(profile.get("path_min_m"), 0.85))
+    footprints = [op[side] for op in changes for side in ("before", "after") if isinstance(op.get(side), dict)]
+    fixtures = [item for item in migrated.get("items", []) if isinstance(item, dict) and _is_approach_fixture(item)]
+    near = set(touched)
+    if footprints and fixtures:
+        contacts = placement.box_contacts(_item_boxes(fixtures), _item_boxes(footprints), reach)
+        near.update(fixtures[row].get("id") for row in set(contacts[:, 0].tolist()))
+    return _Scope(touched, near)
+
+
+def _merge_sections(
+    migrated: dict[str, Any],
+    previous: list[_Section],
+    fresh: list[_Section],
+    scope: _Scope,
+) -> list[_Section]:
+    """Combine the previous report's still-valid entries with re-checked ones, in full-run order.
+
+    ``global`` sections are always recomputed; ``items`` entries are kept
+    unless they involve a touched item, and ``nearest`` entries unless their
+    fixture is in ``scope.near``. Entries are ordered by item position, as a
+    full run emits them.
+    """
+    positions = _unique_item_ids(migrated) or {}
+    merged: list[_Section] = []
+    for (kind, kept), (_, entries) in zip(previous, fresh):
+        if kind != "global":
+            stale = scope.near if kind == "nearest" else scope.touched
+            entries = [entry for entry in kept if not any(item_id in stale for item_id in entry[0])] + entries
+            entries.sort(key=lambda entry: [positions[item_id] for item_id in entry[0]])
+        merged.append((kind, entries))
+    return merged
+
+
 def _object_label(item: dict[str, Any]) -> str:
     return _text(item.get("name") or item.get("furnitureType") or item.get("type"), "object")
 
@@ -663,9 +1021,12 @@ def summarize_rooms(layout: dict[str, Any], warnings: list[dict[str, Any]]) -> l
         labels = sorted({_text(item.get("room"), "Unassigned") for item in layout.get("items", []) if isinstance(item, dict)})
     if not labels:
         labels = ["Project"]
+    by_room: dict[Any, list[dict[str, Any]]] = {}
+    for warning in warnings:
+        by_room.setdefault(warning.get("room"), []).append(warning)
     summaries = []
     for label in labels:
-        room_warnings = [warning for warning in warnings if warning.get("room") in {label, "Project"}]
+        room_warnings = by_room.get(label, []) + (by_room.get("Project", []) if label != "Project" else [])
         highest = "info"
         for severity in VALIDATION_SEVERITIES:
             if any(warning["severity"] == severity for warning in room_warnings):
@@ -747,21 +1108,25 @@ def extraction_inference_summary(layout: dict[str, Any]) -> dict[str, Any]:
     }
 
 
-def command_route(message: str) -> str:
+_COMMAND_ROUTES: tuple[tuple[str, str], ...] = (
+    ("apply_plan", r"\b(apply|use this|commit scenario)\b"),
+    ("revise_plan", r"\b(revise|make it|cheaper|more storage|less renovation|more accessible)\b"),
+    ("export_report", r"\b(export|download|report|brief|shopping list)\b"),
+    ("validate_layout", r"\b(validate|check|sanity|risk|warning|fit)\b"),
+    ("edit_object", r"\b(move|rotate|resize|delete|lock|unlock|edit)\b"),
+    ("draft_plan", r"\b(draft|design|generate|plan|scenario|concept)\b"),
+)
+
+
+def command_routes(message: str) -> list[str]:
+    """Every command route *message* asks for, highest priority first."""
     text = message.lower()
-    if re.search(r"\b(apply|use this|commit scenario)\b", text):
-        return "apply_plan"
-    if re.search(r"\b(revise|make it|cheaper|more storage|less renovation|more accessible)\b", text):
-        return "revise_plan"
-    if re.search(r"\b(export|download|report|brief|shopping list)\b", text):
-        return "export_report"
-    if re.search(r"\b(validate|check|sanity|risk|warning|fit)\b", text):
-        return "validate_layout"
-    if re.search(r"\b(move|rotate|resize|delete|lock|unlock|edit)\b", text):
-        return "edit_object"
-    if re.search(r"\b(draft|design|generate|plan|scenario|concept)\b", text):
-        return "draft_plan"
-    return "ask_question"
+    return [route for route, pattern in _COMMAND_ROUTES if re.search(pattern, text)]
+
+
+def command_route(message: str) -> str:
+    routes = command_routes(message)
+    return routes[0] if routes else "ask_question"
 
 
 def journey_system_prompt(journey: str, metadata: dict[str, Any] | None = None) -> str:
@@ -835,179 +1200,243 @@ def confidence_explanations(layout: dict[str, Any]) -> list[dict[str, str]]:
 
 
 def accessibility_warnings(layout: dict[str, Any], profile_name: str = "general_aging_ready") -> list[dict[str, Any]]:
+    return [warning for _, entries in _accessibility_sections(layout, profile_name) for _, warning in entries]
+
+
+def _accessibility_sections(
+    layout: dict[str, Any], profile_name: str = "general_aging_ready", scope: _Scope | None = None
+) -> list[_Section]:
     profile = ACCESSIBILITY_PROFILES.get(profile_name, ACCESSIBILITY_PROFILES["general_aging_ready"])
-    warnings: list[dict[str, Any]] = []
     door_min = _num(profile["doorway_min_m"], 0.8)
     path_min = _num(profile["path_min_m"], 0.85)
     turning = _num(profile["turning_circle_m"], 1.2)
-    doors = [item for item in layout.get("items", []) if isinstance(item, dict) and _door_width(item)]
     items = [item for item in layout.get("items", []) if isinstance(item, dict)]
 
-    for door in doors:
+    doorways: list[_Entry] = []
+    for door in items:
         width = _door_width(door)
+        if not width or (scope is not None and door.get("id") not in scope.touched):
+            continue
         if width < door_min:
-            warnings.append(
-                _warning(
-                    "blocked",
-                    "doorway_width",
-                    f"{_object_label(door)} is {width:.2f}m wide; target is {door_min:.2f}m.",
-                    "The selected profile may not pass through this doorway comfortably.",
-                    "Verify the door width on site and consider widening, removing the door, or changing the route.",
-                    room=_text(door.get("room"), "Project"),
-                    geometry={"width_m": width, "target_m": door_min, "item_id": door.get("id")},
+            doorways.append(
+                (
+                    (door.get("id"),),
+                    _warning(
+                        "blocked",
+                        "doorway_width",
+                        f"{_object_label(door)} is {width:.2f}m wide; target is {door_min:.2f}m.",
+                        "The selected profile may not pass through this doorway comfortably.",
+                        "Verify the door width on site and consider widening, removing the door, or changing the route.",
+                        room=_text(door.get("room"), "Project"),
+                        geometry={"width_m": width, "target_m": door_min, "item_id": door.get("id")},
+                    ),
                 )
             )
 
-    for i, item in enumerate(items):
-        for other in items[i + 1 :]:
-            gap = _rect_gap(item_rect(item), item_rect(other))
-            if 0 < gap < path_min:
-                warnings.append(
-                    _warning(
-                        "serious",
-                        "path_clearance",
-                        f"Route gap is {gap:.2f}m; target is {path_min:.2f}m.",
-                        "The selected profile needs a wider continuous route between major areas.",
-                        "Move furniture, remove hazards, or mark a renovation option to create a wider path.",
-                        room=_text(item.get("room") or other.get("room"), "Project"),
-                        geometry={"clearance_m": gap, "target_m": path_min},
-                    )
-                )
+    boxes = _item_boxes(items)
+    paths: list[_Entry] = []
+    for i, j in _close_pairs(boxes, path_min, _scoped_rows(items, scope)).tolist():
+        item, other = items[i], items[j]
+        gap = geometry.rect_gap(item_rect(item), item_rect(other))
+        paths.append(
+            (
+                (item.get("id"), other.get("id")),
+                _warning(
+                    "serious",
+                    "path_clearance",
+                    f"Route gap is {gap:.2f}m; target is {path_min:.2f}m.",
+                    "The selected profile needs a wider continuous route between major areas.",
+                    "Move furniture, remove hazards, or mark a renovation option to create a wider path.",
+                    room=_text(item.get("room") or other.get("room"), "Project"),
+                    geometry={"clearance_m": gap, "target_m": path_min},
+                ),
+            )
+        )
 
+    turning_space: list[_Entry] = []
     bounds = _layout_bounds(layout)
     if min(bounds[2] - bounds[0], bounds[3] - bounds[1]) < turning:
-        warnings.append(
-            _warning(
-                "serious",
-                "turning_circle",
-                f"No obvious {turning:.2f}m turning circle fits in the current layout bounds.",
-                "Wheelchair and caregiver-assisted profiles need clear turning space in key rooms.",
-                "Clear furniture from a turning zone or verify room dimensions manually.",
-                geometry={"diameter_m": turning},
+        turning_space.append(
+            (
+                (),
+                _warning(
+                    "serious",
+                    "turning_circle",
+                    f"No obvious {turning:.2f}m turning circle fits in the current layout bounds.",
+                    "Wheelchair and caregiver-assisted profiles need clear turning space in key rooms.",
+                    "Clear furniture from a turning zone or verify room dimensions manually.",
+                    geometry={"diameter_m": turning},
+                ),
             )
         )
 
-    warnings.extend(_bed_transfer_warnings(items, profile))
-    warnings.extend(_bathroom_access_warnings(items, profile))
-    warnings.extend(_kitchen_access_warnings(items, profile))
-    warnings.extend(_door_swing_warnings(items))
-    warnings.extend(_trip_hazard_warnings(items))
-    warnings.extend(_lighting_recommendations(layout))
-    warnings.append(
-        _warning(
-            "info",
-            "storage_reach_height",
-            "Review storage reach heights for daily-use items.",
-            "Reach height is a non-geometric recommendation unless shelf heights are entered.",
-            "Move daily-use storage between knee and shoulder height for the target user.",
-        )
+    near = None if scope is None else scope.near
+    touched = None if scope is None else scope.touched
+    return [
+        ("items", doorways),
+        ("items", paths),
+        ("global", turning_space),
+        ("nearest", _bed_transfer_warnings(items, profile, boxes, near)),
+        ("nearest", _bathroom_access_warnings(items, profile, boxes, near)),
+        ("nearest", _kitchen_access_warnings(items, profile, boxes, near)),
+        ("items", _door_swing_warnings(items, scope)),
+        ("items", _trip_hazard_warnings(items, touched)),
+        ("global", [((), warning) for warning in _lighting_recommendations(layout)]),
+        (
+            "global",
+            [
+                (
+                    (),
+                    _warning(
+                        "info",
+                        "storage_reach_height",
+                        "Review storage reach heights for daily-use items.",
+                        "Reach height is a non-geometric recommendation unless shelf heights are entered.",
+                        "Move daily-use storage between knee and shoulder height for the target user.",
+                    ),
+                )
+            ],
+        ),
+    ]
+
+
+def _is_approach_fixture(item: dict[str, Any]) -> bool:
+    """Whether an accessibility check measures *item*'s gap to its nearest neighbour."""
+    furniture_type = item.get("furnitureType")
+    return (
+        str(furniture_type or "").startswith("bed")
+        or furniture_type in _BATHROOM_TARGETS
+        or furniture_type in _KITCHEN_TYPES
     )
-    return warnings
 
 
-def _bed_transfer_warnings(items: list[dict[str, Any]], profile: dict[str, Any]) -> list[dict[str, Any]]:
-    warnings = []
+def _nearest_gap(items: list[dict[str, Any]], boxes: np.ndarray, index: int, default: float) -> float:
+    """Smallest rect gap from ``items[index]`` to any other item, or *default* when it is alone."""
+    others = [j for j, other in enumerate(items) if other is not items[index]]
+    if not others:
+        return default
+    nearest = others[int(placement.box_gaps(boxes[index : index + 1], boxes[others])[0].argmin())]
+    return geometry.rect_gap(item_rect(items[index]), item_rect(items[nearest]))
+
+
+def _bed_transfer_warnings(
+    items: list[dict[str, Any]], profile: dict[str, Any], boxes: np.ndarray, only: set[Any] | None = None
+) -> list[_Entry]:
+    warnings: list[_Entry] = []
     clearance = max(0.75, _num(profile.get("path_min_m"), 0.85))
-    beds = [item for item in items if str(item.get("furnitureType", "")).startswith("bed")]
-    for bed in beds:
-        gaps = [_rect_gap(item_rect(bed), item_rect(other)) for other in items if other is not bed]
-        free = min(gaps) if gaps else clearance
+    for index, bed in enumerate(items):
+        if not str(bed.get("furnitureType", "")).startswith("bed") or (only is not None and bed.get("id") not in only):
+            continue
+        free = _nearest_gap(items, boxes, index, clearance)
         if free < clearance:
             warnings.append(
-                _warning(
-                    "serious",
-                    "bed_transfer",
-                    f"Bed transfer side clearance appears below {clearance:.2f}m.",
-                    "At least one side and the foot of the bed should remain reachable for the selected profile.",
-                    "Shift the bed or remove nearby furniture to preserve transfer and caregiver access.",
-                    room=_text(bed.get("room"), "Bedroom"),
-                    geometry={"clearance_m": free, "target_m": clearance},
+                (
+                    (bed.get("id"),),
+                    _warning(
+                        "serious",
+                        "bed_transfer",
+                        f"Bed transfer side clearance appears below {clearance:.2f}m.",
+                        "At least one side and the foot of the bed should remain reachable for the selected profile.",
+                        "Shift the bed or remove nearby furniture to preserve transfer and caregiver access.",
+                        room=_text(bed.get("room"), "Bedroom"),
+                        geometry={"clearance_m": free, "target_m": clearance},
+                    ),
                 )
             )
     return warnings
 
 
-def _bathroom_access_warnings(items: list[dict[str, Any]], profile: dict[str, Any]) -> list[dict[str, Any]]:
-    warnings = []
-    targets = {"toilet": "toilet_transfer", "shower": "shower_access", "sink": "vanity_approach"}
+def _bathroom_access_warnings(
+    items: list[dict[str, Any]], profile: dict[str, Any], boxes: np.ndarray, only: set[Any] | None = None
+) -> list[_Entry]:
+    warnings: list[_Entry] = []
     clearance = max(0.75, _num(profile.get("path_min_m"), 0.85))
-    for item in items:
+    for index, item in enumerate(items):
         ftype = item.get("furnitureType")
-        if ftype in targets:
-            nearest = min(
-                (_rect_gap(item_rect(item), item_rect(other)) for other in items if other is not item),
-                default=clearance,
-            )
+        if ftype in _BATHROOM_TARGETS and (only is None or item.get("id") in only):
+            nearest = _nearest_gap(items, boxes, index, clearance)
             if nearest < clearance:
                 warnings.append(
-                    _warning(
-                        "serious",
-                        targets[ftype],
-                        f"{_object_label(item)} approach clearance is {nearest:.2f}m.",
-                        "Bathroom fixtures need clear approach and transfer space for safe use.",
-                        "Move nearby objects, reverse door swing, or treat this as a renovation item.",
-                        room=_text(item.get("room"), "Bathroom"),
-                        geometry={"clearance_m": nearest, "target_m": clearance},
+                    (
+                        (item.get("id"),),
+                        _warning(
+                            "serious",
+                            _BATHROOM_TARGETS[ftype],
+                            f"{_object_label(item)} approach clearance is {nearest:.2f}m.",
+                            "Bathroom fixtures need clear approach and transfer space for safe use.",
+                            "Move nearby objects, reverse door swing, or treat this as a renovation item.",
+                            room=_text(item.get("room"), "Bathroom"),
+                            geometry={"clearance_m": nearest, "target_m": clearance},
+                        ),
                     )
                 )
     return warnings
 
 
-def _kitchen_access_warnings(items: list[dict[str, Any]], profile: dict[str, Any]) -> list[dict[str, Any]]:
-    kitchen_types = {"fridge", "sink", "kitchen_counter", "stove", "washer"}
-    warnings = []
+def _kitchen_access_warnings(
+    items: list[dict[str, Any]], profile: dict[str, Any], boxes: np.ndarray, only: set[Any] | None = None
+) -> list[_Entry]:
+    warnings: list[_Entry] = []
     clearance = _num(profile.get("path_min_m"), 0.85)
-    for item in items:
-        if item.get("furnitureType") in kitchen_types:
-            nearest = min(
-                (_rect_gap(item_rect(item), item_rect(other)) for other in items if other is not item),
-                default=clearance,
-            )
+    for index, item in enumerate(items):
+        if item.get("furnitureType") in _KITCHEN_TYPES and (only is None or item.get("id") in only):
+            nearest = _nearest_gap(items, boxes, index, clearance)
             if nearest < clearance:
                 warnings.append(
-                    _warning(
-                        "warning",
-                        "kitchen_reach_access",
-                        f"{_object_label(item)} has tight approach clearance.",
-                        "Kitchen appliances and counters need reachable front access.",
-                        "Move mobile furniture or revise cabinet/appliance placement.",
-                        room=_text(item.get("room"), "Kitchen"),
-                        geometry={"clearance_m": nearest, "target_m": clearance},
+                    (
+                        (item.get("id"),),
+                        _warning(
+                            "warning",
+                            "kitchen_reach_access",
+                            f"{_object_label(item)} has tight approach clearance.",
+                            "Kitchen appliances and counters need reachable front access.",
+                            "Move mobile furniture or revise cabinet/appliance placement.",
+                            room=_text(item.get("room"), "Kitchen"),
+                            geometry={"clearance_m": nearest, "target_m": clearance},
+                        ),
                     )
                 )
     return warnings
 
 
-def _door_swing_warnings(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    warnings = []
-    for conflict in geometry.door_swing_conflicts({"items": items}):
+def _door_swing_warnings(items: list[Any], scope: _Scope | None = None) -> list[_Entry]:
+    warnings: list[_Entry] = []
+    for conflict in geometry.door_swing_conflicts({"items": items}, None if scope is None else scope.touched):
         warnings.append(
-            _warning(
-                "warning",
-                "door_swing_conflict",
-                f"{conflict['door']} swing conflicts with {conflict['conflict']}.",
-                "Door swings can block bathroom, bedroom, or corridor routes.",
-                "Reverse the swing, use a sliding/no-door opening, or move the obstruction.",
-                geometry=conflict,
+            (
+                (conflict["door_id"], conflict["conflict_id"]),
+                _warning(
+                    "warning",
+                    "door_swing_conflict",
+                    f"{conflict['door']} swing conflicts with {conflict['conflict']}.",
+                    "Door swings can block bathroom, bedroom, or corridor routes.",
+                    "Reverse the swing, use a sliding/no-door opening, or move the obstruction.",
+                    geometry=conflict,
+                ),
             )
         )
     return warnings
 
 
-def _trip_hazard_warnings(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    warnings = []
+def _trip_hazard_warnings(items: list[dict[str, Any]], only: set[Any] | None = None) -> list[_Entry]:
+    warnings: list[_Entry] = []
     hazard_types = {"rug", "threshold", "clutter", "loose_obstacle"}
     for item in items:
+        if only is not None and item.get("id") not in only:
+            continue
         if item.get("hazard") or item.get("furnitureType") in hazard_types:
             warnings.append(
-                _warning(
-                    "warning",
-                    "trip_hazard",
-                    f"{_object_label(item)} is marked as a trip hazard.",
-                    "Rugs, thresholds, clutter zones, tight gaps, and loose obstacles increase fall risk.",
-                    "Remove or secure the hazard and keep the walking route clear.",
-                    room=_text(item.get("room"), "Project"),
-                    geometry={"item_id": item.get("id"), "footprint": _rect_dict(item_rect(item))},
+                (
+                    (item.get("id"),),
+                    _warning(
+                        "warning",
+                        "trip_hazard",
+                        f"{_object_label(item)} is marked as a trip hazard.",
+                        "Rugs, thresholds, clutter zones, tight gaps, and loose obstacles increase fall risk.",
+                        "Remove or secure the hazard and keep the walking route clear.",
+                        room=_text(item.get("room"), "Project"),
+                        geometry={"item_id": item.get("id"), "footprint": _rect_dict(item_rect(item))},
+                    ),
                 )
             )
     return warnings
@@ -1063,15 +1492,9 @@ def night_route_simulation(layout: dict[str, Any]) -> dict[str, Any]:
 
 
 def _route_simulation(layout: dict[str, Any], start: str, end: str, label: str) -> dict[str, Any]:
-    report = build_validation_report(layout, journey="accessibility", accessibility_profile="caregiver_assisted")
-    blockers = [warning for warning in report["warnings"] if warning["severity"] in {"blocked", "serious"}]
-    return {
-        "label": label,
-        "start": start,
-        "end": end,
-        "status": "blocked" if blockers else "clear_with_assumptions",
-        "blockers": blockers[:5],
-    }
+    profile = ACCESSIBILITY_PROFILES["caregiver_assisted"]
+    route = routing.find_route(migrate_layout(layout), start, end, _num(profile["path_min_m"], 0.85))
+    return {"label": label, "profile": profile["label"], **route}
 
 
 def bathroom_safety_checklist(layout: dict[str, Any]) -> list[dict[str, Any]]:
@@ -1089,7 +1512,7 @@ def bathroom_safety_checklist(layout: dict[str, Any]) -> list[dict[str, Any]]:
 
 
 def flag_structural_uncertainty(layout: dict[str, Any]) -> dict[str, Any]:
-    migrated = migrate_layout(layout)
+    migrated = editable_layout(layout)
     for item in migrated.get("items", []):
         if isinstance(item, dict) and item.get("type") == "wall":
             item.setdefault("structural_status", "unknown")
@@ -1099,7 +1522,7 @@ def flag_structural_uncertainty(layout: dict[str, Any]) -> dict[str, Any]:
 
 
 def lock_elements(layout: dict[str, Any], ids: Iterable[str]) -> dict[str, Any]:
-    migrated = migrate_layout(layout)
+    migrated = editable_layout(layout)
     lock_ids = set(ids)
     for item in migrated.get("items", []):
         if isinstance(item, dict) and item.get("id") in lock_ids:
@@ -1367,9 +1790,9 @@ def apply_renovation_scenario(
             "ok": False,
             "blocked": True,
             "reason": "Wall removal or opening suggestions require explicit confirmation and professional verification.",
-            "layout": migrate_layout(layout),
+            "layout": editable_layout(layout),
         }
-    applied = migrate_layout(scenario.get("layout", layout))
+    applied = editable_layout(scenario.get("layout", layout))
     applied.setdefault("metadata", {})["applied_scenario"] = scenario.get("id")
     return {"ok": True, "layout": applied}
 
@@ -1907,7 +2330,7 @@ def repair_layout(raw: Any) -> dict[str, Any]:
     raw_version = _num(raw.get("layout_schema_version"), CURRENT_LAYOUT_SCHEMA_VERSION)
     if raw_version > CURRENT_LAYOUT_SCHEMA_VERSION:
         warnings.append(f"Unsupported schema version {raw_version:g}; attempting repair/migration.")
-    repaired = migrate_layout(raw)
+    repaired = editable_layout(raw)
     warnings.extend(import_warnings(repaired))
     return {"ok": True, "layout": repaired, "warnings": warnings}
 
@@ -1918,7 +2341,7 @@ def import_haus_json(raw: Any) -> dict[str, Any]:
     else:
         parsed = raw
     if isinstance(parsed, dict) and parsed.get("schema") == PROJECT_SCHEMA_ID:
-        project = copy.deepcopy(parsed)
+        project = unpack_snapshots(copy.deepcopy(parsed))
         project["layout"] = migrate_layout(project.get("layout", {}))
         project["scenarios"] = project.get("scenarios") if isinstance(project.get("scenarios"), list) else []
         return {"kind": "project", "project": project, "layout": project["layout"], "warnings": import_warnings(project["layout"])}
@@ -2060,15 +2483,16 @@ def export_project_bundle(
 ) -> Path:
     destination.parent.mkdir(parents=True, exist_ok=True)
     with ZipFile(destination, "w", compression=ZIP_DEFLATED) as zf:
-        zf.writestr("layout.json", json.dumps(project.get("layout", {}), indent=2))
-        zf.writestr("project.json", json.dumps(project, indent=2, default=str))
+        for name, value in (("layout.json", project.get("layout", {})), ("project.json", project)):
+            with zf.open(name, "w") as raw, io.TextIOWrapper(raw, encoding="utf-8") as handle:
+                jsonio.write_stream(value, handle, default=str)
         for name, text in (reports or {}).items():
             zf.writestr(f"reports/{_slug_filename(name) or 'report'}.html", text)
         for name, data in (screenshots or {}).items():
             zf.writestr(f"screenshots/{_slug_filename(name) or 'snapshot'}.png", data)
         for name, data in (source_images or {}).items():
             zf.writestr(f"source-images/{Path(name).name}", data)
-        zf.writestr("catalog/cache.json", json.dumps(catalog_cache or {}, indent=2))
+        zf.writestr("catalog/cache.json", jsonio.dumps(catalog_cache or {}))
     return destination
 
 
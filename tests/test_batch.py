@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+
+from haus import batch
+from haus.batch import discover_images, run_batch
+from haus.types import VectorizeConfig
+
+FIXTURES = Path("tests/fixtures")
+
+
+def test_run_batch_vectorizes_in_parallel_and_resumes(tmp_path: Path) -> None:
+    plans = tmp_path / "plans"
+    plans.mkdir()
+    shutil.copy(FIXTURES / "bto_2room_orange.jpg", plans / "a.jpg")
+    shutil.copy(FIXTURES / "bto_3room_orange.jpg", plans / "b.jpg")
+    shutil.copy(FIXTURES / "bto_3room_orange.jpg", plans / "b.png")
+    assert [path.name for path in discover_images(plans)] == ["a.jpg", "b.jpg", "b.png"]
+
+    out = tmp_path / "out"
+    summary = run_batch(plans, out, workers=2)
+    assert (summary["ok"], summary["errors"], summary["skipped"]) == (3, 0, 0)
+    for name in ("a", "b_jpg", "b_png"):
+        assert (out / name / "layout.json").exists()
+        assert (out / name / "batch.source.json").exists()
+    rows = [json.loads(line) for line in (out / "batch-summary.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert {"read", "extract", "render", "extrude", "export_glb"} <= set(rows[0]["timings_s"])
+
+    again = run_batch(plans, out, workers=1)
+    assert (again["processed"], again["skipped"]) == (0, 3)
+
+    shutil.copy(FIXTURES / "bto_2room_orange.jpg", plans / "b.png")
+    changed = run_batch(plans, out, workers=1)
+    assert (changed["processed"], changed["skipped"]) == (1, 2)
+    assert run_batch(plans, out, workers=1, wall_height=3.0)["processed"] == 3
+
+    # An output tree inside the input tree is not scanned for plans.
+    nested = plans / "vectorized"
+    assert run_batch(plans, nested, workers=1)["processed"] == 3
+    assert list(nested.rglob("*.png"))
+    assert [path.name for path in discover_images(plans, exclude=nested)] == ["a.jpg", "b.jpg", "b.png"]
+    assert run_batch(plans, nested, workers=1)["skipped"] == 3
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="workers must inherit the patched pipeline")
+def test_run_batch_survives_a_worker_that_dies(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def fake_vectorize(config: VectorizeConfig, timings: dict[str, float]) -> dict[str, object]:
+        if config.image_path.stem == "crash":
+            os._exit(1)
+        time.sleep(0.2)  # still busy when the crashed worker takes the pool down
+        config.out_dir.mkdir(parents=True, exist_ok=True)
+        (config.out_dir / "vector.metadata.json").write_text("{}", encoding="utf-8")
+        return {"walls": {"total_segments": 1}, "openings": {"total": 0}}
+
+    monkeypatch.setattr(batch, "run_vectorize", fake_vectorize)
+    plans = tmp_path / "plans"
+    plans.mkdir()
+    for name in ("crash", *(f"plan{n}" for n in range(7))):
+        (plans / f"{name}.png").write_bytes(name.encode())
+
+    # Without per-worker task limits the pool forks, so workers inherit the patched pipeline.
+    summary = run_batch(plans, tmp_path / "out", workers=2, max_tasks_per_worker=None)
+
+    rows = [json.loads(line) for line in Path(summary["summary_path"]).read_text(encoding="utf-8").splitlines()]
+    assert len(rows) == summary["processed"] == 8
+    # Only the window in flight when the worker died is lost; the rest run on a fresh pool.
+    assert 1 <= summary["errors"] <= 4 and summary["ok"] + summary["errors"] == 8
+    assert any(row["status"] == "error" and Path(row["image"]).stem == "crash" for row in rows)
+    assert {Path(row["image"]).stem for row in rows if row["status"] == "ok"} <= {f"plan{n}" for n in range(7)}
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import base64
 import json
+import sys
+import threading
+import time
 from pathlib import Path
 
 import pytest
@@ -16,6 +19,8 @@ from haus.llm.providers import openai_compatible
 @pytest.fixture()
 def chat_client(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> TestClient:
     monkeypatch.setattr(mcp_server, "LAYOUT_PATH", tmp_path / "mcp-layout.json")
+    # Run vectorize jobs on an in-process thread so tests can patch run_vectorize.
+    monkeypatch.setenv("HAUS_VECTORIZE_WORKERS", "0")
     chat_server._DESIGN_PLAN_CACHE.clear()
     chat_server._DESIGN_PLAN_ORDER.clear()
     chat_server._TOOL_CONFIRMATION_CACHE.clear()
@@ -91,6 +96,26 @@ def test_health_route_reports_web_deploy_contract(chat_client: TestClient) -> No
     assert body["service"] == "haus-api"
     assert body["persistence"] == "browser-indexeddb"
     assert body["features"]["mcp_scratch_layout"] is True
+    assert {"calls", "hits", "hit_rate", "tools"} <= set(body["layout_cache"])
+    assert {"hits", "misses", "reuse_rate"} <= set(body["layout_graph_cache"])
+
+
+def test_write_behind_layout_is_on_disk_when_tool_response_completes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    layout_path = tmp_path / "mcp-layout.json"
+    monkeypatch.setattr(mcp_server, "LAYOUT_PATH", layout_path)
+    monkeypatch.setenv("HAUS_LAYOUT_WRITE_BEHIND_MS", "60000")
+    try:
+        with TestClient(chat_server.create_app(str(Path.cwd()))) as client:
+            res = client.post(
+                "/api/chat/tools/dispatch",
+                json={"name": "add_furniture", "arguments": {"furniture_type": "chair"}},
+            )
+            assert res.status_code == 200
+            assert len(json.loads(layout_path.read_text(encoding="utf-8"))["items"]) == 1
+    finally:
+        mcp_server.configure_layout_persistence()
 
 
 def test_cors_allows_vite_dev_origin(chat_client: TestClient) -> None:
@@ -187,7 +212,7 @@ def test_floorplan_vectorize_route_returns_layout(
 ) -> None:
     monkeypatch.setenv("HAUS_RUNTIME_ROOT", str(tmp_path))
 
-    def fake_run_vectorize(config: object) -> dict[str, object]:
+    def fake_run_vectorize(config: object, **_: object) -> dict[str, object]:
         out_dir = getattr(config, "out_dir")
         out_dir.mkdir(parents=True, exist_ok=True)
         layout_path = out_dir / "layout.json"
@@ -227,6 +252,103 @@ def test_floorplan_vectorize_route_returns_layout(
     assert body["artifacts"]["upload_id"]
 
 
+def test_floorplan_vectorize_reuses_cached_result_for_same_upload(
+    chat_client: TestClient,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("HAUS_RUNTIME_ROOT", str(tmp_path))
+    calls: list[object] = []
+
+    def fake_run_vectorize(config: object, **_: object) -> dict[str, object]:
+        calls.append(config)
+        out_dir = getattr(config, "out_dir")
+        out_dir.mkdir(parents=True, exist_ok=True)
+        layout_path = out_dir / "layout.json"
+        wall = {"type": "wall", "pos": [0, 1.3, 0], "geo": [3, 2.6, 0.15], "rot": 0}
+        layout_path.write_text(json.dumps({"version": 1, "metadata": {}, "items": [wall]}), encoding="utf-8")
+        return {"source_image": str(getattr(config, "image_path")), "output_layout": str(layout_path)}
+
+    monkeypatch.setattr(chat_server, "run_vectorize", fake_run_vectorize)
+
+    def upload(name: str, wall_height: str = "2.6") -> dict:
+        res = chat_client.post(
+            "/api/floorplans/vectorize",
+            data={"wall_height_m": wall_height},
+            files={"file": (name, b"same-plan-bytes", "image/png")},
+        )
+        assert res.status_code == 200
+        return res.json()
+
+    first = upload("plan.png")
+    second = upload("brochure.png")
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert len(calls) == 1
+    assert second["artifacts"]["layout"] == first["artifacts"]["layout"]
+    assert second["layout"]["metadata"]["source_filename"] == "brochure.png"
+
+    assert upload("plan.png", wall_height="3.0")["cached"] is False
+    assert len(calls) == 2
+
+
+def test_floorplan_job_api_runs_in_worker_process(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(mcp_server, "LAYOUT_PATH", tmp_path / "mcp-layout.json")
+    monkeypatch.setenv("HAUS_RUNTIME_ROOT", str(tmp_path))
+    monkeypatch.setenv("HAUS_VECTORIZE_WORKERS", "1")
+    plan = Path("tests/fixtures/bto_3room_orange.jpg").read_bytes()
+
+    with TestClient(chat_server.create_app(str(Path.cwd()))) as client:
+        res = client.post("/api/floorplans/vectorize/jobs", files={"file": ("plan.jpg", plan, "image/jpeg")})
+        assert res.status_code == 202
+        job_id = res.json()["job"]["id"]
+
+        stream = client.get(f"/api/floorplans/vectorize/jobs/{job_id}/events")
+        assert "event: stage" in stream.text
+        assert "event: done" in stream.text
+
+        job = client.get(f"/api/floorplans/vectorize/jobs/{job_id}").json()["job"]
+        assert job["status"] == "done"
+        assert [stage["stage"] for stage in job["stages"]][:3] == ["read", "clean", "extract"]
+        assert job["result"]["layout"]["items"]
+        assert client.post(f"/api/floorplans/vectorize/jobs/{job_id}/cancel").status_code == 409
+
+    with TestClient(chat_server.create_app(str(Path.cwd()))) as client:
+        monkeypatch.setenv("HAUS_VECTORIZE_TIMEOUT_S", "0.01")
+        res = client.post(
+            "/api/floorplans/vectorize",
+            data={"wall_height_m": "3.1"},
+            files={"file": ("plan.jpg", plan, "image/jpeg")},
+        )
+        assert res.status_code == 504
+        assert "exceeded" in res.json()["error"]
+
+
+def test_floorplan_jobs_queue_without_blocking_and_can_be_cancelled(
+    chat_client: TestClient,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("HAUS_RUNTIME_ROOT", str(tmp_path))
+    release = threading.Event()
+
+    def slow_vectorize(config: object, **_: object) -> dict[str, object]:
+        release.wait(5)
+        raise RuntimeError("should have been discarded")
+
+    monkeypatch.setattr(chat_server, "run_vectorize", slow_vectorize)
+
+    running = chat_client.post("/api/floorplans/vectorize/jobs", files={"file": ("a.png", b"plan-a", "image/png")}).json()
+    queued = chat_client.post("/api/floorplans/vectorize/jobs", files={"file": ("b.png", b"plan-b", "image/png")}).json()
+    assert chat_client.get("/api/health").json()["vectorize_jobs"]["queued"] >= 1
+
+    res = chat_client.post(f"/api/floorplans/vectorize/jobs/{queued['job']['id']}/cancel")
+    assert res.json()["job"]["status"] == "cancelled"
+    res = chat_client.post(f"/api/floorplans/vectorize/jobs/{running['job']['id']}/cancel")
+    assert res.json()["job"]["status"] == "cancelled"
+    release.set()
+    assert not list((tmp_path / "vectorize-cache").rglob("entry.json"))
+
+
 def test_floorplan_vectorize_rejects_unsupported_file(chat_client: TestClient) -> None:
     res = chat_client.post(
         "/api/floorplans/vectorize",
@@ -241,7 +363,7 @@ def test_floorplan_vectorize_reports_failed_vectorization(
     chat_client: TestClient,
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    def fail_vectorize(config: object) -> dict[str, object]:
+    def fail_vectorize(config: object, **_: object) -> dict[str, object]:
         raise RuntimeError("vectorization failed")
 
     monkeypatch.setattr(chat_server, "run_vectorize", fail_vectorize)
@@ -529,6 +651,124 @@ def test_local_cli_runtime_json_tool_loop(
     assert updated[-1]["content"][0]["text"] == "done"
 
 
+def test_local_cli_runtime_reuses_a_prestarted_process_for_stdin_prompts(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pool = local_cli._RuntimePool()
+    monkeypatch.setattr(local_cli, "_RUNTIME_POOL", pool)
+    monkeypatch.setenv("HAUS_LOCAL_RUNTIME_WARM", "1")
+    cmd = [sys.executable, "-c", "import sys; print(sys.stdin.read().upper())"]
+    try:
+        assert local_cli._run(cmd, "first") == "FIRST"
+        assert local_cli._run(cmd, "second") == "SECOND"
+        assert local_cli._run([*cmd[:2], "print('arg')"], "third", prompt_as_arg=True) == "arg"
+        stats = local_cli.runtime_pool_stats()
+    finally:
+        pool.close()
+
+    row = stats["runtimes"][Path(sys.executable).name]
+    assert (row["steps"], row["warm"], row["cold"], row["failed"]) == (3, 1, 2, 0)
+    assert stats["spares"] == 1
+
+
+def test_local_cli_runtime_stops_idle_spares_without_another_step(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pool = local_cli._RuntimePool()
+    monkeypatch.setattr(local_cli, "_RUNTIME_POOL", pool)
+    monkeypatch.setenv("HAUS_LOCAL_RUNTIME_WARM", "1")
+    monkeypatch.setenv("HAUS_LOCAL_RUNTIME_WARM_IDLE_S", "0.2")
+    cmd = [sys.executable, "-c", "import sys; print(sys.stdin.read())"]
+    runtime = Path(sys.executable).name
+    try:
+        assert local_cli._run(cmd, "last step") == "last step"
+        deadline = time.monotonic() + 10
+        stats = pool.stats()
+        while (stats["spares"] or not stats["runtimes"].get(runtime, {}).get("recycled")) and time.monotonic() < deadline:
+            time.sleep(0.05)
+            stats = pool.stats()
+    finally:
+        pool.close()
+
+    assert stats["spares"] == 0
+    assert stats["runtimes"][runtime]["recycled"] == 1
+
+
+def test_local_cli_runtime_streams_response_text_and_tool_events_per_step(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    replies = [
+        json.dumps({"response": "Checking the room", "tool_calls": [{"name": "list_objects", "arguments": {}}]}),
+        'Here you go:\n{"tool_calls":[],"response":"Two chairs \\u00e9 \\"ok\\""}',
+    ]
+    emitted: list[str] = []
+
+    def fake_stream_run(cmd: list[str], prompt: str, *, prompt_as_arg: bool = False):
+        reply = replies.pop(0)
+        for index in range(0, len(reply), 3):
+            emitted.append(reply[index : index + 3])
+            yield reply[index : index + 3]
+
+    monkeypatch.setattr(local_cli, "_stream_run", fake_stream_run)
+    chunks = []
+    emitted_at_first_text = None
+    for chunk in local_cli.stream_codex(
+        "local",
+        [{"role": "user", "content": [{"type": "text", "text": "what is here?"}]}],
+        "default",
+        lambda name, args: "[]",
+        system="system",
+        tools_spec=[{"name": "list_objects", "description": "List objects", "parameters": {"type": "object", "properties": {}}}],
+        max_tool_steps=3,
+    ):
+        if chunk.type == "text" and emitted_at_first_text is None:
+            emitted_at_first_text = len(emitted)
+        chunks.append(chunk)
+
+    assert emitted_at_first_text is not None and emitted_at_first_text < 10
+    types = [chunk.type for chunk in chunks]
+    assert [kind for kind in types if kind != "text"] == ["tool_call", "tool_result", "done"]
+    first_step = chunks[: types.index("tool_call")]
+    second_step = chunks[types.index("tool_result") + 1 : -1]
+    assert len(first_step) > 1 and "".join(chunk.data["delta"] for chunk in first_step) == "Checking the room"
+    assert len(second_step) > 1 and "".join(chunk.data["delta"] for chunk in second_step) == 'Two chairs é "ok"'
+    assert chunks[-1].data["response"] == 'Two chairs é "ok"'
+    assert chunks[-1].data["history"][-1]["content"][0]["text"] == 'Two chairs é "ok"'
+
+
+def test_local_cli_runtime_retracts_streamed_text_that_the_reply_does_not_keep(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    replies = ['{"response": "Moving the de', '{"response": "Done, the desk is by the wi']
+
+    def fake_stream_run(cmd: list[str], prompt: str, *, prompt_as_arg: bool = False):
+        reply = replies.pop(0)
+        for index in range(0, len(reply), 4):
+            yield reply[index : index + 4]
+
+    monkeypatch.setattr(local_cli, "_stream_run", fake_stream_run)
+    shown = ""
+    chunks = list(
+        local_cli.stream_codex(
+            "local",
+            [{"role": "user", "content": [{"type": "text", "text": "move the desk"}]}],
+            "default",
+            lambda name, args: "{}",
+            system="system",
+            tools_spec=[],
+            max_tool_steps=3,
+        )
+    )
+    for chunk in chunks:
+        if chunk.type == "text":
+            retract = chunk.data.get("retract", "")
+            assert shown.endswith(retract)
+            shown = shown[: len(shown) - len(retract)] + chunk.data["delta"]
+
+    assert sum("retract" in chunk.data for chunk in chunks) == 2
+    assert shown == chunks[-1].data["response"] == local_cli._INVALID_PROTOCOL_RESPONSE
+
+
 def test_local_cli_runtime_does_not_surface_invalid_agent_output(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -585,6 +825,88 @@ def test_chat_stream_returns_sse_events(
     assert '"provider":"ollama"' in body
 
 
+def test_chat_stream_keeps_serving_requests_while_the_provider_blocks(
+    chat_client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    generating = threading.Event()
+    release = threading.Event()
+
+    def fake_stream(api_key: str, messages: list[dict[str, object]], model: str, dispatch):
+        generating.set()
+        release.wait(10)
+        yield chat_server.ChatChunk("text", {"delta": "late"})
+        yield chat_server.ChatChunk("done", {"response": "late", "history": messages})
+
+    monkeypatch.setitem(chat_server._STREAM_FNS, "ollama", fake_stream)
+    bodies: list[str] = []
+
+    def _stream() -> None:
+        with chat_client.stream("POST", "/api/chat/stream", json={"message": "hello", "provider": "ollama"}) as res:
+            bodies.append(res.read().decode("utf-8"))
+
+    worker = threading.Thread(target=_stream)
+    worker.start()
+    try:
+        assert generating.wait(10)
+        sent = time.perf_counter()
+        health = chat_client.get("/api/health")
+        # A provider holding the event loop would delay this until release.wait times out.
+        health_s = time.perf_counter() - sent
+    finally:
+        release.set()
+        worker.join(15)
+
+    assert health.status_code == 200 and health_s < 5
+    assert bodies and "event: done" in bodies[0] and '"delta":"late"' in bodies[0]
+
+
+def test_tool_dispatcher_overlaps_read_only_calls_and_keeps_call_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    events: list[str] = []
+    in_flight: list[int] = [0]
+    peak: list[int] = [0]
+    guard = threading.Lock()
+
+    def slow_read(label: str) -> str:
+        with guard:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.2)
+        with guard:
+            in_flight[0] -= 1
+            events.append(label)
+        return json.dumps({"label": label})
+
+    def write(label: str) -> str:
+        with guard:
+            assert in_flight[0] == 0
+            events.append(label)
+        return json.dumps({"label": label})
+
+    monkeypatch.setitem(chat_server._DISPATCH_RAW, "web_search", lambda a: slow_read(f"search:{a['query']}"))
+    monkeypatch.setitem(chat_server._DISPATCH_RAW, "list_objects", lambda a: slow_read("list"))
+    monkeypatch.setitem(chat_server._DISPATCH_RAW, "move_object", lambda a: write("move"))
+    tool_log: list[dict[str, object]] = []
+    dispatch = chat_server._ToolDispatcher(request_id="test", tool_log=tool_log)
+    calls = [
+        ("web_search", {"query": "sofa"}),
+        ("list_objects", {}),
+        ("web_search", {"query": "rug"}),
+        ("move_object", {"index": 0, "x": 1.0, "z": 1.0}),
+        ("list_objects", {}),
+    ]
+
+    started = time.perf_counter()
+    results = dispatch.many(calls)
+    elapsed = time.perf_counter() - started
+
+    assert [json.loads(result)["label"] for result in results] == ["search:sofa", "list", "search:rug", "move", "list"]
+    assert [entry["tool"] for entry in tool_log] == [name for name, _ in calls]
+    # The three reads before the move overlap; the move waits for them and the last read waits for the move.
+    assert peak[0] == 3 and events[3:] == ["move", "list"]
+    assert elapsed < 0.6
+
+
 def test_chat_rejects_invalid_json_body(chat_client: TestClient) -> None:
     res = chat_client.post(
         "/api/chat",
@@ -806,6 +1128,42 @@ def test_concept_chat_drafts_plan_without_mutating_layout(
     assert mcp_server._load_layout()["items"] == []
 
 
+def test_concept_chat_searches_and_reviews_without_the_tool_lock(
+    chat_client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    lock_free: list[bool] = []
+
+    def tool_lock_is_free() -> None:
+        # The lock is reentrant, so probe it from another thread as a concurrent tool would.
+        def probe() -> None:
+            acquired = chat_server._TOOL_LOCK.acquire(timeout=1)
+            if acquired:
+                chat_server._TOOL_LOCK.release()
+            lock_free.append(acquired)
+
+        thread = threading.Thread(target=probe)
+        thread.start()
+        thread.join()
+
+    def search(query: str, max_results: int = 5) -> list[dict[str, object]]:
+        tool_lock_is_free()
+        return []
+
+    def review(api_key: str, messages: list[dict[str, object]], model: str, dispatch) -> tuple[str, list[dict[str, object]]]:
+        tool_lock_is_free()
+        return "Looks workable.", messages
+
+    monkeypatch.setattr(chat_server, "search_references", search)
+    monkeypatch.setitem(chat_server._CHAT_FNS, "ollama", review)
+
+    res = chat_client.post("/api/chat", json={"message": "Design a living room concept", "provider": "ollama"})
+
+    assert res.status_code == 200
+    assert res.json()["pending_plan"]["llm_review"]["status"] == "reviewed"
+    assert lock_free == [True, True]
+
+
 def test_concept_chat_without_provider_key_uses_deterministic_planner(chat_client: TestClient) -> None:
     res = chat_client.post("/api/chat", json={"message": "Design a whole 4-room HDB flat"})
 
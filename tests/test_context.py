@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import copy
+import json
+
+import pytest
+
+from haus import chat_server
+from haus.llm.context import compact_messages, compact_result, prepare_step
+
+
+def _layout_result() -> str:
+    layout = {
+        "schema": "haus.semantic_layout.v1",
+        "rooms": [{"id": f"r{n}", "polygon": [[0, 0], [400, 0], [400, 300]]} for n in range(3)],
+        "objects": [{"id": f"o{n}", "label": "chair", "x": n, "y": n} for n in range(80)],
+    }
+    return json.dumps(layout)
+
+
+def _step(step: int, text: str) -> list[dict]:
+    call_id = f"t{step}"
+    return [
+        {"role": "assistant", "content": [{"type": "tool_use", "id": call_id, "name": "get_semantic_layout_json", "input": {}}]},
+        {"role": "user", "content": [{"type": "tool_result", "tool_use_id": call_id, "content": text}]},
+    ]
+
+
+def test_older_results_are_compacted_and_the_latest_step_is_kept_whole() -> None:
+    layout = _layout_result()
+    notes = "x" * 5000
+    messages = [{"role": "user", "content": "Tidy up"}, *_step(0, layout), *_step(1, notes), *_step(2, layout)]
+
+    original = copy.deepcopy(messages)
+
+    sent, counts = compact_messages(messages, 1000)
+
+    assert messages == original
+    assert counts["results_compacted"] == 2 and counts["layouts_referenced"] == 1
+    reference = json.loads(sent[2]["content"][0]["content"])
+    assert reference["schema"] == "haus.semantic_layout.v1"
+    assert reference["rooms"] == 3 and reference["objects"] == 80 and reference["omitted_chars"] == len(layout)
+    truncated = sent[4]["content"][0]["content"]
+    assert len(truncated) <= 1000 and truncated.startswith("xxx") and "5000 chars" in truncated
+    assert sent[6] is messages[6] and sent[0] is messages[0]
+    assert counts["chars_saved"] == len(layout) + len(notes) - len(sent[2]["content"][0]["content"]) - len(truncated)
+    assert compact_messages(sent, 1000)[1]["results_compacted"] == 0
+    assert compact_result(layout, 0) == layout
+
+
+def test_prepare_step_compacts_tool_role_messages_unless_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    def messages() -> list[dict]:
+        return [
+            {"role": "user", "content": "hi"},
+            {"role": "tool", "tool_call_id": "a", "content": "y" * 4000},
+            {"role": "assistant", "content": "next"},
+            {"role": "tool", "tool_call_id": "b", "content": "z" * 4000},
+        ]
+
+    monkeypatch.setenv("HAUS_CONTEXT_RESULT_CHARS", "500")
+    entries = messages()
+    sent, step = prepare_step("system", [{"name": "t"}], entries)
+    assert step["results_compacted"] == 1 and len(sent[1]["content"]) <= 500 and len(sent[3]["content"]) == 4000
+    assert entries == messages()
+    assert step["estimated_tokens"] == step["system_tokens"] + step["tools_tokens"] + step["messages_tokens"]
+
+    monkeypatch.setenv("HAUS_CONTEXT_RESULT_CHARS", "0")
+    entries = messages()
+    sent, step = prepare_step("system", [], entries)
+    assert step["results_compacted"] == 0 and sent == messages()
+
+
+def test_route_tools_spec_drops_tools_an_edit_has_no_use_for(monkeypatch: pytest.MonkeyPatch) -> None:
+    names = {tool["name"] for tool in chat_server._route_tools_spec("move the sofa 20cm left")}
+    assert "design_room" not in names and "web_search" not in names
+    assert {"move_object", "get_semantic_layout_json"} <= names
+    assert chat_server._route_tools_spec("what is in this room?") == chat_server._TOOLS_SPEC
+    mixed = {tool["name"] for tool in chat_server._route_tools_spec("move the desk and send me a brief")}
+    assert {"move_object", "web_search"} <= mixed and "design_room" not in mixed
+
+    monkeypatch.setenv("HAUS_CONTEXT_TOOL_ROUTES", "0")
+    assert chat_server._route_tools_spec("move the sofa 20cm left") == chat_server._TOOLS_SPEC
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+
+import pytest
+
+from haus import http_pool
+from haus.llm.providers import ollama
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path == "/missing":
+            self._send(404, b'{"error":"missing"}')
+        elif payload.get("stream"):
+            lines = [{"message": {"content": "Hel"}}, {"message": {"content": "lo"}}, {"done": True}]
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for line in lines:
+                chunk = json.dumps(line).encode() + b"\n"
+                self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self._send(200, json.dumps({"message": {"content": f"echo {payload.get('n')}"}}).encode())
+
+    def _send(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server(monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    for name in ("http_proxy", "HTTP_PROXY", "https_proxy", "HTTPS_PROXY"):
+        monkeypatch.delenv(name, raising=False)
+    pool = http_pool.ConnectionPool()
+    monkeypatch.setattr(http_pool, "_POOL", pool)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    finally:
+        pool.clear()
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_sequential_requests_reuse_one_connection_and_errors_raise_http_error(server: str) -> None:
+    for n in range(5):
+        with http_pool.request("POST", f"{server}/api/chat", body=json.dumps({"n": n}).encode()) as response:
+            assert json.loads(response.read()) == {"message": {"content": f"echo {n}"}}
+    with pytest.raises(HTTPError) as excinfo:
+        http_pool.request("POST", f"{server}/missing", body=b"{}")
+    assert excinfo.value.code == 404 and json.loads(excinfo.value.read()) == {"error": "missing"}
+
+    stats = http_pool.http_pool_stats()
+    assert stats["requests"] == 6
+    assert stats["opened"] == 1 and stats["reused"] == 5
+    assert stats["idle"] == {server: 1}
+
+
+def test_ollama_stream_leaves_its_connection_reusable(server: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OLLAMA_BASE_URL", server)
+    for _ in range(2):
+        chunks = list(ollama.stream_chat("", [{"role": "user", "content": "hi"}], "m", lambda *_: "", system="", tools_spec=[], max_tool_steps=1))
+        assert chunks[-1].data["response"] == "Hello"
+    stats = http_pool.http_pool_stats()
+    assert stats["opened"] == 1 and stats["reused"] == 1 and stats["discarded"] == 0
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import io
+import json
+
+import numpy as np
+import pytest
+
+from haus import jsonio
+
+
+def test_dumps_is_compact_unless_pretty_is_requested(monkeypatch: pytest.MonkeyPatch) -> None:
+    value = {"b": [1, 2.5, None], "a": {"nested": "é"}, 3: True}
+    compact = jsonio.dumps(value)
+    assert "\n" not in compact and ": " not in compact
+    assert json.loads(compact) == {"b": [1, 2.5, None], "a": {"nested": "é"}, "3": True}
+
+    pretty = jsonio.dumps({"b": 1, "a": 2}, pretty=True)
+    assert pretty == '{\n  "a": 2,\n  "b": 1\n}'
+    monkeypatch.setenv(jsonio.PRETTY_ENV, "1")
+    assert jsonio.dumps({"b": 1, "a": 2}) == pretty
+
+    # Values orjson rejects still encode through the standard library.
+    assert json.loads(jsonio.dumps({"big": 2**70}, pretty=False)) == {"big": 2**70}
+    assert jsonio.dumps({"n": np.float64(1.5)}, pretty=False, default=float) == '{"n":1.5}'
+    assert jsonio.loads('{"x": NaN}')["x"] != jsonio.loads('{"x": NaN}')["x"]
+    with pytest.raises(json.JSONDecodeError):
+        jsonio.loads("{not json")
+
+
+def test_write_stream_matches_dumps() -> None:
+    value = {"layout": {"items": [{"id": f"item-{index}", "pos": [index, 0.0, 1.5]} for index in range(5)]}, "scenarios": [], "empty": {}, "title": "Plan"}
+    handle = io.StringIO()
+    jsonio.write_stream(value, handle)
+    assert handle.getvalue() == jsonio.dumps(value, pretty=False)
+    assert json.loads(handle.getvalue()) == value
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import math
 import json
 from pathlib import Path
@@ -168,6 +169,61 @@ def test_score_walkway_detects_narrow_gap(isolated_layout: Path) -> None:
     assert "Encroaching" in result
 
 
+def test_walkway_clearance_field_is_exact_and_reused_until_a_move(isolated_layout: Path) -> None:
+    from haus import clearance_field
+
+    data = mcp_server._normalize_layout(
+        {
+            "version": 1,
+            "items": [
+                _obj(item_type="furniture", furniture_type="wardrobe", x=-0.75, z=1.5, w=1.0, h=2.0, d=3.0),
+                _obj(item_type="furniture", furniture_type="wardrobe", x=0.8, z=1.5, w=1.0, h=2.0, d=3.0),
+            ],
+        }
+    )
+    result = mcp_server._walkway_report(data, 0.0, 0.0, 0.0, 3.0, 0.9, resolution=0.1)
+    # The centerline sits 0.25m from the left wardrobe; the raster alone would round this to cells.
+    assert "Narrowest gap: 0.50m" in result
+    assert "Encroaching objects (2)" in result
+
+    index = mcp_server._layout_index(data)
+    field = clearance_field.field_for(index, resolution=0.1)
+    assert clearance_field.field_for(mcp_server._layout_index(data), resolution=0.1) is field
+    data["items"][0]["pos"][0] = -1.0
+    moved = clearance_field.field_for(mcp_server._layout_index(data), resolution=0.1)
+    assert moved is not field
+    assert "Narrowest gap: 0.60m" in mcp_server._walkway_report(data, 0.0, 0.0, 0.0, 3.0, 0.9, resolution=0.1)
+
+
+def test_plan_accessible_route_uses_profile_width_and_room_routes(isolated_layout: Path) -> None:
+    partition = _obj(item_type="wall", x=3.0, z=1.0, w=0.1, h=2.6, d=2.0)
+    door = _obj(item_type="door", x=3.0, z=2.4, w=0.85, h=2.0, d=0.05, rot=math.pi / 2)
+    door["width_m"] = 0.85
+    layout = {
+        "version": 1,
+        "rooms": [
+            {"id": "living", "label": "Living", "kind": "living", "bounds": {"x_min": 0.0, "z_min": 0.0, "x_max": 3.0, "z_max": 2.825}},
+            {"id": "bedroom", "label": "Bedroom", "kind": "bedroom", "bounds": {"x_min": 3.0, "z_min": 0.0, "x_max": 5.0, "z_max": 2.825}},
+        ],
+        "items": [partition, door],
+    }
+    assert mcp_server._save_layout(layout) is None
+
+    walker = json.loads(mcp_server.plan_accessible_route("Living", "Bedroom", profile="walker"))
+    wheelchair = json.loads(mcp_server.plan_accessible_route("living", "bedroom", profile="wheelchair"))
+    unknown = json.loads(mcp_server.plan_accessible_route("living", "bedroom", profile="jetpack"))
+
+    assert walker["ok"] and walker["route"]["status"] == "clear"
+    assert walker["route"]["required_width_m"] == 0.9
+    assert wheelchair["route"]["status"] == "blocked"
+    assert wheelchair["route"]["bottleneck_m"] == pytest.approx(0.85, abs=0.06)
+    assert not unknown["ok"]
+    assessment = mcp_server._layout_quality_assessment("score_layout", "accessible")
+    assert "Room-to-room routes from Living" in assessment["walkway"]
+    assert "Bedroom: blocked" in assessment["walkway"]
+    assert "Primary circulation is below the 0.915m target." in assessment["warnings"]
+
+
 def test_list_room_templates_returns_all() -> None:
     result = mcp_server.list_room_templates()
     assert "work_from_home" in result
@@ -527,6 +583,10 @@ def test_mcp_project_scenario_report_and_journey_tools(isolated_layout: Path, tm
     scenario_id = scenarios["scenarios"][0]["id"]
     duplicated = json.loads(mcp_server.duplicate_scenario(project_id, scenario_id, "Option B"))
     assert duplicated["scenario"]["parent_scenario_id"] == scenario_id
+    stored = json.loads(mcp_server._project_path(project_id).read_text(encoding="utf-8"))
+    assert all("layout_ref" in scenario and "layout" not in scenario for scenario in stored["scenarios"])
+    reloaded = json.loads(mcp_server.list_scenarios(project_id))["scenarios"]
+    assert reloaded[0]["layout"] == reloaded[1]["layout"]
 
     renovation = json.loads(mcp_server.draft_renovation_options(project_id))
     assert [scenario["name"] for scenario in renovation["scenarios"]] == ["conservative", "balanced", "ambitious"]
@@ -556,3 +616,202 @@ def test_mcp_project_scenario_report_and_journey_tools(isolated_layout: Path, tm
     report = json.loads(mcp_server.export_report(project_id, "designer", [scenario_id]))
     assert report["ok"] is True
     assert Path(report["path"]).exists()
+
+
+def test_spatial_queries_match_item_order(isolated_layout: Path) -> None:
+    layout = {
+        "version": 1,
+        "items": [
+            _obj(item_type="furniture", furniture_type="desk", x=0.0, z=0.0, w=1.2, h=0.75, d=0.6),
+            _obj(item_type="furniture", furniture_type="chair", x=12.0, z=0.0, w=0.5, h=0.45, d=0.5),
+            _obj(item_type="furniture", furniture_type="chair", x=0.3, z=0.1, w=0.5, h=0.45, d=0.5),
+            _obj(item_type="furniture", furniture_type="storage", x=0.5, z=0.0, w=0.8, h=1.2, d=0.4, rot=math.pi / 2),
+            _obj(item_type="furniture", furniture_type="chair", x=3.0, z=0.0, w=0.5, h=0.45, d=0.5),
+        ],
+    }
+    assert mcp_server._save_layout(layout) is None
+
+    result = mcp_server.score_layout("compact_hdb")
+    assert result.index("[0] desk overlaps [2] chair") < result.index("[0] desk overlaps [3] storage")
+    assert result.index("[0] desk overlaps [3] storage") < result.index("[2] chair overlaps [3] storage")
+    assert "[1] chair overlaps" not in result
+
+    nearest = mcp_server.find_nearest(0, count=2)
+    assert nearest.splitlines()[1].startswith("  [2] chair")
+    assert nearest.splitlines()[2].startswith("  [3] storage")
+    assert "[1]" in mcp_server.find_nearest(0, count=10)
+
+    area = mcp_server.find_objects_in_area(-1.0, -1.0, 1.0, 1.0)
+    assert "Found 3 objects" in area
+
+
+def test_batched_candidate_screening_matches_scalar_ranking(isolated_layout: Path) -> None:
+    import random
+
+    rng = random.Random(5)
+    items = [
+        _obj(item_type="furniture", furniture_type="tv_console", x=0.0, z=-3.0, w=1.5, h=0.5, d=0.4),
+        _obj(item_type="furniture", furniture_type="coffee", x=0.0, z=0.0, w=1.0, h=0.4, d=0.6),
+    ]
+    for _ in range(14):
+        items.append(
+            _obj(
+                item_type="furniture",
+                furniture_type="chair",
+                x=rng.uniform(-5, 5),
+                z=rng.uniform(-5, 5),
+                w=rng.uniform(0.3, 0.9),
+                h=0.8,
+                d=rng.uniform(0.3, 0.9),
+                rot=rng.choice([0.0, 0.6, math.pi / 2]),
+            )
+        )
+    layout = {
+        "version": 1,
+        "items": items,
+        "rooms": [
+            {
+                "id": "den",
+                "label": "Den",
+                "bounds": {"x_min": -5.0, "z_min": -5.0, "x_max": 2.0, "z_max": 3.0},
+                "polygon": [[-5.0, -5.0], [2.0, -5.0], [2.0, 0.0], [0.0, 3.0], [-5.0, 3.0]],
+            }
+        ],
+    }
+    assert mcp_server._save_layout(layout) is None
+    data = mcp_server._load_layout()
+
+    for kwargs in (
+        {"room_name": "", "near_index": 1, "face_index": 0},
+        {"room_name": "Den", "near_index": None, "face_index": 0},
+        {"room_name": "", "near_index": None, "face_index": None},
+    ):
+        results = [
+            mcp_server._simulate_candidates(
+                data=data,
+                furniture_type="sofa_2",
+                min_distance=0.5,
+                max_distance=3.5,
+                require_clear_sightline=False,
+                max_candidates=25,
+                grid_size=0.2,
+                batched=batched,
+                **kwargs,
+            )
+            for batched in (True, False)
+        ]
+        assert results[0] == results[1]
+        assert results[0][0]
+
+
+def test_layout_cache_serves_repeat_loads_and_sees_external_writes(
+    isolated_layout: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    isolated_layout.write_text(
+        json.dumps({"version": 1, "_stamp": 1, "items": [_obj(item_type="box", x=0, z=0, w=1, h=1, d=1)]}),
+        encoding="utf-8",
+    )
+    parses = []
+    normalize = mcp_server._normalize_layout
+    monkeypatch.setattr(mcp_server, "_normalize_layout", lambda raw: parses.append(1) or normalize(raw))
+
+    first = mcp_server._load_layout()
+    first["items"][0]["pos"][0] = 9.0
+    assert mcp_server._load_layout()["items"][0]["pos"][0] == 0
+    assert mcp_server._read_layout() is mcp_server._read_layout()
+    assert len(parses) == 1
+
+    shared = mcp_server._read_layout()
+    with pytest.raises(TypeError):
+        shared["items"][0]["pos"][0] = 9.0
+    with pytest.raises(TypeError):
+        shared["items"].append({})
+    with pytest.raises(TypeError):
+        shared["_stamp"] = 5
+    unfrozen = copy.deepcopy(shared)
+    unfrozen["items"][0]["pos"][0] = 9.0
+    assert mcp_server._read_layout()["items"][0]["pos"][0] == 0
+    assert json.loads(mcp_server.get_layout_json())["items"][0]["pos"][0] == 0
+
+    # Same size, same second: caught by the byte comparison for recent files.
+    restamped = isolated_layout.read_text(encoding="utf-8").replace('"_stamp": 1', '"_stamp": 2')
+    isolated_layout.write_text(restamped, encoding="utf-8")
+    assert mcp_server._read_layout()["_stamp"] == 2
+    assert len(parses) == 2
+
+
+def test_save_layout_writes_through_to_cache(isolated_layout: Path) -> None:
+    layout = {
+        "version": 1,
+        "_stamp": 42,
+        "items": [_obj(item_type="furniture", x=1, z=2, w=1, h=1, d=1, furniture_type="chair")],
+        "rooms": [{"id": "den", "label": "Den", "bounds": {"x_min": 0, "z_min": 0, "x_max": 3, "z_max": 3}}],
+    }
+    assert mcp_server._save_layout(layout) is None
+    before = mcp_server.layout_cache_stats()
+    cached = mcp_server._load_layout("write_through_check")
+    after = mcp_server.layout_cache_stats()
+    assert after["hits"] == before["hits"] + 1
+    assert after["stamp"] == 42
+    assert after["tools"]["write_through_check"]["hit_rate"] == 1.0
+    summary_calls = after["tools"].get("get_layout_summary", {}).get("calls", 0)
+    mcp_server.get_layout_summary()
+    assert mcp_server.layout_cache_stats()["tools"]["get_layout_summary"]["calls"] == summary_calls + 1
+
+    mcp_server._LAYOUT_CACHE.clear()
+    assert mcp_server._load_layout() == cached
+
+
+def test_layout_session_commits_many_mutations_with_one_write(
+    isolated_layout: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    assert mcp_server.add_furniture("chair", x=0.0, z=0.0).startswith("Added")
+    writes = []
+    write = mcp_server._write_layout_file
+    monkeypatch.setattr(mcp_server, "_write_layout_file", lambda path, layout: writes.append(1) or write(path, layout))
+
+    with mcp_server.layout_session() as session:
+        mcp_server.add_furniture("desk", x=2.0, z=0.0)
+        mcp_server.move_object(0, 1.0, 1.0)
+        mcp_server.rename_object(1, "work desk")
+        assert len(mcp_server._read_layout()["items"]) == 2
+        assert len(json.loads(isolated_layout.read_text(encoding="utf-8"))["items"]) == 1
+
+    assert session.saves == 3 and session.error is None
+    assert len(writes) == 1
+    saved = json.loads(isolated_layout.read_text(encoding="utf-8"))
+    assert saved["items"][0]["pos"][0] == 1.0
+    assert saved["items"][1]["name"] == "work desk"
+
+    with pytest.raises(RuntimeError):
+        with mcp_server.layout_session():
+            mcp_server.add_furniture("desk", x=4.0, z=0.0)
+            raise RuntimeError("abort")
+    assert len(mcp_server._load_layout()["items"]) == 2
+    assert len(writes) == 1
+
+    # Multi-mutation tools run in their own session, which nests into an outer one.
+    with mcp_server.layout_session() as outer:
+        assert mcp_server.batch_move([0, 1], 0.5, 0.0).startswith("Moved 2")
+        assert not mcp_server.design_flat("minimalist flat").startswith("Error")
+        assert len(writes) == 1
+    assert outer.saves == 2 and outer.error is None
+    assert len(writes) == 2
+    assert mcp_server.batch_move([0, 99], 0.5, 0.0).startswith("Error")
+    assert len(writes) == 2
+
+
+def test_write_behind_coalesces_saves_until_flush(isolated_layout: Path) -> None:
+    mcp_server.configure_layout_persistence(write_behind_s=60.0)
+    try:
+        mcp_server.add_furniture("chair", x=0.0, z=0.0)
+        mcp_server.add_furniture("desk", x=2.0, z=0.0)
+        assert not isolated_layout.exists()
+        assert len(mcp_server._load_layout()["items"]) == 2
+        assert mcp_server.layout_cache_stats()["pending_write"] is True
+
+        assert mcp_server.flush_layout() is None
+        assert len(json.loads(isolated_layout.read_text(encoding="utf-8"))["items"]) == 2
+        assert mcp_server.flush_layout() is None
+    finally:
+        mcp_server.configure_layout_persistence()
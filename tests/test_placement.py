@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import math
+import random
+
+import numpy as np
+
+from haus import geometry, placement
+
+
+def _random_item(rng: random.Random) -> dict:
+    return {
+        "pos": [rng.uniform(-4, 4), 0.4, rng.uniform(-4, 4)],
+        "rot": rng.uniform(-math.pi, math.pi),
+        "geo": [rng.uniform(0.2, 2.0), 0.8, rng.uniform(0.2, 2.0)],
+    }
+
+
+def test_pair_kernels_match_scalar_geometry() -> None:
+    rng = random.Random(11)
+    left = [geometry.item_polygon(_random_item(rng), 0.02) for _ in range(300)]
+    right = [geometry.item_polygon(_random_item(rng), 0.02) for _ in range(300)]
+    a = placement.pack_polygons(left)
+    b = placement.pack_polygons(right)
+
+    assert placement.pair_intersects(a, b).tolist() == [geometry.polygons_intersect(p, q) for p, q in zip(left, right)]
+    expected = [geometry.polygon_distance(p, q) for p, q in zip(left, right)]
+    assert np.allclose(placement.pair_distances(a, b), expected, rtol=0, atol=1e-12)
+
+    nearest = placement.min_distances(a[:20], b)
+    assert np.allclose(nearest, [min(geometry.polygon_distance(p, q) for q in right) for p in left[:20]], rtol=0, atol=1e-12)
+
+
+def test_oriented_rects_match_item_polygon() -> None:
+    item = {"pos": [1.5, 0.4, -2.0], "rot": 0.7, "geo": [1.2, 0.8, 0.6]}
+    packed = placement.oriented_rects(
+        np.array([1.5]), np.array([-2.0]), np.array([math.cos(0.7)]), np.array([math.sin(0.7)]), 0.62, 0.32
+    )
+    assert packed[0].tolist() == [list(point) for point in geometry.item_polygon(item, 0.02)]
+
+
+def test_points_in_polygon_matches_scalar_for_concave_room() -> None:
+    room = [(0.0, 0.0), (4.0, 0.0), (4.0, 2.0), (2.0, 2.0), (2.0, 4.0), (0.0, 4.0)]
+    grid = np.array([(x * 0.25, z * 0.25) for x in range(-2, 20) for z in range(-2, 20)])
+    assert placement.points_in_polygon(grid, room).tolist() == [geometry.point_in_polygon(tuple(p), room) for p in grid]
+
+
+def test_segment_hits_reports_crossings_and_contained_endpoints() -> None:
+    polygons = placement.pack_polygons(
+        [
+            geometry.item_polygon({"pos": [2.0, 0.0, 0.0], "rot": 0.0, "geo": [0.5, 1.0, 0.5]}),
+            geometry.item_polygon({"pos": [2.0, 0.0, 3.0], "rot": 0.3, "geo": [0.5, 1.0, 0.5]}),
+            geometry.item_polygon({"pos": [0.0, 0.0, 0.0], "rot": 0.0, "geo": [0.5, 1.0, 0.5]}),
+        ]
+    )
+    starts = np.array([(0.0, 0.0), (0.0, 3.0), (0.0, 6.0)])
+    ends = np.array([(4.0, 0.0), (4.0, 3.0), (4.0, 6.0)])
+    rows, cols = placement.segment_hits(starts, ends, polygons)
+    assert list(zip(rows.tolist(), cols.tolist())) == [(0, 0), (0, 2), (1, 1)]
+
+
+def test_point_and_box_kernels_match_scalar_geometry() -> None:
+    rng = random.Random(5)
+    items = [_random_item(rng) for _ in range(120)]
+    polygons = [geometry.item_polygon(item) for item in items]
+    points = np.array([(rng.uniform(-5, 5), rng.uniform(-5, 5)) for _ in range(80)])
+
+    expected = [[geometry.distance_point_to_polygon(tuple(p), q) for q in polygons] for p in points]
+    assert np.allclose(placement.point_polygon_distances(points, placement.pack_items(items)), expected, rtol=0, atol=1e-12)
+
+    rects = [geometry.item_rect(item) for item in items]
+    boxes = np.asarray(rects)
+    assert placement.boxes_overlap(boxes, boxes).tolist() == [[geometry.rect_intersects(a, b) for b in rects] for a in rects]
+    assert np.allclose(placement.box_gaps(boxes, boxes), [[geometry.rect_gap(a, b) for b in rects] for a in rects], rtol=0, atol=1e-12)
+
+
+def test_cached_footprints_follow_in_place_edits() -> None:
+    item = {"pos": [1.0, 0.0, 2.0], "rot": 0.0, "geo": [1.0, 1.0, 2.0]}
+    assert geometry.item_rect(item) == (0.5, 1.0, 1.5, 3.0)
+    item["pos"][0] = 3.0
+    item["rot"] = math.pi / 2
+    assert np.allclose(geometry.item_rect(item), (2.0, 1.5, 4.0, 2.5))
+    polygon = geometry.item_polygon(item)
+    polygon.append((0.0, 0.0))
+    assert len(geometry.item_polygon(item)) == 4
+    # bools are not numbers to coerce_float, so they must not share a cache entry with 1/0
+    assert geometry.item_rect({"pos": [True, 0, 0], "geo": [1, 1, 1]}) == (-0.5, -0.5, 0.5, 0.5)
+
+
+def test_sweep_pairs_match_all_pairs_scan(monkeypatch) -> None:
+    rng = random.Random(8)
+    items = [_random_item(rng) for _ in range(150)]
+    rects = [geometry.item_rect(item) for item in items]
+    boxes = np.asarray(rects)
+    for max_gap in (0.0, 0.75):
+        expected = [
+            (i, j)
+            for i in range(len(rects))
+            for j in range(i + 1, len(rects))
+            # Per-axis test: the broad phase keeps every pair whose rect_gap could be within max_gap.
+            if max(rects[j][0] - rects[i][2], rects[i][0] - rects[j][2]) <= max_gap
+            and max(rects[j][1] - rects[i][3], rects[i][1] - rects[j][3]) <= max_gap
+        ]
+        assert [tuple(pair) for pair in placement.sweep_pairs(boxes, max_gap).tolist()] == expected
+    # Crowded axes are processed in batches without changing the result.
+    monkeypatch.setattr(placement, "_SWEEP_BATCH", 5)
+    assert [tuple(pair) for pair in placement.sweep_pairs(boxes, 0.75).tolist()] == expected
+    assert placement.sweep_pairs(boxes[:1]).shape == (0, 2)
+
+    doors = [{"id": f"door-{n}", "type": "door", "width_m": 0.8, "swing_direction": "in", **_random_item(rng)} for n in range(6)]
+    for position, item in enumerate(items):
+        item["id"] = position
+    layout = {"items": items + doors}
+    expected_swings = [
+        (door["id"], other["id"])
+        for door in doors
+        for other in layout["items"]
+        if other is not door and geometry.polygons_intersect(geometry.door_swing_polygon(door), geometry.item_polygon(other))
+    ]
+    conflicts = geometry.door_swing_conflicts(layout)
+    assert [(conflict["door_id"], conflict["conflict_id"]) for conflict in conflicts] == expected_swings
+    assert expected_swings
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 
-from haus import semantic_ir
+from haus import semantic_ir, workbench
 from haus.constraints import get_constraint_pack, list_constraint_packs
 
 
@@ -77,6 +77,34 @@ def test_scenario_transaction_applies_and_reverts() -> None:
     assert not any(item["id"] == "desk" for item in reverted["items"])
 
 
+def test_patch_sequences_apply_by_id_and_share_unchanged_entries() -> None:
+    base = workbench.migrate_layout(
+        {"items": [{"id": f"chair-{n}", "furnitureType": "chair", "pos": [n * 0.6, 0.4, 0.0], "rot": 0, "geo": [0.5, 0.8, 0.5]} for n in range(200)]}
+    )
+    step_one = json.loads(json.dumps(base))
+    step_one["items"][10]["pos"][0] += 0.2
+    del step_one["items"][50]
+    step_one["items"].append({"id": "desk", "furnitureType": "desk", "pos": [1.0, 0.4, 2.0], "rot": 0, "geo": [1.2, 0.75, 0.6]})
+    step_two = json.loads(json.dumps(workbench.migrate_layout(step_one)))
+    step_two["items"][0]["rot"] = 1.57
+    first = semantic_ir.scenario_transaction(base, step_one)
+    second = semantic_ir.scenario_transaction(step_one, step_two)
+
+    indexed = semantic_ir.IndexedLayout(base).apply_patch(first).apply_patch(second)
+    applied = indexed.layout()
+    assert applied["items"] == workbench.migrate_layout(step_two)["items"]
+    assert applied["items"][1] is base["items"][1]
+    assert workbench.is_current_layout(applied)
+
+    reverted = semantic_ir.IndexedLayout(applied).revert_patch(second).revert_patch(first).layout()
+    assert sorted(reverted["items"], key=lambda item: item["id"]) == sorted(base["items"], key=lambda item: item["id"])
+
+    # Every entry sharing a replaced id is replaced, in place.
+    repeated = {"items": [{"id": "a", "pos": [0, 0, 0]}, {"id": "b", "pos": [1, 0, 0]}, {"id": "a", "pos": [2, 0, 0]}]}
+    patch = {"ops": [{"op": "replace", "collection": "items", "id": "a", "after": {"id": "a", "pos": [5, 0, 0]}}]}
+    assert [item["pos"][0] for item in semantic_ir.apply_scenario_patch(repeated, patch)["items"]] == [5, 1, 5]
+
+
 def test_multimodal_contract_schema_catalog_and_evals() -> None:
     contract = semantic_ir.multimodal_intake_contract()
     assert contract["schema"] == semantic_ir.MULTIMODAL_INTAKE_SCHEMA_ID
@@ -88,3 +116,22 @@ def test_multimodal_contract_schema_catalog_and_evals() -> None:
     report = semantic_ir.run_agent_eval_suite()
     assert report["failed"] == 0
     assert report["metrics"]["expected_finding_recall"] == 1.0
+
+
+def test_layout_graph_engine_reuses_unchanged_work_after_an_edit() -> None:
+    engine = semantic_ir.LayoutGraphEngine()
+    layout = _layout()
+    first = engine.build(layout, ["compact_hdb"])
+    assert engine.build(layout, ["compact_hdb"])["findings"] == first["findings"]
+    assert engine.stats()["hits"] == 1
+
+    layout["items"][3]["pos"] = [2.2, 0.2, 2.6]
+    incremental = engine.build(layout, ["compact_hdb"])
+    fresh = semantic_ir.LayoutGraphEngine().build(layout, ["compact_hdb"])
+    for key in ("objects", "adjacency", "zones", "routes", "findings"):
+        assert incremental[key] == fresh[key]
+    stats = engine.stats()
+    assert stats["misses"] == 2 and stats["reused"] > 0
+
+    incremental["findings"].clear()
+    assert engine.build(layout, ["compact_hdb"])["findings"] == fresh["findings"]
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import math
+import random
+
+from haus import geometry
+from haus.benchmarks import layout_benchmark, synthetic_layout
+from haus.spatial_index import LayoutSpatialIndex, index_for
+
+
+def _random_items(count: int, seed: int = 3) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "type": "furniture",
+            "pos": [rng.uniform(-8, 8), 0.4, rng.uniform(-8, 8)],
+            "rot": rng.choice([0.0, 0.4, math.pi / 2]),
+            "visible": True,
+            "geo": [rng.uniform(0.3, 2.2), 0.8, rng.uniform(0.3, 2.2)],
+        }
+        for _ in range(count)
+    ]
+
+
+def test_candidate_pairs_cover_every_overlapping_and_near_pair() -> None:
+    items = _random_items(120)
+    index = LayoutSpatialIndex(items)
+    polygons = [geometry.item_polygon(item) for item in items]
+    expected = {
+        (i, j)
+        for i in range(len(items))
+        for j in range(i + 1, len(items))
+        if geometry.polygon_distance(polygons[i], polygons[j]) < 0.5
+    }
+    pairs = index.candidate_pairs(0.5)
+    assert pairs == sorted(pairs)
+    assert expected <= set(pairs)
+    assert len(pairs) < len(items) * (len(items) - 1) // 2
+
+
+def _point_distance(point: tuple[float, float], polygon: list[tuple[float, float]]) -> float:
+    if geometry.point_in_polygon(point, polygon):
+        return 0.0
+    return min(geometry.distance_point_to_segment(point, a, b) for a, b in geometry.polygon_edges(polygon))
+
+
+def test_nearest_matches_brute_force_point_distance() -> None:
+    items = _random_items(80)
+    index = LayoutSpatialIndex(items)
+    for point in [(0.0, 0.0), (7.5, -7.5), (30.0, 30.0)]:
+        expected = sorted(
+            (_point_distance(point, geometry.item_polygon(item, 0.02)), i) for i, item in enumerate(items)
+        )[:4]
+        found = index.nearest(
+            (point[0], point[1], point[0], point[1]),
+            lambda i, point=point: _point_distance(point, index.polygon(i, 0.02)),
+            count=4,
+            padding=0.02,
+        )
+        assert found == expected
+
+
+def test_sync_picks_up_moves_appends_and_removals() -> None:
+    items = _random_items(10)
+    index = index_for(items)
+    assert index_for(items) is index
+
+    items[0]["pos"] = [50.0, 0.4, 50.0]
+    items.append({"type": "furniture", "pos": [-50.0, 0.4, -50.0], "rot": 0.0, "visible": True, "geo": [1, 1, 1]})
+    assert index.sync() == 2
+    assert index.query_rect((49.0, 49.0, 51.0, 51.0)) == [0]
+    assert index.query_rect((-51.0, -51.0, -49.0, -49.0)) == [10]
+
+    del items[5:]
+    index.sync()
+    assert len(index) == 5
+    assert index.query_rect((-51.0, -51.0, -49.0, -49.0)) == []
+
+
+def test_point_in_polygon_handles_edges_running_against_z() -> None:
+    rotated = geometry.item_polygon({"pos": [-2.37, 0.4, 4.03], "rot": 1.5708, "geo": [1.01, 0.8, 0.47]})
+    assert geometry.point_in_polygon((-2.37, 4.03), rotated)
+    assert not geometry.point_in_polygon((0.05, 4.2), rotated)
+
+
+def test_layout_benchmark_reports_each_size() -> None:
+    assert len(synthetic_layout(37)["items"]) == 37
+    report = layout_benchmark(sizes=[20, 40], repeat=1)
+    assert [row["items"] for row in report["results"]] == [20, 40]
+    assert set(report["scaling_exponent"]) == {"score_layout_s", "simulate_layout_options_s"}
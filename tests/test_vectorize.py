@@ -2,9 +2,12 @@ from __future__ import annotations
 import json
 from pathlib import Path
 import cv2
+import numpy as np
 import pytest
+from haus.benchmarks import compare_extraction, extraction_benchmark
 from haus.extraction import extract_floor_plan
 from haus.pipeline import run_vectorize
+from haus.preprocess import clean_floor_plan
 from haus.types import VectorizeConfig
 
 FIXTURES = Path("tests/fixtures")
@@ -49,6 +52,12 @@ def test_run_vectorize_produces_outputs(tmp_path):
     layout = json.loads((tmp_path / "out" / "layout.json").read_text(encoding="utf-8"))
     wall_hdb_types = {item.get("hdb_type") for item in layout["items"] if item["type"] == "wall"}
     assert wall_hdb_types & {"ferrolite", "partition", "structural", "shelter"}
+    stages = {span["name"]: span for span in metadata["trace"]["stages"]}
+    assert {"read", "clean", "extract", "render", "layout", "debug_artifacts"} <= set(stages)
+    assert "erase_door_arcs" in {child["name"] for child in stages["clean"]["children"]}
+    assert "wall_segments" in {child["name"] for child in stages["extract"]["children"]}
+    written = json.loads((tmp_path / "out" / "vector.metadata.json").read_text(encoding="utf-8"))
+    assert written["trace"]["stages"][0]["name"] == "read"
 
 
 def test_scale_estimation_produces_plausible_value():
@@ -57,3 +66,40 @@ def test_scale_estimation_produces_plausible_value():
     data, _, _ = extract_floor_plan(img_rgb)
     if data.m_per_px is not None:
         assert 0.005 < data.m_per_px < 0.1
+
+
+def test_extraction_benchmark_reports_stages_and_flags_regressions(tmp_path):
+    (tmp_path / "cleaned").mkdir()
+    (tmp_path / "cleaned" / "1.jpg").write_bytes((FIXTURES / "bto_3room_orange.jpg").read_bytes())
+    report = extraction_benchmark(corpus_dir=tmp_path, scales=[1])
+    (row,) = report["results"]
+    assert row["clean"] is False
+    assert {"extract", "extract.wall_segments", "extract.openings"} <= set(row["stages_s"])
+    assert row["walls"] > 0 and row["stable"]
+    assert row["peak_rss_mb"] >= row["base_rss_mb"]
+    assert compare_extraction(report, report) == []
+
+    slower = json.loads(json.dumps(report))
+    slower["results"][0]["stages_s"]["extract"] = row["stages_s"]["extract"] * 2 + 1
+    slower["results"][0]["walls"] = row["walls"] + 1
+    regressions = compare_extraction(slower, report)
+    assert any("extract took" in line for line in regressions)
+    assert any("walls changed" in line for line in regressions)
+
+
+def test_clean_floor_plan_pyramid_mode_refines_downscaled_detection():
+    img = cv2.cvtColor(cv2.imread(str(FIXTURES / "bto_3room_orange.jpg")), cv2.COLOR_BGR2RGB)
+    native = clean_floor_plan(img)
+    assert np.array_equal(clean_floor_plan(img, max_side=max(img.shape[:2])), native)
+
+    upscaled = cv2.resize(img, None, fx=2, fy=2, interpolation=cv2.INTER_LINEAR)
+    pyramid = clean_floor_plan(upscaled, max_side=max(img.shape[:2]))
+    assert pyramid.shape == upscaled.shape
+    # Mapped back down, the full-resolution result should match cleaning the
+    # downscaled copy the detectors actually ran on.
+    size = (img.shape[1], img.shape[0])
+    reference = clean_floor_plan(cv2.resize(upscaled, size, interpolation=cv2.INTER_AREA))
+    back = cv2.resize(pyramid, size, interpolation=cv2.INTER_AREA)
+    dark_back = cv2.cvtColor(back, cv2.COLOR_RGB2GRAY) < 150
+    dark_reference = cv2.cvtColor(reference, cv2.COLOR_RGB2GRAY) < 150
+    assert np.count_nonzero(dark_back == dark_reference) / dark_reference.size > 0.995
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from haus.vectorize_cache import VectorizeCache, cache_key
+
+
+def _store(cache: VectorizeCache, raw: bytes, size: int) -> str:
+    key = cache_key(raw, wall_height=2.6, scale_override=None, clean=True)
+    entry_dir = cache.prepare(key)
+    layout = entry_dir / "layout.json"
+    layout.write_bytes(b"x" * size)
+    cache.commit(key, {"output_layout": str(layout)}, {})
+    return key
+
+
+def test_cache_key_covers_bytes_and_config() -> None:
+    base = cache_key(b"plan", wall_height=2.6, scale_override=None, clean=True)
+    assert base == cache_key(b"plan", wall_height=2.6, scale_override=None, clean=True)
+    assert base != cache_key(b"plan!", wall_height=2.6, scale_override=None, clean=True)
+    assert base != cache_key(b"plan", wall_height=2.6, scale_override=0.01, clean=True)
+    assert base != cache_key(b"plan", wall_height=2.6, scale_override=None, clean=False)
+
+
+def test_evicts_least_recently_used_entries_over_budget(tmp_path: Path) -> None:
+    cache = VectorizeCache(tmp_path, max_bytes=2500)
+    first = _store(cache, b"a", 1000)
+    time.sleep(0.01)
+    second = _store(cache, b"b", 1000)
+    time.sleep(0.01)
+    assert cache.lookup(first) is not None
+    time.sleep(0.01)
+    third = _store(cache, b"c", 1000)
+
+    assert cache.lookup(second) is None
+    assert cache.lookup(first) is not None
+    assert cache.lookup(third) is not None
+
+
+def test_unfinished_entries_are_misses(tmp_path: Path) -> None:
+    cache = VectorizeCache(tmp_path)
+    key = cache_key(b"plan", wall_height=2.6, scale_override=None, clean=True)
+    (cache.prepare(key) / "layout.json").write_text("{}", encoding="utf-8")
+    assert cache.lookup(key) is None
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import copy
 import json
+import math
+import random
 import zipfile
 from pathlib import Path
 
 from haus import geometry
+from haus import semantic_ir
 from haus import workbench
 
 
@@ -167,6 +171,67 @@ def test_known_scale_floorplan_fixture_metadata() -> None:
     assert metadata["expected_room_count_min"] >= 1
 
 
+def test_current_layouts_migrate_without_copying() -> None:
+    raw = _layout()
+    migrated = workbench.migrate_layout(raw)
+    assert migrated is not raw
+    assert workbench.is_current_layout(migrated) and not workbench.is_current_layout(raw)
+    assert workbench.migrate_layout(migrated) is migrated
+
+    editable = workbench.editable_layout(migrated)
+    assert editable == migrated and editable is not migrated
+    first_id = migrated["items"][0]["id"]
+    locked = workbench.lock_elements(migrated, [first_id])
+    assert locked["items"][0]["do_not_touch"] is True
+    assert "do_not_touch" not in migrated["items"][0]
+
+    # A layout carrying the current marker but missing a default is still migrated, into a copy.
+    stale = copy.deepcopy(migrated)
+    del stale["items"][0]["scenario_status"]
+    repaired = workbench.migrate_layout(stale)
+    assert repaired is not stale
+    assert repaired["items"][0]["scenario_status"] == "existing"
+    assert "scenario_status" not in stale["items"][0]
+
+
+def test_project_snapshots_are_stored_as_shared_blobs() -> None:
+    project = workbench.new_project("Blobs", "blank", _layout())
+    moved = workbench.editable_layout(project["layout"])
+    moved["items"][0]["pos"][0] += 0.5
+    project["scenarios"].append(workbench.create_scenario("Moved", "blank", moved))
+    workbench.capture_project_version(project, "revised", moved)
+    expected = json.loads(json.dumps(project))
+
+    packed = json.loads(json.dumps(workbench.pack_snapshots(project)))
+    assert "layout_blobs" not in project and "layout_ref" not in project["scenarios"][0]
+    assert all("layout" not in entry and "layout_ref" in entry for entry in packed["scenarios"] + packed["layout_versions"])
+    assert packed["layout"] == expected["layout"]
+    item_count = len(project["layout"]["items"])
+    room_count = len(project["layout"]["rooms"])
+    # Four snapshots, but only the one moved item adds a blob.
+    assert len(packed["layout_blobs"]) == item_count + room_count + 1
+
+    loaded = workbench.unpack_snapshots(packed)
+    assert loaded == expected
+    first, second = loaded["layout_versions"][0]["layout"], loaded["scenarios"][0]["layout"]
+    assert first["items"][1] is second["items"][1]
+    assert len(workbench.pack_snapshots(loaded)["layout_blobs"]) == item_count + room_count + 1
+    assert workbench.import_haus_json(json.dumps(workbench.pack_snapshots(project)))["project"]["scenarios"] == expected["scenarios"]
+
+    # A snapshot whose blobs are gone stays a ref, and saving again writes it back as it was read.
+    dangling = json.loads(json.dumps(workbench.pack_snapshots(project)))
+    dropped = dangling["scenarios"][0]["layout_ref"]["items"][0]
+    dangling["layout_blobs"].pop(dropped)
+    stored_ref = copy.deepcopy(dangling["scenarios"][0]["layout_ref"])
+    restored = workbench.unpack_snapshots(dangling)
+    assert "layout" not in restored["scenarios"][0] and restored["scenarios"][0]["layout_ref"] == stored_ref
+    for entry in restored["scenarios"] + restored["layout_versions"]:
+        assert "layout" in entry or dropped in entry["layout_ref"]["items"]
+    resaved = json.loads(json.dumps(workbench.pack_snapshots(restored)))
+    assert resaved["scenarios"][0]["layout_ref"] == stored_ref
+    assert set(stored_ref["items"]) - {dropped} <= set(resaved["layout_blobs"])
+
+
 def test_sample_compact_apartment_renovation_report_fixture() -> None:
     fixture = Path(__file__).parent / "fixtures" / "sample_compact_apartment_renovation_report.md"
     report = fixture.read_text()
@@ -211,6 +276,8 @@ def test_command_router_prompts_and_llm_badge() -> None:
     assert workbench.command_route("validate the bathroom") == "validate_layout"
     assert workbench.command_route("export report") == "export_report"
     assert workbench.command_route("move the sofa") == "edit_object"
+    assert workbench.command_routes("move the desk and send me a brief") == ["export_report", "edit_object"]
+    assert workbench.command_routes("what is this?") == []
     prompt = workbench.journey_system_prompt("accessibility", {"country": "US"})
     assert "Accessibility Checker" in prompt
     assert "not ADA certification" in prompt
@@ -495,3 +562,110 @@ def test_designer_presales_artifacts_and_client_safe_static_report(tmp_path: Pat
     assert "Studio A" in static
     assert "raw_plan" not in static
     assert (folder / "reports").exists()
+
+
+def test_routes_follow_the_doorway_and_report_its_bottleneck() -> None:
+    def wall(x: float, z: float, length: float) -> dict:
+        return {"type": "wall", "pos": [x, 1.3, z], "geo": [0.1, 2.6, length], "rot": 0, "visible": True}
+
+    layout = {
+        "rooms": [
+            {"id": "hall", "label": "Hall", "kind": "hall", "bounds": {"x_min": 0.0, "z_min": 0.0, "x_max": 3.0, "z_max": 3.0}},
+            {"id": "bath", "label": "Bath", "kind": "bathroom", "bounds": {"x_min": 3.0, "z_min": 0.0, "x_max": 5.0, "z_max": 3.0}},
+        ],
+        "items": [
+            # Partition at x=3 with a 0.8m doorway between z=2.0 and z=2.8.
+            wall(3.0, 1.0, 2.0),
+            wall(3.0, 2.9, 0.2),
+            {"id": "bath-door", "type": "door", "width_m": 0.8, "pos": [3.0, 1.0, 2.4], "geo": [0.8, 2.0, 0.05], "rot": 1.5708, "visible": True},
+            {"id": "toilet", "type": "fixture", "furnitureType": "toilet", "pos": [4.5, 0.4, 0.5], "geo": [0.4, 0.8, 0.7], "rot": 0, "visible": True},
+        ],
+    }
+
+    walker = workbench.routing.find_route(layout, "hall", "toilet", 0.6)
+    wheelchair = workbench.routing.find_route(layout, "Hall", "bath", 0.915)
+    missing = workbench.routing.find_route(layout, "hall", "garage", 0.6)
+
+    assert walker["status"] == "clear"
+    assert walker["clear_width_m"] >= 0.6
+    # The route has to go round the partition through the doorway, not straight across.
+    assert walker["length_m"] > 1.0
+    assert any(2.0 <= point["z"] <= 2.8 for point in walker["path"] if abs(point["x"] - 3.0) < 0.3)
+    assert wheelchair["status"] == "blocked"
+    assert 0.6 <= wheelchair["bottleneck_m"] < 0.915
+    assert wheelchair["blockers"]
+    assert missing["status"] == "needs_inputs"
+    assert missing["missing"] == ["garage"]
+
+    navigator = workbench.routing.navigator_for(layout)
+    assert workbench.routing.navigator_for(layout) is navigator
+    layout["items"][1]["pos"][2] = 2.7
+    assert workbench.routing.navigator_for(layout) is not navigator
+
+
+def test_room_routes_on_a_fresh_navigator_match_a_warm_one() -> None:
+    layout = {
+        "rooms": [
+            {"id": "living", "label": "Living", "bounds": {"x_min": 0.0, "z_min": 0.0, "x_max": 4.0, "z_max": 3.5}},
+            {"id": "study", "label": "Study", "bounds": {"x_min": 4.0, "z_min": 0.0, "x_max": 7.0, "z_max": 3.5}},
+        ],
+        "items": [],
+    }
+
+    fresh = workbench.routing.Navigator(layout).widest("living", "study")
+    warm = workbench.routing.Navigator(layout)
+    warm.widest("living", "study")
+    assert fresh == warm.widest("living", "study")
+    assert fresh > 1.5
+
+    workbench.routing._NAVIGATORS.clear()
+    first = workbench.routing.find_route(layout, "living", "study", 0.9)
+    assert first == workbench.routing.find_route(layout, "living", "study", 0.9)
+    assert first["status"] == "clear"
+    assert math.isclose(first["bottleneck_m"], 2 * fresh, abs_tol=0.01)
+
+
+def test_incremental_validation_matches_a_full_rebuild() -> None:
+    rng = random.Random(16)
+    kinds = ["chair", "bed_double", "toilet", "fridge", "sink", "rug", "sofa", "table"]
+    items = [
+        {
+            "id": f"item-{n}",
+            "furnitureType": kinds[n % len(kinds)],
+            "pos": [rng.uniform(-4, 4), 0.4, rng.uniform(-4, 4)],
+            "rot": rng.uniform(-math.pi, math.pi),
+            "geo": [rng.uniform(0.3, 1.6), 0.8, rng.uniform(0.3, 1.6)],
+        }
+        for n in range(60)
+    ]
+    items += [
+        {"id": f"door-{n}", "type": "door", "width_m": 0.7, "swing_direction": "in", "pos": [rng.uniform(-4, 4), 1.0, rng.uniform(-4, 4)], "rot": 0.0, "geo": [0.8, 2.0, 0.1]}
+        for n in range(4)
+    ]
+    before = {"items": items}
+    after = copy.deepcopy(before)
+    after["items"][3]["pos"][0] += 1.1
+    after["items"][10]["rot"] += 0.6
+    after["items"][61]["pos"][2] -= 0.5
+    del after["items"][20]
+    after["items"].insert(5, {"id": "new-bed", "furnitureType": "bed_single", "pos": [0.2, 0.4, 0.3], "rot": 0.0, "geo": [1.0, 0.5, 2.0]})
+    changes = semantic_ir.layout_diff(before, after)["ops"]
+
+    for journey in ("blank", "accessibility", "renovation"):
+        previous = workbench.build_validation_report(before, journey=journey, accessibility_profile="wheelchair")
+        incremental = workbench.build_validation_report(
+            after, journey=journey, accessibility_profile="wheelchair", previous=previous, changes=changes
+        )
+        full = workbench.build_validation_report(after, journey=journey, accessibility_profile="wheelchair")
+        assert incremental["warnings"] == full["warnings"]
+        # Warnings away from the edits are carried over from the previous report.
+        assert {id(warning) for warning in incremental["warnings"]} & {id(warning) for warning in previous["warnings"]}
+        assert incremental["room_summaries"] == full["room_summaries"]
+        assert {warning["code"] for warning in full["warnings"]} > {"missing_measurements"}
+
+    # A report built for another profile, or room edits, fall back to a full run.
+    previous = workbench.build_validation_report(before, journey="accessibility")
+    mismatched = workbench.build_validation_report(
+        after, journey="accessibility", accessibility_profile="wheelchair", previous=previous, changes=changes
+    )
+    assert mismatched["warnings"] == workbench.build_validation_report(after, journey="accessibility", accessibility_profile="wheelchair")["warnings"]